@@ -1,11 +1,21 @@
 """Database engine management."""
 
+import asyncio
+import ssl
+from collections.abc import Callable
 from logging import DEBUG
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, TypeVar
+from urllib.parse import quote_plus
 
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine.base import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
 from configuration import configuration
@@ -15,9 +25,13 @@ from models.database.base import Base
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
 # pylint: disable=invalid-name
 engine: Optional[Engine] = None
 session_local: Optional[sessionmaker] = None
+async_engine: Optional[AsyncEngine] = None
+async_session_local: Optional[async_sessionmaker[AsyncSession]] = None
 
 
 def get_engine() -> Engine:
@@ -68,6 +82,56 @@ def get_session() -> Session:
     return session_local()
 
 
+def get_async_session() -> AsyncSession:
+    """Get an async database session. Raises an error if not initialized.
+
+    Provide a new AsyncSession bound to the async engine (aiosqlite or
+    asyncpg driver).
+
+    Returns:
+        AsyncSession: A SQLAlchemy AsyncSession bound to the initialized async engine.
+
+    Raises:
+        RuntimeError: If the async database has not been initialized; call
+        initialize_async_database() first.
+    """
+    if async_session_local is None:
+        raise RuntimeError(
+            "Async database session not initialized. "
+            "Call initialize_async_database() first."
+        )
+    return async_session_local()
+
+
+async def run_in_session(func: Callable[[Session], T]) -> T:
+    """Run an ORM callable against a database session without blocking the event loop.
+
+    When the async engine is initialized, the callable is executed through
+    AsyncSession.run_sync(), so all SQL is sent using the async driver and
+    the event loop is free while waiting for the database. When only the
+    synchronous engine is available, the callable runs with a regular
+    Session in a worker thread.
+
+    Parameters:
+    ----------
+        func: Callable receiving a synchronous ORM Session; it is responsible
+        for committing its own changes.
+
+    Returns:
+    -------
+        The value returned by `func`.
+    """
+    if async_session_local is not None:
+        async with async_session_local() as session:
+            return await session.run_sync(func)
+
+    def _run() -> T:
+        with get_session() as session:
+            return func(session)
+
+    return await asyncio.to_thread(_run)
+
+
 def _create_sqlite_engine(config: SQLiteDatabaseConfiguration, **kwargs: Any) -> Engine:
     """Create SQLite database engine.
 
@@ -163,6 +227,114 @@ def _create_postgres_engine(
     return postgres_engine
 
 
+def _create_sqlite_async_engine(
+    config: SQLiteDatabaseConfiguration, **kwargs: Any
+) -> AsyncEngine:
+    """Create SQLite async database engine using the aiosqlite driver.
+
+    Parameters:
+    ----------
+        config (SQLiteDatabaseConfiguration): Configuration containing
+        `db_path` for the SQLite file.
+        **kwargs: Additional keyword arguments forwarded to create_async_engine.
+
+    Returns:
+    -------
+        AsyncEngine: A SQLAlchemy AsyncEngine bound to the SQLite database file.
+
+    Raises:
+    ------
+        FileNotFoundError: If the parent directory of `config.db_path` does not exist.
+        RuntimeError: If engine creation fails.
+    """
+    if not Path(config.db_path).parent.exists():
+        raise FileNotFoundError(
+            f"SQLite database directory does not exist: {config.db_path}"
+        )
+
+    try:
+        return create_async_engine(f"sqlite+aiosqlite:///{config.db_path}", **kwargs)
+    except Exception as e:
+        logger.exception("Failed to create async SQLite engine")
+        raise RuntimeError(f"Async SQLite engine creation failed: {e}") from e
+
+
+def _asyncpg_ssl(
+    config: PostgreSQLDatabaseConfiguration,
+) -> ssl.SSLContext | bool | str:
+    """Map the libpq SSL mode to the ssl argument of asyncpg.
+
+    The CA certificate is used the same way libpq uses sslrootcert: only
+    modes verifying the server load it, with "require" verifying the
+    certificate chain like "verify-ca" when a CA certificate is configured
+    and "verify-full" checking the host name as well.
+
+    Parameters:
+    ----------
+        config (PostgreSQLDatabaseConfiguration): Database settings with the
+        SSL mode and optional CA certificate path.
+
+    Returns:
+    -------
+        False when SSL is disabled, an SSL context verifying the server
+        against the configured CA certificate, or the SSL mode name that
+        asyncpg interprets like libpq otherwise.
+    """
+    if config.ssl_mode == "disable":
+        return False
+    if config.ca_cert_path is not None and config.ssl_mode in (
+        "require",
+        "verify-ca",
+        "verify-full",
+    ):
+        context = ssl.create_default_context(cafile=str(config.ca_cert_path))
+        context.check_hostname = config.ssl_mode == "verify-full"
+        return context
+    return config.ssl_mode
+
+
+def _create_postgres_async_engine(
+    config: PostgreSQLDatabaseConfiguration, **kwargs: Any
+) -> AsyncEngine:
+    """Create PostgreSQL async database engine using the asyncpg driver.
+
+    The schema for a custom namespace is expected to exist already; it is
+    created by the synchronous engine in initialize_database().
+
+    Parameters:
+    ----------
+        config (PostgreSQLDatabaseConfiguration): Connection and database
+        settings (user, password, host, port, db, ssl options, optional
+        namespace and ca_cert_path).
+        **kwargs: Additional keyword arguments forwarded to create_async_engine.
+
+    Returns:
+    -------
+        AsyncEngine: A SQLAlchemy AsyncEngine for the configured PostgreSQL database.
+
+    Raises:
+    ------
+        RuntimeError: If engine creation fails.
+    """
+    postgres_url = (
+        f"postgresql+asyncpg://{config.user}:"
+        f"{quote_plus(config.password.get_secret_value())}@"
+        f"{config.host}:{config.port}/{config.db}"
+    )
+
+    connect_args: dict[str, Any] = {}
+    if config.namespace is not None and config.namespace != "public":
+        connect_args["server_settings"] = {"search_path": config.namespace}
+
+    connect_args["ssl"] = _asyncpg_ssl(config)
+
+    try:
+        return create_async_engine(postgres_url, connect_args=connect_args, **kwargs)
+    except Exception as e:
+        logger.exception("Failed to create async PostgreSQL engine")
+        raise RuntimeError(f"Async PostgreSQL engine creation failed: {e}") from e
+
+
 def initialize_database() -> None:
     """Initialize the database engine.
 
@@ -209,3 +381,71 @@ def initialize_database() -> None:
             engine = _create_postgres_engine(postgres_config, **create_engine_kwargs)
 
     session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def initialize_async_database() -> None:
+    """Initialize the async database engine.
+
+    Initialize module-level async engine and async session factory next to
+    the synchronous ones created by initialize_database(). The async engine
+    targets the same database, using aiosqlite for SQLite and asyncpg for
+    PostgreSQL, and is used by the request hot path (see run_in_session) so
+    database latency does not block the event loop. PostgreSQL requiring GSS
+    encryption is left to the synchronous engine, as asyncpg does not
+    support it.
+
+    May raise RuntimeError if engine creation fails.
+    """
+    db_config = configuration.database_configuration
+
+    global async_engine, async_session_local  # pylint: disable=global-statement
+
+    create_engine_kwargs = {
+        "echo": bool(logger.isEnabledFor(DEBUG)),
+        "pool_pre_ping": True,
+    }
+
+    match db_config.db_type:
+        case "sqlite":
+            logger.info("Initialize async SQLite database")
+            sqlite_config = db_config.config
+            if not isinstance(sqlite_config, SQLiteDatabaseConfiguration):
+                raise TypeError(
+                    f"Expected SQLiteDatabaseConfiguration, got {type(sqlite_config)}"
+                )
+            async_engine = _create_sqlite_async_engine(
+                sqlite_config, **create_engine_kwargs
+            )
+        case "postgres":
+            logger.info("Initialize async PostgreSQL database")
+            postgres_config = db_config.config
+            if not isinstance(postgres_config, PostgreSQLDatabaseConfiguration):
+                raise TypeError(
+                    f"Expected PostgreSQLDatabaseConfiguration, got {type(postgres_config)}"
+                )
+            if postgres_config.gss_encmode == "require":
+                # asyncpg can not negotiate GSS encryption, so requests keep
+                # using the synchronous engine in worker threads
+                logger.warning(
+                    "GSS encryption is not supported by the async PostgreSQL "
+                    "driver, using the synchronous engine instead"
+                )
+                return
+            async_engine = _create_postgres_async_engine(
+                postgres_config, **create_engine_kwargs
+            )
+
+    async_session_local = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+async def dispose_async_database() -> None:
+    """Close all connections held by the async engine and reset its state."""
+    global async_engine, async_session_local  # pylint: disable=global-statement
+
+    if async_engine is not None:
+        await async_engine.dispose()
+        logger.info("Closed async database engine")
+    async_engine = None
+    async_session_local = None
@@ -223,7 +223,7 @@ async def get_conversation_endpoint_handler(  # pylint: disable=too-many-locals,
     )
 
     user_id = auth[0]
-    conversation = validate_and_retrieve_conversation(
+    conversation = await validate_and_retrieve_conversation(
         normalized_conv_id=normalized_conv_id,
         user_id=user_id,
         others_allowed=(
@@ -245,7 +245,7 @@ async def get_conversation_endpoint_handler(  # pylint: disable=too-many-locals,
         )
 
         # Retrieve turns metadata from database (can be empty for legacy conversations)
-        db_turns = retrieve_conversation_turns(normalized_conv_id)
+        db_turns = await retrieve_conversation_turns(normalized_conv_id)
 
         # Use Conversations API to retrieve conversation items
         items = await get_all_conversation_items(client, llama_stack_conv_id)
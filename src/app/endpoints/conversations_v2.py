@@ -1,5 +1,6 @@
 """Handler for REST API calls to manage conversation history."""
 
+import asyncio
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Request
@@ -101,7 +102,9 @@ async def get_conversations_list_endpoint_handler(
         response = InternalServerErrorResponse.cache_unavailable()
         raise HTTPException(**response.model_dump())
 
-    conversations = configuration.conversation_cache.list(user_id, skip_userid_check)
+    conversations = await asyncio.to_thread(
+        configuration.conversation_cache.list, user_id, skip_userid_check
+    )
     logger.info("Conversations for user %s: %s", user_id, len(conversations))
 
     return ConversationsListResponseV2(conversations=conversations)
@@ -131,10 +134,13 @@ async def get_conversation_endpoint_handler(
         response = InternalServerErrorResponse.cache_unavailable()
         raise HTTPException(**response.model_dump())
 
-    check_conversation_existence(user_id, conversation_id)
+    await asyncio.to_thread(check_conversation_existence, user_id, conversation_id)
 
-    conversation = configuration.conversation_cache.get(
-        user_id, conversation_id, skip_userid_check
+    conversation = await asyncio.to_thread(
+        configuration.conversation_cache.get,
+        user_id,
+        conversation_id,
+        skip_userid_check,
     )
     # Each entry in conversation is a single turn
     chat_history: list[ConversationTurn] = [
@@ -170,8 +176,11 @@ async def delete_conversation_endpoint_handler(
         raise HTTPException(**response.model_dump())
 
     logger.info("Deleting conversation %s for user %s", conversation_id, user_id)
-    deleted = configuration.conversation_cache.delete(
-        user_id, conversation_id, skip_userid_check
+    deleted = await asyncio.to_thread(
+        configuration.conversation_cache.delete,
+        user_id,
+        conversation_id,
+        skip_userid_check,
     )
     return ConversationDeleteResponse(deleted=deleted, conversation_id=conversation_id)
 
@@ -201,11 +210,15 @@ async def update_conversation_endpoint_handler(
         response = InternalServerErrorResponse.cache_unavailable()
         raise HTTPException(**response.model_dump())
 
-    check_conversation_existence(user_id, conversation_id)
+    await asyncio.to_thread(check_conversation_existence, user_id, conversation_id)
 
     # Update the topic summary in the cache
-    configuration.conversation_cache.set_topic_summary(
-        user_id, conversation_id, update_request.topic_summary, skip_userid_check
+    await asyncio.to_thread(
+        configuration.conversation_cache.set_topic_summary,
+        user_id,
+        conversation_id,
+        update_request.topic_summary,
+        skip_userid_check,
     )
 
     logger.info(
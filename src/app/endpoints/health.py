@@ -29,6 +29,7 @@ from models.responses import (
     ProviderHealthStatus,
     ReadinessResponse,
 )
+from utils.common import DeferredMcpRegistration
 
 logger = get_logger(__name__)
 router = APIRouter(tags=["health"])
@@ -132,9 +133,10 @@ async def readiness_probe_get_method(
     """
     Handle the readiness probe endpoint, returning service readiness.
 
-    If any provider reports an error status, responds with HTTP 503
-    and details of unhealthy providers; otherwise, indicates the
-    service is ready.
+    If MCP servers are still being registered in background, or any
+    provider reports an error status, responds with HTTP 503 (with
+    details of unhealthy providers); otherwise, indicates the service
+    is ready.
 
     ### Parameters:
     - response: The outgoing HTTP response (used by middleware).
@@ -150,6 +152,12 @@ async def readiness_probe_get_method(
 
     logger.info("Response to /v1/readiness endpoint")
 
+    # Deferred MCP servers registration has to finish first
+    mcp_registered, mcp_reason = DeferredMcpRegistration().status()
+    if not mcp_registered:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return ReadinessResponse(ready=False, reason=mcp_reason, providers=[])
+
     provider_statuses = await get_providers_health_statuses()
 
     # Check if any provider is unhealthy (not counting not_implemented as unhealthy)
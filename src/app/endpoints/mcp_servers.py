@@ -29,6 +29,8 @@ from models.responses import (
     MCPServerRegistrationResponse,
 )
 from utils.endpoints import check_configuration_loaded
+from utils.registry_cache import REGISTRY_TOOLGROUPS, LlamaStackRegistryCache
+from utils.tool_catalog import ToolCatalog
 
 logger = get_logger(__name__)
 router = APIRouter(tags=["mcp-servers"])
@@ -101,6 +103,8 @@ async def register_mcp_server_handler(
             provider_id=mcp_server.provider_id,
             mcp_endpoint={"uri": mcp_server.url},
         )
+        LlamaStackRegistryCache().invalidate(REGISTRY_TOOLGROUPS)
+        ToolCatalog().invalidate(mcp_server.name)
     except APIConnectionError as e:
         configuration.remove_mcp_server(body.name)
         logger.error("Failed to register MCP server with Llama Stack: %s", e)
@@ -255,6 +259,8 @@ async def delete_mcp_server_handler(
         response = NotFoundResponse(resource="MCP server", resource_id=name)
         raise HTTPException(**response.model_dump()) from e
 
+    LlamaStackRegistryCache().invalidate(REGISTRY_TOOLGROUPS)
+    ToolCatalog().invalidate(name)
     logger.info("Dynamically unregistered MCP server: %s", name)
 
     return MCPServerDeleteResponse(
@@ -25,6 +25,7 @@ from models.responses import (
     ModelsResponse,
 )
 from utils.endpoints import check_configuration_loaded
+from utils.registry_cache import LlamaStackRegistryCache
 
 logger = get_logger(__name__)
 router = APIRouter(tags=["models"])
@@ -121,7 +122,7 @@ async def models_endpoint_handler(
         # try to get Llama Stack client
         client = AsyncLlamaStackClientHolder().get_client()
         # retrieve models
-        models = await client.models.list()
+        models = await LlamaStackRegistryCache().models(client)
 
         # parse models to legacy format
         parsed_models = [parse_llama_stack_model(model) for model in models]
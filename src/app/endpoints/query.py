@@ -1,6 +1,8 @@
 """Handler for REST API call to provide answer to query using Response API."""
 
+import asyncio
 import datetime
+import time
 from typing import Annotated, Any, Optional, cast
 
 from fastapi import APIRouter, Depends, HTTPException, Request
@@ -24,6 +26,7 @@ from client import AsyncLlamaStackClientHolder
 from configuration import configuration
 from constants import ENDPOINT_PATH_QUERY
 from log import get_logger
+from metrics import recording
 from models.api.responses import (
     UNAUTHORIZED_OPENAPI_EXAMPLES_WITH_MCP_OAUTH,
     ForbiddenResponse,
@@ -50,11 +53,12 @@ from utils.mcp_headers import McpHeaders, mcp_headers_dependency
 from utils.mcp_oauth_probe import check_mcp_auth
 from utils.query import (
     consume_query_tokens,
+    discard_preparation_stages,
     handle_known_apistatus_errors,
     is_context_length_error,
     prepare_input,
     store_query_results,
-    update_azure_token,
+    timed_preparation_stage,
     validate_attachments_metadata,
     validate_model_provider_override,
 )
@@ -64,11 +68,14 @@ from utils.responses import (
     deduplicate_referenced_documents,
     extract_vector_store_ids_from_tools,
     get_topic_summary,
+    join_topic_summary,
     prepare_responses_params,
+    start_topic_summary,
 )
 from utils.shields import run_shield_moderation, validate_shield_ids_override
 from utils.suid import normalize_conversation_id
 from utils.types import (
+    RAGContext,
     ShieldModerationResult,
     TurnSummary,
 )
@@ -137,11 +144,8 @@ async def query_endpoint_handler(
     started_at = datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
     user_id, _, _skip_userid_check, token = auth
 
-    # Check MCP Auth
-    await check_mcp_auth(configuration, mcp_headers, token, request.headers)
-
-    # Check token availability
-    check_tokens_available(configuration.quota_limiters, user_id)
+    preparation_started = time.monotonic()
+    endpoint_path = ENDPOINT_PATH_QUERY
 
     # Enforce RBAC: optionally disallow overriding model/provider in requests
     validate_model_provider_override(
@@ -155,6 +159,27 @@ async def query_endpoint_handler(
     if query_request.attachments:
         validate_attachments_metadata(query_request.attachments)
 
+    client = AsyncLlamaStackClientHolder().get_client()
+
+    # Moderation input is the raw user content (query + attachments) without injected RAG
+    # context, to avoid false positives from retrieved document content.
+    moderation_input = prepare_input(query_request)
+
+    # Check MCP Auth and token availability concurrently
+    await asyncio.gather(
+        timed_preparation_stage(
+            endpoint_path,
+            "mcp_auth",
+            check_mcp_auth(configuration, mcp_headers, token, request.headers),
+        ),
+        asyncio.to_thread(
+            check_tokens_available,
+            configuration.quota_limiters,
+            user_id,
+            configuration.quota_engine,
+        ),
+    )
+
     # Retrieve conversation if conversation_id is provided
     user_conversation = None
     if query_request.conversation_id:
@@ -162,43 +187,82 @@ async def query_endpoint_handler(
             "Conversation ID specified in query: %s", query_request.conversation_id
         )
         normalized_conv_id = normalize_conversation_id(query_request.conversation_id)
-        user_conversation = validate_and_retrieve_conversation(
-            normalized_conv_id=normalized_conv_id,
-            user_id=user_id,
-            others_allowed=Action.READ_OTHERS_CONVERSATIONS
-            in request.state.authorized_actions,
+        user_conversation = await timed_preparation_stage(
+            endpoint_path,
+            "conversation",
+            validate_and_retrieve_conversation(
+                normalized_conv_id=normalized_conv_id,
+                user_id=user_id,
+                others_allowed=Action.READ_OTHERS_CONVERSATIONS
+                in request.state.authorized_actions,
+            ),
         )
 
-    client = AsyncLlamaStackClientHolder().get_client()
-
-    # Moderation input is the raw user content (query + attachments) without injected RAG
-    # context, to avoid false positives from retrieved document content.
-    endpoint_path = ENDPOINT_PATH_QUERY
-    moderation_input = prepare_input(query_request)
-    moderation_result = await run_shield_moderation(
-        client, moderation_input, endpoint_path, query_request.shield_ids
+    # Moderation, inline RAG and API request parameters (model check, tools,
+    # new conversation) are prepared concurrently only once the request passed
+    # the checks above. Inline RAG is retrieved speculatively while moderation
+    # runs and is discarded if the query is blocked.
+    moderation_task = asyncio.create_task(
+        timed_preparation_stage(
+            endpoint_path,
+            "moderation",
+            run_shield_moderation(
+                client, moderation_input, endpoint_path, query_request.shield_ids
+            ),
+        )
     )
-
-    # Build RAG context from Inline RAG sources
-    inline_rag_context = await build_rag_context(
-        client,
-        moderation_result.decision,
-        query_request.query,
-        query_request.vector_store_ids,
-        query_request.solr,
+    rag_task = asyncio.create_task(
+        timed_preparation_stage(
+            endpoint_path,
+            "inline_rag",
+            build_rag_context(
+                client,
+                "passed",
+                query_request.query,
+                query_request.vector_store_ids,
+                query_request.solr,
+            ),
+        )
     )
+    responses_params_task = asyncio.create_task(
+        timed_preparation_stage(
+            endpoint_path,
+            "responses_params",
+            prepare_responses_params(
+                client,
+                query_request,
+                user_conversation,
+                token,
+                mcp_headers,
+                stream=False,
+                store=True,
+                request_headers=request.headers,
+            ),
+        )
+    )
+    stages: list[asyncio.Task[Any]] = [
+        moderation_task,
+        rag_task,
+        responses_params_task,
+    ]
+    try:
+        moderation_result = await moderation_task
+
+        # Build RAG context from Inline RAG sources
+        inline_rag_context = (
+            await rag_task if moderation_result.decision == "passed" else RAGContext()
+        )
 
-    # Prepare API request parameters
-    responses_params = await prepare_responses_params(
-        client,
-        query_request,
-        user_conversation,
-        token,
-        mcp_headers,
-        stream=False,
-        store=True,
-        request_headers=request.headers,
-        inline_rag_context=inline_rag_context.context_text,
+        responses_params = await responses_params_task
+    finally:
+        await discard_preparation_stages(stages)
+
+    # Inject inline RAG context into the LLM input
+    responses_params.input = prepare_input(
+        query_request, inline_rag_context.context_text
+    )
+    recording.record_request_preparation_duration(
+        endpoint_path, "total", time.monotonic() - preparation_started
     )
 
     # Handle Azure token refresh if needed
@@ -206,14 +270,27 @@ async def query_endpoint_handler(
         responses_params.model.startswith("azure")
         and AzureEntraIDManager().is_entra_id_configured
         and AzureEntraIDManager().is_token_expired
-        and AzureEntraIDManager().refresh_token()
+        and await AzureEntraIDManager().refresh_token_async()
     ):
-        client = await update_azure_token(client)
+        client = AsyncLlamaStackClientHolder().get_client()
+
+    # Generate topic summary for new conversation alongside the main response
+    topic_summary_task = None
+    if not user_conversation and query_request.generate_topic_summary:
+        logger.debug("Generating topic summary for new conversation")
+        topic_summary_task = start_topic_summary(
+            get_topic_summary(query_request.query, client, responses_params.model)
+        )
 
     # Retrieve response using Responses API
-    turn_summary = await retrieve_response(
-        client, responses_params, moderation_result, endpoint_path
-    )
+    try:
+        turn_summary = await retrieve_response(
+            client, responses_params, moderation_result, endpoint_path
+        )
+    except BaseException:
+        if topic_summary_task is not None:
+            topic_summary_task.cancel()
+        raise
 
     if moderation_result.decision == "passed":
         # Combine inline RAG results (BYOK + Solr) with tool-based RAG results for the transcript
@@ -229,32 +306,32 @@ async def query_endpoint_handler(
             rag_documents + tool_rag_documents
         )
 
-    # Get topic summary for new conversation
-    if not user_conversation and query_request.generate_topic_summary:
-        logger.debug("Generating topic summary for new conversation")
-        topic_summary = await get_topic_summary(
-            query_request.query, client, responses_params.model
-        )
-    else:
-        topic_summary = None
+    topic_summary = None
+    if topic_summary_task is not None:
+        topic_summary = await join_topic_summary(topic_summary_task)
 
     logger.info("Consuming tokens")
-    consume_query_tokens(
+    available_quotas = await asyncio.to_thread(
+        consume_query_tokens,
         user_id=user_id,
         model_id=responses_params.model,
         token_usage=turn_summary.token_usage,
     )
 
-    logger.info("Getting available quotas")
-    available_quotas = get_available_quotas(
-        quota_limiters=configuration.quota_limiters, user_id=user_id
-    )
+    if available_quotas is None:
+        logger.info("Getting available quotas")
+        available_quotas = await asyncio.to_thread(
+            get_available_quotas,
+            quota_limiters=configuration.quota_limiters,
+            user_id=user_id,
+            quota_engine=configuration.quota_engine,
+        )
 
     completed_at = datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
     conversation_id = normalize_conversation_id(responses_params.conversation)
 
     logger.info("Storing query results")
-    store_query_results(
+    await store_query_results(
         user_id=user_id,
         conversation_id=conversation_id,
         model=responses_params.model,
@@ -57,7 +57,12 @@ from models.requests import ResponsesRequest
 from models.responses import (
     ResponsesResponse,
 )
-from observability import ResponsesEventData, build_responses_event, send_splunk_event
+from observability import (
+    ResponsesEventData,
+    build_responses_event,
+    queue_splunk_event,
+    send_splunk_event,
+)
 from utils.conversations import append_turn_items_to_conversation
 from utils.endpoints import (
     check_configuration_loaded,
@@ -72,7 +77,6 @@ from utils.query import (
     handle_known_apistatus_errors,
     is_context_length_error,
     store_query_results,
-    update_azure_token,
     validate_model_provider_override,
 )
 from utils.quota import check_tokens_available, get_available_quotas
@@ -88,11 +92,13 @@ from utils.responses import (
     get_topic_summary,
     get_zero_usage,
     is_server_deployed_output,
+    join_topic_summary,
     parse_rag_chunks,
     parse_referenced_documents,
     resolve_client_tool_choice,
     resolve_tool_choice,
     select_model_for_responses,
+    start_topic_summary,
 )
 from utils.rh_identity import get_rh_identity_context
 from utils.shields import run_shield_moderation
@@ -216,6 +222,8 @@ def _queue_responses_splunk_event(  # pylint: disable=too-many-arguments,too-man
         user_agent=user_agent,
     )
     event = build_responses_event(event_data)
+    if queue_splunk_event(event, sourcetype):
+        return
     if fire_and_forget:
         task = asyncio.create_task(send_splunk_event(event, sourcetype))
         _background_splunk_tasks.add(task)
@@ -279,7 +287,12 @@ async def responses_endpoint_handler(
     await check_mcp_auth(configuration, mcp_headers, token, request.headers)
 
     # Check token availability
-    check_tokens_available(configuration.quota_limiters, user_id)
+    await asyncio.to_thread(
+        check_tokens_available,
+        configuration.quota_limiters,
+        user_id,
+        configuration.quota_engine,
+    )
 
     # Enforce RBAC: optionally disallow overriding model in requests
     validate_model_provider_override(
@@ -320,9 +333,9 @@ async def responses_endpoint_handler(
         updated_request.model.startswith("azure")
         and AzureEntraIDManager().is_entra_id_configured
         and AzureEntraIDManager().is_token_expired
-        and AzureEntraIDManager().refresh_token()
+        and await AzureEntraIDManager().refresh_token_async()
     ):
-        client = await update_azure_token(client)
+        client = AsyncLlamaStackClientHolder().get_client()
 
     input_text = (
         original_request.input
@@ -532,8 +545,11 @@ async def shield_violation_generator(
         SSE-formatted strings for streaming events, ending with [DONE]
     """
     normalized_conv_id = normalize_conversation_id(api_params.conversation)
-    available_quotas = get_available_quotas(
-        quota_limiters=configuration.quota_limiters, user_id=context.auth[0]
+    available_quotas = await asyncio.to_thread(
+        get_available_quotas,
+        quota_limiters=configuration.quota_limiters,
+        user_id=context.auth[0],
+        quota_engine=configuration.quota_engine,
     )
     moderation_result = cast(ShieldModerationBlocked, context.moderation_result)
 
@@ -832,16 +848,22 @@ async def response_generator(
             turn_summary.token_usage = extract_token_usage(
                 latest_response_object.usage, api_params.model, context.endpoint_path
             )
-            consume_query_tokens(
+            available_quotas = await asyncio.to_thread(
+                consume_query_tokens,
                 user_id=context.auth[0],
                 model_id=api_params.model,
                 token_usage=turn_summary.token_usage,
             )
 
             # Get available quotas after token consumption
-            chunk_dict["response"]["available_quotas"] = get_available_quotas(
-                quota_limiters=configuration.quota_limiters, user_id=context.auth[0]
-            )
+            if available_quotas is None:
+                available_quotas = await asyncio.to_thread(
+                    get_available_quotas,
+                    quota_limiters=configuration.quota_limiters,
+                    user_id=context.auth[0],
+                    quota_engine=configuration.quota_engine,
+                )
+            chunk_dict["response"]["available_quotas"] = available_quotas
             turn_summary.llm_response = extract_text_from_response_items(
                 latest_response_object.output
             )
@@ -890,20 +912,22 @@ async def generate_response(
         SSE-formatted strings from the generator
     """
     user_id, _, skip_userid_check, _ = context.auth
-    async for event in generator:
-        yield event
+    topic_summary_task = _start_topic_summary(api_params, context)
+    try:
+        async for event in generator:
+            yield event
+    except BaseException:
+        if topic_summary_task is not None:
+            topic_summary_task.cancel()
+        raise
 
-    # Get topic summary for new conversation
     topic_summary = None
-    if context.generate_topic_summary:
-        logger.debug("Generating topic summary for new conversation")
-        topic_summary = await get_topic_summary(
-            context.input_text, context.client, api_params.model
-        )
+    if topic_summary_task is not None:
+        topic_summary = await join_topic_summary(topic_summary_task)
 
     completed_at = datetime.now(UTC)
     if api_params.store:
-        store_query_results(
+        await store_query_results(
             user_id=user_id,
             conversation_id=normalize_conversation_id(api_params.conversation),
             model=api_params.model,
@@ -930,21 +954,38 @@ async def generate_response(
         )
 
 
-async def handle_non_streaming_response(
-    original_request: ResponsesRequest,
+def _start_topic_summary(
+    api_params: ResponsesApiParams, context: ResponsesContext
+) -> Optional[asyncio.Task[str]]:
+    """Start topic summary generation for a new conversation, if requested.
+
+    Args:
+        api_params: API parameters
+        context: Responses context
+    Returns:
+        Task generating the topic summary, or None if not requested
+    """
+    if not context.generate_topic_summary:
+        return None
+    logger.debug("Generating topic summary for new conversation")
+    return start_topic_summary(
+        get_topic_summary(context.input_text, context.client, api_params.model)
+    )
+
+
+async def _retrieve_non_streaming_response(
     api_params: ResponsesApiParams,
     context: ResponsesContext,
-) -> ResponsesResponse:
-    """Handle non-streaming response from Responses API.
+) -> tuple[OpenAIResponseObject, str]:
+    """Retrieve the response object and its text, or the shield refusal.
 
     Args:
-        original_request: Original request (read-only)
         api_params: API parameters
         context: Responses context
     Returns:
-        ResponsesResponse with the completed response
+        Tuple of the response object and the response text
     """
-    user_id, _, skip_userid_check, _ = context.auth
+    user_id = context.auth[0]
 
     # Fork: Get response object (blocked vs normal)
     if context.moderation_result.decision == "blocked":
@@ -987,7 +1028,8 @@ async def handle_non_streaming_response(
                 api_response.usage, api_params.model, context.endpoint_path
             )
             logger.info("Consuming tokens")
-            consume_query_tokens(
+            await asyncio.to_thread(
+                consume_query_tokens,
                 user_id=user_id,
                 model_id=api_params.model,
                 token_usage=token_usage,
@@ -1054,19 +1096,46 @@ async def handle_non_streaming_response(
             )
             error_response = handle_known_apistatus_errors(e, api_params.model)
             raise HTTPException(**error_response.model_dump()) from e
+    return api_response, output_text
+
+
+async def handle_non_streaming_response(
+    original_request: ResponsesRequest,
+    api_params: ResponsesApiParams,
+    context: ResponsesContext,
+) -> ResponsesResponse:
+    """Handle non-streaming response from Responses API.
+
+    Args:
+        original_request: Original request (read-only)
+        api_params: API parameters
+        context: Responses context
+    Returns:
+        ResponsesResponse with the completed response
+    """
+    user_id, _, skip_userid_check, _ = context.auth
+
+    topic_summary_task = _start_topic_summary(api_params, context)
+    try:
+        api_response, output_text = await _retrieve_non_streaming_response(
+            api_params, context
+        )
+    except BaseException:
+        if topic_summary_task is not None:
+            topic_summary_task.cancel()
+        raise
 
     # Get available quotas
     logger.info("Getting available quotas")
-    available_quotas = get_available_quotas(
-        quota_limiters=configuration.quota_limiters, user_id=user_id
+    available_quotas = await asyncio.to_thread(
+        get_available_quotas,
+        quota_limiters=configuration.quota_limiters,
+        user_id=user_id,
+        quota_engine=configuration.quota_engine,
     )
-    # Get topic summary for new conversation
     topic_summary = None
-    if context.generate_topic_summary:
-        logger.debug("Generating topic summary for new conversation")
-        topic_summary = await get_topic_summary(
-            context.input_text, context.client, api_params.model
-        )
+    if topic_summary_task is not None:
+        topic_summary = await join_topic_summary(topic_summary_task)
 
     vector_store_ids = extract_vector_store_ids_from_tools(api_params.tools)
     turn_summary = build_turn_summary(
@@ -1097,7 +1166,7 @@ async def handle_non_streaming_response(
             output_tokens=turn_summary.token_usage.output_tokens,
         )
     if api_params.store:
-        store_query_results(
+        await store_query_results(
             user_id=user_id,
             conversation_id=normalize_conversation_id(api_params.conversation),
             model=api_params.model,
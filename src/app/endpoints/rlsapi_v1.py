@@ -4,6 +4,7 @@ This module provides the /infer endpoint for stateless inference requests
 from the RHEL Lightspeed Command Line Assistant (CLA).
 """
 
+import asyncio
 import functools
 import time
 from datetime import UTC, datetime
@@ -39,7 +40,12 @@ from models.api.responses import (
 from models.config import Action
 from models.rlsapi.requests import RlsapiV1InferRequest, RlsapiV1SystemInfo
 from models.rlsapi.responses import RlsapiV1InferData, RlsapiV1InferResponse
-from observability import InferenceEventData, build_inference_event, send_splunk_event
+from observability import (
+    InferenceEventData,
+    build_inference_event,
+    queue_splunk_event,
+    send_splunk_event,
+)
 from utils.endpoints import check_configuration_loaded
 from utils.query import (
     consume_query_tokens,
@@ -48,6 +54,7 @@ from utils.query import (
     is_context_length_error,
 )
 from utils.quota import check_tokens_available
+from utils.registry_cache import LlamaStackRegistryCache
 from utils.responses import (
     build_turn_summary,
     check_model_configured,
@@ -185,7 +192,7 @@ async def _get_default_model_id() -> str:
     # 2. Auto-discover from Llama Stack
     client = AsyncLlamaStackClientHolder().get_client()
     try:
-        models = await client.models.list()
+        models = await LlamaStackRegistryCache().models(client)
     except APIConnectionError as e:
         error_response = ServiceUnavailableResponse(
             backend_name="Llama Stack",
@@ -365,7 +372,8 @@ def _queue_splunk_event(  # pylint: disable=too-many-arguments,too-many-position
     )
 
     event = build_inference_event(event_data)
-    background_tasks.add_task(send_splunk_event, event, sourcetype)
+    if not queue_splunk_event(event, sourcetype):
+        background_tasks.add_task(send_splunk_event, event, sourcetype)
 
 
 async def _check_shield_moderation(  # pylint: disable=too-many-arguments,too-many-positional-arguments
@@ -677,7 +685,12 @@ async def infer_endpoint(  # pylint: disable=R0914
     # No-op when quota_subject is not configured or no quota limiters exist.
     quota_id = _resolve_quota_subject(request, auth)
     if quota_id is not None:
-        check_tokens_available(configuration.quota_limiters, quota_id)
+        await asyncio.to_thread(
+            check_tokens_available,
+            configuration.quota_limiters,
+            quota_id,
+            configuration.quota_engine,
+        )
 
     endpoint_path = ENDPOINT_PATH_INFER
 
@@ -756,7 +769,8 @@ async def infer_endpoint(  # pylint: disable=R0914
 
     # Consume quota tokens after successful inference.
     if quota_id is not None:
-        consume_query_tokens(
+        await asyncio.to_thread(
+            consume_query_tokens,
             user_id=quota_id,
             model_id=model_id,
             token_usage=token_usage,
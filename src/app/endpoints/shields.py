@@ -24,6 +24,7 @@ from models.responses import (
     ShieldsResponse,
 )
 from utils.endpoints import check_configuration_loaded
+from utils.registry_cache import LlamaStackRegistryCache
 
 logger = get_logger(__name__)
 router = APIRouter(tags=["shields"])
@@ -78,7 +79,7 @@ async def shields_endpoint_handler(
         # try to get Llama Stack client
         client = AsyncLlamaStackClientHolder().get_client()
         # retrieve shields
-        shields = await client.shields.list()
+        shields = await LlamaStackRegistryCache().shields(client)
         s = [dict(s) for s in shields]
         return ShieldsResponse(shields=s)
 
@@ -5,6 +5,7 @@
 import asyncio
 import datetime
 import json
+import time
 from collections.abc import AsyncIterator
 from typing import Annotated, Any, Optional, cast
 
@@ -86,14 +87,16 @@ from utils.endpoints import (
 )
 from utils.mcp_headers import McpHeaders, mcp_headers_dependency
 from utils.mcp_oauth_probe import check_mcp_auth
+from utils.persistence_queue import PersistenceQueue, QueryResultsRecord
 from utils.query import (
     consume_query_tokens,
+    discard_preparation_stages,
     extract_provider_and_model_from_model_id,
     handle_known_apistatus_errors,
     is_context_length_error,
     prepare_input,
     store_query_results,
-    update_azure_token,
+    timed_preparation_stage,
     update_conversation_topic_summary,
     validate_attachments_metadata,
     validate_model_provider_override,
@@ -107,9 +110,12 @@ from utils.responses import (
     extract_token_usage,
     extract_vector_store_ids_from_tools,
     get_topic_summary,
+    join_topic_summary,
     parse_rag_chunks,
     parse_referenced_documents,
     prepare_responses_params,
+    start_topic_summary,
+    track_background_topic_summary_task,
 )
 from utils.shields import (
     append_turn_to_conversation,
@@ -119,15 +125,12 @@ from utils.shields import (
 from utils.stream_interrupts import get_stream_interrupt_registry
 from utils.suid import get_suid, normalize_conversation_id
 from utils.token_counter import TokenCounter
-from utils.types import ReferencedDocument, TurnSummary
+from utils.types import RAGContext, ReferencedDocument, TurnSummary
 from utils.vector_search import build_rag_context
 
 logger = get_logger(__name__)
 router = APIRouter(tags=["streaming_query"])
 
-# Tracks background topic summary tasks for graceful shutdown.
-_background_topic_summary_tasks: list[asyncio.Task[None]] = []
-
 streaming_query_responses: dict[int | str, dict[str, Any]] = {
     200: StreamingQueryResponse.openapi_response(),
     401: UnauthorizedResponse.openapi_response(
@@ -193,11 +196,8 @@ async def streaming_query_endpoint_handler(  # pylint: disable=too-many-locals
     user_id, _user_name, _skip_userid_check, token = auth
     started_at = datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    # Check MCP Auth
-    await check_mcp_auth(configuration, mcp_headers, token, request.headers)
-
-    # Check token availability
-    check_tokens_available(configuration.quota_limiters, user_id)
+    preparation_started = time.monotonic()
+    endpoint_path = ENDPOINT_PATH_STREAMING_QUERY
 
     # Enforce RBAC: optionally disallow overriding model/provider in requests
     validate_model_provider_override(
@@ -211,6 +211,27 @@ async def streaming_query_endpoint_handler(  # pylint: disable=too-many-locals
     if query_request.attachments:
         validate_attachments_metadata(query_request.attachments)
 
+    client = AsyncLlamaStackClientHolder().get_client()
+
+    # Moderation input is the raw user content (query + attachments) without injected RAG
+    # context, to avoid false positives from retrieved document content.
+    moderation_input = prepare_input(query_request)
+
+    # Check MCP Auth and token availability concurrently
+    await asyncio.gather(
+        timed_preparation_stage(
+            endpoint_path,
+            "mcp_auth",
+            check_mcp_auth(configuration, mcp_headers, token, request.headers),
+        ),
+        asyncio.to_thread(
+            check_tokens_available,
+            configuration.quota_limiters,
+            user_id,
+            configuration.quota_engine,
+        ),
+    )
+
     # Retrieve conversation if conversation_id is provided
     user_conversation = None
     if query_request.conversation_id:
@@ -218,43 +239,82 @@ async def streaming_query_endpoint_handler(  # pylint: disable=too-many-locals
             "Conversation ID specified in query: %s", query_request.conversation_id
         )
         normalized_conv_id = normalize_conversation_id(query_request.conversation_id)
-        user_conversation = validate_and_retrieve_conversation(
-            normalized_conv_id=normalized_conv_id,
-            user_id=user_id,
-            others_allowed=Action.READ_OTHERS_CONVERSATIONS
-            in request.state.authorized_actions,
+        user_conversation = await timed_preparation_stage(
+            endpoint_path,
+            "conversation",
+            validate_and_retrieve_conversation(
+                normalized_conv_id=normalized_conv_id,
+                user_id=user_id,
+                others_allowed=Action.READ_OTHERS_CONVERSATIONS
+                in request.state.authorized_actions,
+            ),
         )
 
-    client = AsyncLlamaStackClientHolder().get_client()
-
-    # Moderation input is the raw user content (query + attachments) without injected RAG
-    # context, to avoid false positives from retrieved document content.
-    moderation_input = prepare_input(query_request)
-    endpoint_path = ENDPOINT_PATH_STREAMING_QUERY
-    moderation_result = await run_shield_moderation(
-        client, moderation_input, endpoint_path, query_request.shield_ids
+    # Moderation, inline RAG and API request parameters (model check, tools,
+    # new conversation) are prepared concurrently only once the request passed
+    # the checks above. Inline RAG is retrieved speculatively while moderation
+    # runs and is discarded if the query is blocked.
+    moderation_task = asyncio.create_task(
+        timed_preparation_stage(
+            endpoint_path,
+            "moderation",
+            run_shield_moderation(
+                client, moderation_input, endpoint_path, query_request.shield_ids
+            ),
+        )
     )
-
-    # Build RAG context from Inline RAG sources
-    inline_rag_context = await build_rag_context(
-        client,
-        moderation_result.decision,
-        query_request.query,
-        query_request.vector_store_ids,
-        query_request.solr,
+    rag_task = asyncio.create_task(
+        timed_preparation_stage(
+            endpoint_path,
+            "inline_rag",
+            build_rag_context(
+                client,
+                "passed",
+                query_request.query,
+                query_request.vector_store_ids,
+                query_request.solr,
+            ),
+        )
     )
+    responses_params_task = asyncio.create_task(
+        timed_preparation_stage(
+            endpoint_path,
+            "responses_params",
+            prepare_responses_params(
+                client=client,
+                query_request=query_request,
+                user_conversation=user_conversation,
+                token=token,
+                mcp_headers=mcp_headers,
+                stream=True,
+                store=True,
+                request_headers=request.headers,
+            ),
+        )
+    )
+    stages: list[asyncio.Task[Any]] = [
+        moderation_task,
+        rag_task,
+        responses_params_task,
+    ]
+    try:
+        moderation_result = await moderation_task
 
-    # Prepare API request parameters
-    responses_params = await prepare_responses_params(
-        client=client,
-        query_request=query_request,
-        user_conversation=user_conversation,
-        token=token,
-        mcp_headers=mcp_headers,
-        stream=True,
-        store=True,
-        request_headers=request.headers,
-        inline_rag_context=inline_rag_context.context_text,
+        # Build RAG context from Inline RAG sources
+        inline_rag_context = (
+            await rag_task if moderation_result.decision == "passed" else RAGContext()
+        )
+
+        responses_params = await responses_params_task
+    finally:
+        await discard_preparation_stages(stages)
+
+    # Inject inline RAG context into the LLM input
+    responses_params.input = prepare_input(
+        query_request, inline_rag_context.context_text
+    )
+    recording.record_request_preparation_duration(
+        endpoint_path, "total", time.monotonic() - preparation_started
     )
 
     # Handle Azure token refresh if needed
@@ -262,9 +322,9 @@ async def streaming_query_endpoint_handler(  # pylint: disable=too-many-locals
         responses_params.model.startswith("azure")
         and AzureEntraIDManager().is_entra_id_configured
         and AzureEntraIDManager().is_token_expired
-        and AzureEntraIDManager().refresh_token()
+        and await AzureEntraIDManager().refresh_token_async()
     ):
-        client = await update_azure_token(client)
+        client = AsyncLlamaStackClientHolder().get_client()
 
     request_id = get_suid()
 
@@ -393,15 +453,18 @@ async def retrieve_response_generator(
 async def _background_update_topic_summary(
     context: ResponseGeneratorContext,
     model: str,
+    topic_summary_task: Optional[asyncio.Task[str]] = None,
 ) -> None:
     """Generate topic summary and update DB/cache in the background.
 
     Runs as a fire-and-forget task after an interrupted turn is persisted.
+    A topic summary already being generated alongside the stream is reused.
     All errors are caught and logged.
     """
     try:
         topic_summary = await asyncio.wait_for(
-            get_topic_summary(
+            topic_summary_task
+            or get_topic_summary(
                 context.query_request.query,
                 context.client,
                 model,
@@ -409,7 +472,7 @@ async def _background_update_topic_summary(
             timeout=TOPIC_SUMMARY_INTERRUPT_TIMEOUT_SECONDS,
         )
         if topic_summary:
-            update_conversation_topic_summary(
+            await update_conversation_topic_summary(
                 context.conversation_id,
                 topic_summary,
                 user_id=context.user_id,
@@ -427,28 +490,11 @@ async def _background_update_topic_summary(
         )
 
 
-async def shutdown_background_topic_summary_tasks() -> None:
-    """Cancel and await outstanding background topic summary tasks on shutdown.
-
-    Ensures graceful shutdown so in-flight topic summary generation can be
-    cleaned up. Called from the application lifespan shutdown phase.
-    """
-    tasks = list(_background_topic_summary_tasks)
-    if not tasks:
-        return
-    logger.debug(
-        "Shutting down %d outstanding background topic summary task(s)",
-        len(tasks),
-    )
-    for task in tasks:
-        task.cancel()
-    await asyncio.gather(*tasks, return_exceptions=True)
-
-
 async def _persist_interrupted_turn(
     context: ResponseGeneratorContext,
     responses_params: ResponsesApiParams,
     turn_summary: TurnSummary,
+    topic_summary_task: Optional[asyncio.Task[str]] = None,
 ) -> None:
     """Persist the user query and an interrupted response into the conversation.
 
@@ -463,6 +509,8 @@ async def _persist_interrupted_turn(
         responses_params: The Responses API parameters.
         turn_summary: TurnSummary with llm_response already set to the
             interrupted message.
+        topic_summary_task: Topic summary generation started with the stream,
+            if any; reused instead of generating the summary again.
     """
     try:
         await append_turn_to_conversation(
@@ -481,7 +529,7 @@ async def _persist_interrupted_turn(
         completed_at = datetime.datetime.now(datetime.UTC).strftime(
             "%Y-%m-%dT%H:%M:%SZ"
         )
-        store_query_results(
+        await store_query_results(
             user_id=context.user_id,
             conversation_id=context.conversation_id,
             model=responses_params.model,
@@ -501,10 +549,10 @@ async def _persist_interrupted_turn(
                 _background_update_topic_summary(
                     context=context,
                     model=responses_params.model,
+                    topic_summary_task=topic_summary_task,
                 )
             )
-            _background_topic_summary_tasks.append(task)
-            task.add_done_callback(_background_topic_summary_tasks.remove)
+            track_background_topic_summary_task(task)
     except Exception:  # pylint: disable=broad-except
         logger.exception(
             "Failed to store interrupted query results for request %s",
@@ -516,6 +564,7 @@ def _register_interrupt_callback(
     context: ResponseGeneratorContext,
     responses_params: ResponsesApiParams,
     turn_summary: TurnSummary,
+    topic_summary_task: Optional[asyncio.Task[str]] = None,
 ) -> list[bool]:
     """Build an interrupt callback and register the stream for cancellation.
 
@@ -532,6 +581,8 @@ def _register_interrupt_callback(
         context: The response generator context.
         responses_params: The Responses API parameters.
         turn_summary: TurnSummary populated during streaming.
+        topic_summary_task: Topic summary generation started with the stream,
+            if any.
 
     Returns:
     -------
@@ -546,7 +597,9 @@ def _register_interrupt_callback(
             return
         guard[0] = True
         turn_summary.llm_response = INTERRUPTED_RESPONSE_MESSAGE
-        await _persist_interrupted_turn(context, responses_params, turn_summary)
+        await _persist_interrupted_turn(
+            context, responses_params, turn_summary, topic_summary_task
+        )
 
     current_task = asyncio.current_task()
     if current_task is not None:
@@ -566,6 +619,99 @@ def _register_interrupt_callback(
     return guard
 
 
+async def _store_completed_turn(  # pylint: disable=too-many-arguments
+    context: ResponseGeneratorContext,
+    responses_params: ResponsesApiParams,
+    turn_summary: TurnSummary,
+    *,
+    completed_at: str,
+    topic_summary: Optional[str],
+    write_behind: bool,
+) -> None:
+    """Store results of a successfully streamed turn.
+
+    With write-behind enabled the results are handed over to the persistence
+    queue, so the response can be closed without waiting for storage.
+
+    Parameters:
+    ----------
+        context: The response generator context.
+        responses_params: The Responses API parameters.
+        turn_summary: TurnSummary populated during streaming.
+        completed_at: ISO formatted timestamp when the stream completed.
+        topic_summary: Optional topic summary for a new conversation.
+        write_behind: Whether to submit the results to the persistence queue.
+    """
+    if write_behind:
+        logger.info("Queueing query results")
+        await PersistenceQueue().submit(
+            QueryResultsRecord(
+                user_id=context.user_id,
+                conversation_id=context.conversation_id,
+                model=responses_params.model,
+                completed_at=completed_at,
+                started_at=context.started_at,
+                summary=turn_summary,
+                query=context.query_request.query,
+                attachments=context.query_request.attachments,
+                skip_userid_check=context.skip_userid_check,
+                topic_summary=topic_summary,
+            )
+        )
+        return
+
+    # Store query results (transcript, conversation details, cache)
+    logger.info("Storing query results")
+    await store_query_results(
+        user_id=context.user_id,
+        conversation_id=context.conversation_id,
+        model=responses_params.model,
+        completed_at=completed_at,
+        started_at=context.started_at,
+        summary=turn_summary,
+        query=context.query_request.query,
+        attachments=context.query_request.attachments,
+        skip_userid_check=context.skip_userid_check,
+        topic_summary=topic_summary,
+    )
+
+
+def _consume_turn_tokens(
+    context: ResponseGeneratorContext,
+    responses_params: ResponsesApiParams,
+    turn_summary: TurnSummary,
+    write_behind: bool,
+) -> dict[str, int]:
+    """Consume tokens of the completed turn and return the available quotas.
+
+    Args:
+        context: The response generator context
+        responses_params: The Responses API parameters
+        turn_summary: TurnSummary with the token usage of the turn
+        write_behind: Whether token usage history is recorded by the
+            write-behind persistence queue instead
+
+    Returns:
+        Available quotas keyed by quota limiter name
+    """
+    logger.info("Consuming tokens")
+    available_quotas = consume_query_tokens(
+        user_id=context.user_id,
+        model_id=responses_params.model,
+        token_usage=turn_summary.token_usage,
+        record_history=not write_behind,
+    )
+    # Get available quotas, unless returned by the consumption
+    if available_quotas is None:
+        logger.info("Getting available quotas")
+        available_quotas = get_available_quotas(
+            quota_limiters=configuration.quota_limiters,
+            user_id=context.user_id,
+            quota_engine=configuration.quota_engine,
+        )
+    return available_quotas
+
+
 async def generate_response(
     generator: AsyncIterator[str],
     context: ResponseGeneratorContext,
@@ -580,6 +726,10 @@ async def generate_response(
     an interrupted response are persisted to the conversation, but
     token consumption is skipped (no usage data is available).
 
+    For new conversations the topic summary is generated concurrently
+    with the stream; it is cancelled when the stream fails and reused for
+    the interrupted turn when the stream is interrupted.
+
     Args:
         generator: The base generator to wrap
         context: The response generator context
@@ -589,8 +739,24 @@ async def generate_response(
     Yields:
         SSE-formatted strings from the wrapped generator
     """
+    # The topic summary depends only on the question, so for new conversations
+    # it is generated while the main response is streamed
+    topic_summary_task = None
+    if (
+        not context.query_request.conversation_id
+        and context.query_request.generate_topic_summary
+    ):
+        logger.debug("Generating topic summary for new conversation")
+        topic_summary_task = start_topic_summary(
+            get_topic_summary(
+                context.query_request.query,
+                context.client,
+                responses_params.model,
+            )
+        )
+
     persist_guard = _register_interrupt_callback(
-        context, responses_params, turn_summary
+        context, responses_params, turn_summary, topic_summary_task
     )
 
     stream_completed = False
@@ -631,41 +797,35 @@ async def generate_response(
         if not persist_guard[0]:
             persist_guard[0] = True
             turn_summary.llm_response = INTERRUPTED_RESPONSE_MESSAGE
-            await _persist_interrupted_turn(context, responses_params, turn_summary)
+            await _persist_interrupted_turn(
+                context, responses_params, turn_summary, topic_summary_task
+            )
         yield stream_interrupted_event(context.request_id)
     finally:
         get_stream_interrupt_registry().deregister_stream(context.request_id)
+        # an interrupted turn hands the topic summary over to its persistence
+        if topic_summary_task is not None and not (
+            stream_completed or persist_guard[0]
+        ):
+            topic_summary_task.cancel()
 
     if not stream_completed:
         return
 
     # Post-stream side effects: only run when streaming finished successfully
 
-    # Get topic summary for new conversations if needed
+    # Join topic summary of a new conversation
     topic_summary = None
-    if not context.query_request.conversation_id:
-        should_generate = context.query_request.generate_topic_summary
-        if should_generate:
-            logger.debug("Generating topic summary for new conversation")
-            topic_summary = await get_topic_summary(
-                context.query_request.query,
-                context.client,
-                responses_params.model,
-            )
+    if topic_summary_task is not None:
+        topic_summary = await join_topic_summary(topic_summary_task)
 
-    # Consume tokens
-    logger.info("Consuming tokens")
-    consume_query_tokens(
-        user_id=context.user_id,
-        model_id=responses_params.model,
-        token_usage=turn_summary.token_usage,
-    )
-    # Get available quotas
-    logger.info("Getting available quotas")
-    available_quotas = get_available_quotas(
-        quota_limiters=configuration.quota_limiters, user_id=context.user_id
-    )
+    # With the write-behind queue running, query results (including token
+    # usage history) are persisted after the stream is closed
+    write_behind = PersistenceQueue().running
 
+    available_quotas = await asyncio.to_thread(
+        _consume_turn_tokens, context, responses_params, turn_summary, write_behind
+    )
     yield stream_end_event(
         turn_summary.token_usage,
         available_quotas,
@@ -674,19 +834,13 @@ async def generate_response(
     )
     completed_at = datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    # Store query results (transcript, conversation details, cache)
-    logger.info("Storing query results")
-    store_query_results(
-        user_id=context.user_id,
-        conversation_id=context.conversation_id,
-        model=responses_params.model,
+    await _store_completed_turn(
+        context,
+        responses_params,
+        turn_summary,
         completed_at=completed_at,
-        started_at=context.started_at,
-        summary=turn_summary,
-        query=context.query_request.query,
-        attachments=context.query_request.attachments,
-        skip_userid_check=context.skip_userid_check,
         topic_summary=topic_summary,
+        write_behind=write_behind,
     )
 
 
@@ -0,0 +1,101 @@
+"""Handler for REST API call to retrieve aggregated token usage history."""
+
+import asyncio
+import sqlite3
+from datetime import datetime
+from typing import Annotated, Any, Literal, Optional
+
+import psycopg2
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from authentication import get_auth_dependency
+from authentication.interface import AuthTuple
+from authorization.middleware import authorize
+from configuration import configuration
+from log import get_logger
+from models.api.responses import (
+    UNAUTHORIZED_OPENAPI_EXAMPLES,
+    ForbiddenResponse,
+    InternalServerErrorResponse,
+    ServiceUnavailableResponse,
+    UnauthorizedResponse,
+)
+from models.config import Action
+from models.responses import TokenUsageResponse
+from utils.endpoints import check_configuration_loaded
+
+logger = get_logger(__name__)
+router = APIRouter(tags=["token_usage"])
+
+
+token_usage_responses: dict[int | str, dict[str, Any]] = {
+    200: TokenUsageResponse.openapi_response(),
+    401: UnauthorizedResponse.openapi_response(examples=UNAUTHORIZED_OPENAPI_EXAMPLES),
+    403: ForbiddenResponse.openapi_response(examples=["endpoint"]),
+    500: InternalServerErrorResponse.openapi_response(
+        examples=["configuration", "token usage history", "database"]
+    ),
+    503: ServiceUnavailableResponse.openapi_response(examples=["kubernetes api"]),
+}
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+@router.get("/token-usage", responses=token_usage_responses)
+@authorize(Action.ADMIN)
+async def token_usage_endpoint_handler(
+    auth: Annotated[AuthTuple, Depends(get_auth_dependency())],
+    request: Request,
+    user_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    granularity: Literal["hour", "day"] = "day",
+) -> TokenUsageResponse:
+    """
+    Handle requests to the /token-usage endpoint.
+
+    Return token usage per user, provider and model rolled up into hourly
+    or daily buckets, optionally for one user and a time range only.
+
+    ### Parameters:
+    - auth: Authentication tuple from the auth dependency.
+    - request: The incoming HTTP request.
+    - user_id: Return usage of this user only.
+    - start: Return buckets starting at or after this time.
+    - end: Return buckets starting before this time.
+    - granularity: Size of the buckets, `hour` or `day`.
+
+    ### Returns:
+    - TokenUsageResponse: Token usage ordered by bucket.
+
+    ### Raises:
+    - HTTPException: With status 500 when token usage history is not
+      enabled or cannot be read.
+    """
+    # Used only for authorization
+    _ = auth
+
+    # Nothing interesting in the request
+    _ = request
+
+    check_configuration_loaded(configuration)
+
+    token_usage_history = configuration.token_usage_history
+    if token_usage_history is None:
+        logger.warning("Token usage history is not configured")
+        response = InternalServerErrorResponse.token_usage_history_unavailable()
+        raise HTTPException(**response.model_dump())
+
+    try:
+        usage = await asyncio.to_thread(
+            token_usage_history.usage,
+            user_id=user_id,
+            start=start,
+            end=end,
+            granularity=granularity,
+        )
+    except (psycopg2.Error, sqlite3.Error) as e:
+        logger.exception("Database error reading token usage history.")
+        response = InternalServerErrorResponse.database_error()
+        raise HTTPException(**response.model_dump()) from e
+
+    return TokenUsageResponse(granularity=granularity, usage=usage)
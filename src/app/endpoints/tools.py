@@ -1,10 +1,16 @@
 """Handler for REST API call to list available tools from MCP servers."""
 
+import asyncio
 from typing import Annotated, Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from llama_stack_client import APIConnectionError, BadRequestError
+from llama_stack_client import (
+    APIConnectionError,
+    AsyncLlamaStackClient,
+    BadRequestError,
+)
 
+import constants
 from authentication import get_auth_dependency
 from authentication.interface import AuthTuple
 from authorization.middleware import authorize
@@ -18,7 +24,7 @@ from models.api.responses import (
     ServiceUnavailableResponse,
     UnauthorizedResponse,
 )
-from models.config import Action
+from models.config import Action, ModelContextProtocolServer
 from models.responses import (
     ToolsResponse,
 )
@@ -30,6 +36,8 @@ from utils.mcp_headers import (
     mcp_headers_dependency,
 )
 from utils.mcp_oauth_probe import check_mcp_auth
+from utils.registry_cache import LlamaStackRegistryCache
+from utils.tool_catalog import ToolCatalog
 from utils.tool_formatter import format_tools_list
 
 logger = get_logger(__name__)
@@ -93,6 +101,75 @@ def _normalize_tool_dict(tool_dict: dict[str, Any], toolgroup: Any) -> None:
         tool_dict["type"] = getattr(toolgroup, "type", None) or "tool"
 
 
+async def _list_toolgroup_tools(
+    client: AsyncLlamaStackClient,
+    semaphore: asyncio.Semaphore,
+    toolgroup: Any,
+    mcp_server: Optional[ModelContextProtocolServer],
+    headers: dict[str, str],
+) -> list[dict[str, Any]]:
+    """List formatted tools of a toolgroup, served from the tool catalog.
+
+    Parameters:
+    ----------
+        client: Llama Stack client.
+        semaphore: Bounds the number of concurrent listings of one request.
+        toolgroup: Toolgroup registered in Llama Stack.
+        mcp_server: MCP server backing the toolgroup, None for built-in ones.
+        headers: Headers (including Authorization) passed to the MCP server.
+
+    Returns:
+    -------
+        Formatted tool dicts, empty when the toolgroup is not found.
+
+    Raises:
+    ------
+        HTTPException: 503 when Llama Stack is unreachable.
+    """
+
+    async def load() -> list[dict[str, Any]]:
+        extra_headers = dict(headers)
+        authorization = extra_headers.pop("Authorization", None)
+        async with semaphore:
+            tools_response = await client.tools.list(
+                toolgroup_id=toolgroup.identifier,
+                extra_headers=extra_headers,
+                extra_query={"authorization": authorization},
+            )
+
+        # Determine server source based on toolgroup type
+        server_source = (
+            mcp_server.url or toolgroup.identifier
+            if mcp_server is not None
+            else "builtin"
+        )
+        tool_dicts = []
+        for tool in tools_response:
+            tool_dict = dict(tool)
+            _normalize_tool_dict(tool_dict, toolgroup)
+            tool_dict["server_source"] = server_source
+            tool_dicts.append(tool_dict)
+
+        logger.debug(
+            "Retrieved %d tools from toolgroup %s (source: %s)",
+            len(tool_dicts),
+            toolgroup.identifier,
+            server_source,
+        )
+        # Format tools with structured description parsing
+        return format_tools_list(tool_dicts)
+
+    try:
+        return await ToolCatalog().tools(client, toolgroup.identifier, headers, load)
+    except BadRequestError:
+        logger.error("Toolgroup %s is not found", toolgroup.identifier)
+        return []
+    except APIConnectionError as e:
+        logger.error("Unable to connect to Llama Stack: %s", e)
+        response = ServiceUnavailableResponse(backend_name="Llama Stack", cause=str(e))
+        raise HTTPException(**response.model_dump()) from e
+
+
 tools_responses: dict[int | str, dict[str, Any]] = {
     200: ToolsResponse.openapi_response(),
     401: UnauthorizedResponse.openapi_response(examples=UNAUTHORIZED_OPENAPI_EXAMPLES),
@@ -106,7 +183,7 @@ tools_responses: dict[int | str, dict[str, Any]] = {
 
 @router.get("/tools", responses=tools_responses)
 @authorize(Action.GET_TOOLS)
-async def tools_endpoint_handler(  # pylint: disable=too-many-locals,too-many-statements
+async def tools_endpoint_handler(  # pylint: disable=too-many-locals
     request: Request,
     auth: Annotated[AuthTuple, Depends(get_auth_dependency())],
     mcp_headers: McpHeaders = Depends(mcp_headers_dependency),
@@ -144,35 +221,23 @@ async def tools_endpoint_handler(  # pylint: disable=too-many-locals,too-many-st
     # Check MCP Auth
     await check_mcp_auth(configuration, mcp_headers, token, request.headers)
 
-    toolgroups_response = []
     try:
         client = AsyncLlamaStackClientHolder().get_client()
         logger.debug("Retrieving tools from all toolgroups")
-        toolgroups_response = await client.toolgroups.list()
+        toolgroups_response = await LlamaStackRegistryCache().toolgroups(client)
     except APIConnectionError as e:
         logger.error("Unable to connect to Llama Stack: %s", e)
         response = ServiceUnavailableResponse(backend_name="Llama Stack", cause=str(e))
         raise HTTPException(**response.model_dump()) from e
 
-    consolidated_tools = []
-    mcp_server_names = (
-        {mcp_server.name for mcp_server in configuration.mcp_servers}
-        if configuration.mcp_servers
-        else set()
-    )
+    mcp_servers = {
+        mcp_server.name: mcp_server for mcp_server in configuration.mcp_servers
+    }
+    semaphore = asyncio.Semaphore(constants.TOOL_CATALOG_MAX_CONCURRENT_LISTINGS)
+    listings = []
 
     for toolgroup in toolgroups_response:
-        mcp_server = None
-        if toolgroup.identifier in mcp_server_names:
-            mcp_server = next(
-                (
-                    s
-                    for s in configuration.mcp_servers
-                    if s.name == toolgroup.identifier
-                ),
-                None,
-            )
-
+        mcp_server = mcp_servers.get(toolgroup.identifier)
         headers = complete_mcp_headers.get(toolgroup.identifier, {})
         if mcp_server is not None:
             unresolved = find_unresolved_auth_headers(
@@ -187,60 +252,19 @@ async def tools_endpoint_handler(  # pylint: disable=too-many-locals,too-many-st
                     len(mcp_server.authorization_headers) - len(unresolved),
                 )
                 continue
-
-        try:
-            authorization = headers.pop("Authorization", None)
-
-            tools_response = await client.tools.list(
-                toolgroup_id=toolgroup.identifier,
-                extra_headers=headers,
-                extra_query={"authorization": authorization},
-            )
-        except BadRequestError:
-            logger.error("Toolgroup %s is not found", toolgroup.identifier)
-            continue
-        except APIConnectionError as e:
-            logger.error("Unable to connect to Llama Stack: %s", e)
-            response = ServiceUnavailableResponse(
-                backend_name="Llama Stack", cause=str(e)
-            )
-            raise HTTPException(**response.model_dump()) from e
-
-        # Convert tools to dict format
-        tools_count = 0
-        server_source = "unknown"
-
-        for tool in tools_response:
-            tool_dict = dict(tool)
-
-            _normalize_tool_dict(tool_dict, toolgroup)
-
-            # Determine server source based on toolgroup type
-            if mcp_server:
-                tool_dict["server_source"] = mcp_server.url or toolgroup.identifier
-            else:
-                # This is a built-in toolgroup
-                tool_dict["server_source"] = "builtin"
-
-            consolidated_tools.append(tool_dict)
-            tools_count += 1
-            server_source = tool_dict["server_source"]
-
-        logger.debug(
-            "Retrieved %d tools from toolgroup %s (source: %s)",
-            tools_count,
-            toolgroup.identifier,
-            server_source,
+        listings.append(
+            _list_toolgroup_tools(client, semaphore, toolgroup, mcp_server, headers)
         )
 
+    formatted_tools = [
+        tool for tools in await asyncio.gather(*listings) for tool in tools
+    ]
+
     logger.info(
         "Retrieved total of %d tools (%d from built-in toolgroups, %d from MCP servers)",
-        len(consolidated_tools),
-        len([t for t in consolidated_tools if t.get("server_source") == "builtin"]),
-        len([t for t in consolidated_tools if t.get("server_source") != "builtin"]),
+        len(formatted_tools),
+        len([t for t in formatted_tools if t.get("server_source") == "builtin"]),
+        len([t for t in formatted_tools if t.get("server_source") != "builtin"]),
     )
 
-    # Format tools with structured description parsing
-    formatted_tools = format_tools_list(consolidated_tools)
-
     return ToolsResponse(tools=formatted_tools)
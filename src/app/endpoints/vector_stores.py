@@ -48,6 +48,7 @@ from models.responses import (
 )
 from utils.endpoints import check_configuration_loaded
 from utils.query import handle_known_apistatus_errors
+from utils.registry_cache import REGISTRY_VECTOR_STORES, LlamaStackRegistryCache
 
 logger = get_logger(__name__)
 router = APIRouter(tags=["vector-stores"])
@@ -181,6 +182,7 @@ async def create_vector_store(
             **body_dict,
             extra_body=extra_body,
         )
+        LlamaStackRegistryCache().invalidate(REGISTRY_VECTOR_STORES)
 
         return VectorStoreResponse(
             id=vector_store.id,
@@ -355,6 +357,7 @@ async def update_vector_store(
         vector_store = await client.vector_stores.update(
             vector_store_id, **body.model_dump(exclude_none=True)
         )
+        LlamaStackRegistryCache().invalidate(REGISTRY_VECTOR_STORES)
 
         return VectorStoreResponse(
             id=vector_store.id,
@@ -417,6 +420,7 @@ async def delete_vector_store(
     try:
         client = AsyncLlamaStackClientHolder().get_client()
         await client.vector_stores.delete(vector_store_id)
+        LlamaStackRegistryCache().invalidate(REGISTRY_VECTOR_STORES)
         return VectorStoreDeleteResponse(deleted=True, vector_store_id=vector_store_id)
     except APIConnectionError as e:
         logger.error("Unable to connect to Llama Stack: %s", e)
@@ -1,5 +1,6 @@
 """Definition of FastAPI based web service."""
 
+import asyncio
 import os
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
@@ -16,17 +17,33 @@ from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import version
 from a2a_storage import A2AStorageFactory
 from app import routers
-from app.database import create_tables, initialize_database
-from app.endpoints.streaming_query import shutdown_background_topic_summary_tasks
+from app.database import (
+    create_tables,
+    dispose_async_database,
+    initialize_async_database,
+    initialize_database,
+)
 from authorization.azure_token_manager import AzureEntraIDManager
 from client import AsyncLlamaStackClientHolder
 from configuration import configuration
 from log import get_logger
 from metrics import recording
 from models.api.responses import InternalServerErrorResponse
+from observability import start_splunk_exporter, stop_splunk_exporter
+from quota.quota_lease import release_quota_leases
+from quota.token_usage_history import flush_token_usage_histories
+from runners.quota_scheduler import (
+    start_async_quota_scheduler,
+    stop_async_quota_scheduler,
+)
 from sentry import initialize_sentry
-from utils.common import register_mcp_servers_async
+from utils.common import DeferredMcpRegistration, register_mcp_servers_async
+from utils.http_clients import close_http_clients, open_http_clients
 from utils.llama_stack_version import check_llama_stack_version
+from utils.persistence_queue import PersistenceQueue
+from utils.postgres_pool import close_connection_pools
+from utils.query import push_azure_token
+from utils.responses import shutdown_background_topic_summary_tasks
 
 logger = get_logger(__name__)
 
@@ -59,11 +76,22 @@ _OPENAPI_TAGS: Final[list[dict[str, str]]] = [
     {"name": "shields", "description": "Safety shields."},
     {"name": "streaming_query", "description": "Streaming query (SSE)."},
     {"name": "streaming_query_interrupt", "description": "Streaming interrupt."},
+    {"name": "token_usage", "description": "Token usage history."},
     {"name": "tools", "description": "Tools."},
     {"name": "vector-stores", "description": "Vector stores and files."},
 ]
 
 
+def _initialize_database_tables() -> None:
+    """Initialize the database engine and create missing tables.
+
+    Run in a worker thread during startup, concurrently with the Llama Stack
+    version check and MCP servers registration.
+    """
+    initialize_database()
+    create_tables()
+
+
 # running on FastAPI startup
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
@@ -76,47 +104,78 @@ async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     configuration.load_configuration(os.environ["LIGHTSPEED_STACK_CONFIG_PATH"])
 
     initialize_sentry()
+    open_http_clients(configuration.configuration.http_clients)
 
     azure_config = configuration.configuration.azure_entra_id
     if azure_config is not None:
         AzureEntraIDManager().set_config(azure_config)
-        if not AzureEntraIDManager().refresh_token():
+        if not await AzureEntraIDManager().refresh_token_async():
             logger.warning(
                 "Failed to refresh Azure token at startup. "
-                "Token refresh will be retried on next Azure request."
+                "Token refresh will be retried in background."
             )
 
     llama_stack_config = configuration.configuration.llama_stack
     await AsyncLlamaStackClientHolder().load(llama_stack_config)
     client = AsyncLlamaStackClientHolder().get_client()
-    # check if the Llama Stack version is supported by the service
-    try:
-        await check_llama_stack_version(client)
-    except APIConnectionError as e:
-        llama_stack_url = llama_stack_config.url
+
+    # independent startup steps run concurrently; the first failure (in this
+    # order) is raised once all of them finished
+    startup_steps = [
+        check_llama_stack_version(client),
+        asyncio.to_thread(_initialize_database_tables),
+    ]
+    mcp_registration = configuration.configuration.mcp_registration
+    if not mcp_registration.deferred:
+        logger.info("Registering MCP servers")
+        startup_steps.append(
+            register_mcp_servers_async(logger, configuration.configuration)
+        )
+    results = await asyncio.gather(*startup_steps, return_exceptions=True)
+    if isinstance(results[0], APIConnectionError):
         logger.error(
             "Failed to connect to Llama Stack at '%s'. "
             "Please verify that the 'llama_stack.url' configuration is correct "
             "and that the Llama Stack service is running and accessible. "
             "Original error: %s",
-            llama_stack_url,
-            e,
+            llama_stack_config.url,
+            results[0],
         )
-        raise
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
 
-    logger.info("Registering MCP servers")
-    await register_mcp_servers_async(logger, configuration.configuration)
+    if azure_config is not None:
+        # new tokens are passed to the client before the previous ones expire
+        await AzureEntraIDManager().start_refresher(push_azure_token)
+
+    if mcp_registration.deferred:
+        # readiness probe fails until the MCP servers are registered
+        logger.info("Registering MCP servers in background")
+        DeferredMcpRegistration().start(logger, configuration.configuration)
+
+    initialize_async_database()
+    await PersistenceQueue().start(configuration.persistence_queue)
+    await start_splunk_exporter(configuration.splunk)
+    await start_async_quota_scheduler(configuration.configuration)
     logger.info("App startup complete")
 
-    initialize_database()
-    create_tables()
-
     yield
 
     # Cleanup resources on shutdown
     try:
+        await AzureEntraIDManager().stop_refresher()
+        await DeferredMcpRegistration().stop()
         await shutdown_background_topic_summary_tasks()
         await A2AStorageFactory.cleanup()
+        await PersistenceQueue().stop()
+        await stop_splunk_exporter()
+        await dispose_async_database()
+        await stop_async_quota_scheduler()
+        release_quota_leases()
+        flush_token_usage_histories()
+        close_connection_pools()
+        await close_http_clients()
     finally:
         # Flush pending Sentry events after cleanup so any errors during
         # shutdown are captured before the process exits.
@@ -1,21 +1,26 @@
 """Manage authentication flow for FastAPI endpoints with JWK based JWT auth."""
 
+import asyncio
+import hashlib
 import json
-from asyncio import Lock
+import time
+from asyncio import Lock, Task
 from collections.abc import Callable
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Optional
 
 import aiohttp
-from authlib.jose import JsonWebKey, Key, KeySet, jwt
+from authlib.jose import JsonWebKey, JWTClaims, Key, KeySet, jwt
 from authlib.jose.errors import (
     BadSignatureError,
     DecodeError,
     ExpiredTokenError,
     JoseError,
 )
-from cachetools import TTLCache
+from cachetools import TLRUCache
 from fastapi import HTTPException, Request
 
+import constants
 from authentication.interface import AuthInterface, AuthTuple
 from authentication.utils import extract_user_token
 from constants import (
@@ -24,15 +29,181 @@ from constants import (
 from log import get_logger
 from models.api.responses import UnauthorizedResponse
 from models.config import JwkConfiguration
+from utils.http_clients import get_http_session
 
 logger = get_logger(__name__)
 
-# Global JWK registry to avoid re-fetching JWKs for each request. Cached for 1
-# hour, keys are unlikely to change frequently.
-_jwk_cache: TTLCache[str, KeySet] = TTLCache(maxsize=3, ttl=3600)
-# Ideally this would be an RWLock, but it would require adding a dependency on
-# aiorwlock
-_jwk_cache_lock = Lock()
+
+@dataclass
+class JwkSetEntry:
+    """One cached JWK set.
+
+    Attributes:
+        key_set: Keys fetched from the JWK URL.
+        fetched_at: Monotonic timestamp of the fetch.
+    """
+
+    key_set: KeySet
+    fetched_at: float
+
+
+class JwkCache:  # pylint: disable=too-many-instance-attributes
+    """Cache of JWK sets and of claims of already verified tokens.
+
+    JWK sets are fetched with one shared HTTP session and refreshed in
+    background before they expire, so requests wait for a fetch only when a
+    URL is used for the first time or was not used for a whole TTL. Fetches
+    of one URL are serialized by a per-URL lock and never block requests
+    using other URLs. Tokens signed by a key missing in the cached set cause
+    a refetch, at most once per refetch interval, so rotated keys are picked
+    up early without letting unknown keys trigger a fetch per request.
+
+    Verified claims are keyed by a hash of the token and the JWK URL and
+    kept until the token expires, at most for the claims TTL, so repeated
+    requests with the same token skip signature verification.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty caches."""
+        self.ttl = constants.JWK_CACHE_TTL_SECONDS
+        self.refresh_ahead = constants.JWK_CACHE_REFRESH_AHEAD_SECONDS
+        self.refetch_interval = constants.JWK_UNKNOWN_KEY_REFETCH_INTERVAL_SECONDS
+        self.claims_ttl = constants.JWT_CLAIMS_CACHE_TTL_SECONDS
+        self._key_sets: dict[str, JwkSetEntry] = {}
+        self._locks: dict[str, Lock] = {}
+        self._refreshes: dict[str, Task[None]] = {}
+        self._claims: TLRUCache[tuple[bytes, str], tuple[JWTClaims, float]] = TLRUCache(
+            maxsize=constants.JWT_CLAIMS_CACHE_MAX_SIZE,
+            ttu=lambda _key, value, _now: value[1],
+            timer=time.time,
+        )
+
+    def __contains__(self, url: str) -> bool:
+        """Check if a JWK set of the URL is cached."""
+        return url in self._key_sets
+
+    def clear(self) -> None:
+        """Drop all cached JWK sets and claims."""
+        for task in self._refreshes.values():
+            task.cancel()
+        self._refreshes.clear()
+        self._key_sets.clear()
+        self._locks.clear()
+        self._claims.clear()
+
+    async def key_set(self, url: str) -> KeySet:
+        """Return the JWK set of the URL, fetching it when not cached.
+
+        Parameters:
+        ----------
+            url: URL of the JWK set.
+
+        Returns:
+        -------
+            KeySet: The JWK set.
+        """
+        entry = self._key_sets.get(url)
+        if entry is not None:
+            age = time.monotonic() - entry.fetched_at
+            if age < self.ttl:
+                if age >= self.ttl - self.refresh_ahead:
+                    self._start_refresh(url)
+                return entry.key_set
+        return await self._fetch(url, fetched_before=time.monotonic())
+
+    async def refetch_key_set(self, url: str) -> Optional[KeySet]:
+        """Refetch the JWK set after a token signed by an unknown key was seen.
+
+        Parameters:
+        ----------
+            url: URL of the JWK set.
+
+        Returns:
+        -------
+            Optional[KeySet]: The refetched JWK set, or None when the set was
+            fetched too recently to be fetched again.
+        """
+        entry = self._key_sets.get(url)
+        if (
+            entry is not None
+            and time.monotonic() - entry.fetched_at < self.refetch_interval
+        ):
+            return None
+        return await self._fetch(url, fetched_before=time.monotonic())
+
+    def claims(self, token: str, url: str) -> Optional[JWTClaims]:
+        """Return claims of a token verified before, if still cached.
+
+        Parameters:
+        ----------
+            token: The bearer token.
+            url: URL of the JWK set the token was verified with.
+
+        Returns:
+        -------
+            Optional[JWTClaims]: The verified claims, or None.
+        """
+        cached = self._claims.get((self._digest(token), url))
+        return None if cached is None else cached[0]
+
+    def store_claims(self, token: str, url: str, claims: JWTClaims) -> None:
+        """Cache verified claims of a token until it expires.
+
+        Parameters:
+        ----------
+            token: The bearer token.
+            url: URL of the JWK set the token was verified with.
+            claims: Claims of the token, already validated.
+        """
+        expires_at = time.time() + self.claims_ttl
+        expiry = claims.get("exp")
+        if isinstance(expiry, (int, float)) and not isinstance(expiry, bool):
+            expires_at = min(expires_at, float(expiry))
+        if expires_at > time.time():
+            self._claims[(self._digest(token), url)] = (claims, expires_at)
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        """Hash the token, so tokens are not kept in memory."""
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    async def _fetch(self, url: str, fetched_before: float) -> KeySet:
+        """Fetch the JWK set unless another request fetched it meanwhile."""
+        lock = self._locks.setdefault(url, Lock())
+        async with lock:
+            entry = self._key_sets.get(url)
+            if entry is not None and entry.fetched_at >= fetched_before:
+                return entry.key_set
+            async with get_http_session(constants.HTTP_CLIENT_JWK).get(
+                url,
+                timeout=aiohttp.ClientTimeout(
+                    total=constants.JWK_FETCH_TIMEOUT_SECONDS
+                ),
+            ) as resp:
+                resp.raise_for_status()
+                key_set = JsonWebKey.import_key_set(await resp.json())
+            self._key_sets[url] = JwkSetEntry(key_set, time.monotonic())
+            return key_set
+
+    def _start_refresh(self, url: str) -> None:
+        """Refresh the JWK set in background unless already being refreshed."""
+        if url in self._refreshes:
+            return
+        task = asyncio.create_task(self._refresh(url))
+        self._refreshes[url] = task
+        task.add_done_callback(lambda _: self._refreshes.pop(url, None))
+
+    async def _refresh(self, url: str) -> None:
+        """Refresh the JWK set, keeping the cached one when the fetch fails."""
+        try:
+            await self._fetch(url, fetched_before=time.monotonic())
+        except (aiohttp.ClientError, TimeoutError, ValueError, JoseError) as e:
+            logger.warning("Unable to refresh JWK set from %s: %s", url, e)
+
+
+# Global JWK registry to avoid re-fetching JWKs and re-verifying tokens for
+# each request.
+_jwk_cache = JwkCache()
 
 
 async def get_jwk_set(url: str) -> KeySet:
@@ -43,14 +214,7 @@ async def get_jwk_set(url: str) -> KeySet:
     Returns:
         KeySet: The JWK `KeySet` corresponding to the URL.
     """
-    async with _jwk_cache_lock:
-        if url not in _jwk_cache:
-            async with aiohttp.ClientSession() as session:
-                # TODO(omertuc): handle connection errors, timeouts, etc.
-                async with session.get(url) as resp:
-                    resp.raise_for_status()
-                    _jwk_cache[url] = JsonWebKey.import_key_set(await resp.json())
-        return _jwk_cache[url]
+    return await _jwk_cache.key_set(url)
 
 
 class KeyNotFoundError(Exception):
@@ -192,10 +356,55 @@ class JwkTokenAuthDependency(AuthInterface):  # pylint: disable=too-few-public-m
             raise HTTPException(**response.model_dump())
 
         user_token = extract_user_token(request.headers)
+        url = str(self.config.url)
+
+        claims = _jwk_cache.claims(user_token, url)
+        if claims is None:
+            claims = await self._verify(user_token, url)
+            _jwk_cache.store_claims(user_token, url, claims)
 
         try:
-            jwk_set = await get_jwk_set(str(self.config.url))
-        except aiohttp.ClientError as exc:
+            user_id: str = claims[self.config.jwt_configuration.user_id_claim]
+        except KeyError as exc:
+            missing_claim = self.config.jwt_configuration.user_id_claim
+            response = UnauthorizedResponse(
+                cause=f"Token missing claim: {missing_claim}"
+            )
+            raise HTTPException(**response.model_dump()) from exc
+
+        try:
+            username: str = claims[self.config.jwt_configuration.username_claim]
+        except KeyError as exc:
+            missing_claim = self.config.jwt_configuration.username_claim
+            response = UnauthorizedResponse(
+                cause=f"Token missing claim: {missing_claim}"
+            )
+            raise HTTPException(**response.model_dump()) from exc
+
+        logger.info("Successfully authenticated user %s (ID: %s)", username, user_id)
+
+        return user_id, username, self.skip_userid_check, user_token
+
+    async def _verify(self, user_token: str, url: str) -> JWTClaims:
+        """Verify the token signature and validate its claims.
+
+        Parameters:
+        ----------
+            user_token (str): The bearer token.
+            url (str): URL of the JWK set with the signing keys.
+
+        Returns:
+        -------
+            JWTClaims: The validated claims of the token.
+
+        Raises:
+        ------
+            HTTPException: With status 401 when the keys cannot be fetched or
+            the token is not valid.
+        """
+        try:
+            jwk_set = await get_jwk_set(url)
+        except (aiohttp.ClientError, TimeoutError) as exc:
             logger.error("Failed to fetch JWK set: %s", exc)
             response = UnauthorizedResponse(
                 cause="Unable to reach authentication key server"
@@ -213,7 +422,7 @@ class JwkTokenAuthDependency(AuthInterface):  # pylint: disable=too-few-public-m
             raise HTTPException(**response.model_dump()) from exc
 
         try:
-            claims = jwt.decode(user_token, key=key_resolver_func(jwk_set))
+            claims = await self._decode(user_token, url, jwk_set)
         except (KeyNotFoundError, BadSignatureError, DecodeError, JoseError) as exc:
             logger.warning("Token decode error: %s", exc)
             cause_map = {
@@ -236,24 +445,24 @@ class JwkTokenAuthDependency(AuthInterface):  # pylint: disable=too-few-public-m
             response = UnauthorizedResponse(cause="Token validation failed")
             raise HTTPException(**response.model_dump()) from exc
 
-        try:
-            user_id: str = claims[self.config.jwt_configuration.user_id_claim]
-        except KeyError as exc:
-            missing_claim = self.config.jwt_configuration.user_id_claim
-            response = UnauthorizedResponse(
-                cause=f"Token missing claim: {missing_claim}"
-            )
-            raise HTTPException(**response.model_dump()) from exc
+        return claims
 
-        try:
-            username: str = claims[self.config.jwt_configuration.username_claim]
-        except KeyError as exc:
-            missing_claim = self.config.jwt_configuration.username_claim
-            response = UnauthorizedResponse(
-                cause=f"Token missing claim: {missing_claim}"
-            )
-            raise HTTPException(**response.model_dump()) from exc
+    @staticmethod
+    async def _decode(user_token: str, url: str, jwk_set: KeySet) -> JWTClaims:
+        """Decode the token, refetching the keys once when its key is unknown.
 
-        logger.info("Successfully authenticated user %s (ID: %s)", username, user_id)
-
-        return user_id, username, self.skip_userid_check, user_token
+        Keys are refetched at most once per refetch interval, so that tokens
+        signed by unknown keys cannot make the service fetch keys on every
+        request.
+        """
+        try:
+            return jwt.decode(user_token, key=key_resolver_func(jwk_set))
+        except KeyNotFoundError:
+            try:
+                refetched = await _jwk_cache.refetch_key_set(url)
+            except (aiohttp.ClientError, TimeoutError, ValueError, JoseError) as e:
+                logger.warning("Unable to refetch JWK set from %s: %s", url, e)
+                refetched = None
+            if refetched is None:
+                raise
+            return jwt.decode(user_token, key=key_resolver_func(refetched))
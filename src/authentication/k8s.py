@@ -1,14 +1,23 @@
 """Manage authentication flow for FastAPI endpoints with K8S/OCP."""
 
+import asyncio
+import base64
+import hashlib
+import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from http import HTTPStatus
-from typing import Optional, Self, cast
+from typing import Any, Optional, Self, cast
 
 import kubernetes.client
+from cachetools import TLRUCache
 from fastapi import HTTPException, Request
 from kubernetes.client.rest import ApiException
 from kubernetes.config import ConfigException
 
+import constants
 from authentication.interface import NO_AUTH_TUPLE, AuthInterface
 from authentication.utils import extract_user_token
 from configuration import configuration
@@ -20,6 +29,7 @@ from models.api.responses import (
     ServiceUnavailableResponse,
     UnauthorizedResponse,
 )
+from utils.types import Singleton
 
 logger = get_logger(__name__)
 
@@ -385,6 +395,228 @@ def get_user_info(token: str) -> Optional[kubernetes.client.V1TokenReviewStatus]
         return None
 
 
+def review_token(token: str, virtual_path: str) -> tuple[str, str]:
+    """Authenticate the token and authorize its user for the virtual path.
+
+    Performs a TokenReview followed by a SubjectAccessReview; both are
+    blocking calls to the Kubernetes API server.
+
+    Parameters:
+    ----------
+        token: The bearer token to be validated.
+        virtual_path: Path used in SubjectAccessReview non-resource attributes.
+
+    Returns:
+    -------
+        tuple[str, str]: The user's UID and username.
+
+    Raises:
+    ------
+        HTTPException:
+            401 if the token is invalid or expired.
+            403 if the user is not authorized.
+            500 or 503 if the Kubernetes API cannot be used.
+    """
+    user_info = get_user_info(token)
+
+    if user_info is None:
+        response = UnauthorizedResponse(cause="Invalid or expired Kubernetes token")
+        raise HTTPException(**response.model_dump())
+
+    # Cast user to proper type for type checking
+    user = cast(kubernetes.client.V1UserInfo, user_info.user)
+
+    if user.username == "kube:admin":
+        try:
+            user.uid = K8sClientSingleton.get_cluster_id()
+        except K8sAPIConnectionError as e:
+            # Kubernetes API is unreachable - return 503
+            logger.error("Cannot connect to Kubernetes API: %s", e)
+            response = ServiceUnavailableResponse(
+                backend_name="Kubernetes API",
+                cause=str(e),
+            )
+            raise HTTPException(**response.model_dump()) from e
+        except K8sConfigurationError as e:
+            # Cluster misconfiguration or client error - return 500
+            logger.error("Cluster configuration error: %s", e)
+            response = InternalServerErrorResponse(
+                response="Internal server error",
+                cause=str(e),
+            )
+            raise HTTPException(**response.model_dump()) from e
+
+    try:
+        authorization_api = K8sClientSingleton.get_authz_api()
+        sar = kubernetes.client.V1SubjectAccessReview(
+            spec=kubernetes.client.V1SubjectAccessReviewSpec(
+                user=user.username,
+                groups=user.groups,
+                non_resource_attributes=kubernetes.client.V1NonResourceAttributes(
+                    path=virtual_path, verb="get"
+                ),
+            )
+        )
+        sar_response = cast(
+            kubernetes.client.V1SubjectAccessReview,
+            authorization_api.create_subject_access_review(sar),
+        )
+
+    except Exception as e:
+        logger.error("API exception during SubjectAccessReview: %s", e)
+        response = ServiceUnavailableResponse(
+            backend_name="Kubernetes API",
+            cause="Unable to perform authorization check",
+        )
+        raise HTTPException(**response.model_dump()) from e
+
+    sar_status = cast(
+        kubernetes.client.V1SubjectAccessReviewStatus, sar_response.status
+    )
+    user_uid = cast(str, user.uid)
+    username = cast(str, user.username)
+
+    if not sar_status.allowed:
+        response = ForbiddenResponse.endpoint(user_id=user_uid)
+        raise HTTPException(**response.model_dump())
+
+    return user_uid, username
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """Read expiry of a JWT token without verifying the token.
+
+    Kubernetes service account and OIDC tokens are JWTs; other tokens have
+    no expiry that could be read.
+
+    Parameters:
+    ----------
+        token: The bearer token.
+
+    Returns:
+    -------
+        Optional[float]: UNIX timestamp of the `exp` claim, or None if the
+        token is not a JWT with an expiry.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+        expiry = claims.get("exp")
+    except (IndexError, ValueError, AttributeError):
+        return None
+    if isinstance(expiry, bool) or not isinstance(expiry, (int, float)):
+        return None
+    return float(expiry)
+
+
+@dataclass
+class K8sReview:
+    """Cached result of the token and access reviews.
+
+    Attributes:
+        user: The user's UID and username, when the user is authorized.
+        error: Arguments of the HTTPException raised for a rejected token
+            or a denied access review.
+        expires_at: Monotonic time when the result expires.
+    """
+
+    user: Optional[tuple[str, str]]
+    error: Optional[dict[str, Any]]
+    expires_at: float
+
+
+class K8sReviewCache(metaclass=Singleton):
+    """TTL cache of Kubernetes review results with single-flight loading.
+
+    Results are keyed by a hash of the token and the virtual path, so tokens
+    are not kept in memory. Successful reviews are cached at most until the
+    token expires; rejected tokens and denied reviews are cached for a short
+    time only, failures of the Kubernetes API are not cached at all.
+    Concurrent requests with the same token share one review, and reviews
+    run in a bounded thread pool so the event loop is not blocked.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache and the review thread pool."""
+        self.ttl = constants.K8S_AUTH_CACHE_TTL_SECONDS
+        self.negative_ttl = constants.K8S_AUTH_NEGATIVE_CACHE_TTL_SECONDS
+        self._reviews: TLRUCache[tuple[str, str], K8sReview] = TLRUCache(
+            maxsize=constants.K8S_AUTH_CACHE_MAX_SIZE,
+            ttu=lambda _key, review, _now: review.expires_at,
+            timer=time.monotonic,
+        )
+        self._inflight: dict[tuple[str, str], asyncio.Future[K8sReview]] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=constants.K8S_AUTH_MAX_WORKERS, thread_name_prefix="k8s-auth"
+        )
+
+    def clear(self) -> None:
+        """Drop all cached review results."""
+        self._reviews.clear()
+
+    async def review(self, token: str, virtual_path: str) -> tuple[str, str]:
+        """Return the user authorized by the token, reviewing it when needed.
+
+        Parameters:
+        ----------
+            token: The bearer token to be validated.
+            virtual_path: Path used in SubjectAccessReview non-resource attributes.
+
+        Returns:
+        -------
+            tuple[str, str]: The user's UID and username.
+
+        Raises:
+        ------
+            HTTPException: The same errors as `review_token`.
+        """
+        key = (hashlib.sha256(token.encode("utf-8")).hexdigest(), virtual_path)
+        review = self._reviews.get(key)
+        if review is None:
+            future = self._inflight.get(key)
+            if future is None:
+                future = asyncio.ensure_future(self._load(key, token, virtual_path))
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            review = await asyncio.shield(future)
+        if review.user is None:
+            raise HTTPException(**cast(dict[str, Any], review.error))
+        return review.user
+
+    async def _load(
+        self, key: tuple[str, str], token: str, virtual_path: str
+    ) -> K8sReview:
+        """Review the token in the thread pool and cache the result."""
+        loop = asyncio.get_running_loop()
+        try:
+            user = await loop.run_in_executor(
+                self._executor, review_token, token, virtual_path
+            )
+            review = K8sReview(user=user, error=None, expires_at=0.0)
+            ttl = self.ttl
+        except HTTPException as e:
+            if e.status_code not in (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN):
+                raise
+            error = {
+                "status_code": e.status_code,
+                "detail": e.detail,
+                "headers": e.headers,
+            }
+            review = K8sReview(user=None, error=error, expires_at=0.0)
+            ttl = self.negative_ttl
+
+        now = time.monotonic()
+        review.expires_at = now + ttl
+        expiry = token_expiry(token)
+        if expiry is not None:
+            review.expires_at = min(review.expires_at, now + expiry - time.time())
+        if review.expires_at > now:
+            self._reviews[key] = review
+        return review
+
+
 class K8SAuthDependency(AuthInterface):  # pylint: disable=too-few-public-methods
     """FastAPI dependency for Kubernetes (k8s) authentication and authorization.
 
@@ -447,68 +679,7 @@ class K8SAuthDependency(AuthInterface):  # pylint: disable=too-few-public-method
                     return NO_AUTH_TUPLE
 
         token = extract_user_token(request.headers)
-        user_info = get_user_info(token)
-
-        if user_info is None:
-            response = UnauthorizedResponse(cause="Invalid or expired Kubernetes token")
-            raise HTTPException(**response.model_dump())
-
-        # Cast user to proper type for type checking
-        user = cast(kubernetes.client.V1UserInfo, user_info.user)
-
-        if user.username == "kube:admin":
-            try:
-                user.uid = K8sClientSingleton.get_cluster_id()
-            except K8sAPIConnectionError as e:
-                # Kubernetes API is unreachable - return 503
-                logger.error("Cannot connect to Kubernetes API: %s", e)
-                response = ServiceUnavailableResponse(
-                    backend_name="Kubernetes API",
-                    cause=str(e),
-                )
-                raise HTTPException(**response.model_dump()) from e
-            except K8sConfigurationError as e:
-                # Cluster misconfiguration or client error - return 500
-                logger.error("Cluster configuration error: %s", e)
-                response = InternalServerErrorResponse(
-                    response="Internal server error",
-                    cause=str(e),
-                )
-                raise HTTPException(**response.model_dump()) from e
-
-        try:
-            authorization_api = K8sClientSingleton.get_authz_api()
-            sar = kubernetes.client.V1SubjectAccessReview(
-                spec=kubernetes.client.V1SubjectAccessReviewSpec(
-                    user=user.username,
-                    groups=user.groups,
-                    non_resource_attributes=kubernetes.client.V1NonResourceAttributes(
-                        path=self.virtual_path, verb="get"
-                    ),
-                )
-            )
-            sar_response = cast(
-                kubernetes.client.V1SubjectAccessReview,
-                authorization_api.create_subject_access_review(sar),
-            )
-
-        except Exception as e:
-            logger.error("API exception during SubjectAccessReview: %s", e)
-            response = ServiceUnavailableResponse(
-                backend_name="Kubernetes API",
-                cause="Unable to perform authorization check",
-            )
-            raise HTTPException(**response.model_dump()) from e
-
-        sar_status = cast(
-            kubernetes.client.V1SubjectAccessReviewStatus, sar_response.status
-        )
-        user_uid = cast(str, user.uid)
-        username = cast(str, user.username)
-
-        if not sar_status.allowed:
-            response = ForbiddenResponse.endpoint(user_id=user_uid)
-            raise HTTPException(**response.model_dump())
+        user_uid, username = await K8sReviewCache().review(token, self.virtual_path)
 
         return (
             user_uid,
@@ -1,14 +1,19 @@
 """Azure Entra ID token manager for Azure OpenAI authentication."""
 
+import asyncio
 import os
+import random
 import time
-from typing import Optional
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
 
 from azure.core.credentials import AccessToken
-from azure.core.exceptions import ClientAuthenticationError
+from azure.core.exceptions import AzureError, ClientAuthenticationError
 from azure.identity import ClientSecretCredential, CredentialUnavailableError
+from azure.identity.aio import ClientSecretCredential as AsyncClientSecretCredential
 from pydantic import SecretStr
 
+import constants
 from configuration import AzureEntraIdConfiguration
 from log import get_logger
 from utils.types import Singleton
@@ -25,6 +30,7 @@ class AzureEntraIDManager(metaclass=Singleton):
     This singleton class handles:
     - Token caching and expiration tracking
     - Token refresh using client credentials flow
+    - Background token refresh before expiration
     - Configuration management for Entra ID authentication
 
     The access token is passed via request headers to authenticate
@@ -35,6 +41,9 @@ class AzureEntraIDManager(metaclass=Singleton):
         """Initialize the token manager with empty state."""
         self._expires_on: int = 0
         self._entra_id_config: Optional[AzureEntraIdConfiguration] = None
+        self._on_refresh: Optional[Callable[[], Awaitable[None]]] = None
+        self._refresh: Optional[asyncio.Task[bool]] = None
+        self._refresher: Optional[asyncio.Task[None]] = None
 
     def set_config(self, azure_config: AzureEntraIdConfiguration) -> None:
         """Set the Azure Entra ID configuration."""
@@ -75,6 +84,110 @@ class AzureEntraIDManager(metaclass=Singleton):
             return True
         return False
 
+    async def refresh_token_async(self) -> bool:
+        """Refresh the cached Azure access token without blocking the event loop.
+
+        Concurrent callers share one refresh. When the background refresher
+        is running, the refreshed token is also passed to its callback.
+
+        Returns:
+            bool: True if token was successfully refreshed, False otherwise.
+
+        Raises:
+            ValueError: If Entra ID configuration has not been set.
+        """
+        if self._entra_id_config is None:
+            raise ValueError("Azure Entra ID configuration not set")
+
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._refresh_token())
+        # a cancelled caller must not cancel the refresh shared with others
+        return await asyncio.shield(self._refresh)
+
+    async def start_refresher(
+        self, on_refresh: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> None:
+        """Start refreshing the access token in background before it expires.
+
+        Parameters:
+        ----------
+            on_refresh (Optional[Callable[[], Awaitable[None]]]): Coroutine
+            function called after every successful refresh, used to pass the
+            new token to the Llama Stack client.
+
+        Raises:
+        ------
+            ValueError: If Entra ID configuration has not been set.
+        """
+        if self._entra_id_config is None:
+            raise ValueError("Azure Entra ID configuration not set")
+        self._on_refresh = on_refresh
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(
+                self._run_refresher(), name="azure-token-refresher"
+            )
+            logger.info("Azure access token refresher started")
+
+    async def stop_refresher(self) -> None:
+        """Stop the background refresher and any refresh in progress."""
+        tasks: list[asyncio.Task[Any]] = [
+            task for task in (self._refresher, self._refresh) if task
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refresher = None
+        self._refresh = None
+        self._on_refresh = None
+
+    async def _run_refresher(self) -> None:
+        """Refresh the token ahead of expiration, retrying failures with jitter."""
+        retry_delay = constants.AZURE_TOKEN_RETRY_INITIAL_DELAY_SECONDS
+        # expiration of the token the refresher last waited for
+        waited_for: Optional[int] = None
+        while True:
+            expires_on = self._expires_on
+            remaining = expires_on - time.time()
+            if expires_on != waited_for and remaining > 0:
+                waited_for = expires_on
+                # tokens living shorter than the refresh-ahead time are
+                # refreshed in the middle of their remaining lifetime
+                if remaining > constants.AZURE_TOKEN_REFRESH_AHEAD_SECONDS:
+                    remaining -= constants.AZURE_TOKEN_REFRESH_AHEAD_SECONDS
+                else:
+                    remaining /= 2
+                await asyncio.sleep(remaining)
+                # the token might have been refreshed by a request meanwhile
+                continue
+            try:
+                refreshed = await self.refresh_token_async()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("Failed to refresh Azure access token: %s", e)
+                refreshed = False
+            if refreshed:
+                retry_delay = constants.AZURE_TOKEN_RETRY_INITIAL_DELAY_SECONDS
+                continue
+            await asyncio.sleep(retry_delay * random.uniform(0.5, 1.0))
+            retry_delay = min(
+                retry_delay * 2, constants.AZURE_TOKEN_RETRY_MAX_DELAY_SECONDS
+            )
+
+    async def _refresh_token(self) -> bool:
+        """Retrieve a new token, store it and pass it to the refresh callback."""
+        logger.info("Refreshing Azure access token")
+        token_obj = await self._retrieve_access_token_async()
+        if token_obj is None:
+            return False
+        self._update_access_token(token_obj.token, token_obj.expires_on)
+        if self._on_refresh is not None:
+            try:
+                await self._on_refresh()
+            except BaseException:
+                # the client still uses the previous token, so refresh again
+                self._expires_on = 0
+                raise
+        return True
+
     def _update_access_token(self, token: str, expires_on: int) -> None:
         """Update the token in env var and track expiration time."""
         self._expires_on = expires_on - TOKEN_EXPIRATION_LEEWAY
@@ -100,3 +213,20 @@ class AzureEntraIDManager(metaclass=Singleton):
         except (ClientAuthenticationError, CredentialUnavailableError):
             logger.warning("Failed to retrieve Azure access token")
             return None
+
+    async def _retrieve_access_token_async(self) -> Optional[AccessToken]:
+        """Retrieve a new access token from Azure without blocking the event loop."""
+        if not self._entra_id_config:
+            return None
+
+        try:
+            async with AsyncClientSecretCredential(
+                tenant_id=self._entra_id_config.tenant_id.get_secret_value(),
+                client_id=self._entra_id_config.client_id.get_secret_value(),
+                client_secret=self._entra_id_config.client_secret.get_secret_value(),
+            ) as credential:
+                return await credential.get_token(self._entra_id_config.scope)
+
+        except AzureError:
+            logger.warning("Failed to retrieve Azure access token")
+            return None
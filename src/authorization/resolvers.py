@@ -1,11 +1,14 @@
 """Authorization resolvers for role evaluation and access control."""
 
 import base64
+import hashlib
 import json
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Any
 
-from jsonpath_ng import parse
+from cachetools import LRUCache
+from jsonpath_ng import JSONPath, parse
 
 import constants
 from authentication.interface import AuthTuple
@@ -18,6 +21,21 @@ logger = get_logger(__name__)
 UserRoles = set[str]
 
 
+@lru_cache(maxsize=256)
+def compile_jsonpath(jsonpath: str) -> JSONPath:
+    """Parse a JSONPath expression once and reuse the parsed expression.
+
+    Parameters:
+    ----------
+        jsonpath (str): JSONPath expression.
+
+    Returns:
+    -------
+        JSONPath: The parsed expression.
+    """
+    return parse(jsonpath)
+
+
 class RoleResolutionError(Exception):
     """Custom exception for role resolution errors."""
 
@@ -89,23 +107,38 @@ class JwtRolesResolver(RolesResolver):  # pylint: disable=too-few-public-methods
             matches, and optional negation or regex matching.
         """
         self.role_rules = role_rules
+        # JSONPath expressions are parsed only once
+        self._expressions = [compile_jsonpath(rule.jsonpath) for rule in role_rules]
+        # roles resolved from claims, keyed by digest of the token payload
+        self._roles_cache: LRUCache[bytes, frozenset[str]] = LRUCache(
+            maxsize=constants.AUTHORIZATION_ROLES_CACHE_MAX_SIZE
+        )
 
     async def resolve_roles(self, auth: AuthTuple) -> UserRoles:
         """Extract roles from JWT claims using configured rules.
 
         Determine user roles by evaluating configured JwtRoleRule objects
-        against JWT claims extracted from the provided AuthTuple.
+        against JWT claims extracted from the provided AuthTuple. Roles are
+        resolved once per distinct token payload; later requests with the
+        same claims are served from a bounded cache without decoding them.
 
         Returns:
             roles (UserRoles): Set of role names derived from all configured
             rules that match the token's claims.
         """
-        jwt_claims = self._get_claims(auth)
-        return {
-            role
-            for rule in self.role_rules
-            for role in self.evaluate_role_rules(rule, jwt_claims)
-        }
+        _, _, _, token = auth
+        payload = "" if token == constants.NO_USER_TOKEN else token.split(".")[1]
+        key = hashlib.sha256(payload.encode("utf-8")).digest()
+        roles = self._roles_cache.get(key)
+        if roles is None:
+            jwt_claims = self._get_claims(auth)
+            roles = frozenset(
+                role
+                for rule, expression in zip(self.role_rules, self._expressions)
+                for role in self._evaluate_rule(rule, expression, jwt_claims)
+            )
+            self._roles_cache[key] = roles
+        return set(roles)
 
     @staticmethod
     def evaluate_role_rules(rule: JwtRoleRule, jwt_claims: dict[str, Any]) -> UserRoles:
@@ -125,11 +158,19 @@ class JwtRolesResolver(RolesResolver):  # pylint: disable=too-few-public-methods
             roles (set[str]): The set of roles from `rule.roles` if the rule
             matches `jwt_claims`, otherwise an empty set.
         """
+        return JwtRolesResolver._evaluate_rule(
+            rule, compile_jsonpath(rule.jsonpath), jwt_claims
+        )
+
+    @staticmethod
+    def _evaluate_rule(
+        rule: JwtRoleRule, expression: JSONPath, jwt_claims: dict[str, Any]
+    ) -> UserRoles:
+        """Get roles from a rule whose JSONPath expression is already parsed."""
         return (
             set(rule.roles)
             if JwtRolesResolver._evaluate_operator(
-                rule,
-                [match.value for match in parse(rule.jsonpath).find(jwt_claims)],
+                rule, [match.value for match in expression.find(jwt_claims)]
             )
             else set()
         )
@@ -317,6 +358,43 @@ class GenericAccessResolver(AccessResolver):  # pylint: disable=too-few-public-m
                 self._access_lookup[rule.role] = set()
             self._access_lookup[rule.role].update(rule.actions)
 
+        # Actions granted to role sets seen so far: (granted, allowed) where
+        # allowed has the ADMIN action expanded to all other actions
+        self._role_set_actions: LRUCache[
+            frozenset[str], tuple[frozenset[Action], frozenset[Action]]
+        ] = LRUCache(maxsize=constants.AUTHORIZATION_ROLE_SETS_CACHE_MAX_SIZE)
+
+    def _actions(
+        self, user_roles: UserRoles
+    ) -> tuple[frozenset[Action], frozenset[Action]]:
+        """Look up actions granted to the role set, computing them on first use.
+
+        Parameters:
+        ----------
+            user_roles (UserRoles): Set of role names.
+
+        Returns:
+        -------
+            tuple[frozenset[Action], frozenset[Action]]: Actions granted by
+            the access rules, and actions the roles may perform, with ADMIN
+            replaced by every other action.
+        """
+        key = frozenset(user_roles)
+        actions = self._role_set_actions.get(key)
+        if actions is None:
+            granted = frozenset(
+                action
+                for role in key
+                for action in self._access_lookup.get(role, set())
+            )
+            allowed = granted
+            # If the user is allowed the admin action, they can perform any action
+            if Action.ADMIN in granted:
+                allowed = frozenset(Action) - {Action.ADMIN}
+            actions = (granted, allowed)
+            self._role_set_actions[key] = actions
+        return actions
+
     def check_access(self, action: Action, user_roles: UserRoles) -> bool:
         """Check if the user has access to the specified action based on their roles.
 
@@ -335,18 +413,14 @@ class GenericAccessResolver(AccessResolver):  # pylint: disable=too-few-public-m
             true if at least one role permits the action or ADMIN override
             applies, false otherwise.
         """
-        if action != Action.ADMIN and self.check_access(Action.ADMIN, user_roles):
-            # Recurse to check if the roles allow the user to perform the admin action,
-            # if they do, then we allow any action
+        granted, _ = self._actions(user_roles)
+        # roles allowed to perform the admin action are allowed any action
+        if action in granted or Action.ADMIN in granted:
+            logger.debug(
+                "Access granted: roles %s can perform action '%s'", user_roles, action
+            )
             return True
 
-        for role in user_roles:
-            if role in self._access_lookup and action in self._access_lookup[role]:
-                logger.debug(
-                    "Access granted: role '%s' can perform action '%s'", role, action
-                )
-                return True
-
         logger.debug(
             "Access denied: roles %s cannot perform action '%s'", user_roles, action
         )
@@ -362,14 +436,5 @@ class GenericAccessResolver(AccessResolver):  # pylint: disable=too-few-public-m
             If any role grants Action.ADMIN, returns every Action except
             Action.ADMIN.
         """
-        actions = {
-            action
-            for role in user_roles
-            for action in self._access_lookup.get(role, set())
-        }
-
-        # If the user is allowed the admin action, they can perform any action
-        if Action.ADMIN in actions:
-            return set(Action) - {Action.ADMIN}
-
-        return actions
+        _, allowed = self._actions(user_roles)
+        return set(allowed)
@@ -78,6 +78,23 @@ class Cache(ABC):
         Cache._check_conversation_id(conversation_id)
         return f"{user_id}{Cache.COMPOUND_KEY_SEPARATOR}{conversation_id}"
 
+    @abstractmethod
+    def connect(self) -> None:
+        """Abstract method to initialize connection to the cache storage.
+
+        Open the connection and prepare the storage for use; called again by
+        the `connection` decorator when the connection was lost.
+        """
+
+    @abstractmethod
+    def connected(self) -> bool:
+        """Abstract method to check if connection to the cache storage is alive.
+
+        Returns:
+        -------
+            bool: True if the cache storage is connected, False otherwise.
+        """
+
     @abstractmethod
     def get(
         self, user_id: str, conversation_id: str, skip_user_id_check: bool
@@ -119,6 +136,25 @@ class Cache(ABC):
             skip_user_id_check (bool): If True, skip validation of `user_id`.
         """
 
+    def insert_or_append_many(
+        self, entries: list[tuple[str, str, CacheEntry, bool]]
+    ) -> None:
+        """Store cache entries of several conversations.
+
+        Database backed caches override this method to store all entries in
+        one transaction; others store the entries one by one.
+
+        Parameters:
+        ----------
+            entries (list[tuple[str, str, CacheEntry, bool]]): User ID,
+            conversation ID, cache entry and skip user ID check flag of each
+            entry, in the order the entries are appended.
+        """
+        for user_id, conversation_id, cache_entry, skip_user_id_check in entries:
+            self.insert_or_append(
+                user_id, conversation_id, cache_entry, skip_user_id_check
+            )
+
     @abstractmethod
     def delete(
         self, user_id: str, conversation_id: str, skip_user_id_check: bool
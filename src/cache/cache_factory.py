@@ -6,6 +6,7 @@ from cache.in_memory_cache import InMemoryCache
 from cache.noop_cache import NoopCache
 from cache.postgres_cache import PostgresCache
 from cache.sqlite_cache import SQLiteCache
+from cache.tiered_cache import TieredCache
 from log import get_logger
 from models.config import ConversationHistoryConfiguration
 
@@ -22,6 +23,8 @@ class CacheFactory:
 
         Returns:
             An instance of `Cache` (either `SQLiteCache`, `PostgresCache` or `InMemoryCache`).
+            `SQLiteCache` and `PostgresCache` are wrapped in `TieredCache`
+            when the read cache is configured.
 
         Raises:
             ValueError: If `config.type` is None, if required type-specific
@@ -29,6 +32,15 @@ class CacheFactory:
             cache type.
         """
         logger.info("Creating cache instance of type %s", config.type)
+        cache = CacheFactory._conversation_cache_backend(config)
+        if config.read_cache is not None:
+            logger.info("Using read cache in front of %s cache", config.type)
+            return TieredCache(cache, config.read_cache)
+        return cache
+
+    @staticmethod
+    def _conversation_cache_backend(config: ConversationHistoryConfiguration) -> Cache:
+        """Create an instance of Cache for the configured cache type."""
         match config.type:
             case constants.CACHE_TYPE_NOOP:
                 return NoopCache()
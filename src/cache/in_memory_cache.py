@@ -1,5 +1,11 @@
 """In-memory cache implementation."""
 
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from threading import Lock
+from time import monotonic, time
+from typing import Optional
+
 from cache.cache import Cache
 from log import get_logger
 from models.cache_entry import CacheEntry
@@ -10,8 +16,43 @@ from utils.connection_decorator import connection
 logger = get_logger(__name__)
 
 
+@dataclass
+class CachedConversation:
+    """Conversation history stored in the in-memory cache.
+
+    Attributes:
+        user_id: Owner of the conversation.
+        conversation_id: Conversation ID unique for given user.
+        entries: Cache entries in the order they were appended.
+        sizes: Approximate size in bytes of each entry in `entries`.
+        topic_summary: Topic summary of the conversation, if any.
+        last_message_timestamp: Wall clock time of the last change.
+        last_used: Monotonic time of the last read or change, used for TTL.
+    """
+
+    user_id: str
+    conversation_id: str
+    entries: deque[CacheEntry] = field(default_factory=deque)
+    sizes: deque[int] = field(default_factory=deque)
+    topic_summary: Optional[str] = None
+    last_message_timestamp: float = 0.0
+    last_used: float = 0.0
+
+
 class InMemoryCache(Cache):
-    """In-memory cache implementation."""
+    """In-memory cache implementation.
+
+    Conversations are kept in a least recently used (LRU) order keyed by
+    user ID and conversation ID. Each user additionally has an index of
+    conversations ordered by last message time, so listing does not need
+    to scan or sort all cached conversations.
+
+    The cache is bounded by the number of entries and, optionally, by the
+    approximate size of entries in bytes. Least recently used
+    conversations are evicted when either limit is exceeded. Conversations
+    not used for the configured TTL expire. All operations are guarded by
+    a lock, so the cache can be shared between threads.
+    """
 
     def __init__(self, config: InMemoryCacheConfig) -> None:
         """Create a new instance of in-memory cache.
@@ -23,6 +64,15 @@ class InMemoryCache(Cache):
             config (InMemoryCacheConfig): Configuration options controlling cache behavior.
         """
         self.cache_config = config
+        self._lock = Lock()
+        # all conversations, least recently used first
+        self._conversations: OrderedDict[tuple[str, str], CachedConversation] = (
+            OrderedDict()
+        )
+        # conversations of each user, oldest last message first
+        self._user_index: dict[str, OrderedDict[str, CachedConversation]] = {}
+        self._entries_count = 0
+        self._bytes_count = 0
 
     def connect(self) -> None:
         """Initialize connection to database.
@@ -70,11 +120,15 @@ class InMemoryCache(Cache):
 
         Returns:
         -------
-            Empty list.
+            Cache entries of the conversation in insertion order; empty list
+            if the conversation is not cached.
         """
-        # just check if user_id and conversation_id are UUIDs
         super().construct_key(user_id, conversation_id, skip_user_id_check)
-        return []
+        with self._lock:
+            conversation = self._lookup(user_id, conversation_id)
+            if conversation is None:
+                return []
+            return list(conversation.entries)
 
     @connection
     def insert_or_append(
@@ -86,11 +140,9 @@ class InMemoryCache(Cache):
     ) -> None:
         """Set the value associated with the given key.
 
-        Validate and construct the cache key for a user's conversation without storing data.
-
-        This method verifies the provided `user_id` and `conversation_id` (via
-        the base class key construction/validation) and performs no persistent
-        storage or mutation.
+        Append the cache entry to the user's conversation, creating the
+        conversation when it is not cached yet, and evict least recently
+        used conversations if the cache limits are exceeded.
 
         Parameters:
         ----------
@@ -99,8 +151,15 @@ class InMemoryCache(Cache):
             cache_entry: The `CacheEntry` object to store.
             skip_user_id_check: Skip user_id suid check.
         """
-        # just check if user_id and conversation_id are UUIDs
         super().construct_key(user_id, conversation_id, skip_user_id_check)
+        size = len(cache_entry.model_dump_json())
+        with self._lock:
+            conversation = self._touch(user_id, conversation_id)
+            conversation.entries.append(cache_entry)
+            conversation.sizes.append(size)
+            self._entries_count += 1
+            self._bytes_count += size
+            self._evict(conversation)
 
     @connection
     def delete(
@@ -108,7 +167,8 @@ class InMemoryCache(Cache):
     ) -> bool:
         """Delete conversation history for a given user_id and conversation_id.
 
-        Validate the provided user and conversation identifiers and report deletion success.
+        Validate the provided user and conversation identifiers and remove
+        the conversation from the cache.
 
         Parameters:
         ----------
@@ -118,11 +178,15 @@ class InMemoryCache(Cache):
 
         Returns:
         -------
-            bool: True in all cases.
+            bool: True if the conversation had cached entries, False otherwise.
         """
-        # just check if user_id and conversation_id are UUIDs
         super().construct_key(user_id, conversation_id, skip_user_id_check)
-        return True
+        with self._lock:
+            conversation = self._conversations.get((user_id, conversation_id))
+            if conversation is None:
+                return False
+            self._remove(conversation)
+            return bool(conversation.entries)
 
     @connection
     def list(
@@ -137,11 +201,26 @@ class InMemoryCache(Cache):
 
         Returns:
         -------
-            An empty list.
+            A list of ConversationData objects containing conversation_id,
+            topic_summary, and last_message_timestamp, most recent first.
 
         """
         super()._check_user_id(user_id, skip_user_id_check)
-        return []
+        with self._lock:
+            conversations = self._user_index.get(user_id)
+            if not conversations:
+                return []
+            for conversation in list(conversations.values()):
+                if self._expired(conversation):
+                    self._remove(conversation)
+            return [
+                ConversationData(
+                    conversation_id=conversation.conversation_id,
+                    topic_summary=conversation.topic_summary,
+                    last_message_timestamp=conversation.last_message_timestamp,
+                )
+                for conversation in reversed(conversations.values())
+            ]
 
     @connection
     def set_topic_summary(
@@ -153,6 +232,10 @@ class InMemoryCache(Cache):
     ) -> None:
         """Set the topic summary for the given conversation.
 
+        Only the summary of a cached conversation is updated, its position in
+        the list of conversations stays the same. The conversation is created
+        when it is not cached yet.
+
         Parameters:
         ----------
             user_id: User identification.
@@ -160,8 +243,12 @@ class InMemoryCache(Cache):
             topic_summary: The topic summary to store.
             skip_user_id_check: Skip user_id suid check.
         """
-        # just check if user_id and conversation_id are UUIDs
         super().construct_key(user_id, conversation_id, skip_user_id_check)
+        with self._lock:
+            conversation = self._lookup(user_id, conversation_id)
+            if conversation is None:
+                conversation = self._touch(user_id, conversation_id)
+            conversation.topic_summary = topic_summary
 
     def ready(self) -> bool:
         """Check if the cache is ready.
@@ -170,3 +257,82 @@ class InMemoryCache(Cache):
             True (`bool`): Always `True` for this in-memory cache implementation.
         """
         return True
+
+    def _expired(self, conversation: CachedConversation) -> bool:
+        """Check if the conversation was not used for longer than the TTL."""
+        ttl = self.cache_config.ttl_seconds
+        return ttl is not None and monotonic() - conversation.last_used > ttl
+
+    def _lookup(
+        self, user_id: str, conversation_id: str
+    ) -> Optional[CachedConversation]:
+        """Find a cached conversation and mark it as recently used.
+
+        Must be called with the lock held. Expired conversations are removed.
+        """
+        key = (user_id, conversation_id)
+        conversation = self._conversations.get(key)
+        if conversation is None:
+            return None
+        if self._expired(conversation):
+            self._remove(conversation)
+            return None
+        conversation.last_used = monotonic()
+        self._conversations.move_to_end(key)
+        return conversation
+
+    def _touch(self, user_id: str, conversation_id: str) -> CachedConversation:
+        """Find or create a conversation and record a new message in it.
+
+        Must be called with the lock held. The conversation becomes both the
+        most recently used one and the user's latest conversation.
+        """
+        conversation = self._lookup(user_id, conversation_id)
+        if conversation is None:
+            conversation = CachedConversation(user_id, conversation_id)
+            self._conversations[(user_id, conversation_id)] = conversation
+            conversation.last_used = monotonic()
+        user_conversations = self._user_index.setdefault(user_id, OrderedDict())
+        user_conversations[conversation_id] = conversation
+        user_conversations.move_to_end(conversation_id)
+        conversation.last_message_timestamp = time()
+        return conversation
+
+    def _remove(self, conversation: CachedConversation) -> None:
+        """Remove the conversation from the cache; must be called with the lock held."""
+        del self._conversations[(conversation.user_id, conversation.conversation_id)]
+        user_conversations = self._user_index[conversation.user_id]
+        del user_conversations[conversation.conversation_id]
+        if not user_conversations:
+            del self._user_index[conversation.user_id]
+        self._entries_count -= len(conversation.entries)
+        self._bytes_count -= sum(conversation.sizes)
+
+    def _over_limit(self) -> bool:
+        """Check if the cache exceeds its configured limits."""
+        max_bytes = self.cache_config.max_bytes
+        return self._entries_count > self.cache_config.max_entries or (
+            max_bytes is not None and self._bytes_count > max_bytes
+        )
+
+    def _evict(self, current: CachedConversation) -> None:
+        """Evict least recently used conversations until the cache fits its limits.
+
+        Must be called with the lock held. The current conversation is never
+        evicted as a whole; when it alone exceeds the limits its oldest
+        entries are dropped instead.
+        """
+        while self._over_limit():
+            oldest = next(iter(self._conversations.values()))
+            if oldest is not current:
+                logger.debug(
+                    "Evicting conversation %s from in-memory cache",
+                    oldest.conversation_id,
+                )
+                self._remove(oldest)
+                continue
+            if len(current.entries) <= 1:
+                break
+            current.entries.popleft()
+            self._entries_count -= 1
+            self._bytes_count -= current.sizes.popleft()
@@ -1,9 +1,11 @@
 """PostgreSQL cache implementation."""
 
 import json
+from typing import Any
 
 import psycopg2
 from psycopg2.extensions import AsIs
+from psycopg2.extras import execute_batch
 
 from cache.cache import Cache
 from cache.cache_error import CacheError
@@ -12,6 +14,7 @@ from models.cache_entry import CacheEntry
 from models.config import PostgreSQLDatabaseConfiguration
 from models.responses import ConversationData
 from utils.connection_decorator import connection
+from utils.postgres_pool import pooled_connection
 from utils.types import ReferencedDocument, ToolCallSummary, ToolResultSummary
 
 logger = get_logger(__name__)
@@ -95,6 +98,16 @@ class PostgresCache(Cache):
         VALUES (%s, %s, CURRENT_TIMESTAMP, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
 
+    # CURRENT_TIMESTAMP does not change within a transaction, but created_at is
+    # part of the primary key, so entries appended to the same conversation in
+    # one transaction need the clock time
+    INSERT_CONVERSATION_HISTORY_BATCH_STATEMENT = """
+        INSERT INTO cache(user_id, conversation_id, created_at, started_at, completed_at,
+                          query, response, provider, model, referenced_documents,
+                          tool_calls, tool_results)
+        VALUES (%s, %s, clock_timestamp(), %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+
     QUERY_CACHE_SIZE = """
         SELECT count(*) FROM cache;
         """
@@ -170,7 +183,8 @@ class PostgresCache(Cache):
                     "Maximum length is 63 characters."
                 )
         try:
-            self.connection = psycopg2.connect(
+            self.connection = pooled_connection(
+                config,
                 host=config.host,
                 port=config.port,
                 user=config.user,
@@ -204,7 +218,7 @@ class PostgresCache(Cache):
         try:
             with self.connection.cursor() as cursor:
                 cursor.execute("SELECT 1")
-            logger.info("Connection to storage is ok")
+            logger.debug("Connection to storage is ok")
             return True
         except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
             logger.error("Disconnected from storage: %s", e)
@@ -230,21 +244,21 @@ class PostgresCache(Cache):
         # any CREATE statement can raise it's own exception
         # and it should not interfere with other statements
         cursor = self.connection.cursor()
+        try:
+            logger.info("Initializing schema")
+            if namespace != "public":
+                cursor.execute(PostgresCache.CREATE_SCHEMA, (AsIs(namespace),))
 
-        logger.info("Initializing schema")
-        if namespace != "public":
-            cursor.execute(PostgresCache.CREATE_SCHEMA, (AsIs(namespace),))
-
-        logger.info("Initializing table for cache")
-        cursor.execute(PostgresCache.CREATE_CACHE_TABLE)
-
-        logger.info("Initializing table for conversations")
-        cursor.execute(PostgresCache.CREATE_CONVERSATIONS_TABLE)
+            logger.info("Initializing table for cache")
+            cursor.execute(PostgresCache.CREATE_CACHE_TABLE)
 
-        logger.info("Initializing index for cache")
-        cursor.execute(PostgresCache.CREATE_INDEX)
+            logger.info("Initializing table for conversations")
+            cursor.execute(PostgresCache.CREATE_CONVERSATIONS_TABLE)
 
-        cursor.close()
+            logger.info("Initializing index for cache")
+            cursor.execute(PostgresCache.CREATE_INDEX)
+        finally:
+            cursor.close()
         self.connection.commit()
 
     @connection
@@ -370,67 +384,11 @@ class PostgresCache(Cache):
             raise CacheError("insert_or_append: cache is disconnected")
 
         try:
-            referenced_documents_json = None
-            if cache_entry.referenced_documents:
-                try:
-                    docs_as_dicts = [
-                        doc.model_dump(mode="json")
-                        for doc in cache_entry.referenced_documents
-                    ]
-                    referenced_documents_json = json.dumps(docs_as_dicts)
-                except (TypeError, ValueError) as e:
-                    logger.warning(
-                        "Failed to serialize referenced_documents for "
-                        "conversation %s: %s",
-                        conversation_id,
-                        e,
-                    )
-
-            tool_calls_json = None
-            if cache_entry.tool_calls:
-                try:
-                    tool_calls_as_dicts = [
-                        tc.model_dump(mode="json") for tc in cache_entry.tool_calls
-                    ]
-                    tool_calls_json = json.dumps(tool_calls_as_dicts)
-                except (TypeError, ValueError) as e:
-                    logger.warning(
-                        "Failed to serialize tool_calls for conversation %s: %s",
-                        conversation_id,
-                        e,
-                    )
-
-            tool_results_json = None
-            if cache_entry.tool_results:
-                try:
-                    tool_results_as_dicts = [
-                        tr.model_dump(mode="json") for tr in cache_entry.tool_results
-                    ]
-                    tool_results_json = json.dumps(tool_results_as_dicts)
-                except (TypeError, ValueError) as e:
-                    logger.warning(
-                        "Failed to serialize tool_results for conversation %s: %s",
-                        conversation_id,
-                        e,
-                    )
-
             # the whole operation is run in one transaction
             with self.connection.cursor() as cursor:
                 cursor.execute(
                     PostgresCache.INSERT_CONVERSATION_HISTORY_STATEMENT,
-                    (
-                        user_id,
-                        conversation_id,
-                        cache_entry.started_at,
-                        cache_entry.completed_at,
-                        cache_entry.query,
-                        cache_entry.response,
-                        cache_entry.provider,
-                        cache_entry.model,
-                        referenced_documents_json,
-                        tool_calls_json,
-                        tool_results_json,
-                    ),
+                    self._cache_row(user_id, conversation_id, cache_entry),
                 )
 
                 # Update or insert conversation record with last_message_timestamp
@@ -443,6 +401,121 @@ class PostgresCache(Cache):
             logger.error("PostgresCache.insert_or_append: %s", e)
             raise CacheError("PostgresCache.insert_or_append", e) from e
 
+    @connection
+    def insert_or_append_many(
+        self, entries: list[tuple[str, str, CacheEntry, bool]]
+    ) -> None:
+        """Store cache entries of several conversations in one transaction.
+
+        Parameters:
+        ----------
+            entries (list[tuple[str, str, CacheEntry, bool]]): User ID,
+            conversation ID, cache entry and skip user ID check flag of each
+            entry, in the order the entries are appended.
+
+        Raises:
+        ------
+            CacheError: If the cache is disconnected or a database error occurs
+            while persisting the entries; no entry is stored in that case.
+        """
+        if self.connection is None:
+            logger.error("Cache is disconnected")
+            raise CacheError("insert_or_append_many: cache is disconnected")
+
+        params = [
+            self._cache_row(user_id, conversation_id, cache_entry)
+            + (user_id, conversation_id, None)
+            for user_id, conversation_id, cache_entry, _ in entries
+        ]
+        try:
+            # all statements are sent at once, so they run in one implicit
+            # transaction
+            with self.connection.cursor() as cursor:
+                execute_batch(
+                    cursor,
+                    f"{PostgresCache.INSERT_CONVERSATION_HISTORY_BATCH_STATEMENT};"
+                    f"{PostgresCache.UPSERT_CONVERSATION_STATEMENT}",
+                    params,
+                    page_size=len(params),
+                )
+        except psycopg2.DatabaseError as e:
+            logger.error("PostgresCache.insert_or_append_many: %s", e)
+            raise CacheError("PostgresCache.insert_or_append_many", e) from e
+
+    @staticmethod
+    def _cache_row(
+        user_id: str, conversation_id: str, cache_entry: CacheEntry
+    ) -> tuple[Any, ...]:
+        """Create parameters of the statement inserting a cache entry.
+
+        Parameters:
+        ----------
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            cache_entry: The `CacheEntry` object to store.
+
+        Returns:
+        -------
+            tuple[Any, ...]: Parameters of `INSERT_CONVERSATION_HISTORY_STATEMENT`.
+        """
+        referenced_documents_json = None
+        if cache_entry.referenced_documents:
+            try:
+                docs_as_dicts = [
+                    doc.model_dump(mode="json")
+                    for doc in cache_entry.referenced_documents
+                ]
+                referenced_documents_json = json.dumps(docs_as_dicts)
+            except (TypeError, ValueError) as e:
+                logger.warning(
+                    "Failed to serialize referenced_documents for "
+                    "conversation %s: %s",
+                    conversation_id,
+                    e,
+                )
+
+        tool_calls_json = None
+        if cache_entry.tool_calls:
+            try:
+                tool_calls_as_dicts = [
+                    tc.model_dump(mode="json") for tc in cache_entry.tool_calls
+                ]
+                tool_calls_json = json.dumps(tool_calls_as_dicts)
+            except (TypeError, ValueError) as e:
+                logger.warning(
+                    "Failed to serialize tool_calls for conversation %s: %s",
+                    conversation_id,
+                    e,
+                )
+
+        tool_results_json = None
+        if cache_entry.tool_results:
+            try:
+                tool_results_as_dicts = [
+                    tr.model_dump(mode="json") for tr in cache_entry.tool_results
+                ]
+                tool_results_json = json.dumps(tool_results_as_dicts)
+            except (TypeError, ValueError) as e:
+                logger.warning(
+                    "Failed to serialize tool_results for conversation %s: %s",
+                    conversation_id,
+                    e,
+                )
+
+        return (
+            user_id,
+            conversation_id,
+            cache_entry.started_at,
+            cache_entry.completed_at,
+            cache_entry.query,
+            cache_entry.response,
+            cache_entry.provider,
+            cache_entry.model,
+            referenced_documents_json,
+            tool_calls_json,
+            tool_results_json,
+        )
+
     @connection
     def delete(
         self, user_id: str, conversation_id: str, skip_user_id_check: bool = False
@@ -2,7 +2,9 @@
 
 import json
 import sqlite3
+from threading import RLock
 from time import time
+from typing import Any
 
 from cache.cache import Cache
 from cache.cache_error import CacheError
@@ -138,6 +140,9 @@ class SQLiteCache(Cache):
             the connection.
         """
         self.sqlite_config = config
+        # the connection is also used by the persistence queue writing cache
+        # entries from a worker thread
+        self.connection_lock = RLock()
 
         # initialize connection to DB
         self.connect()
@@ -160,7 +165,9 @@ class SQLiteCache(Cache):
         self.connection = None
         config = self.sqlite_config
         try:
-            self.connection = sqlite3.connect(database=config.db_path)
+            self.connection = sqlite3.connect(
+                database=config.db_path, check_same_thread=False
+            )
             self.initialize_cache()
         except sqlite3.Error as e:
             if self.connection is not None:
@@ -184,7 +191,7 @@ class SQLiteCache(Cache):
         try:
             cursor = self.connection.cursor()
             cursor.execute("SELECT 1")
-            logger.info("Connection to storage is ok")
+            logger.debug("Connection to storage is ok")
             return True
         except sqlite3.Error as e:
             logger.error("Disconnected from storage: %s", e)
@@ -347,6 +354,83 @@ class SQLiteCache(Cache):
         cursor = self.connection.cursor()
         current_time = time()
 
+        cursor.execute(
+            self.INSERT_CONVERSATION_HISTORY_STATEMENT,
+            self._cache_row(user_id, conversation_id, current_time, cache_entry),
+        )
+
+        # Update or insert conversation record with last_message_timestamp
+        cursor.execute(
+            self.UPSERT_CONVERSATION_STATEMENT,
+            (user_id, conversation_id, None, current_time),
+        )
+
+        cursor.close()
+        self.connection.commit()
+
+    @connection
+    def insert_or_append_many(
+        self, entries: list[tuple[str, str, CacheEntry, bool]]
+    ) -> None:
+        """Store cache entries of several conversations in one transaction.
+
+        Parameters:
+        ----------
+            entries (list[tuple[str, str, CacheEntry, bool]]): User ID,
+            conversation ID, cache entry and skip user ID check flag of each
+            entry, in the order the entries are appended.
+
+        Raises:
+        ------
+            CacheError: If the cache connection is not available.
+            sqlite3.Error: If the entries cannot be stored; no entry is stored
+            in that case.
+        """
+        if self.connection is None:
+            logger.error("Cache is disconnected")
+            raise CacheError("insert_or_append_many: cache is disconnected")
+
+        current_time = time()
+        # created_at is part of the primary key, so entries appended to the
+        # same conversation need distinct creation times
+        rows = [
+            self._cache_row(user_id, conversation_id, current_time + i * 1e-6, entry)
+            for i, (user_id, conversation_id, entry, _) in enumerate(entries)
+        ]
+        conversations = [(row[0], row[1], None, row[2]) for row in rows]
+
+        # it is not possible to use context manager there, because SQLite does
+        # not support it
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("BEGIN")
+            cursor.executemany(self.INSERT_CONVERSATION_HISTORY_STATEMENT, rows)
+            cursor.executemany(self.UPSERT_CONVERSATION_STATEMENT, conversations)
+            cursor.execute("COMMIT")
+        except sqlite3.Error:
+            if self.connection.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _cache_row(
+        user_id: str, conversation_id: str, created_at: float, cache_entry: CacheEntry
+    ) -> tuple[Any, ...]:
+        """Create parameters of the statement inserting a cache entry.
+
+        Parameters:
+        ----------
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            created_at: Time the entry is stored at.
+            cache_entry: The `CacheEntry` object to store.
+
+        Returns:
+        -------
+            tuple[Any, ...]: Parameters of `INSERT_CONVERSATION_HISTORY_STATEMENT`.
+        """
         referenced_documents_json = None
         if cache_entry.referenced_documents:
             try:
@@ -391,33 +475,21 @@ class SQLiteCache(Cache):
                     e,
                 )
 
-        cursor.execute(
-            self.INSERT_CONVERSATION_HISTORY_STATEMENT,
-            (
-                user_id,
-                conversation_id,
-                current_time,
-                cache_entry.started_at,
-                cache_entry.completed_at,
-                cache_entry.query,
-                cache_entry.response,
-                cache_entry.provider,
-                cache_entry.model,
-                referenced_documents_json,
-                tool_calls_json,
-                tool_results_json,
-            ),
+        return (
+            user_id,
+            conversation_id,
+            created_at,
+            cache_entry.started_at,
+            cache_entry.completed_at,
+            cache_entry.query,
+            cache_entry.response,
+            cache_entry.provider,
+            cache_entry.model,
+            referenced_documents_json,
+            tool_calls_json,
+            tool_results_json,
         )
 
-        # Update or insert conversation record with last_message_timestamp
-        cursor.execute(
-            self.UPSERT_CONVERSATION_STATEMENT,
-            (user_id, conversation_id, None, current_time),
-        )
-
-        cursor.close()
-        self.connection.commit()
-
     @connection
     def delete(
         self, user_id: str, conversation_id: str, skip_user_id_check: bool = False
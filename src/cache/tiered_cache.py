@@ -0,0 +1,255 @@
+"""Read-through cache in front of another cache implementation."""
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Generic, Optional, TypeVar
+
+from cache.cache import Cache
+from log import get_logger
+from models.cache_entry import CacheEntry
+from models.config import ConversationReadCacheConfig
+from models.responses import ConversationData
+
+logger = get_logger(__name__)
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class _LRU(Generic[K, V]):
+    """Bounded least recently used mapping with optional expiration.
+
+    Not thread safe; callers must hold a lock.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[int]) -> None:
+        """Create an empty mapping holding at most `max_size` items."""
+        self._items: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the value for the key, or None if it is missing or expired."""
+        item = self._items.get(key)
+        if item is None:
+            return None
+        stored_at, value = item
+        ttl = self._ttl_seconds
+        if ttl is not None and monotonic() - stored_at > ttl:
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        """Store the value, evicting the least recently used item when full."""
+        self._items[key] = (monotonic(), value)
+        self._items.move_to_end(key)
+        if len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        """Remove the key if present."""
+        self._items.pop(key, None)
+
+
+class TieredCache(Cache):
+    """Read-through cache in front of another cache implementation.
+
+    Conversation histories and conversation lists read from the wrapped
+    cache (usually a database backed one) are kept deserialized in a
+    bounded in-process LRU, so repeated reads do not hit the database.
+
+    All changes are written to the wrapped cache first and then applied to
+    the cached data (write-through): appended entries are added to the
+    cached history and the user's cached conversation list is dropped, as
+    timestamps of the conversations are assigned by the wrapped cache.
+    """
+
+    def __init__(self, backend: Cache, config: ConversationReadCacheConfig) -> None:
+        """Create a read-through cache in front of the given cache.
+
+        Parameters:
+        ----------
+            backend (Cache): Cache holding the conversation history.
+            config (ConversationReadCacheConfig): Read cache limits.
+        """
+        self.backend = backend
+        self.read_cache_config = config
+        self._lock = Lock()
+        self._histories: _LRU[tuple[str, str], list[CacheEntry]] = _LRU(
+            config.max_conversations, config.ttl_seconds
+        )
+        self._lists: _LRU[str, list[ConversationData]] = _LRU(
+            config.max_conversations, config.ttl_seconds
+        )
+        # incremented on every change, so data read from the wrapped cache
+        # concurrently with a change is not cached
+        self._version = 0
+
+    def connect(self) -> None:
+        """Initialize connection to the wrapped cache."""
+        self.backend.connect()
+
+    def connected(self) -> bool:
+        """Check if connection to the wrapped cache is alive.
+
+        Returns:
+            True if the wrapped cache is connected, False otherwise.
+        """
+        return self.backend.connected()
+
+    def get(
+        self, user_id: str, conversation_id: str, skip_user_id_check: bool = False
+    ) -> list[CacheEntry]:
+        """Get the value associated with the given key.
+
+        Parameters:
+        ----------
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            skip_user_id_check: Skip user_id suid check.
+
+        Returns:
+        -------
+            Cache entries of the conversation, read from the wrapped cache
+            when they are not cached yet.
+        """
+        key = (user_id, conversation_id)
+        with self._lock:
+            entries = self._histories.get(key)
+            version = self._version
+        if entries is not None:
+            return list(entries)
+        entries = self.backend.get(user_id, conversation_id, skip_user_id_check)
+        with self._lock:
+            if version == self._version:
+                self._histories.put(key, list(entries))
+        return entries
+
+    def insert_or_append(
+        self,
+        user_id: str,
+        conversation_id: str,
+        cache_entry: CacheEntry,
+        skip_user_id_check: bool = False,
+    ) -> None:
+        """Set the value associated with the given key.
+
+        Parameters:
+        ----------
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            cache_entry: The `CacheEntry` object to store.
+            skip_user_id_check: Skip user_id suid check.
+        """
+        self.backend.insert_or_append(
+            user_id, conversation_id, cache_entry, skip_user_id_check
+        )
+        with self._lock:
+            self._version += 1
+            entries = self._histories.get((user_id, conversation_id))
+            if entries is not None:
+                entries.append(cache_entry)
+            self._lists.pop(user_id)
+
+    def insert_or_append_many(
+        self, entries: list[tuple[str, str, CacheEntry, bool]]
+    ) -> None:
+        """Store cache entries of several conversations.
+
+        Parameters:
+        ----------
+            entries (list[tuple[str, str, CacheEntry, bool]]): User ID,
+            conversation ID, cache entry and skip user ID check flag of each
+            entry, in the order the entries are appended.
+        """
+        self.backend.insert_or_append_many(entries)
+        with self._lock:
+            self._version += 1
+            for user_id, conversation_id, cache_entry, _ in entries:
+                cached = self._histories.get((user_id, conversation_id))
+                if cached is not None:
+                    cached.append(cache_entry)
+                self._lists.pop(user_id)
+
+    def delete(
+        self, user_id: str, conversation_id: str, skip_user_id_check: bool = False
+    ) -> bool:
+        """Delete conversation history for a given user_id and conversation_id.
+
+        Parameters:
+        ----------
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            skip_user_id_check: Skip user_id suid check.
+
+        Returns:
+        -------
+            bool: Result of the deletion in the wrapped cache.
+        """
+        try:
+            return self.backend.delete(user_id, conversation_id, skip_user_id_check)
+        finally:
+            with self._lock:
+                self._version += 1
+                self._histories.pop((user_id, conversation_id))
+                self._lists.pop(user_id)
+
+    def list(
+        self, user_id: str, skip_user_id_check: bool = False
+    ) -> list[ConversationData]:
+        """List all conversations for a given user_id.
+
+        Parameters:
+        ----------
+            user_id: User identification.
+            skip_user_id_check: Skip user_id suid check.
+
+        Returns:
+        -------
+            A list of ConversationData objects, read from the wrapped cache
+            when they are not cached yet.
+        """
+        with self._lock:
+            conversations = self._lists.get(user_id)
+            version = self._version
+        if conversations is not None:
+            return list(conversations)
+        conversations = self.backend.list(user_id, skip_user_id_check)
+        with self._lock:
+            if version == self._version:
+                self._lists.put(user_id, list(conversations))
+        return conversations
+
+    def set_topic_summary(
+        self,
+        user_id: str,
+        conversation_id: str,
+        topic_summary: str,
+        skip_user_id_check: bool = False,
+    ) -> None:
+        """Set the topic summary for the given conversation.
+
+        Parameters:
+        ----------
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            topic_summary: The topic summary to store.
+            skip_user_id_check: Skip user_id suid check.
+        """
+        self.backend.set_topic_summary(
+            user_id, conversation_id, topic_summary, skip_user_id_check
+        )
+        with self._lock:
+            self._version += 1
+            self._lists.pop(user_id)
+
+    def ready(self) -> bool:
+        """Check if the wrapped cache is ready.
+
+        Returns:
+            True if the wrapped cache is ready, False otherwise.
+        """
+        return self.backend.ready()
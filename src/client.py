@@ -3,7 +3,7 @@
 import json
 import os
 import tempfile
-from typing import Optional
+from typing import Any, Optional
 
 import yaml
 from fastapi import HTTPException
@@ -15,6 +15,7 @@ from llama_stack_configuration import YamlDumper, enrich_byok_rag, enrich_solr
 from log import get_logger
 from models.api.responses import ServiceUnavailableResponse
 from models.config import LlamaStackConfiguration
+from utils.registry_cache import LlamaStackRegistryCache
 from utils.types import Singleton
 
 logger = get_logger(__name__)
@@ -139,6 +140,7 @@ class AsyncLlamaStackClientHolder(metaclass=Singleton):
             )
             raise HTTPException(**error_response.model_dump()) from e
         self._lsc = client
+        LlamaStackRegistryCache().invalidate()
         return client
 
     async def check_model_available(self, model_id: str) -> tuple[bool, str]:
@@ -164,9 +166,13 @@ class AsyncLlamaStackClientHolder(metaclass=Singleton):
             A tuple of (available, reason) where available is True if the
             model was found, and reason describes the outcome.
         """
+        registry = LlamaStackRegistryCache()
         try:
             client = self.get_client()
-            models = await client.models.list()
+            models = await registry.models(client)
+            if not any(m.id == model_id for m in models):
+                # the cached listing may predate the model registration
+                models = await registry.models(client, force_refresh=True)
         except RuntimeError as e:
             logger.warning("Client not initialized, skipping model check: %s", e)
             return False, f"Client not initialized: {e!s}"
@@ -188,7 +194,7 @@ class AsyncLlamaStackClientHolder(metaclass=Singleton):
             try:
                 await self.reload_library_client()
                 client = self.get_client()
-                reloaded_models = await client.models.list()
+                reloaded_models = await registry.models(client, force_refresh=True)
                 if any(m.id == model_id for m in reloaded_models):
                     logger.info(
                         "Model %s found after client reload",
@@ -211,6 +217,18 @@ class AsyncLlamaStackClientHolder(metaclass=Singleton):
         )
         return False, f"Model {model_id} not found in model registry"
 
+    @property
+    def provider_data(self) -> dict[str, Any]:
+        """Provider data passed to Llama Stack in request headers of the client."""
+        if not self._lsc:
+            return {}
+        current_headers = self._lsc.default_headers or {}
+        provider_data_json = current_headers.get("X-LlamaStack-Provider-Data")
+        try:
+            return json.loads(provider_data_json) if provider_data_json else {}
+        except (json.JSONDecodeError, TypeError):
+            return {}
+
     def update_provider_data(self, updates: dict[str, str]) -> AsyncLlamaStackClient:
         """Update provider data headers for service client.
 
@@ -227,20 +245,16 @@ class AsyncLlamaStackClientHolder(metaclass=Singleton):
                 "AsyncLlamaStackClient has not been initialised. Ensure 'load(..)' has been called."
             )
 
-        current_headers = self._lsc.default_headers or {}
-        provider_data_json = current_headers.get("X-LlamaStack-Provider-Data")
-
-        try:
-            provider_data = json.loads(provider_data_json) if provider_data_json else {}
-        except (json.JSONDecodeError, TypeError):
-            provider_data = {}
-
+        provider_data = self.provider_data
         provider_data.update(updates)
 
         updated_headers = {
-            **current_headers,
+            **(self._lsc.default_headers or {}),
             "X-LlamaStack-Provider-Data": json.dumps(provider_data),
         }
 
+        previous_client = self._lsc
         self._lsc = self._lsc.copy(set_default_headers=updated_headers)  # type: ignore[arg-type]
+        # same Llama Stack instance, only the request headers differ
+        LlamaStackRegistryCache().rebind(previous_client, self._lsc)
         return self._lsc
@@ -21,10 +21,12 @@ from models.config import (
     ConversationHistoryConfiguration,
     Customization,
     DatabaseConfiguration,
+    HttpClientsConfiguration,
     InferenceConfiguration,
     LlamaStackConfiguration,
     ModelContextProtocolServer,
     OkpConfiguration,
+    PersistenceQueueConfiguration,
     QuotaHandlersConfiguration,
     RagConfiguration,
     RlsapiV1Configuration,
@@ -32,9 +34,12 @@ from models.config import (
     SplunkConfiguration,
     UserDataCollection,
 )
+from quota.quota_engine import QuotaEngine
 from quota.quota_limiter import QuotaLimiter
 from quota.quota_limiter_factory import QuotaLimiterFactory
 from quota.token_usage_history import TokenUsageHistory
+from utils.mcp_tool_plans import McpToolPlans
+from utils.tool_catalog import ToolCatalog
 
 logger = get_logger(__name__)
 
@@ -64,6 +69,7 @@ class AppConfig:  # pylint: disable=too-many-public-methods
         self._configuration: Optional[Configuration] = None
         self._conversation_cache: Optional[Cache] = None
         self._quota_limiters: list[QuotaLimiter] = []
+        self._quota_engine: Optional[QuotaEngine] = None
         self._token_usage_history: Optional[TokenUsageHistory] = None
         self._dynamic_mcp_server_names: set[str] = set()
 
@@ -94,9 +100,11 @@ class AppConfig:  # pylint: disable=too-many-public-methods
         # clear cached values when configuration changes
         self._conversation_cache = None
         self._quota_limiters = []
+        self._quota_engine = None
         self._token_usage_history = None
         # now it is possible to re-read configuration
         self._configuration = Configuration(**config_dict)
+        McpToolPlans().compile(self._configuration.mcp_servers)
 
     @property
     def configuration(self) -> Configuration:
@@ -199,6 +207,8 @@ class AppConfig:  # pylint: disable=too-many-public-methods
                 )
         self._configuration.mcp_servers.append(mcp_server)
         self._dynamic_mcp_server_names.add(mcp_server.name)
+        McpToolPlans().compile_server(mcp_server)
+        ToolCatalog().invalidate(mcp_server.name)
 
     def remove_mcp_server(self, name: str) -> None:
         """Remove a dynamically registered MCP server from the runtime configuration.
@@ -222,6 +232,8 @@ class AppConfig:  # pylint: disable=too-many-public-methods
             s for s in self._configuration.mcp_servers if s.name != name
         ]
         self._dynamic_mcp_server_names.discard(name)
+        McpToolPlans().discard(name)
+        ToolCatalog().invalidate(name)
 
     def is_dynamic_mcp_server(self, name: str) -> bool:
         """Check if an MCP server was dynamically registered.
@@ -403,6 +415,26 @@ class AppConfig:  # pylint: disable=too-many-public-methods
             )
         return self._quota_limiters
 
+    @property
+    def quota_engine(self) -> Optional[QuotaEngine]:
+        """Return engine checking and consuming quota of all limiters at once.
+
+        Returns:
+            Optional[QuotaEngine]: The engine, or `None` when the quota
+            limiters have to be used one by one (no limiters are configured
+            or quota is leased).
+
+        Raises:
+            LogicError: If the configuration has not been loaded.
+        """
+        if self._configuration is None:
+            raise LogicError("logic error: configuration is not loaded")
+        if self._quota_engine is None:
+            self._quota_engine = QuotaEngine.create(
+                self._configuration.quota_handlers, self.quota_limiters
+            )
+        return self._quota_engine
+
     @property
     def token_usage_history(self) -> Optional[TokenUsageHistory]:
         """
@@ -437,6 +469,20 @@ class AppConfig:  # pylint: disable=too-many-public-methods
             raise LogicError("logic error: configuration is not loaded")
         return self._configuration.azure_entra_id
 
+    @property
+    def persistence_queue(self) -> PersistenceQueueConfiguration:
+        """Return persistence queue configuration."""
+        if self._configuration is None:
+            raise LogicError("logic error: configuration is not loaded")
+        return self._configuration.persistence_queue
+
+    @property
+    def http_clients(self) -> HttpClientsConfiguration:
+        """Return outbound HTTP clients configuration."""
+        if self._configuration is None:
+            raise LogicError("logic error: configuration is not loaded")
+        return self._configuration.http_clients
+
     @property
     def splunk(self) -> Optional[SplunkConfiguration]:
         """Return Splunk configuration, or None if not provided."""
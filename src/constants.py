@@ -17,6 +17,72 @@ INTERRUPTED_RESPONSE_MESSAGE: Final[str] = "You interrupted this request."
 # Max seconds to wait for topic summary in background task after interrupt persist.
 TOPIC_SUMMARY_INTERRUPT_TIMEOUT_SECONDS: Final[float] = 30.0
 
+# Max seconds to wait for a topic summary started together with the main response.
+TOPIC_SUMMARY_JOIN_TIMEOUT_SECONDS: Final[float] = 30.0
+
+# Seconds Llama Stack registry listings (models, shields, ...) are cached for.
+LLAMA_STACK_REGISTRY_CACHE_TTL_SECONDS: Final[float] = 60.0
+
+# Seconds before expiry when a cached registry listing is refreshed in background.
+LLAMA_STACK_REGISTRY_CACHE_REFRESH_AHEAD_SECONDS: Final[float] = 10.0
+
+# Seconds tool listings of Llama Stack toolgroups are cached for by the /tools endpoint.
+TOOL_CATALOG_CACHE_TTL_SECONDS: Final[float] = 60.0
+
+# Maximum number of cached toolgroup tool listings (per toolgroup and credentials).
+TOOL_CATALOG_CACHE_MAX_SIZE: Final[int] = 1024
+
+# Maximum number of toolgroups whose tools are listed concurrently by one request.
+TOOL_CATALOG_MAX_CONCURRENT_LISTINGS: Final[int] = 8
+
+# Seconds successful Kubernetes token and access reviews are cached for.
+K8S_AUTH_CACHE_TTL_SECONDS: Final[float] = 60.0
+
+# Seconds rejected Kubernetes tokens and denied access reviews are cached for.
+K8S_AUTH_NEGATIVE_CACHE_TTL_SECONDS: Final[float] = 5.0
+
+# Maximum number of cached Kubernetes review results.
+K8S_AUTH_CACHE_MAX_SIZE: Final[int] = 10000
+
+# Maximum number of Kubernetes review calls running at the same time.
+K8S_AUTH_MAX_WORKERS: Final[int] = 8
+
+# Seconds JWK sets are cached for.
+JWK_CACHE_TTL_SECONDS: Final[float] = 3600.0
+
+# Seconds before expiry when a cached JWK set is refreshed in background.
+JWK_CACHE_REFRESH_AHEAD_SECONDS: Final[float] = 300.0
+
+# Minimum seconds between refetches of a JWK set for tokens signed by unknown keys.
+JWK_UNKNOWN_KEY_REFETCH_INTERVAL_SECONDS: Final[float] = 60.0
+
+# Seconds a JWK set fetch may take.
+JWK_FETCH_TIMEOUT_SECONDS: Final[float] = 10.0
+
+# Maximum seconds verified JWT claims are cached for, even if the token expires later.
+JWT_CLAIMS_CACHE_TTL_SECONDS: Final[float] = 300.0
+
+# Maximum number of cached verified JWT claims.
+JWT_CLAIMS_CACHE_MAX_SIZE: Final[int] = 10000
+
+# Seconds before expiry when the Azure Entra ID access token is refreshed in background.
+AZURE_TOKEN_REFRESH_AHEAD_SECONDS: Final[float] = 300.0
+
+# Seconds before the first retry of a failed Azure Entra ID token refresh.
+AZURE_TOKEN_RETRY_INITIAL_DELAY_SECONDS: Final[float] = 1.0
+
+# Maximum seconds between retries of a failed Azure Entra ID token refresh.
+AZURE_TOKEN_RETRY_MAX_DELAY_SECONDS: Final[float] = 60.0
+
+# Maximum number of distinct JWT claims whose resolved roles are cached.
+AUTHORIZATION_ROLES_CACHE_MAX_SIZE: Final[int] = 10000
+
+# Maximum number of distinct role sets whose authorized actions are cached.
+AUTHORIZATION_ROLE_SETS_CACHE_MAX_SIZE: Final[int] = 1024
+
+# Seconds a conversation read waits for queued writes of that conversation.
+PERSISTENCE_QUEUE_READ_WAIT_SECONDS: Final[float] = 5.0
+
 # Supported attachment types
 ATTACHMENT_TYPES: Final[frozenset] = frozenset(
     {
@@ -140,6 +206,41 @@ DEFAULT_MAX_FILE_UPLOAD_SIZE: Final[int] = 100 * 1024 * 1024  # 100 MB
 DEFAULT_JWT_UID_CLAIM: Final[str] = "user_id"
 DEFAULT_JWT_USER_NAME_CLAIM: Final[str] = "username"
 
+# Seconds results of MCP OAuth probes that did not require authentication are cached for.
+MCP_OAUTH_PROBE_CACHE_TTL_SECONDS: Final[float] = 60.0
+
+# Seconds results of MCP OAuth probes requiring authentication or failing are cached for.
+MCP_OAUTH_PROBE_NEGATIVE_CACHE_TTL_SECONDS: Final[float] = 5.0
+
+# Seconds before expiry when a cached MCP OAuth probe result is refreshed in background.
+MCP_OAUTH_PROBE_REFRESH_AHEAD_SECONDS: Final[float] = 15.0
+
+# Maximum number of cached MCP OAuth probe results.
+MCP_OAUTH_PROBE_CACHE_MAX_SIZE: Final[int] = 10000
+
+# Seconds an MCP OAuth probe may take.
+MCP_OAUTH_PROBE_TIMEOUT_SECONDS: Final[float] = 10.0
+
+# Seconds to wait before retrying a failed deferred MCP registration; doubled after each failure.
+MCP_REGISTRATION_RETRY_INITIAL_DELAY_SECONDS: Final[float] = 1.0
+
+# Upper bound of the delay between retries of a failed deferred MCP servers registration.
+MCP_REGISTRATION_RETRY_MAX_DELAY_SECONDS: Final[float] = 30.0
+
+# Seconds to wait before retrying a failed Splunk HEC request; doubled after each failure.
+SPLUNK_RETRY_INITIAL_DELAY_SECONDS: Final[float] = 1.0
+
+# Upper bound of the delay between retries of a failed Splunk HEC request.
+SPLUNK_RETRY_MAX_DELAY_SECONDS: Final[float] = 30.0
+
+# Seconds the Splunk exporter may take to send queued events on shutdown.
+SPLUNK_EXPORTER_STOP_TIMEOUT_SECONDS: Final[float] = 10.0
+
+# Destination names of outbound HTTP client pools
+HTTP_CLIENT_JWK: Final[str] = "jwk"
+HTTP_CLIENT_MCP_OAUTH_PROBE: Final[str] = "mcp_oauth_probe"
+HTTP_CLIENT_SPLUNK: Final[str] = "splunk"
+
 # MCP authorization header special values
 MCP_AUTH_KUBERNETES: Final[str] = "kubernetes"
 MCP_AUTH_CLIENT: Final[str] = "client"
@@ -185,6 +286,9 @@ DEFAULT_EMBEDDING_DIMENSION: Final[int] = 768
 USER_QUOTA_LIMITER: Final[str] = "user_limiter"
 CLUSTER_QUOTA_LIMITER: Final[str] = "cluster_limiter"
 
+# Number of attempts to lease quota when the quota is changed concurrently.
+QUOTA_LEASE_EXCHANGE_ATTEMPTS: Final[int] = 5
+
 # RAG as a tool constants
 DEFAULT_RAG_TOOL: Final[str] = "file_search"
 TOOL_RAG_MAX_CHUNKS: Final[int] = 10  # retrieved from RAG as a tool
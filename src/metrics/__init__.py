@@ -22,6 +22,45 @@ LLM_INFERENCE_DURATION_BUCKETS: Final[tuple[float, ...]] = (
     float("inf"),
 )
 
+POSTGRES_POOL_ACQUIRE_DURATION_BUCKETS: Final[tuple[float, ...]] = (
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    float("inf"),
+)
+
+HTTP_CLIENT_CONNECT_DURATION_BUCKETS: Final[tuple[float, ...]] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    float("inf"),
+)
+
+REQUEST_PREPARATION_DURATION_BUCKETS: Final[tuple[float, ...]] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    float("inf"),
+)
+
 # Counter to track REST API calls
 # This will be used to count how many times each API endpoint is called
 # and the status code of the response
@@ -79,3 +118,85 @@ llm_inference_duration_seconds = Histogram(
     ["provider", "model", "endpoint", "result"],
     buckets=LLM_INFERENCE_DURATION_BUCKETS,
 )
+
+# Histogram to measure the stages run before a query reaches the LLM
+# (moderation, inline RAG, tool preparation, ...); they bound time-to-first-token.
+request_preparation_duration_seconds = Histogram(
+    "ls_request_preparation_duration_seconds",
+    "Query preparation stage duration",
+    ["endpoint", "stage"],
+    buckets=REQUEST_PREPARATION_DURATION_BUCKETS,
+)
+
+# Gauge with the number of idle and in use connections of PostgreSQL pools
+postgres_pool_connections = Gauge(
+    "ls_postgres_pool_connections",
+    "PostgreSQL connection pool connections",
+    ["pool", "state"],
+)
+
+# Histogram to measure how long requests wait for a pooled PostgreSQL connection
+postgres_pool_acquire_duration_seconds = Histogram(
+    "ls_postgres_pool_acquire_duration_seconds",
+    "PostgreSQL connection pool acquire duration",
+    ["pool"],
+    buckets=POSTGRES_POOL_ACQUIRE_DURATION_BUCKETS,
+)
+
+# Metric that counts how many times no pooled PostgreSQL connection was free in time
+postgres_pool_acquire_timeouts_total = Counter(
+    "ls_postgres_pool_acquire_timeouts_total",
+    "PostgreSQL connection pool acquire timeouts",
+    ["pool"],
+)
+
+# Gauge with the number of in use and queued connections of outbound HTTP client pools
+http_client_pool_connections = Gauge(
+    "ls_http_client_pool_connections",
+    "Outbound HTTP client pool connections",
+    ["pool", "state"],
+)
+
+# Histogram to measure how long opening a new outbound HTTP connection takes,
+# including DNS resolution and TLS handshake
+http_client_pool_connect_duration_seconds = Histogram(
+    "ls_http_client_pool_connect_duration_seconds",
+    "Outbound HTTP client pool connection setup duration",
+    ["pool"],
+    buckets=HTTP_CLIENT_CONNECT_DURATION_BUCKETS,
+)
+
+# Metric that counts Splunk events sent to HEC
+splunk_events_sent_total = Counter(
+    "ls_splunk_events_sent_total",
+    "Splunk events sent to HEC",
+)
+
+# Metric that counts Splunk events dropped because the queue was full ("overflow")
+# or because HEC did not accept them ("send_failed")
+splunk_events_dropped_total = Counter(
+    "ls_splunk_events_dropped_total",
+    "Splunk events dropped",
+    ["reason"],
+)
+
+# Gauge with the time of the last quota revocation run of each quota limiter
+quota_scheduler_last_run_timestamp_seconds = Gauge(
+    "ls_quota_scheduler_last_run_timestamp_seconds",
+    "Time of the last quota scheduler run",
+    ["limiter"],
+)
+
+# Gauge with the number of quota rows changed by the last revocation run
+quota_scheduler_rows_updated = Gauge(
+    "ls_quota_scheduler_rows_updated",
+    "Quota rows updated by the last quota scheduler run",
+    ["limiter"],
+)
+
+# Gauge with the delay of the last revocation run behind its schedule
+quota_scheduler_lag_seconds = Gauge(
+    "ls_quota_scheduler_lag_seconds",
+    "Quota scheduler run delay behind schedule",
+    ["limiter"],
+)
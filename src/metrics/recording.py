@@ -129,3 +129,136 @@ def record_llm_inference_duration(
         ).observe(duration)
     except (AttributeError, TypeError, ValueError):
         logger.warning("Failed to update LLM inference duration metric", exc_info=True)
+
+
+def record_request_preparation_duration(
+    endpoint_path: str, stage: str, duration: float
+) -> None:
+    """Record the duration of one query preparation stage.
+
+    Args:
+        endpoint_path: API endpoint path for metric labeling.
+        stage: Bounded stage label, such as ``moderation`` or ``total``.
+        duration: Stage duration in seconds.
+    """
+    try:
+        metrics.request_preparation_duration_seconds.labels(
+            endpoint_path, stage
+        ).observe(duration)
+    except (AttributeError, TypeError, ValueError):
+        logger.warning(
+            "Failed to update request preparation duration metric", exc_info=True
+        )
+
+
+def record_postgres_pool_connections(pool: str, idle: int, in_use: int) -> None:
+    """Record the number of connections of a PostgreSQL connection pool.
+
+    Args:
+        pool: Connection pool name used as the metric label.
+        idle: Number of open connections waiting in the pool.
+        in_use: Number of connections borrowed from the pool.
+    """
+    try:
+        metrics.postgres_pool_connections.labels(pool, "idle").set(idle)
+        metrics.postgres_pool_connections.labels(pool, "in_use").set(in_use)
+    except (AttributeError, TypeError, ValueError):
+        logger.warning("Failed to update connection pool metric", exc_info=True)
+
+
+def record_postgres_pool_acquire(pool: str, duration: float) -> None:
+    """Record how long it took to borrow a connection from a PostgreSQL pool.
+
+    Args:
+        pool: Connection pool name used as the metric label.
+        duration: Time spent waiting for the connection in seconds.
+    """
+    try:
+        metrics.postgres_pool_acquire_duration_seconds.labels(pool).observe(duration)
+    except (AttributeError, TypeError, ValueError):
+        logger.warning("Failed to update connection pool acquire metric", exc_info=True)
+
+
+def record_postgres_pool_acquire_timeout(pool: str) -> None:
+    """Record that no connection of a PostgreSQL pool was free in time.
+
+    Args:
+        pool: Connection pool name used as the metric label.
+    """
+    try:
+        metrics.postgres_pool_acquire_timeouts_total.labels(pool).inc()
+    except (AttributeError, TypeError, ValueError):
+        logger.warning("Failed to update connection pool timeout metric", exc_info=True)
+
+
+def record_http_client_pool_connections(pool: str, state: str, change: int) -> None:
+    """Record a change of the number of connections of an HTTP client pool.
+
+    Args:
+        pool: Destination name of the pool used as the metric label.
+        state: Connection state, "in_use" or "queued".
+        change: Number of connections added to (or removed from) the state.
+    """
+    try:
+        metrics.http_client_pool_connections.labels(pool, state).inc(change)
+    except (AttributeError, TypeError, ValueError):
+        logger.warning("Failed to update HTTP client pool metric", exc_info=True)
+
+
+def record_http_client_pool_connect(pool: str, duration: float) -> None:
+    """Record how long opening a connection of an HTTP client pool took.
+
+    Args:
+        pool: Destination name of the pool used as the metric label.
+        duration: Time spent resolving, connecting and TLS handshaking in seconds.
+    """
+    try:
+        metrics.http_client_pool_connect_duration_seconds.labels(pool).observe(duration)
+    except (AttributeError, TypeError, ValueError):
+        logger.warning("Failed to update HTTP client connect metric", exc_info=True)
+
+
+def record_splunk_events_sent(count: int) -> None:
+    """Record Splunk events accepted by HEC.
+
+    Args:
+        count: Number of events sent in one HEC request.
+    """
+    try:
+        metrics.splunk_events_sent_total.inc(count)
+    except (AttributeError, TypeError, ValueError):
+        logger.warning("Failed to update Splunk sent events metric", exc_info=True)
+
+
+def record_splunk_events_dropped(reason: str, count: int = 1) -> None:
+    """Record Splunk events that were not sent.
+
+    Args:
+        reason: Why the events were dropped, "overflow" or "send_failed".
+        count: Number of dropped events.
+    """
+    try:
+        metrics.splunk_events_dropped_total.labels(reason).inc(count)
+    except (AttributeError, TypeError, ValueError):
+        logger.warning("Failed to update Splunk dropped events metric", exc_info=True)
+
+
+def record_quota_scheduler_run(
+    limiter: str, timestamp: float, rows: int, lag: float
+) -> None:
+    """Record one quota revocation run of a quota limiter.
+
+    Args:
+        limiter: Quota limiter name used as the metric label.
+        timestamp: Unix time when the run started.
+        rows: Number of quota rows updated by the run.
+        lag: Delay of the run behind its schedule in seconds.
+    """
+    try:
+        metrics.quota_scheduler_last_run_timestamp_seconds.labels(limiter).set(
+            timestamp
+        )
+        metrics.quota_scheduler_rows_updated.labels(limiter).set(rows)
+        metrics.quota_scheduler_lag_seconds.labels(limiter).set(lag)
+    except (AttributeError, TypeError, ValueError):
+        logger.warning("Failed to update quota scheduler metrics", exc_info=True)
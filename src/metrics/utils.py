@@ -10,6 +10,7 @@ from log import get_logger
 from models.api.responses import ServiceUnavailableResponse
 from utils.common import run_once_async
 from utils.endpoints import check_configuration_loaded
+from utils.registry_cache import LlamaStackRegistryCache
 
 logger = get_logger(__name__)
 
@@ -20,7 +21,9 @@ async def setup_model_metrics() -> None:
     logger.info("Setting up model metrics")
     check_configuration_loaded(configuration)
     try:
-        model_list = await AsyncLlamaStackClientHolder().get_client().models.list()
+        model_list = await LlamaStackRegistryCache().models(
+            AsyncLlamaStackClientHolder().get_client()
+        )
     except (APIConnectionError, APIStatusError) as e:
         response = ServiceUnavailableResponse(backend_name="Llama Stack", cause=str(e))
         raise HTTPException(**response.model_dump()) from e
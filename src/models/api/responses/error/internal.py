@@ -52,6 +52,13 @@ class InternalServerErrorResponse(AbstractErrorResponse):
                         "cause": "Conversation cache is not configured or unavailable.",
                     },
                 },
+                {
+                    "label": "token usage history",
+                    "detail": {
+                        "response": "Token usage history not configured",
+                        "cause": "Token usage history is not enabled or unavailable.",
+                    },
+                },
                 {
                     "label": "database",
                     "detail": {
@@ -160,6 +167,20 @@ class InternalServerErrorResponse(AbstractErrorResponse):
             cause="Conversation cache is not configured or unavailable.",
         )
 
+    @classmethod
+    def token_usage_history_unavailable(cls) -> Self:
+        """
+        Create an InternalServerErrorResponse indicating token usage history is unavailable.
+
+        Returns:
+            Error response with a message that token usage history is not
+            configured and a corresponding cause.
+        """
+        return cls(
+            response="Token usage history not configured",
+            cause="Token usage history is not enabled or unavailable.",
+        )
+
     @classmethod
     def database_error(cls) -> Self:
         """
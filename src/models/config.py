@@ -177,6 +177,85 @@ class InMemoryCacheConfig(ConfigurationBase):
         description="Maximum number of entries stored in the in-memory cache",
     )
 
+    max_bytes: Optional[PositiveInt] = Field(
+        default=None,
+        title="Max bytes",
+        description=(
+            "Approximate maximum size in bytes of entries stored in the in-memory "
+            "cache. Least recently used conversations are evicted when exceeded. "
+            "If not specified, the cache size is limited by max_entries only."
+        ),
+    )
+
+    ttl_seconds: Optional[PositiveInt] = Field(
+        default=None,
+        title="Time to live",
+        description=(
+            "Number of seconds a conversation is kept in the in-memory cache after "
+            "it was last used. If not specified, conversations do not expire."
+        ),
+    )
+
+
+class PostgreSQLPoolConfiguration(ConfigurationBase):
+    """PostgreSQL connection pool configuration.
+
+    Connections to one PostgreSQL database are shared by the conversation
+    cache, quota limiters and token usage history. Each database operation
+    borrows a connection from the pool, so concurrent requests do not wait
+    for a single shared connection.
+    """
+
+    min_size: NonNegativeInt = Field(
+        1,
+        title="Minimum size",
+        description="Number of connections opened when the pool is created",
+    )
+
+    max_size: PositiveInt = Field(
+        10,
+        title="Maximum size",
+        description="Maximum number of connections opened by the pool",
+    )
+
+    max_lifetime: PositiveInt = Field(
+        3600,
+        title="Maximum lifetime",
+        description="Number of seconds after which a connection is closed and "
+        "replaced by a new one",
+    )
+
+    acquire_timeout: PositiveInt = Field(
+        30,
+        title="Acquire timeout",
+        description="Number of seconds to wait for a free connection when all "
+        "connections are in use",
+    )
+
+    health_check_interval: Optional[PositiveInt] = Field(
+        None,
+        title="Health check interval",
+        description="Number of seconds between background checks of idle "
+        "connections; broken connections are closed before they are borrowed. "
+        "When not set, broken connections are only detected when a statement "
+        "fails, and the failing operation is retried on a new connection",
+    )
+
+    @model_validator(mode="after")
+    def check_pool_configuration(self) -> Self:
+        """
+        Validate connection pool size limits.
+
+        Returns:
+            self: The validated configuration instance.
+
+        Raises:
+            ValueError: If `min_size` is greater than `max_size`.
+        """
+        if self.min_size > self.max_size:
+            raise ValueError("Pool min_size must not be greater than max_size")
+        return self
+
 
 class PostgreSQLDatabaseConfiguration(ConfigurationBase):
     """PostgreSQL database configuration.
@@ -247,6 +326,19 @@ class PostgreSQLDatabaseConfiguration(ConfigurationBase):
         description="Path to CA certificate",
     )
 
+    pool: PostgreSQLPoolConfiguration = Field(
+        default_factory=lambda: PostgreSQLPoolConfiguration(
+            min_size=1,
+            max_size=10,
+            max_lifetime=3600,
+            acquire_timeout=30,
+            health_check_interval=None,
+        ),
+        title="Connection pool",
+        description="Connection pool used by the conversation cache, quota "
+        "limiters and token usage history",
+    )
+
     @model_validator(mode="after")
     def check_postgres_configuration(self) -> Self:
         """
@@ -582,6 +674,30 @@ class ModelContextProtocolServer(ConfigurationBase):
         return self
 
 
+class McpRegistrationConfiguration(ConfigurationBase):
+    """Registration of MCP servers in Llama Stack at service startup.
+
+    MCP servers are registered as Llama Stack toolgroups concurrently, with
+    at most `max_concurrency` registrations in flight. When `deferred` is
+    enabled, the service starts accepting requests (and liveness probes)
+    before the registration finishes; the readiness probe reports the
+    service as not ready until all MCP servers are registered.
+    """
+
+    max_concurrency: PositiveInt = Field(
+        default=8,
+        title="Maximum concurrency",
+        description="Maximum number of MCP servers registered in parallel",
+    )
+
+    deferred: bool = Field(
+        default=False,
+        title="Deferred registration",
+        description="Register MCP servers in the background after the service "
+        "starts; the readiness probe fails until the registration finishes",
+    )
+
+
 class LlamaStackConfiguration(ConfigurationBase):
     """Llama stack configuration.
 
@@ -684,6 +800,103 @@ class LlamaStackConfiguration(ConfigurationBase):
         return self
 
 
+class HttpClientPoolConfiguration(ConfigurationBase):
+    """Pool of connections of one outbound HTTP client.
+
+    Connections are kept open between requests, so repeated requests to the
+    same destination do not pay for a new TCP connection and TLS handshake.
+    """
+
+    max_connections: PositiveInt = Field(
+        100,
+        title="Maximum connections",
+        description="Maximum number of connections opened by the pool",
+    )
+
+    max_connections_per_host: NonNegativeInt = Field(
+        0,
+        title="Maximum connections per host",
+        description="Maximum number of connections opened to one host; "
+        "0 means no limit other than the maximum number of connections",
+    )
+
+    keepalive_timeout: PositiveInt = Field(
+        30,
+        title="Keep-alive timeout",
+        description="Number of seconds an idle connection is kept open for reuse",
+    )
+
+    dns_cache_ttl: Optional[NonNegativeInt] = Field(
+        300,
+        title="DNS cache TTL",
+        description="Number of seconds resolved host addresses are cached for; "
+        "when not set, addresses are cached forever",
+    )
+
+    verify_ssl: bool = Field(
+        True,
+        title="Verify SSL",
+        description="Whether to verify SSL certificates of HTTPS destinations",
+    )
+
+    ca_cert_path: Optional[FilePath] = Field(
+        None,
+        title="CA certificate path",
+        description="Path to a file with CA certificates used to verify SSL "
+        "certificates instead of the system ones",
+    )
+
+
+class HttpClientsConfiguration(ConfigurationBase):
+    """Outbound HTTP clients configuration.
+
+    Outbound HTTP requests (JWK set fetches, MCP OAuth probes, Splunk HEC
+    events) use long-lived connection pools, one per destination, opened
+    and closed with the service.
+
+    Every pool exports the `ls_http_client_pool_connections` metric with the
+    number of connections in use (from the moment a request gets a connection
+    until its response headers arrive) and of requests queued for a free
+    connection, and the `ls_http_client_pool_connect_duration_seconds` histogram
+    with the time to open a new connection, including the TLS handshake.
+    """
+
+    default: HttpClientPoolConfiguration = Field(
+        default_factory=lambda: HttpClientPoolConfiguration(
+            max_connections=100,
+            max_connections_per_host=0,
+            keepalive_timeout=30,
+            dns_cache_ttl=300,
+            verify_ssl=True,
+            ca_cert_path=None,
+        ),
+        title="Default pool",
+        description="Configuration of pools not configured in 'pools'",
+    )
+
+    pools: dict[str, HttpClientPoolConfiguration] = Field(
+        default_factory=dict,
+        title="Pools",
+        description="Configuration of pools by destination name: "
+        f"'{constants.HTTP_CLIENT_JWK}', '{constants.HTTP_CLIENT_MCP_OAUTH_PROBE}' "
+        f"or '{constants.HTTP_CLIENT_SPLUNK}'",
+    )
+
+    def pool(self, name: str) -> HttpClientPoolConfiguration:
+        """Return configuration of the pool with the given destination name.
+
+        Parameters:
+        ----------
+            name: Destination name of the pool.
+
+        Returns:
+        -------
+            HttpClientPoolConfiguration: Pool configuration, the default one
+            when the pool is not configured.
+        """
+        return self.pools.get(name, self.default)  # pylint: disable=no-member
+
+
 class SplunkConfiguration(ConfigurationBase):
     """Splunk HEC (HTTP Event Collector) configuration.
 
@@ -739,6 +952,40 @@ class SplunkConfiguration(ConfigurationBase):
         description="Whether to verify SSL certificates for HEC endpoint.",
     )
 
+    queue_size: PositiveInt = Field(
+        10000,
+        title="Queue size",
+        description="Maximum number of events waiting to be sent. When the "
+        "queue is full, new events are dropped.",
+    )
+
+    batch_size: PositiveInt = Field(
+        100,
+        title="Batch size",
+        description="Maximum number of events sent in one HEC request.",
+    )
+
+    batch_max_bytes: PositiveInt = Field(
+        1000000,
+        title="Batch maximum bytes",
+        description="Uncompressed size of queued events in bytes after which "
+        "a batch is sent without waiting for more events.",
+    )
+
+    flush_interval_ms: NonNegativeInt = Field(
+        1000,
+        title="Flush interval",
+        description="Milliseconds the exporter waits for more events before "
+        "sending a batch that is not full.",
+    )
+
+    max_retries: NonNegativeInt = Field(
+        3,
+        title="Maximum retries",
+        description="Number of times a failed HEC request is retried before "
+        "its events are dropped.",
+    )
+
     @model_validator(mode="after")
     def check_splunk_configuration(self) -> Self:
         """Validate that required fields are set when Splunk is enabled.
@@ -1412,6 +1659,74 @@ class RlsapiV1Configuration(ConfigurationBase):
     )
 
 
+class PersistenceQueueConfiguration(ConfigurationBase):
+    """Write-behind persistence of streamed query results.
+
+    When enabled, conversation details, turns, conversation cache entries,
+    transcripts and token usage history of completed streaming queries are
+    handed over to an in-process worker once the final event is sent. The
+    worker stores records from many requests in batches, committing each
+    batch in a single database transaction.
+
+    Records waiting in the queue are lost if the process crashes, unless a
+    spool directory is configured; records spooled there are persisted
+    again when the service starts. The queue is therefore disabled by
+    default and has to be enabled explicitly.
+    """
+
+    enabled: bool = Field(
+        default=False,
+        title="Enabled",
+        description="Persist streamed query results in the background instead "
+        "of before the streaming response is closed. Disabled by default, "
+        "because records waiting in the queue are lost on a crash unless a "
+        "spool directory is configured.",
+    )
+
+    max_size: PositiveInt = Field(
+        default=1000,
+        title="Maximum queue size",
+        description="Maximum number of records waiting to be persisted. When "
+        "the queue is full, new records are persisted directly by the request.",
+    )
+
+    batch_size: PositiveInt = Field(
+        default=50,
+        title="Batch size",
+        description="Maximum number of records persisted in one database transaction.",
+    )
+
+    batch_wait_ms: NonNegativeInt = Field(
+        default=50,
+        title="Batch wait",
+        description="Milliseconds the worker waits for more records before "
+        "persisting a batch that is not full.",
+    )
+
+    spool_path: Optional[str] = Field(
+        default=None,
+        title="Spool directory",
+        description="Directory where queued records are written until they are "
+        "persisted, so they survive a crash. Spooling is disabled when not set.",
+    )
+
+    @model_validator(mode="after")
+    def check_spool_path(self) -> Self:
+        """Check that the spool directory is usable when configured.
+
+        Returns:
+            Self: The validated configuration instance.
+        """
+        if self.spool_path is not None:
+            checks.directory_check(
+                Path(self.spool_path),
+                desc="Check directory to spool persistence queue",
+                must_exists=False,
+                must_be_writable=True,
+            )
+        return self
+
+
 class InferenceConfiguration(ConfigurationBase):
     """Inference configuration."""
 
@@ -1449,6 +1764,31 @@ class InferenceConfiguration(ConfigurationBase):
         return self
 
 
+class ConversationReadCacheConfig(ConfigurationBase):
+    """Read-through cache in front of the conversation history database.
+
+    Conversation histories and conversation lists read from the SQLite or
+    PostgreSQL conversation cache are kept in process memory, so repeated
+    reads of hot conversations do not query the database. The read cache is
+    updated whenever conversations are changed through this service.
+    """
+
+    max_conversations: PositiveInt = Field(
+        default=1000,
+        title="Max conversations",
+        description="Maximum number of conversation histories kept in the read cache. "
+        "The same limit applies to the number of cached per-user conversation lists.",
+    )
+
+    ttl_seconds: Optional[PositiveInt] = Field(
+        default=None,
+        title="Time to live",
+        description="Number of seconds cached data is used before it is read from "
+        "the database again. Set it when conversations can be changed by other "
+        "service replicas. If not specified, cached data does not expire.",
+    )
+
+
 class ConversationHistoryConfiguration(ConfigurationBase):
     """Conversation history configuration."""
 
@@ -1476,6 +1816,13 @@ class ConversationHistoryConfiguration(ConfigurationBase):
         description="PostgreSQL database configuration",
     )
 
+    read_cache: Optional[ConversationReadCacheConfig] = Field(
+        None,
+        title="Read cache configuration",
+        description="In-process read-through cache in front of the SQLite or "
+        "PostgreSQL conversation history database",
+    )
+
     @model_validator(mode="after")
     def check_cache_configuration(self) -> Self:
         """
@@ -1489,13 +1836,15 @@ class ConversationHistoryConfiguration(ConfigurationBase):
                         or if other backend configs are present.
             ValueError: If `type` is "postgres" but `postgres` config is
                         missing, or if other backend configs are present.
+            ValueError: If `read_cache` is configured for a cache type other
+                        than "sqlite" or "postgres".
 
         Returns:
             The validated model instance.
         """
         # if any backend config is provided, type must be explicitly selected
         if self.type is None:
-            if any([self.memory, self.sqlite, self.postgres]):
+            if any([self.memory, self.sqlite, self.postgres, self.read_cache]):
                 raise ValueError(
                     "Conversation cache type must be set when backend configuration is provided"
                 )
@@ -1520,6 +1869,13 @@ class ConversationHistoryConfiguration(ConfigurationBase):
                 # no other DBs configuration allowed
                 if any([self.memory, self.sqlite]):
                     raise ValueError("Only PostgreSQL cache config must be provided")
+        if self.read_cache is not None and self.type not in (
+            constants.CACHE_TYPE_SQLITE,
+            constants.CACHE_TYPE_POSTGRES,
+        ):
+            raise ValueError(
+                "Read cache can be used with SQLite or PostgreSQL cache only"
+            )
         return self
 
 
@@ -1686,9 +2042,25 @@ class QuotaLimiterConfiguration(ConfigurationBase):
         description="Period specified in human readable form",
     )
 
+    scheduler_period: Optional[PositiveInt] = Field(
+        None,
+        title="Scheduler period",
+        description="How often, in seconds, the quota scheduler checks whether "
+        "the period of this limiter was reached. The quota scheduler period is "
+        "used when not set",
+    )
+
 
 class QuotaSchedulerConfiguration(ConfigurationBase):
-    """Quota scheduler configuration."""
+    """Quota scheduler configuration.
+
+    In the ``thread`` mode, the quota scheduler runs in a separate thread
+    started before the service workers. In the ``async`` mode, it runs as
+    asyncio tasks in the event loop of every service worker, started and
+    stopped with the application, with a separate timer for each quota
+    limiter. Quota is changed in batches of ``batch_size`` rows so that
+    revocation does not lock large parts of the quota table at once.
+    """
 
     period: PositiveInt = Field(
         1,
@@ -1712,6 +2084,87 @@ class QuotaSchedulerConfiguration(ConfigurationBase):
         "times with specified delay.",
     )
 
+    mode: Literal["thread", "async"] = Field(
+        "thread",
+        title="Scheduler mode",
+        description="Run the quota scheduler in a separate thread or as "
+        "asyncio tasks of the service",
+    )
+
+    batch_size: PositiveInt = Field(
+        1000,
+        title="Batch size",
+        description="Maximum number of quota rows changed by one statement",
+    )
+
+
+class QuotaLeaseConfiguration(ConfigurationBase):
+    """Leased quota configuration.
+
+    Instead of reading and updating the quota database on every request,
+    each service worker leases blocks of quota per subject and enforces and
+    decrements them in memory. Leases running low are refilled by a
+    background thread, and unused quota is returned when a lease is not used
+    for `ttl` seconds and when the service shuts down.
+
+    The quota a subject can overspend is bounded by the lease size times the
+    number of workers holding a lease for the subject.
+    Unused quota leased before the quota scheduler resets the quota is
+    dropped instead of being added to the quota of the new period.
+    """
+
+    size: PositiveInt = Field(
+        10000,
+        title="Lease size",
+        description="Number of tokens leased from the quota database at once",
+    )
+
+    ttl: PositiveInt = Field(
+        60,
+        title="Lease time to live",
+        description="Number of seconds after which a lease is renewed, so "
+        "changes made by the quota scheduler are picked up. Leases not used "
+        "during that time are returned to the quota database",
+    )
+
+    refill_threshold: float = Field(
+        0.2,
+        ge=0.0,
+        le=1.0,
+        title="Refill threshold",
+        description="Fraction of the lease size below which the lease is "
+        "refilled in the background",
+    )
+
+    refill_interval: PositiveInt = Field(
+        1,
+        title="Refill interval",
+        description="Number of seconds between background lease refills",
+    )
+
+
+class TokenUsageAggregationConfiguration(ConfigurationBase):
+    """Aggregated token usage history configuration.
+
+    Instead of updating token usage history after every request, each service
+    worker sums token usage per user, provider, model and hour in memory and
+    writes the sums to the database in one batch every ``flush_interval``
+    seconds, or earlier when ``max_pending`` sums are waiting. Sums not
+    written yet are flushed when the service shuts down.
+    """
+
+    flush_interval: PositiveInt = Field(
+        10,
+        title="Flush interval",
+        description="Number of seconds between writes of aggregated token usage",
+    )
+
+    max_pending: PositiveInt = Field(
+        10000,
+        title="Maximum pending entries",
+        description="Number of aggregated entries that triggers an early write",
+    )
+
 
 class QuotaHandlersConfiguration(ConfigurationBase):
     """Quota limiter configuration.
@@ -1742,7 +2195,11 @@ class QuotaHandlersConfiguration(ConfigurationBase):
 
     scheduler: QuotaSchedulerConfiguration = Field(
         default_factory=lambda: QuotaSchedulerConfiguration(
-            period=1, database_reconnection_count=10, database_reconnection_delay=1
+            period=1,
+            database_reconnection_count=10,
+            database_reconnection_delay=1,
+            mode="thread",
+            batch_size=1000,
         ),
         title="Quota scheduler",
         description="Quota scheduler configuration",
@@ -1754,6 +2211,20 @@ class QuotaHandlersConfiguration(ConfigurationBase):
         description="Enables storing information about token usage history",
     )
 
+    lease: Optional[QuotaLeaseConfiguration] = Field(
+        None,
+        title="Quota lease",
+        description="Lease blocks of quota per subject and enforce them in "
+        "memory instead of querying the quota database on every request",
+    )
+
+    token_history_aggregation: Optional[TokenUsageAggregationConfiguration] = Field(
+        None,
+        title="Token history aggregation",
+        description="Aggregate token usage history in memory and write it "
+        "periodically in batches instead of after every request",
+    )
+
 
 class RagConfiguration(ConfigurationBase):
     """RAG strategy configuration.
@@ -1876,6 +2347,12 @@ class Configuration(ConfigurationBase):
         "are not accessible to lightspeed-core agents.",
     )
 
+    mcp_registration: McpRegistrationConfiguration = Field(
+        default_factory=McpRegistrationConfiguration,
+        title="MCP servers registration",
+        description="Registration of MCP servers in Llama Stack at service startup.",
+    )
+
     authentication: AuthenticationConfiguration = Field(
         default_factory=lambda: AuthenticationConfiguration(
             skip_for_health_probes=False,
@@ -1915,7 +2392,7 @@ class Configuration(ConfigurationBase):
 
     conversation_cache: ConversationHistoryConfiguration = Field(
         default_factory=lambda: ConversationHistoryConfiguration(
-            type=None, memory=None, sqlite=None, postgres=None
+            type=None, memory=None, sqlite=None, postgres=None, read_cache=None
         ),
         title="Conversation history configuration",
         description="Conversation history configuration.",
@@ -1936,7 +2413,11 @@ class Configuration(ConfigurationBase):
 
     quota_handlers: QuotaHandlersConfiguration = Field(
         default_factory=lambda: QuotaHandlersConfiguration(
-            sqlite=None, postgres=None, enable_token_history=False
+            sqlite=None,
+            postgres=None,
+            enable_token_history=False,
+            token_history_aggregation=None,
+            lease=None,
         ),
         title="Quota handlers",
         description="Quota handlers configuration",
@@ -1950,6 +2431,19 @@ class Configuration(ConfigurationBase):
         "the RHEL Lightspeed Command Line Assistant (CLA).",
     )
 
+    persistence_queue: PersistenceQueueConfiguration = Field(
+        default_factory=PersistenceQueueConfiguration,
+        title="Persistence queue configuration",
+        description="Write-behind queue used to persist streamed query results "
+        "after the response has been sent.",
+    )
+
+    http_clients: HttpClientsConfiguration = Field(
+        default_factory=HttpClientsConfiguration,
+        title="HTTP clients configuration",
+        description="Connection pools used for outbound HTTP requests.",
+    )
+
     splunk: Optional[SplunkConfiguration] = Field(
         default=None,
         title="Splunk configuration",
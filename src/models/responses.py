@@ -35,7 +35,13 @@ from constants import MEDIA_TYPE_EVENT_STREAM
 from log import get_logger
 from models.api.responses.constants import SUCCESSFUL_RESPONSE_DESCRIPTION
 from models.config import Configuration
-from utils.types import RAGChunk, ReferencedDocument, ToolCallSummary, ToolResultSummary
+from utils.types import (
+    RAGChunk,
+    ReferencedDocument,
+    TokenUsageBucket,
+    ToolCallSummary,
+    ToolResultSummary,
+)
 
 logger = get_logger(__name__)
 
@@ -1484,6 +1490,47 @@ class ConfigurationResponse(AbstractSuccessfulResponse):
     }
 
 
+class TokenUsageResponse(AbstractSuccessfulResponse):
+    """Success response model for the token usage endpoint.
+
+    Attributes:
+        granularity: Size of the time buckets.
+        usage: Token usage per user, provider, model and time bucket.
+    """
+
+    granularity: Literal["hour", "day"] = Field(
+        ...,
+        description="Size of the time buckets",
+        examples=["day"],
+    )
+
+    usage: list[TokenUsageBucket] = Field(
+        default_factory=list,
+        description="Token usage per user, provider, model and time bucket",
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "granularity": "day",
+                    "usage": [
+                        {
+                            "user_id": "123e4567-e89b-12d3-a456-426614174000",
+                            "provider": "openai",
+                            "model": "gpt-4o-mini",
+                            "bucket": "2025-10-01T00:00:00Z",
+                            "input_tokens": 12000,
+                            "output_tokens": 3400,
+                            "requests": 42,
+                        }
+                    ],
+                }
+            ]
+        }
+    }
+
+
 class ResponsesResponse(AbstractSuccessfulResponse):
     """Model representing a response from the Responses API following LCORE specification.
 
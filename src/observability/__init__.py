@@ -3,7 +3,8 @@
 This module provides functionality for sending telemetry events to external
 systems like Splunk HEC for monitoring and analytics.
 
-The splunk module provides a format-agnostic send_splunk_event() function.
+The splunk module provides format-agnostic queue_splunk_event() and
+send_splunk_event() functions.
 Event formats are in the formats subpackage - see formats.rlsapi for the
 default implementation, or create your own format module.
 """
@@ -14,12 +15,20 @@ from observability.formats import (
     build_inference_event,
     build_responses_event,
 )
-from observability.splunk import send_splunk_event
+from observability.splunk import (
+    queue_splunk_event,
+    send_splunk_event,
+    start_splunk_exporter,
+    stop_splunk_exporter,
+)
 
 __all__ = [
     "InferenceEventData",
     "build_inference_event",
     "ResponsesEventData",
     "build_responses_event",
+    "queue_splunk_event",
     "send_splunk_event",
+    "start_splunk_exporter",
+    "stop_splunk_exporter",
 ]
@@ -1,13 +1,31 @@
-"""Async Splunk HEC client for sending telemetry events."""
+"""Async Splunk HEC client for sending telemetry events.
 
+Events are handed over to an in-process exporter with a bounded queue. A
+single flusher sends the queued events in batches: newline-separated HEC
+envelopes in one gzip-compressed request, sent once the batch is full or the
+flush interval elapsed. The HEC token is cached and read again only when the
+token file changes. Failed requests are retried with backoff; events that can
+not be queued or sent are dropped and counted.
+"""
+
+import asyncio
+import gzip
+import json
+import os
 import platform
+import random
 import time
 from typing import Any, Optional
 
 import aiohttp
 
+import constants
 from configuration import configuration
 from log import get_logger
+from metrics.recording import record_splunk_events_dropped, record_splunk_events_sent
+from models.config import SplunkConfiguration
+from utils.http_clients import get_http_session
+from utils.types import Singleton
 from version import __version__
 
 logger = get_logger(__name__)
@@ -67,24 +85,249 @@ async def send_splunk_event(event: dict[str, Any], sourcetype: str) -> None:
         "Content-Type": "application/json",
     }
 
-    timeout = aiohttp.ClientTimeout(total=splunk_config.timeout)
-    connector = aiohttp.TCPConnector(ssl=splunk_config.verify_ssl)
-
     try:
-        async with aiohttp.ClientSession(
-            timeout=timeout, connector=connector
-        ) as session:
-            async with session.post(
-                splunk_config.url, json=payload, headers=headers
+        async with get_http_session(constants.HTTP_CLIENT_SPLUNK).post(
+            splunk_config.url,
+            json=payload,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=splunk_config.timeout),
+            ssl=splunk_config.verify_ssl,
+        ) as response:
+            if response.status >= 400:
+                body = await response.text()
+                logger.warning(
+                    "Splunk HEC request failed with status %d: %s",
+                    response.status,
+                    body[:200],
+                )
+    except aiohttp.ClientError as e:
+        logger.warning("Splunk HEC request failed: %s", e)
+    except TimeoutError:
+        logger.warning("Splunk HEC request timed out after %ds", splunk_config.timeout)
+
+
+def _is_retryable(status: Optional[int]) -> bool:
+    """Check whether a failed HEC request may succeed when sent again."""
+    return status is None or status == 429 or status >= 500
+
+
+class SplunkExporter(metaclass=Singleton):
+    """Bounded queue of Splunk events sent in batches by a single flusher."""
+
+    def __init__(self) -> None:
+        """Initialize the exporter in the stopped state."""
+        self._config: Optional[SplunkConfiguration] = None
+        self._queue: Optional[asyncio.Queue[bytes]] = None
+        self._flusher: Optional[asyncio.Task[None]] = None
+        self._overflowing = False
+        self._host = _get_hostname()
+        self._token: Optional[str] = None
+        self._token_mtime: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        """Check whether events are accepted by the exporter."""
+        return self._flusher is not None and not self._flusher.done()
+
+    async def start(self, config: Optional[SplunkConfiguration]) -> None:
+        """Start the flusher when Splunk integration is enabled.
+
+        Args:
+            config: Splunk configuration, or None if not provided.
+        """
+        if self.running or config is None or not config.enabled:
+            return
+        self._config = config
+        self._queue = asyncio.Queue(maxsize=config.queue_size)
+        self._overflowing = False
+        self._token = None
+        self._token_mtime = None
+        self._flusher = asyncio.create_task(self._run())
+        logger.info("Splunk exporter started")
+
+    async def stop(self) -> None:
+        """Send queued events and stop the flusher."""
+        if self._flusher is None or self._queue is None:
+            return
+        if self.running:
+            try:
+                await asyncio.wait_for(
+                    self._queue.join(), constants.SPLUNK_EXPORTER_STOP_TIMEOUT_SECONDS
+                )
+            except TimeoutError:
+                logger.warning(
+                    "Splunk exporter stopped with %d events not sent",
+                    self._queue.qsize(),
+                )
+        self._flusher.cancel()
+        await asyncio.gather(self._flusher, return_exceptions=True)
+        self._flusher = None
+        self._queue = None
+        logger.info("Splunk exporter stopped")
+
+    def enqueue(self, event: dict[str, Any], sourcetype: str) -> bool:
+        """Queue an event to be sent with the next batch.
+
+        Args:
+            event: The event payload to send.
+            sourcetype: The Splunk sourcetype of the event.
+
+        Returns:
+            bool: False when the exporter is not running and the event has to
+            be sent directly, True otherwise (also when the event was dropped
+            because the queue is full).
+        """
+        if not self.running or self._queue is None or self._config is None:
+            return False
+        envelope = {
+            "time": int(time.time()),
+            "host": self._host,
+            "source": f"{self._config.source} (v{__version__})",
+            "sourcetype": sourcetype,
+            "index": self._config.index,
+            "event": event,
+        }
+        try:
+            self._queue.put_nowait(json.dumps(envelope).encode("utf-8"))
+        except asyncio.QueueFull:
+            record_splunk_events_dropped("overflow")
+            if not self._overflowing:
+                logger.warning("Splunk event queue is full, dropping events")
+            self._overflowing = True
+            return True
+        self._overflowing = False
+        return True
+
+    async def _run(self) -> None:
+        """Take batches of events from the queue and send them."""
+        assert self._queue is not None and self._config is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0])
+            deadline = loop.time() + self._config.flush_interval_ms / 1000
+            while (
+                len(batch) < self._config.batch_size
+                and size < self._config.batch_max_bytes
+            ):
+                if self._queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(self._queue.get(), remaining)
+                        )
+                    except TimeoutError:
+                        break
+                else:
+                    batch.append(self._queue.get_nowait())
+                size += len(batch[-1])
+            try:
+                await self._send_batch(batch)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Unable to send Splunk events")
+                record_splunk_events_dropped("send_failed", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _send_batch(self, batch: list[bytes]) -> None:
+        """Send events in one compressed HEC request, retrying on failures."""
+        assert self._config is not None
+        body = gzip.compress(b"\n".join(batch))
+        delay = constants.SPLUNK_RETRY_INITIAL_DELAY_SECONDS
+        for attempt in range(self._config.max_retries + 1):
+            token = self._read_token()
+            if token is None:
+                break
+            status = await self._post(body, token)
+            if status is not None and status < 400:
+                record_splunk_events_sent(len(batch))
+                return
+            if not _is_retryable(status) or attempt == self._config.max_retries:
+                break
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, constants.SPLUNK_RETRY_MAX_DELAY_SECONDS)
+        logger.warning("Dropping %d Splunk events that could not be sent", len(batch))
+        record_splunk_events_dropped("send_failed", len(batch))
+
+    async def _post(self, body: bytes, token: str) -> Optional[int]:
+        """Post a compressed batch, returning the status or None on errors."""
+        assert self._config is not None and self._config.url is not None
+        headers = {
+            "Authorization": f"Splunk {token}",
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+        }
+        try:
+            async with get_http_session(constants.HTTP_CLIENT_SPLUNK).post(
+                self._config.url,
+                data=body,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=self._config.timeout),
+                ssl=self._config.verify_ssl,
             ) as response:
                 if response.status >= 400:
-                    body = await response.text()
+                    text = await response.text()
                     logger.warning(
                         "Splunk HEC request failed with status %d: %s",
                         response.status,
-                        body[:200],
+                        text[:200],
                     )
-    except aiohttp.ClientError as e:
-        logger.warning("Splunk HEC request failed: %s", e)
-    except TimeoutError:
-        logger.warning("Splunk HEC request timed out after %ds", splunk_config.timeout)
+                return response.status
+        except aiohttp.ClientError as e:
+            logger.warning("Splunk HEC request failed: %s", e)
+        except TimeoutError:
+            logger.warning(
+                "Splunk HEC request timed out after %ds", self._config.timeout
+            )
+        return None
+
+    def _read_token(self) -> Optional[str]:
+        """Return the cached HEC token, reading it again when the file changed."""
+        assert self._config is not None
+        token_path = str(self._config.token_path)
+        try:
+            mtime = os.stat(token_path).st_mtime_ns
+        except OSError as e:
+            # keep the last token while a rotated file is being replaced
+            if self._token is None:
+                logger.warning(
+                    "Failed to read Splunk HEC token from %s: %s", token_path, e
+                )
+            return self._token
+        if self._token is None or mtime != self._token_mtime:
+            token = _read_token_from_file(token_path)
+            if token:
+                self._token = token
+                self._token_mtime = mtime
+        return self._token
+
+
+def queue_splunk_event(event: dict[str, Any], sourcetype: str) -> bool:
+    """Queue an event to be sent by the Splunk exporter.
+
+    Args:
+        event: The event payload to send.
+        sourcetype: The Splunk sourcetype of the event.
+
+    Returns:
+        bool: False when the exporter is not running; the event then has to be
+        sent with send_splunk_event().
+    """
+    return SplunkExporter().enqueue(event, sourcetype)
+
+
+async def start_splunk_exporter(config: Optional[SplunkConfiguration]) -> None:
+    """Start the Splunk exporter; called on startup.
+
+    Args:
+        config: Splunk configuration, or None if not provided.
+    """
+    await SplunkExporter().start(config)
+
+
+async def stop_splunk_exporter() -> None:
+    """Send queued Splunk events and stop the exporter; called on shutdown."""
+    await SplunkExporter().stop()
@@ -6,13 +6,17 @@ import psycopg2
 
 from log import get_logger
 from models.config import PostgreSQLDatabaseConfiguration
+from utils.postgres_pool import pooled_connection
 
 logger = get_logger(__name__)
 
 
 def connect_pg(config: PostgreSQLDatabaseConfiguration) -> Any:
     """
-    Create and return a psycopg2 connection to the configured PostgreSQL database.
+    Create and return a pooled connection to the configured PostgreSQL database.
+
+    The returned object borrows a connection from the pool shared by all
+    components connecting to the same database for each cursor.
 
     Parameters:
     ----------
@@ -22,7 +26,7 @@ def connect_pg(config: PostgreSQLDatabaseConfiguration) -> Any:
 
     Returns:
     -------
-        connection: A psycopg2 database connection
+        connection: A connection-like object backed by the shared pool
 
     Raises:
     ------
@@ -34,7 +38,8 @@ def connect_pg(config: PostgreSQLDatabaseConfiguration) -> Any:
         namespace = config.namespace
 
     try:
-        connection = psycopg2.connect(
+        return pooled_connection(
+            config,
             host=config.host,
             port=config.port,
             user=config.user,
@@ -45,9 +50,6 @@ def connect_pg(config: PostgreSQLDatabaseConfiguration) -> Any:
             gssencmode=config.gss_encmode,
             options=f"-c search_path={namespace}",
         )
-        if connection is not None:
-            connection.autocommit = True
-        return connection
     except psycopg2.Error as e:
         logger.exception("Error connecting to PostgreSQL database:\n%s", e)
         raise
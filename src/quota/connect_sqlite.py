@@ -31,7 +31,10 @@ def connect_sqlite(config: SQLiteDatabaseConfiguration) -> Any:
     # even if SQLite is not alive
     connection = None
     try:
-        connection = sqlite3.connect(database=config.db_path)
+        # the connection is shared with background threads (quota lease
+        # refills, aggregated token usage writes); its users serialize access
+        # to it with their connection lock, see `utils.connection_decorator`
+        connection = sqlite3.connect(database=config.db_path, check_same_thread=False)
         if connection is not None:
             connection.autocommit = True
         return connection
@@ -0,0 +1,342 @@
+"""Quota engine checking and consuming quota of all limiters at once.
+
+Quota limiters check and update their quota one by one, each with its own
+statements. The quota engine does the same for all configured limiters
+together: quota of all limiters is checked with one query, and tokens are
+consumed from all limiters and recorded in token usage history and its
+rollups in one transaction (a single statement with PostgreSQL). The consumption returns the
+updated quota, so it does not have to be read again for the response.
+"""
+
+import sqlite3
+from datetime import UTC, datetime
+from threading import RLock
+from typing import Any, Optional
+
+from log import get_logger
+from models.config import (
+    PostgreSQLDatabaseConfiguration,
+    QuotaHandlersConfiguration,
+    SQLiteDatabaseConfiguration,
+)
+from quota.connect_pg import connect_pg
+from quota.connect_sqlite import connect_sqlite
+from quota.quota_exceed_error import QuotaExceedError
+from quota.quota_limiter import QuotaLimiter
+from quota.revokable_quota_limiter import RevokableQuotaLimiter
+from quota.sql import (
+    CONSUME_QUOTA_SQLITE,
+    CONSUME_QUOTAS_HISTORY_PG,
+    CONSUME_QUOTAS_PG,
+    CONSUME_QUOTAS_ROW_PG,
+    CONSUME_TOKENS_FOR_USER_PG,
+    CONSUME_TOKENS_FOR_USER_SQLITE,
+    INIT_QUOTA_IF_MISSING_PG,
+    INIT_QUOTA_IF_MISSING_SQLITE,
+    ROLLUP_TOKEN_USAGE_PG,
+    ROLLUP_TOKEN_USAGE_SQLITE,
+    SELECT_QUOTAS,
+    SUBJECT_CONDITION_PG,
+    SUBJECT_CONDITION_SQLITE,
+)
+from quota.token_usage_history import token_usage_record
+from utils.connection_decorator import connection
+
+logger = get_logger(__name__)
+
+
+class QuotaEngine:
+    """Check and consume quota of all quota limiters at once."""
+
+    def __init__(
+        self,
+        configuration: QuotaHandlersConfiguration,
+        limiters: list[RevokableQuotaLimiter],
+    ) -> None:
+        """Initialize the engine for the given limiters and connect to the database.
+
+        Parameters:
+        ----------
+            configuration (QuotaHandlersConfiguration): Configuration with
+            the quota database settings.
+            limiters (list[RevokableQuotaLimiter]): Quota limiters, in the
+            order in which they are checked.
+        """
+        self.sqlite_connection_config: Optional[SQLiteDatabaseConfiguration] = (
+            configuration.sqlite
+        )
+        self.postgres_connection_config: Optional[PostgreSQLDatabaseConfiguration] = (
+            configuration.postgres
+        )
+        self.limiters = limiters
+        # limiters of the same subject type share one row in the database
+        self._subject_types = list(
+            dict.fromkeys(limiter.subject_type for limiter in limiters)
+        )
+        condition = (
+            SUBJECT_CONDITION_PG
+            if self.postgres_connection_config is not None
+            else SUBJECT_CONDITION_SQLITE
+        )
+        self._select_statement = SELECT_QUOTAS.format(
+            subjects=" OR ".join([condition] * len(self._subject_types))
+        )
+        self.connection: Any = None
+        # requests check and consume quota from worker threads
+        self.connection_lock = RLock()
+        self.connect()
+
+    @staticmethod
+    def create(
+        configuration: QuotaHandlersConfiguration, limiters: list[QuotaLimiter]
+    ) -> Optional["QuotaEngine"]:
+        """Create the engine when it can handle all configured limiters.
+
+        Parameters:
+        ----------
+            configuration (QuotaHandlersConfiguration): Quota configuration.
+            limiters (list[QuotaLimiter]): Configured quota limiters.
+
+        Returns:
+        -------
+            Optional[QuotaEngine]: The engine, or `None` when no limiters are
+            configured, quota is leased, or a limiter stores its quota in
+            a different way.
+        """
+        if not limiters or configuration.lease is not None:
+            return None
+        revokable = [
+            limiter
+            for limiter in limiters
+            if isinstance(limiter, RevokableQuotaLimiter)
+        ]
+        if len(revokable) != len(limiters):
+            return None
+        return QuotaEngine(configuration, revokable)
+
+    # pylint: disable=W0201
+    def connect(self) -> None:
+        """Initialize connection to the quota database."""
+        logger.info("Initializing connection to quota engine database")
+        if self.postgres_connection_config is not None:
+            self.connection = connect_pg(self.postgres_connection_config)
+        if self.sqlite_connection_config is not None:
+            self.connection = connect_sqlite(self.sqlite_connection_config)
+
+    def connected(self) -> bool:
+        """Check if connection to the quota database was established.
+
+        Returns:
+            bool: `True` if the engine holds a connection; broken connections
+            are detected when a statement fails.
+        """
+        return self.connection is not None
+
+    def _subject_ids(self, subject_id: str) -> dict[str, str]:
+        """Map subject types to the subject IDs stored in the database."""
+        return {
+            subject_type: "" if subject_type == "c" else subject_id
+            for subject_type in self._subject_types
+        }
+
+    def _quotas_by_limiter(
+        self, subject_id: str, rows: list[tuple[str, str, int]]
+    ) -> dict[str, int]:
+        """Map quota read from the database to limiter names.
+
+        Rows missing in the database are initialized with the initial quota
+        of the limiter.
+        """
+        available = {subject_type: value for _, subject_type, value in rows}
+        for subject_type, row_id in self._subject_ids(subject_id).items():
+            if subject_type not in available:
+                limiter = next(
+                    limiter
+                    for limiter in self.limiters
+                    if limiter.subject_type == subject_type
+                )
+                self._init_quota(row_id, limiter)
+                available[subject_type] = limiter.initial_quota
+        return {
+            type(limiter).__name__: available[limiter.subject_type]
+            for limiter in self.limiters
+        }
+
+    def _init_quota(self, row_id: str, limiter: RevokableQuotaLimiter) -> None:
+        """Insert the quota row of a subject when it does not exist yet."""
+        statement = (
+            INIT_QUOTA_IF_MISSING_PG
+            if self.postgres_connection_config is not None
+            else INIT_QUOTA_IF_MISSING_SQLITE
+        )
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                statement,
+                (
+                    row_id,
+                    limiter.subject_type,
+                    limiter.initial_quota,
+                    limiter.initial_quota,
+                    datetime.now(tz=UTC),
+                ),
+            )
+        finally:
+            cursor.close()
+
+    @connection
+    def available_quotas(self, subject_id: str) -> dict[str, int]:
+        """Read quota available to the subject in all limiters with one query.
+
+        Parameters:
+        ----------
+            subject_id (str): Identifier of the subject (user).
+
+        Returns:
+        -------
+            dict[str, int]: Available quota keyed by quota limiter class name.
+        """
+        params: list[str] = []
+        for subject_type, row_id in self._subject_ids(subject_id).items():
+            params += [row_id, subject_type]
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(self._select_statement, params)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        return self._quotas_by_limiter(subject_id, rows)
+
+    def ensure_available_quota(self, subject_id: str) -> None:
+        """Ensure that there's available quota left in all limiters.
+
+        Parameters:
+        ----------
+            subject_id (str): Identifier of the subject (user).
+
+        Raises:
+        ------
+            QuotaExceedError: If the quota of any limiter is exhausted.
+        """
+        quotas = self.available_quotas(subject_id)
+        for limiter in self.limiters:
+            available = quotas[type(limiter).__name__]
+            logger.info("Available quota for subject %s is %d", subject_id, available)
+            if available <= 0:
+                row_id = "" if limiter.subject_type == "c" else subject_id
+                e = QuotaExceedError(row_id, limiter.subject_type, available)
+                logger.exception("Quota exceed: %s", e)
+                raise e
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    @connection
+    def consume_tokens(
+        self,
+        subject_id: str,
+        input_tokens: int,
+        output_tokens: int,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> dict[str, int]:
+        """Consume tokens from all limiters and record token usage history.
+
+        Parameters:
+        ----------
+            subject_id (str): Identifier of the subject (user).
+            input_tokens (int): Number of input tokens to consume.
+            output_tokens (int): Number of output tokens to consume.
+            provider (Optional[str]): Provider recorded in token usage history;
+            history is recorded only when both provider and model are set.
+            model (Optional[str]): Model recorded in token usage history.
+
+        Returns:
+        -------
+            dict[str, int]: Quota available after the consumption, keyed by
+            quota limiter class name.
+        """
+        logger.info(
+            "Consuming %d input and %d output tokens for subject %s",
+            input_tokens,
+            output_tokens,
+            subject_id,
+        )
+        tokens = input_tokens + output_tokens
+        # every limiter consumes the tokens, even if it shares its row
+        deltas = dict.fromkeys(self._subject_types, 0)
+        for limiter in self.limiters:
+            deltas[limiter.subject_type] += tokens
+        history: Optional[dict[str, Any]] = None
+        updated_at = datetime.now(tz=UTC)
+        if provider is not None and model is not None:
+            history = token_usage_record(
+                subject_id, provider, model, input_tokens, output_tokens, updated_at
+            )
+        subject_ids = self._subject_ids(subject_id)
+        if self.postgres_connection_config is not None:
+            rows = self._consume_pg(subject_ids, deltas, history, updated_at)
+        else:
+            rows = self._consume_sqlite(subject_ids, deltas, history, updated_at)
+        return self._quotas_by_limiter(subject_id, rows)
+
+    def _consume_pg(
+        self,
+        subject_ids: dict[str, str],
+        deltas: dict[str, int],
+        history: Optional[dict[str, Any]],
+        updated_at: datetime,
+    ) -> list[tuple[str, str, int]]:
+        """Consume tokens and record history with one PostgreSQL statement."""
+        params: dict[str, Any] = {"updated_at": updated_at}
+        rows = []
+        for index, subject_type in enumerate(self._subject_types):
+            rows.append(CONSUME_QUOTAS_ROW_PG.format(index=index))
+            params[f"id_{index}"] = subject_ids[subject_type]
+            params[f"subject_{index}"] = subject_type
+            params[f"tokens_{index}"] = deltas[subject_type]
+        history_statement = ""
+        if history is not None:
+            history_statement = CONSUME_QUOTAS_HISTORY_PG.format(
+                statement=CONSUME_TOKENS_FOR_USER_PG, rollup=ROLLUP_TOKEN_USAGE_PG
+            )
+            params.update(history)
+        statement = CONSUME_QUOTAS_PG.format(
+            rows=", ".join(rows), history=history_statement
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(statement, params)
+            return cursor.fetchall()
+
+    def _consume_sqlite(
+        self,
+        subject_ids: dict[str, str],
+        deltas: dict[str, int],
+        history: Optional[dict[str, Any]],
+        updated_at: datetime,
+    ) -> list[tuple[str, str, int]]:
+        """Consume tokens and record history in one SQLite transaction."""
+        rows = []
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("BEGIN")
+            for subject_type in self._subject_types:
+                cursor.execute(
+                    CONSUME_QUOTA_SQLITE,
+                    (
+                        deltas[subject_type],
+                        updated_at,
+                        subject_ids[subject_type],
+                        subject_type,
+                    ),
+                )
+                rows += cursor.fetchall()
+            if history is not None:
+                cursor.execute(CONSUME_TOKENS_FOR_USER_SQLITE, history)
+                cursor.execute(ROLLUP_TOKEN_USAGE_SQLITE, history)
+            cursor.execute("COMMIT")
+        except sqlite3.Error:
+            if self.connection.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+        return rows
@@ -0,0 +1,267 @@
+"""Quota leased from the quota database and enforced in memory.
+
+A quota limiter with leases enabled does not read and update the quota
+database on every request. Instead, it leases a block of quota per subject
+and checks and decrements it in memory, so the common request path does no
+quota I/O at all. A background thread tops up leases running low and renews
+expired ones; unused quota is returned to the database when a lease is not
+used anymore and when the service shuts down.
+
+Every change of the quota database is an exchange: the remaining quota of a
+lease (negative when more tokens were consumed than leased) is returned and
+a new block is leased in a single update. Each lease remembers the quota
+period it was leased in, so unused quota leased before the quota scheduler
+reset the quota is not added on top of the new period's quota.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any, Optional
+
+from log import get_logger
+from models.config import QuotaLeaseConfiguration
+
+logger = get_logger(__name__)
+
+# exchange(subject_id, returned, requested, period)
+#     -> (granted, available in database, period)
+QuotaExchange = Callable[[str, int, int, Any], tuple[int, int, Any]]
+
+
+@dataclass
+class QuotaLease:
+    """Quota leased for one subject."""
+
+    # leased quota not consumed yet, negative when overspent
+    remaining: int = 0
+    # quota left in the database after the last exchange
+    available: int = 0
+    leased_at: float = 0.0
+    used_at: float = 0.0
+    # quota period of the last exchange, None before the first one
+    period: Any = None
+    # serializes exchanges of the lease
+    lock: Lock = field(default_factory=Lock, repr=False)
+
+
+class QuotaLeases:
+    """Leases of one quota limiter, keyed by subject ID."""
+
+    def __init__(
+        self, config: QuotaLeaseConfiguration, exchange: QuotaExchange, name: str
+    ) -> None:
+        """Create empty leases and start the background refill thread.
+
+        Parameters:
+        ----------
+            config (QuotaLeaseConfiguration): Lease size and timing.
+            exchange (QuotaExchange): Function returning quota to the database
+            and leasing a new block, see `RevokableQuotaLimiter.exchange_quota`.
+            name (str): Name used for logging and the refill thread.
+        """
+        self.config = config
+        self.name = name
+        self._exchange = exchange
+        self._leases: dict[str, QuotaLease] = {}
+        self._lock = Lock()
+        self._stopped = Event()
+        self._refiller = Thread(
+            target=self._run_refills, name=f"quota-lease-{name}", daemon=True
+        )
+        self._refiller.start()
+        _active_leases.add(self)
+
+    def _expired(self, lease: QuotaLease, now: float) -> bool:
+        """Check if the lease has to be renewed."""
+        return now - lease.leased_at > self.config.ttl
+
+    def _needs_renewal(self, lease: QuotaLease, now: float) -> bool:
+        """Check if the lease has expired or its quota is exhausted."""
+        return lease.remaining <= 0 or self._expired(lease, now)
+
+    def _renew(
+        self, subject_id: str, lease: QuotaLease, if_needed: bool = False
+    ) -> bool:
+        """Return the remaining quota of the lease and lease a new block.
+
+        Quota consumed while the database is being updated is kept, as only
+        the returned amount is replaced by the granted one.
+
+        Parameters:
+        ----------
+            subject_id (str): Identifier of the subject.
+            lease (QuotaLease): The subject's lease.
+            if_needed (bool): Renew the lease only if it is still expired or
+            exhausted once no other thread is renewing it.
+
+        Returns:
+        -------
+            bool: `False` if the lease was released in the meantime.
+        """
+        with lease.lock:
+            with self._lock:
+                if self._leases.get(subject_id) is not lease:
+                    return False
+                if if_needed and not self._needs_renewal(lease, monotonic()):
+                    return True
+                returned = lease.remaining
+            granted, available, period = self._exchange(
+                subject_id, returned, self.config.size, lease.period
+            )
+            with self._lock:
+                lease.remaining += granted - returned
+                lease.available = available
+                lease.leased_at = monotonic()
+                lease.period = period
+        logger.debug(
+            "Leased %d tokens of %s quota for subject %s, %d returned",
+            granted,
+            self.name,
+            subject_id,
+            returned,
+        )
+        return True
+
+    def ensure(self, subject_id: str) -> int:
+        """Make sure the subject has a valid lease.
+
+        A new lease is taken synchronously only for subjects without a lease,
+        with an expired one or with an exhausted one (the database may still
+        have quota); all other calls do not access the database.
+
+        Parameters:
+        ----------
+            subject_id (str): Identifier of the subject.
+
+        Returns:
+        -------
+            int: Quota remaining in the lease.
+        """
+        while True:
+            with self._lock:
+                lease = self._leases.get(subject_id)
+                if lease is None:
+                    lease = self._leases[subject_id] = QuotaLease(used_at=monotonic())
+                elif not self._needs_renewal(lease, monotonic()):
+                    return lease.remaining
+            if self._renew(subject_id, lease, if_needed=True):
+                return lease.remaining
+
+    def consume(self, subject_id: str, tokens: int) -> bool:
+        """Consume tokens from the subject's lease.
+
+        Parameters:
+        ----------
+            subject_id (str): Identifier of the subject.
+            tokens (int): Number of tokens to consume.
+
+        Returns:
+        -------
+            bool: `False` if the subject has no lease, so the tokens have to
+            be consumed in the database directly.
+        """
+        with self._lock:
+            lease = self._leases.get(subject_id)
+            if lease is None:
+                return False
+            lease.remaining -= tokens
+            lease.used_at = monotonic()
+        return True
+
+    def available(self, subject_id: str) -> Optional[int]:
+        """Estimate quota available for the subject without database access.
+
+        Parameters:
+        ----------
+            subject_id (str): Identifier of the subject.
+
+        Returns:
+        -------
+            Optional[int]: Quota left in the lease and in the database after
+            the last exchange, or `None` if the subject has no lease.
+        """
+        with self._lock:
+            lease = self._leases.get(subject_id)
+            if lease is None:
+                return None
+            return lease.available + lease.remaining
+
+    def drop(self, subject_id: str) -> None:
+        """Forget the subject's lease without returning it, e.g. after revoke."""
+        with self._lock:
+            self._leases.pop(subject_id, None)
+
+    def refill(self) -> None:
+        """Release unused leases and renew expired or low ones."""
+        now = monotonic()
+        threshold = self.config.size * self.config.refill_threshold
+        with self._lock:
+            leases = list(self._leases.items())
+        for subject_id, lease in leases:
+            try:
+                if now - lease.used_at > self.config.ttl:
+                    self._release(subject_id, lease)
+                elif self._expired(lease, now) or lease.remaining < threshold:
+                    self._renew(subject_id, lease)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning(
+                    "Unable to refill %s quota lease for subject %s: %s",
+                    self.name,
+                    subject_id,
+                    e,
+                )
+
+    def _release(self, subject_id: str, lease: QuotaLease) -> None:
+        """Return the remaining quota of the lease and forget the lease.
+
+        When the quota cannot be returned, it is kept in the subject's lease,
+        so it is returned by a later refill instead of being lost.
+        """
+        with self._lock:
+            if self._leases.get(subject_id) is lease:
+                del self._leases[subject_id]
+        with lease.lock:
+            with self._lock:
+                returned, lease.remaining = lease.remaining, 0
+            if returned == 0:
+                return
+            try:
+                self._exchange(subject_id, returned, 0, lease.period)
+            except Exception:
+                with self._lock:
+                    kept = self._leases.setdefault(subject_id, lease)
+                    kept.remaining += returned
+                raise
+
+    def _run_refills(self) -> None:
+        """Refill leases periodically until the leases are closed."""
+        while not self._stopped.wait(self.config.refill_interval):
+            self.refill()
+
+    def close(self) -> None:
+        """Stop the refill thread and return all leases to the database."""
+        self._stopped.set()
+        _active_leases.discard(self)
+        with self._lock:
+            leases = list(self._leases.items())
+        for subject_id, lease in leases:
+            try:
+                self._release(subject_id, lease)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning(
+                    "Unable to return %s quota lease for subject %s: %s",
+                    self.name,
+                    subject_id,
+                    e,
+                )
+
+
+_active_leases: set[QuotaLeases] = set()
+
+
+def release_quota_leases() -> None:
+    """Return all leased quota; called from the application lifespan shutdown."""
+    for leases in list(_active_leases):
+        leases.close()
@@ -182,7 +182,7 @@ class QuotaLimiter(ABC):
         try:
             cursor = self.connection.cursor()
             cursor.execute("SELECT 1")
-            logger.info("Connection to storage is ok")
+            logger.debug("Connection to storage is ok")
             return True
         except (psycopg2.OperationalError, sqlite3.Error) as e:
             logger.error("Disconnected from storage: %s", e)
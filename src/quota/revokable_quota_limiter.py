@@ -1,16 +1,24 @@
 """Simple quota limiter where quota can be revoked."""
 
 from datetime import UTC, datetime
+from threading import RLock
+from typing import Any, Optional
 
+import constants
 from log import get_logger
 from models.config import QuotaHandlersConfiguration
 from quota.quota_exceed_error import QuotaExceedError
+from quota.quota_lease import QuotaLeases
 from quota.quota_limiter import QuotaLimiter
 from quota.sql import (
     CREATE_QUOTA_TABLE_PG,
     CREATE_QUOTA_TABLE_SQLITE,
+    EXCHANGE_QUOTA_PG,
+    EXCHANGE_QUOTA_SQLITE,
     INIT_QUOTA_PG,
     INIT_QUOTA_SQLITE,
+    SELECT_QUOTA_PERIOD_PG,
+    SELECT_QUOTA_PERIOD_SQLITE,
     SELECT_QUOTA_PG,
     SELECT_QUOTA_SQLITE,
     SET_AVAILABLE_QUOTA_PG,
@@ -53,6 +61,14 @@ class RevokableQuotaLimiter(QuotaLimiter):
         self.increase_by = increase_by
         self.sqlite_connection_config = configuration.sqlite
         self.postgres_connection_config = configuration.postgres
+        # the connection is also used by the lease refill thread
+        self.connection_lock = RLock()
+        # quota leased from the database, when enabled
+        self.leases: Optional[QuotaLeases] = None
+        if configuration.lease is not None:
+            self.leases = QuotaLeases(
+                configuration.lease, self.exchange_quota, type(self).__name__
+            )
 
     @connection
     def available_quota(self, subject_id: str = "") -> int:
@@ -72,6 +88,10 @@ class RevokableQuotaLimiter(QuotaLimiter):
         """
         if self.subject_type == "c":
             subject_id = ""
+        if self.leases is not None:
+            leased = self.leases.available(subject_id)
+            if leased is not None:
+                return leased
         if self.sqlite_connection_config is not None:
             return self._read_available_quota(SELECT_QUOTA_SQLITE, subject_id)
         if self.postgres_connection_config is not None:
@@ -100,15 +120,17 @@ class RevokableQuotaLimiter(QuotaLimiter):
         # it is not possible to use context manager there, because SQLite does
         # not support it
         cursor = self.connection.cursor()
-        cursor.execute(
-            query_statement,
-            (subject_id, self.subject_type),
-        )
-        value = cursor.fetchone()
+        try:
+            cursor.execute(
+                query_statement,
+                (subject_id, self.subject_type),
+            )
+            value = cursor.fetchone()
+        finally:
+            cursor.close()
         if value is None:
             self._init_quota(subject_id)
             return self.initial_quota
-        cursor.close()
         return value[0]
 
     @connection
@@ -125,6 +147,9 @@ class RevokableQuotaLimiter(QuotaLimiter):
         """
         if self.subject_type == "c":
             subject_id = ""
+        # quota is set to an absolute value, leased quota is not returned
+        if self.leases is not None:
+            self.leases.drop(subject_id)
 
         if self.postgres_connection_config is not None:
             self._revoke_quota(SET_AVAILABLE_QUOTA_PG, subject_id)
@@ -150,12 +175,14 @@ class RevokableQuotaLimiter(QuotaLimiter):
         revoked_at = datetime.now(tz=UTC)
 
         cursor = self.connection.cursor()
-        cursor.execute(
-            set_statement,
-            (self.initial_quota, revoked_at, subject_id, self.subject_type),
-        )
-        self.connection.commit()
-        cursor.close()
+        try:
+            cursor.execute(
+                set_statement,
+                (self.initial_quota, revoked_at, subject_id, self.subject_type),
+            )
+            self.connection.commit()
+        finally:
+            cursor.close()
 
     @connection
     def increase_quota(self, subject_id: str = "") -> None:
@@ -200,11 +227,14 @@ class RevokableQuotaLimiter(QuotaLimiter):
         updated_at = datetime.now(tz=UTC)
 
         cursor = self.connection.cursor()
-        cursor.execute(
-            set_statement,
-            (self.increase_by, updated_at, subject_id, self.subject_type),
-        )
-        self.connection.commit()
+        try:
+            cursor.execute(
+                set_statement,
+                (self.increase_by, updated_at, subject_id, self.subject_type),
+            )
+            self.connection.commit()
+        finally:
+            cursor.close()
 
     def ensure_available_quota(self, subject_id: str = "") -> None:
         """Ensure that there's available quota left.
@@ -224,7 +254,10 @@ class RevokableQuotaLimiter(QuotaLimiter):
         """
         if self.subject_type == "c":
             subject_id = ""
-        available = self.available_quota(subject_id)
+        if self.leases is not None:
+            available = self.leases.ensure(subject_id)
+        else:
+            available = self.available_quota(subject_id)
         logger.info("Available quota for subject %s is %d", subject_id, available)
         # check if ID still have available tokens to be consumed
         if available <= 0:
@@ -261,6 +294,10 @@ class RevokableQuotaLimiter(QuotaLimiter):
             output_tokens,
             subject_id,
         )
+        if self.leases is not None and self.leases.consume(
+            subject_id, input_tokens + output_tokens
+        ):
+            return
 
         if self.sqlite_connection_config is not None:
             self._consume_tokens(
@@ -305,12 +342,153 @@ class RevokableQuotaLimiter(QuotaLimiter):
         to_be_consumed = input_tokens + output_tokens
 
         cursor = self.connection.cursor()
-        cursor.execute(
-            update_statement,
-            (-to_be_consumed, updated_at, subject_id, self.subject_type),
+        try:
+            cursor.execute(
+                update_statement,
+                (-to_be_consumed, updated_at, subject_id, self.subject_type),
+            )
+            self.connection.commit()
+        finally:
+            cursor.close()
+
+    @connection
+    def exchange_quota(
+        self, subject_id: str, returned: int, requested: int, period: Any = None
+    ) -> tuple[int, int, Any]:
+        """Return leased quota and lease a new block of quota.
+
+        The available quota is read and then updated only if it was not
+        changed concurrently (compare and swap); the exchange is retried
+        otherwise. When all attempts fail, the returned quota is added to the
+        available quota and no new quota is leased.
+
+        Unused quota leased in a previous quota period is dropped when the
+        quota is reset periodically, as the reset already restored it.
+
+        Parameters:
+        ----------
+            subject_id (str): Identifier of the subject.
+            returned (int): Leased quota not consumed; negative when more
+            tokens were consumed than leased.
+            requested (int): Quota to be leased.
+            period (Any): Quota period returned by the previous exchange of
+            the lease, `None` for a new lease.
+
+        Returns:
+        -------
+            tuple[int, int, Any]: Leased quota, between zero and `requested`,
+            quota left available in the database and the current quota period.
+        """
+        if self.subject_type == "c":
+            subject_id = ""
+        if self.sqlite_connection_config is not None:
+            select_statement = SELECT_QUOTA_PERIOD_SQLITE
+            exchange_statement = EXCHANGE_QUOTA_SQLITE
+            update_statement = UPDATE_AVAILABLE_QUOTA_SQLITE
+        elif self.postgres_connection_config is not None:
+            select_statement = SELECT_QUOTA_PERIOD_PG
+            exchange_statement = EXCHANGE_QUOTA_PG
+            update_statement = UPDATE_AVAILABLE_QUOTA_PG
+        else:
+            return 0, 0, None
+
+        available = 0
+        current_period = period
+        for _ in range(constants.QUOTA_LEASE_EXCHANGE_ATTEMPTS):
+            available, current_period = self._read_quota_period(
+                select_statement, subject_id
+            )
+            if self._reset_since(period, current_period) and returned > 0:
+                logger.debug(
+                    "Quota of subject %s was reset, dropping %d unused tokens",
+                    subject_id,
+                    returned,
+                )
+                returned = 0
+            total = available + returned
+            granted = min(requested, max(total, 0))
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(
+                    exchange_statement,
+                    (
+                        total - granted,
+                        datetime.now(tz=UTC),
+                        subject_id,
+                        self.subject_type,
+                        available,
+                    ),
+                )
+                exchanged = cursor.rowcount == 1
+            finally:
+                cursor.close()
+            if exchanged:
+                return granted, total - granted, current_period
+
+        logger.warning(
+            "Quota of subject %s changed concurrently, returning %d tokens only",
+            subject_id,
+            returned,
         )
-        self.connection.commit()
-        cursor.close()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                update_statement,
+                (returned, datetime.now(tz=UTC), subject_id, self.subject_type),
+            )
+        finally:
+            cursor.close()
+        return 0, available + returned, current_period
+
+    def _reset_since(self, period: Any, current_period: Any) -> bool:
+        """Check if the quota was reset after the given quota period.
+
+        Parameters:
+        ----------
+            period (Any): Quota period of the previous exchange, or `None`.
+            current_period (Any): Quota period stored in the database.
+
+        Returns:
+        -------
+            bool: `True` if the quota scheduler resets the quota of this
+            limiter and a new period started since `period`.
+        """
+        return (
+            period is not None
+            and current_period != period
+            and self.initial_quota > 0
+            and self.increase_by == 0
+        )
+
+    def _read_quota_period(
+        self, query_statement: str, subject_id: str
+    ) -> tuple[int, Any]:
+        """Read available quota and the quota period of a subject.
+
+        Initializes the quota when no record exists for the subject.
+
+        Parameters:
+        ----------
+            query_statement (str): SQL statement selecting the available
+            quota and the revocation timestamp.
+            subject_id (str): Identifier of the subject.
+
+        Returns:
+        -------
+            tuple[int, Any]: The available quota and the revocation timestamp
+            identifying the quota period.
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query_statement, (subject_id, self.subject_type))
+            value = cursor.fetchone()
+            if value is None:
+                self._init_quota(subject_id)
+                cursor.execute(query_statement, (subject_id, self.subject_type))
+                value = cursor.fetchone()
+        finally:
+            cursor.close()
+        return value[0], value[1]
 
     def _initialize_tables(self) -> None:
         """Initialize tables used by quota limiter.
@@ -321,11 +499,13 @@ class RevokableQuotaLimiter(QuotaLimiter):
         """
         logger.info("Initializing tables for quota limiter")
         cursor = self.connection.cursor()
-        if self.sqlite_connection_config is not None:
-            cursor.execute(CREATE_QUOTA_TABLE_SQLITE)
-        elif self.postgres_connection_config is not None:
-            cursor.execute(CREATE_QUOTA_TABLE_PG)
-        cursor.close()
+        try:
+            if self.sqlite_connection_config is not None:
+                cursor.execute(CREATE_QUOTA_TABLE_SQLITE)
+            elif self.postgres_connection_config is not None:
+                cursor.execute(CREATE_QUOTA_TABLE_PG)
+        finally:
+            cursor.close()
         self.connection.commit()
 
     def _init_quota(self, subject_id: str = "") -> None:
@@ -348,17 +528,19 @@ class RevokableQuotaLimiter(QuotaLimiter):
 
         if self.sqlite_connection_config is not None:
             cursor = self.connection.cursor()
-            cursor.execute(
-                INIT_QUOTA_SQLITE,
-                (
-                    subject_id,
-                    self.subject_type,
-                    self.initial_quota,
-                    self.initial_quota,
-                    revoked_at,
-                ),
-            )
-            cursor.close()
+            try:
+                cursor.execute(
+                    INIT_QUOTA_SQLITE,
+                    (
+                        subject_id,
+                        self.subject_type,
+                        self.initial_quota,
+                        self.initial_quota,
+                        revoked_at,
+                    ),
+                )
+            finally:
+                cursor.close()
             self.connection.commit()
         if self.postgres_connection_config is not None:
             with self.connection.cursor() as cursor:
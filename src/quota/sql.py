@@ -26,35 +26,75 @@ CREATE_QUOTA_TABLE_SQLITE = """
     """
 
 
+# index used by quota revocation to find rows whose period was reached
+CREATE_QUOTA_REVOCATION_INDEX = """
+    CREATE INDEX IF NOT EXISTS quota_limits_revoked_at
+        ON quota_limits (subject, revoked_at);
+    """
+
+# quota revocation statements change at most %(batch_size)s rows at once; the
+# condition is repeated in the outer query so rows revoked concurrently by
+# another worker are not changed twice, and rows locked by running requests
+# are skipped until the next batch or run
 INCREASE_QUOTA_STATEMENT_PG = """
     UPDATE quota_limits
-       SET available=available+%s, revoked_at=NOW()
-     WHERE subject=%s
-       AND revoked_at < NOW() - INTERVAL %s ;
+       SET available=available+%(value)s, revoked_at=NOW()
+     WHERE subject=%(subject)s
+       AND revoked_at < NOW() - INTERVAL %(period)s
+       AND id IN (
+           SELECT id
+             FROM quota_limits
+            WHERE subject=%(subject)s
+              AND revoked_at < NOW() - INTERVAL %(period)s
+            LIMIT %(batch_size)s
+              FOR UPDATE SKIP LOCKED
+       );
     """
 
 
 INCREASE_QUOTA_STATEMENT_SQLITE = """
     UPDATE quota_limits
-       SET available=available+?, revoked_at=datetime('now')
-     WHERE subject=?
-       AND revoked_at < datetime('now', ?);
+       SET available=available+:value, revoked_at=datetime('now')
+     WHERE subject=:subject
+       AND revoked_at < datetime('now', :period)
+       AND id IN (
+           SELECT id
+             FROM quota_limits
+            WHERE subject=:subject
+              AND revoked_at < datetime('now', :period)
+            LIMIT :batch_size
+       );
     """
 
 
 RESET_QUOTA_STATEMENT_PG = """
     UPDATE quota_limits
-       SET available=%s, revoked_at=NOW()
-     WHERE subject=%s
-       AND revoked_at < NOW() - INTERVAL %s ;
+       SET available=%(value)s, revoked_at=NOW()
+     WHERE subject=%(subject)s
+       AND revoked_at < NOW() - INTERVAL %(period)s
+       AND id IN (
+           SELECT id
+             FROM quota_limits
+            WHERE subject=%(subject)s
+              AND revoked_at < NOW() - INTERVAL %(period)s
+            LIMIT %(batch_size)s
+              FOR UPDATE SKIP LOCKED
+       );
     """
 
 
 RESET_QUOTA_STATEMENT_SQLITE = """
     UPDATE quota_limits
-       SET available=?, revoked_at=datetime('now')
-     WHERE subject=?
-       AND revoked_at < datetime('now', ?);
+       SET available=:value, revoked_at=datetime('now')
+     WHERE subject=:subject
+       AND revoked_at < datetime('now', :period)
+       AND id IN (
+           SELECT id
+             FROM quota_limits
+            WHERE subject=:subject
+              AND revoked_at < datetime('now', :period)
+            LIMIT :batch_size
+       );
     """
 
 INIT_QUOTA_PG = """
@@ -79,6 +119,20 @@ SELECT_QUOTA_SQLITE = """
      WHERE id=? AND subject=? LIMIT 1
     """
 
+# the revocation timestamp identifies the quota period, it changes when the
+# quota scheduler resets or increases the quota
+SELECT_QUOTA_PERIOD_PG = """
+    SELECT available, revoked_at
+      FROM quota_limits
+     WHERE id=%s AND subject=%s LIMIT 1
+    """
+
+SELECT_QUOTA_PERIOD_SQLITE = """
+    SELECT available, revoked_at
+      FROM quota_limits
+     WHERE id=? AND subject=? LIMIT 1
+    """
+
 SET_AVAILABLE_QUOTA_PG = """
     UPDATE quota_limits
        SET available=%s, revoked_at=%s
@@ -103,6 +157,70 @@ UPDATE_AVAILABLE_QUOTA_SQLITE = """
      WHERE id=? AND subject=?
     """
 
+# used to lease quota: the row is updated only when it was not changed since
+# the available quota was read
+EXCHANGE_QUOTA_PG = """
+    UPDATE quota_limits
+       SET available=%s, updated_at=%s
+     WHERE id=%s AND subject=%s AND available=%s
+    """
+
+EXCHANGE_QUOTA_SQLITE = """
+    UPDATE quota_limits
+       SET available=?, updated_at=?
+     WHERE id=? AND subject=? AND available=?
+    """
+
+INIT_QUOTA_IF_MISSING_PG = """
+    INSERT INTO quota_limits (id, subject, quota_limit, available, revoked_at)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (id, subject) DO NOTHING
+    """
+
+INIT_QUOTA_IF_MISSING_SQLITE = """
+    INSERT INTO quota_limits (id, subject, quota_limit, available, revoked_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (id, subject) DO NOTHING
+    """
+
+# quota of all limiters, {subjects} is a disjunction of SUBJECT_CONDITION_*
+SELECT_QUOTAS = """
+    SELECT id, subject, available
+      FROM quota_limits
+     WHERE {subjects}
+    """
+
+SUBJECT_CONDITION_PG = "(id=%s AND subject=%s)"
+
+SUBJECT_CONDITION_SQLITE = "(id=? AND subject=?)"
+
+# consume tokens from all limiters and record token usage history and its
+# rollups in one statement; {rows} are CONSUME_QUOTAS_ROW_PG values and
+# {history} is either empty or CONSUME_QUOTAS_HISTORY_PG
+CONSUME_QUOTAS_PG = """
+    WITH consumed AS (
+        UPDATE quota_limits AS q
+           SET available=q.available-c.tokens, updated_at=%(updated_at)s
+          FROM (VALUES {rows}) AS c(id, subject, tokens)
+         WHERE q.id=c.id AND q.subject=c.subject
+     RETURNING q.id, q.subject, q.available
+    ){history}
+    SELECT id, subject, available FROM consumed
+    """
+
+CONSUME_QUOTAS_ROW_PG = "(%(id_{index})s, %(subject_{index})s, %(tokens_{index})s)"
+
+CONSUME_QUOTAS_HISTORY_PG = """,
+    history AS ({statement}),
+    rollup AS ({rollup})"""
+
+CONSUME_QUOTA_SQLITE = """
+    UPDATE quota_limits
+       SET available=available-?, updated_at=?
+     WHERE id=? AND subject=?
+    RETURNING id, subject, available
+    """
+
 CREATE_TOKEN_USAGE_TABLE = """
     CREATE TABLE IF NOT EXISTS token_usage (
         user_id         text NOT NULL,
@@ -145,3 +263,74 @@ CONSUME_TOKENS_FOR_USER_PG = """
        AND token_usage.provider=%(provider)s
        AND token_usage.model=%(model)s
     """
+
+# token usage rolled up into hourly ('h') and daily ('d') buckets
+CREATE_TOKEN_USAGE_ROLLUP_TABLE = """
+    CREATE TABLE IF NOT EXISTS token_usage_rollup (
+        user_id         text NOT NULL,
+        provider        text NOT NULL,
+        model           text NOT NULL,
+        granularity     char(1) NOT NULL,
+        bucket          timestamp with time zone NOT NULL,
+        input_tokens    bigint NOT NULL,
+        output_tokens   bigint NOT NULL,
+        requests        int NOT NULL,
+        PRIMARY KEY(user_id, granularity, bucket, provider, model)
+    );
+    """
+
+CREATE_TOKEN_USAGE_ROLLUP_INDEX = """
+    CREATE INDEX IF NOT EXISTS token_usage_rollup_bucket
+        ON token_usage_rollup (granularity, bucket);
+    """
+
+ROLLUP_TOKEN_USAGE_SQLITE = """
+    INSERT INTO token_usage_rollup (user_id, provider, model, granularity, bucket,
+                                    input_tokens, output_tokens, requests)
+    VALUES (:user_id, :provider, :model, 'h', :hour, :input_tokens, :output_tokens, :requests),
+           (:user_id, :provider, :model, 'd', :day, :input_tokens, :output_tokens, :requests)
+    ON CONFLICT (user_id, granularity, bucket, provider, model)
+    DO UPDATE
+       SET input_tokens=token_usage_rollup.input_tokens+excluded.input_tokens,
+           output_tokens=token_usage_rollup.output_tokens+excluded.output_tokens,
+           requests=token_usage_rollup.requests+excluded.requests
+    """
+
+ROLLUP_TOKEN_USAGE_PG = """
+    INSERT INTO token_usage_rollup (user_id, provider, model, granularity, bucket,
+                                    input_tokens, output_tokens, requests)
+    VALUES (%(user_id)s, %(provider)s, %(model)s, 'h', %(hour)s,
+            %(input_tokens)s, %(output_tokens)s, %(requests)s),
+           (%(user_id)s, %(provider)s, %(model)s, 'd', %(day)s,
+            %(input_tokens)s, %(output_tokens)s, %(requests)s)
+    ON CONFLICT (user_id, granularity, bucket, provider, model)
+    DO UPDATE
+       SET input_tokens=token_usage_rollup.input_tokens+EXCLUDED.input_tokens,
+           output_tokens=token_usage_rollup.output_tokens+EXCLUDED.output_tokens,
+           requests=token_usage_rollup.requests+EXCLUDED.requests
+    """
+
+# token usage buckets; {conditions} are SELECT_TOKEN_USAGE_* conditions
+# joined by AND
+SELECT_TOKEN_USAGE_ROLLUP = """
+    SELECT user_id, provider, model, bucket, input_tokens, output_tokens, requests
+      FROM token_usage_rollup
+     WHERE {conditions}
+     ORDER BY bucket, user_id, provider, model
+    """
+
+SELECT_TOKEN_USAGE_GRANULARITY_PG = "granularity=%(granularity)s"
+
+SELECT_TOKEN_USAGE_GRANULARITY_SQLITE = "granularity=:granularity"
+
+SELECT_TOKEN_USAGE_USER_PG = "user_id=%(user_id)s"
+
+SELECT_TOKEN_USAGE_USER_SQLITE = "user_id=:user_id"
+
+SELECT_TOKEN_USAGE_START_PG = "bucket>=%(start)s"
+
+SELECT_TOKEN_USAGE_START_SQLITE = "bucket>=:start"
+
+SELECT_TOKEN_USAGE_END_PG = "bucket<%(end)s"
+
+SELECT_TOKEN_USAGE_END_SQLITE = "bucket<:end"
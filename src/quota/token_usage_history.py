@@ -3,33 +3,97 @@
 One table named `token_usage` is used to store statistic about token usage
 history. Input and output token count are stored for each triple (user_id,
 provider, model). This triple is also used as a primary key to this table.
+
+Token usage is also rolled up into hourly and daily buckets stored in the
+`token_usage_rollup` table, which is used to report usage of a user or of a
+time range without scanning raw rows. When aggregation is configured, token
+usage is summed in memory and both tables are updated periodically in one
+batch instead of after every request.
 """
 
 import sqlite3
 from datetime import UTC, datetime
-from typing import Any, Optional
+from threading import Event, Lock, RLock, Thread
+from typing import Any, Literal, Optional
 
 import psycopg2
+from psycopg2.extras import execute_batch
 
 from log import get_logger
 from models.config import (
     PostgreSQLDatabaseConfiguration,
     QuotaHandlersConfiguration,
     SQLiteDatabaseConfiguration,
+    TokenUsageAggregationConfiguration,
 )
 from quota.connect_pg import connect_pg
 from quota.connect_sqlite import connect_sqlite
 from quota.sql import (
     CONSUME_TOKENS_FOR_USER_PG,
     CONSUME_TOKENS_FOR_USER_SQLITE,
+    CREATE_TOKEN_USAGE_ROLLUP_INDEX,
+    CREATE_TOKEN_USAGE_ROLLUP_TABLE,
     CREATE_TOKEN_USAGE_TABLE,
+    ROLLUP_TOKEN_USAGE_PG,
+    ROLLUP_TOKEN_USAGE_SQLITE,
+    SELECT_TOKEN_USAGE_END_PG,
+    SELECT_TOKEN_USAGE_END_SQLITE,
+    SELECT_TOKEN_USAGE_GRANULARITY_PG,
+    SELECT_TOKEN_USAGE_GRANULARITY_SQLITE,
+    SELECT_TOKEN_USAGE_ROLLUP,
+    SELECT_TOKEN_USAGE_START_PG,
+    SELECT_TOKEN_USAGE_START_SQLITE,
+    SELECT_TOKEN_USAGE_USER_PG,
+    SELECT_TOKEN_USAGE_USER_SQLITE,
 )
 from utils.connection_decorator import connection
+from utils.types import TokenUsageBucket
 
 logger = get_logger(__name__)
 
-
-class TokenUsageHistory:
+# rollup bucket granularity used in the database
+GRANULARITIES = {"hour": "h", "day": "d"}
+
+
+def token_usage_record(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    user_id: str,
+    provider: str,
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    updated_at: datetime,
+) -> dict[str, Any]:
+    """Create parameters of the statements recording token usage of one request.
+
+    Parameters:
+    ----------
+        user_id (str): Identifier of the user.
+        provider (str): Provider name associated with the usage.
+        model (str): Model name associated with the usage.
+        input_tokens (int): Number of input tokens.
+        output_tokens (int): Number of output tokens.
+        updated_at (datetime): Time when the tokens were used.
+
+    Returns:
+    -------
+        dict[str, Any]: Statement parameters, including the hourly and daily
+        rollup buckets.
+    """
+    hour = updated_at.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+    return {
+        "user_id": user_id,
+        "provider": provider,
+        "model": model,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "requests": 1,
+        "updated_at": updated_at,
+        "hour": hour,
+        "day": hour.replace(hour=0),
+    }
+
+
+class TokenUsageHistory:  # pylint: disable=too-many-instance-attributes
     """Class with implementation of storage for token usage history."""
 
     def __init__(self, configuration: QuotaHandlersConfiguration) -> None:
@@ -40,7 +104,8 @@ class TokenUsageHistory:
 
         Stores SQLite and PostgreSQL connection settings for later reconnection
         attempts, initializes the internal connection state, and opens the
-        database connection.
+        database connection. When aggregation is configured, a background
+        thread writing the aggregated token usage is started.
 
         Parameters:
         ----------
@@ -55,11 +120,28 @@ class TokenUsageHistory:
         self.postgres_connection_config: Optional[PostgreSQLDatabaseConfiguration] = (
             configuration.postgres
         )
+        self.aggregation: Optional[TokenUsageAggregationConfiguration] = (
+            configuration.token_history_aggregation
+        )
         self.connection: Optional[Any] = None
+        # the connection is also used by the thread writing aggregated usage
+        self.connection_lock = RLock()
+
+        # token usage not written yet, keyed by user, provider, model and hour
+        self._pending: dict[tuple[str, str, str, datetime], dict[str, Any]] = {}
+        self._pending_lock = Lock()
+        self._flush_requested = Event()
+        self._stopped = Event()
 
         # initialize connection to DB
         self.connect()
 
+        if self.aggregation is not None:
+            Thread(
+                target=self._run_flushes, name="token-usage-history", daemon=True
+            ).start()
+            _active_histories.add(self)
+
     # pylint: disable=W0201
     def connect(self) -> None:
         """Initialize connection to database.
@@ -67,9 +149,9 @@ class TokenUsageHistory:
         Establish a database connection for token usage history and ensure required tables exist.
 
         Selects PostgreSQL if its configuration is present, otherwise uses
-        SQLite; initializes the token_usage table, enables autocommit on the
-        connection, and ensures the connection is closed and the exception is
-        re-raised if table initialization fails.
+        SQLite; initializes the token_usage and token_usage_rollup tables,
+        enables autocommit on the connection, and ensures the connection is
+        closed and the exception is re-raised if table initialization fails.
 
         Raises:
             ValueError: If neither PostgreSQL nor SQLite configuration is provided.
@@ -91,7 +173,6 @@ class TokenUsageHistory:
 
         self.connection.autocommit = True
 
-    @connection
     def consume_tokens(  # pylint: disable=too-many-arguments,too-many-positional-arguments
         self,
         user_id: str,
@@ -102,7 +183,9 @@ class TokenUsageHistory:
     ) -> None:
         """Consume tokens by given user.
 
-        Record token usage for a specific user/provider/model triple in persistent storage.
+        Record token usage for a specific user/provider/model triple in
+        persistent storage. When aggregation is configured, the usage is only
+        added to the in-memory sums written later in a batch.
 
         Parameters:
         ----------
@@ -124,35 +207,232 @@ class TokenUsageHistory:
             input_tokens,
             output_tokens,
         )
-        query_statement: str = ""
-        if self.postgres_connection_config is not None:
-            query_statement = CONSUME_TOKENS_FOR_USER_PG
-        if self.sqlite_connection_config is not None:
-            query_statement = CONSUME_TOKENS_FOR_USER_SQLITE
+        record = token_usage_record(
+            user_id, provider, model, input_tokens, output_tokens, datetime.now(tz=UTC)
+        )
+        if self.aggregation is None:
+            self._write([record])
+            return
+        self._aggregate([record])
+
+    def consume_tokens_batch(
+        self, usages: list[tuple[str, str, str, int, int]]
+    ) -> None:
+        """Consume tokens of several requests at once.
 
+        Token usage of all requests is written in one transaction, or added
+        to the in-memory sums when aggregation is configured.
+
+        Parameters:
+        ----------
+            usages (list[tuple[str, str, str, int, int]]): User ID, provider,
+            model, input tokens and output tokens of each request.
+        """
+        if not usages:
+            return
+        logger.info("Token usage changed by %d requests", len(usages))
+        now = datetime.now(tz=UTC)
+        records = [
+            token_usage_record(
+                user_id, provider, model, input_tokens, output_tokens, now
+            )
+            for user_id, provider, model, input_tokens, output_tokens in usages
+        ]
+        if self.aggregation is None:
+            self._write(records)
+            return
+        self._aggregate(records)
+
+    def _aggregate(self, records: list[dict[str, Any]]) -> None:
+        """Add token usage to the in-memory sums written later in a batch.
+
+        Parameters:
+        ----------
+            records (list[dict[str, Any]]): Statement parameters created by
+            `token_usage_record`.
+        """
+        assert self.aggregation is not None
+        with self._pending_lock:
+            for record in records:
+                key = (
+                    record["user_id"],
+                    record["provider"],
+                    record["model"],
+                    record["hour"],
+                )
+                pending = self._pending.get(key)
+                if pending is None:
+                    self._pending[key] = record
+                else:
+                    pending["input_tokens"] += record["input_tokens"]
+                    pending["output_tokens"] += record["output_tokens"]
+                    pending["requests"] += 1
+                    pending["updated_at"] = record["updated_at"]
+            if len(self._pending) >= self.aggregation.max_pending:
+                self._flush_requested.set()
+
+    def flush(self) -> None:
+        """Write token usage aggregated in memory to the database.
+
+        Usage that could not be written is kept and written with the next
+        flush.
+        """
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            self._write(list(pending.values()))
+        except Exception:
+            with self._pending_lock:
+                for key, record in pending.items():
+                    newer = self._pending.get(key)
+                    if newer is not None:
+                        record["input_tokens"] += newer["input_tokens"]
+                        record["output_tokens"] += newer["output_tokens"]
+                        record["requests"] += newer["requests"]
+                        record["updated_at"] = newer["updated_at"]
+                    self._pending[key] = record
+            raise
+        logger.debug("Written %d aggregated token usage entries", len(pending))
+
+    def close(self) -> None:
+        """Stop the background writes and flush the aggregated token usage."""
+        self._stopped.set()
+        self._flush_requested.set()
+        _active_histories.discard(self)
+        self.flush()
+
+    def _run_flushes(self) -> None:
+        """Flush aggregated token usage periodically until closed."""
+        assert self.aggregation is not None
+        while not self._stopped.is_set():
+            self._flush_requested.wait(self.aggregation.flush_interval)
+            self._flush_requested.clear()
+            if self._stopped.is_set():
+                return
+            try:
+                self.flush()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("Unable to write token usage history: %s", e)
+
+    @connection
+    def _write(self, records: list[dict[str, Any]]) -> None:
+        """Add token usage to the totals and to the rollups in one transaction.
+
+        Parameters:
+        ----------
+            records (list[dict[str, Any]]): Statement parameters created by
+            `token_usage_record`.
+        """
         # check if the connection was established
         if self.connection is None:
             logger.warning("Not connected, need to reconnect later")
             return
 
-        # timestamp to be used
-        updated_at = datetime.now(tz=UTC)
+        if self.postgres_connection_config is not None:
+            # all statements are sent at once, so they run in one implicit
+            # transaction
+            with self.connection.cursor() as cursor:
+                execute_batch(
+                    cursor,
+                    f"{CONSUME_TOKENS_FOR_USER_PG};{ROLLUP_TOKEN_USAGE_PG}",
+                    records,
+                    page_size=len(records),
+                )
+            return
 
         # it is not possible to use context manager there, because SQLite does
         # not support it
         cursor = self.connection.cursor()
-        cursor.execute(
-            query_statement,
-            {
-                "user_id": user_id,
-                "provider": provider,
-                "model": model,
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "updated_at": updated_at,
-            },
-        )
-        cursor.close()
+        try:
+            cursor.execute("BEGIN")
+            cursor.executemany(CONSUME_TOKENS_FOR_USER_SQLITE, records)
+            cursor.executemany(ROLLUP_TOKEN_USAGE_SQLITE, records)
+            cursor.execute("COMMIT")
+        except sqlite3.Error:
+            if self.connection.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+
+    @connection
+    def usage(
+        self,
+        user_id: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        granularity: Literal["hour", "day"] = "day",
+    ) -> list[TokenUsageBucket]:
+        """Read token usage from the hourly or daily rollups.
+
+        Token usage aggregated by this worker and not written yet is written
+        first.
+
+        Parameters:
+        ----------
+            user_id (Optional[str]): Read usage of this user only.
+            start (Optional[datetime]): Read buckets starting at or after this time.
+            end (Optional[datetime]): Read buckets starting before this time.
+            granularity (Literal["hour", "day"]): Size of the buckets.
+
+        Returns:
+        -------
+            list[TokenUsageBucket]: Token usage ordered by bucket.
+        """
+        if self.aggregation is not None:
+            self.flush()
+        if self.connection is None:
+            logger.warning("Not connected, need to reconnect later")
+            return []
+
+        pg = self.postgres_connection_config is not None
+        conditions = [
+            (
+                SELECT_TOKEN_USAGE_GRANULARITY_PG
+                if pg
+                else SELECT_TOKEN_USAGE_GRANULARITY_SQLITE
+            )
+        ]
+        params: dict[str, Any] = {"granularity": GRANULARITIES[granularity]}
+        if user_id is not None:
+            conditions.append(
+                SELECT_TOKEN_USAGE_USER_PG if pg else SELECT_TOKEN_USAGE_USER_SQLITE
+            )
+            params["user_id"] = user_id
+        if start is not None:
+            conditions.append(
+                SELECT_TOKEN_USAGE_START_PG if pg else SELECT_TOKEN_USAGE_START_SQLITE
+            )
+            params["start"] = start.astimezone(UTC)
+        if end is not None:
+            conditions.append(
+                SELECT_TOKEN_USAGE_END_PG if pg else SELECT_TOKEN_USAGE_END_SQLITE
+            )
+            params["end"] = end.astimezone(UTC)
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                SELECT_TOKEN_USAGE_ROLLUP.format(conditions=" AND ".join(conditions)),
+                params,
+            )
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        return [
+            TokenUsageBucket(
+                user_id=row[0],
+                provider=row[1],
+                model=row[2],
+                bucket=row[3],
+                input_tokens=row[4],
+                output_tokens=row[5],
+                requests=row[6],
+            )
+            for row in rows
+        ]
 
     def connected(self) -> bool:
         """Check if connection to quota usage history database is alive.
@@ -170,7 +450,7 @@ class TokenUsageHistory:
         try:
             cursor = self.connection.cursor()
             cursor.execute("SELECT 1")
-            logger.info("Connection to storage is ok")
+            logger.debug("Connection to storage is ok")
             return True
         except (psycopg2.OperationalError, sqlite3.Error) as e:
             logger.error("Disconnected from storage: %s", e)
@@ -188,7 +468,8 @@ class TokenUsageHistory:
         Ensure the token_usage table exists in the configured database.
 
         Creates the table required to store per-user token usage history (input/output tokens per
-        user_id, provider, model) and commits the change to the database.
+        user_id, provider, model), the table with hourly and daily rollups of
+        the usage, and commits the change to the database.
         """
         # check if the connection was established
         if self.connection is None:
@@ -197,6 +478,22 @@ class TokenUsageHistory:
 
         logger.info("Initializing tables for token usage history")
         cursor = self.connection.cursor()
-        cursor.execute(CREATE_TOKEN_USAGE_TABLE)
-        cursor.close()
+        try:
+            cursor.execute(CREATE_TOKEN_USAGE_TABLE)
+            cursor.execute(CREATE_TOKEN_USAGE_ROLLUP_TABLE)
+            cursor.execute(CREATE_TOKEN_USAGE_ROLLUP_INDEX)
+        finally:
+            cursor.close()
         self.connection.commit()
+
+
+_active_histories: set[TokenUsageHistory] = set()
+
+
+def flush_token_usage_histories() -> None:
+    """Write all aggregated token usage; called from the application lifespan shutdown."""
+    for history in list(_active_histories):
+        try:
+            history.close()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Unable to write token usage history: %s", e)
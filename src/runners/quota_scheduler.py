@@ -1,11 +1,19 @@
-"""User and cluster quota scheduler runner."""
+"""User and cluster quota scheduler runner.
 
+The scheduler runs either in a separate thread started before the service
+workers, or as asyncio tasks of the service started from the application
+lifespan. In both modes each quota limiter has its own schedule.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from threading import Thread
-from time import sleep
+from time import monotonic, sleep, time
 from typing import Any, Optional
 
 import constants
 from log import get_logger
+from metrics import recording
 from models.config import (
     Configuration,
     QuotaHandlersConfiguration,
@@ -14,6 +22,7 @@ from models.config import (
 from quota.connect_pg import connect_pg
 from quota.connect_sqlite import connect_sqlite
 from quota.sql import (
+    CREATE_QUOTA_REVOCATION_INDEX,
     CREATE_QUOTA_TABLE_PG,
     CREATE_QUOTA_TABLE_SQLITE,
     INCREASE_QUOTA_STATEMENT_PG,
@@ -21,6 +30,11 @@ from quota.sql import (
     RESET_QUOTA_STATEMENT_PG,
     RESET_QUOTA_STATEMENT_SQLITE,
 )
+from utils.connection_decorator import (
+    is_closed_connection_error,
+    is_connection_error,
+)
+from utils.types import Singleton
 
 logger = get_logger(__name__)
 
@@ -43,16 +57,7 @@ def quota_scheduler(config: QuotaHandlersConfiguration) -> bool:
         because the function enters an infinite loop), `False` if validation
         failed or a database connection could not be established.
     """
-    if config is None:
-        logger.warning("Quota limiters are not configured, skipping")
-        return False
-
-    if config.sqlite is None and config.postgres is None:
-        logger.warning("Storage for quota limiter is not set, skipping")
-        return False
-
-    if len(config.limiters) == 0:
-        logger.warning("No limiters are setup, skipping")
+    if not check_configuration(config):
         return False
 
     for _ in range(config.scheduler.database_reconnection_count):
@@ -80,19 +85,27 @@ def quota_scheduler(config: QuotaHandlersConfiguration) -> bool:
     if create_quota_table is not None:
         init_tables(connection, create_quota_table)
 
-    period = config.scheduler.period
-
     increase_quota_statement = get_increase_quota_statement(config)
     reset_quota_statement = get_reset_quota_statement(config)
 
     logger.info(
         "Quota scheduler started in separated thread with period set to %d seconds",
-        period,
+        config.scheduler.period,
     )
 
+    # time when each limiter is due next
+    next_runs = [monotonic()] * len(config.limiters)
+
     while True:  # pylint: disable=too-many-nested-blocks
         logger.info("Quota scheduler sync started")
-        for limiter in config.limiters:
+        for index, limiter in enumerate(config.limiters):
+            now = monotonic()
+            if next_runs[index] > now:
+                continue
+            lag = now - next_runs[index]
+            next_runs[index] = next_run(
+                next_runs[index], now, limiter_period(config, limiter)
+            )
             try:
                 if not connected(connection):
                     # the old connection might be closed to avoid resource leaks
@@ -105,18 +118,127 @@ def quota_scheduler(config: QuotaHandlersConfiguration) -> bool:
                     if connection is None:
                         logger.warning("Can not connect to database, skipping")
                         continue
-                quota_revocation(
-                    connection, limiter, increase_quota_statement, reset_quota_statement
+                scheduled_revocation(
+                    connection,
+                    limiter,
+                    increase_quota_statement,
+                    reset_quota_statement,
+                    config.scheduler.batch_size,
+                    lag,
                 )
             except Exception as e:  # pylint: disable=broad-exception-caught
                 logger.error("Quota revoke error: %s", e)
         logger.info("Quota scheduler sync finished")
-        sleep(period)
+        sleep(max(0.0, min(next_runs) - monotonic()))
     # unreachable code
     connection.close()
     return True
 
 
+def check_configuration(config: Optional[QuotaHandlersConfiguration]) -> bool:
+    """
+    Check that the quota scheduler has storage and limiters to work with.
+
+    Parameters:
+    ----------
+        config (Optional[QuotaHandlersConfiguration]): Quota configuration.
+
+    Returns:
+    -------
+        bool: `True` if the scheduler can be started, `False` otherwise.
+    """
+    if config is None:
+        logger.warning("Quota limiters are not configured, skipping")
+        return False
+
+    if config.sqlite is None and config.postgres is None:
+        logger.warning("Storage for quota limiter is not set, skipping")
+        return False
+
+    if len(config.limiters) == 0:
+        logger.warning("No limiters are setup, skipping")
+        return False
+
+    return True
+
+
+def limiter_period(
+    config: QuotaHandlersConfiguration, limiter: QuotaLimiterConfiguration
+) -> int:
+    """
+    Return how often the quota of the limiter is revoked, in seconds.
+
+    Parameters:
+    ----------
+        config (QuotaHandlersConfiguration): Quota configuration with the
+        default scheduler period.
+        limiter (QuotaLimiterConfiguration): Limiter configuration.
+
+    Returns:
+    -------
+        int: The limiter's own scheduler period, or the scheduler period.
+    """
+    if limiter.scheduler_period is not None:
+        return limiter.scheduler_period
+    return config.scheduler.period
+
+
+def next_run(scheduled: float, now: float, period: float) -> float:
+    """
+    Compute when a limiter is due next.
+
+    Runs are kept on the original schedule; runs missed because the previous
+    one took too long are skipped instead of being run back to back.
+
+    Parameters:
+    ----------
+        scheduled (float): Time the last run was scheduled for.
+        now (float): Current time.
+        period (float): Limiter period in seconds.
+
+    Returns:
+    -------
+        float: Time of the next run.
+    """
+    scheduled += period
+    if scheduled < now:
+        scheduled += (now - scheduled) // period * period + period
+    return scheduled
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def scheduled_revocation(
+    connection: Any,
+    limiter: QuotaLimiterConfiguration,
+    increase_quota_statement: str,
+    reset_quota_statement: str,
+    batch_size: int,
+    lag: float,
+) -> int:
+    """
+    Run quota revocation of one limiter and record the scheduler metrics.
+
+    Parameters:
+    ----------
+        connection (Any): Database connection.
+        limiter (QuotaLimiterConfiguration): Limiter configuration to process.
+        increase_quota_statement (str): SQL statement used to increment quota values.
+        reset_quota_statement (str): SQL statement used to reset quota values.
+        batch_size (int): Maximum number of rows changed by one statement.
+        lag (float): Delay of the run behind its schedule in seconds.
+
+    Returns:
+    -------
+        int: Number of quota rows changed.
+    """
+    started_at = time()
+    rows = quota_revocation(
+        connection, limiter, increase_quota_statement, reset_quota_statement, batch_size
+    )
+    recording.record_quota_scheduler_run(limiter.name, started_at, rows, lag)
+    return rows
+
+
 def connected(connection: Any) -> bool:
     """Check if DB is still connected.
 
@@ -179,7 +301,8 @@ def quota_revocation(
     quota_limiter: QuotaLimiterConfiguration,
     increase_quota_statement: str,
     reset_quota_statement: str,
-) -> None:
+    batch_size: int,
+) -> int:
     """
     Apply configured quota updates for a quota limiter using the provided database connection.
 
@@ -192,6 +315,11 @@ def quota_revocation(
         quota_limiter (QuotaLimiterConfiguration): Limiter configuration to process.
         increase_quota_statement (str): SQL statement used to increment quota values.
         reset_quota_statement (str): SQL statement used to reset quota values.
+        batch_size (int): Maximum number of rows changed by one statement.
+
+    Returns:
+    -------
+        int: Number of quota rows changed.
 
     Raises:
     ------
@@ -210,25 +338,30 @@ def quota_revocation(
         raise ValueError("Limiter period not set, skipping revocation")
 
     subject_id = get_subject_id(quota_limiter.type)
+    rows = 0
 
     if quota_limiter.quota_increase is not None:
-        increase_quota(
+        rows += increase_quota(
             connection,
             increase_quota_statement,
             subject_id,
             quota_limiter.quota_increase,
             quota_limiter.period,
+            batch_size,
         )
 
     if quota_limiter.initial_quota is not None and quota_limiter.initial_quota > 0:
-        reset_quota(
+        rows += reset_quota(
             connection,
             reset_quota_statement,
             subject_id,
             quota_limiter.initial_quota,
             quota_limiter.period,
+            batch_size,
         )
 
+    return rows
+
 
 def increase_quota(
     connection: Any,
@@ -236,7 +369,8 @@ def increase_quota(
     subject_id: str,
     increase_by: int,
     period: str,
-) -> None:
+    batch_size: int,
+) -> int:
     """
     Increase the stored quota for a subject by a specified amount for a given period.
 
@@ -247,12 +381,17 @@ def increase_quota(
     ----------
         connection (Any): Database connection object (Postgres or SQLite) to
                           execute the statement on.
-        update_statement (str): SQL update statement that accepts parameters
-                                (increase_by, subject_id, period).
+        update_statement (str): SQL update statement that accepts named
+                                parameters (value, subject, period, batch_size).
         subject_id (str): Identifier for the subject whose quota is modified
                           (e.g., "u" for user, "c" for cluster).
         increase_by (int): Amount to add to the subject's quota.
         period (str): Quota period identifier used to scope the update.
+        batch_size (int): Maximum number of rows changed by one statement.
+
+    Returns:
+    -------
+        int: Number of quota rows changed.
     """
     logger.info(
         "Increasing quota for subject '%s' by %d when period %s is reached",
@@ -260,21 +399,9 @@ def increase_quota(
         increase_by,
         period,
     )
-
-    # for compatibility with SQLite it is not possible to use context manager
-    # there
-    cursor = connection.cursor()
-    cursor.execute(
-        update_statement,
-        (
-            increase_by,
-            subject_id,
-            period,
-        ),
+    return update_in_batches(
+        connection, update_statement, subject_id, increase_by, period, batch_size
     )
-    cursor.close()
-    connection.commit()
-    logger.info("Changed %d rows in database", cursor.rowcount)
 
 
 def reset_quota(
@@ -283,7 +410,8 @@ def reset_quota(
     subject_id: str,
     reset_to: int,
     period: str,
-) -> None:
+    batch_size: int,
+) -> int:
     """
     Set the stored quota for a subject to a specific value for the given period.
 
@@ -291,10 +419,16 @@ def reset_quota(
     ----------
         connection (Any): Database connection object used to execute the update.
         update_statement (str): SQL statement that sets the quota value
-                                (expects parameters: new_value, subject_id, period).
+                                (expects named parameters: value, subject,
+                                period, batch_size).
         subject_id (str): Identifier for the quota subject (e.g., "u" for user, "c" for cluster).
         reset_to (int): Value to set the subject's quota to.
         period (str): Period identifier for which the quota is being set.
+        batch_size (int): Maximum number of rows changed by one statement.
+
+    Returns:
+    -------
+        int: Number of quota rows changed.
     """
     logger.info(
         "Resetting quota for subject '%s' to %d when period %s is reached",
@@ -302,21 +436,58 @@ def reset_quota(
         reset_to,
         period,
     )
-
-    # for compatibility with SQLite it is not possible to use context manager
-    # there
-    cursor = connection.cursor()
-    cursor.execute(
-        update_statement,
-        (
-            reset_to,
-            subject_id,
-            period,
-        ),
+    return update_in_batches(
+        connection, update_statement, subject_id, reset_to, period, batch_size
     )
-    cursor.close()
-    connection.commit()
-    logger.info("Changed %d rows in database", cursor.rowcount)
+
+
+def update_in_batches(
+    connection: Any,
+    update_statement: str,
+    subject_id: str,
+    value: int,
+    period: str,
+    batch_size: int,
+) -> int:
+    """
+    Repeat a quota update statement until it changes less than a full batch.
+
+    Each batch is committed separately, so rows are not locked for the
+    whole revocation.
+
+    Parameters:
+    ----------
+        connection (Any): Database connection object used to execute the update.
+        update_statement (str): Quota increase or reset statement.
+        subject_id (str): Identifier for the quota subject.
+        value (int): Value used to increase or reset the quota.
+        period (str): Quota period identifier used to scope the update.
+        batch_size (int): Maximum number of rows changed by one statement.
+
+    Returns:
+    -------
+        int: Number of quota rows changed.
+    """
+    params = {
+        "value": value,
+        "subject": subject_id,
+        "period": period,
+        "batch_size": batch_size,
+    }
+    rows = 0
+    while True:
+        # for compatibility with SQLite it is not possible to use context
+        # manager there
+        cursor = connection.cursor()
+        cursor.execute(update_statement, params)
+        changed = cursor.rowcount
+        cursor.close()
+        connection.commit()
+        rows += changed
+        if changed < batch_size:
+            break
+    logger.info("Changed %d rows in database", rows)
+    return rows
 
 
 def get_subject_id(limiter_type: str) -> str:
@@ -371,11 +542,14 @@ def init_tables(connection: Any, create_quota_table: str) -> None:
     ----------
         connection (Any): A DB-API compatible connection on which the quota
                           table(s) will be created; changes are committed before returning.
-        create_quota_table (str): Command used to create table with quota.
+        create_quota_table (str): Command used to create table with quota;
+                                  the index used by quota revocation is
+                                  created as well.
     """
     logger.info("Initializing tables for quota limiter")
     cursor = connection.cursor()
     cursor.execute(create_quota_table)
+    cursor.execute(CREATE_QUOTA_REVOCATION_INDEX)
     cursor.close()
     connection.commit()
 
@@ -389,6 +563,9 @@ def start_quota_scheduler(configuration: Configuration) -> None:
         configuration (Configuration): Global configuration whose `quota_handlers`
                                        attribute is passed to the scheduler thread.
     """
+    if configuration.quota_handlers.scheduler.mode != "thread":
+        logger.info("Quota scheduler runs in the service event loop")
+        return
     logger.info("Starting quota scheduler")
     thread = Thread(
         target=quota_scheduler,
@@ -396,3 +573,159 @@ def start_quota_scheduler(configuration: Configuration) -> None:
         args=(configuration.quota_handlers,),
     )
     thread.start()
+
+
+class AsyncQuotaScheduler(metaclass=Singleton):
+    """Quota scheduler running as asyncio tasks of the service.
+
+    Every quota limiter has its own task sleeping until the limiter is due.
+    Database statements run in a dedicated single thread, so they neither
+    block the event loop nor take threads used to handle requests.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler in the stopped state."""
+        self._config: Optional[QuotaHandlersConfiguration] = None
+        self._connection: Any = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: list[asyncio.Task[None]] = []
+
+    @property
+    def running(self) -> bool:
+        """Check whether the limiter tasks are running."""
+        return any(not task.done() for task in self._tasks)
+
+    async def start(self, config: QuotaHandlersConfiguration) -> bool:
+        """Connect to the quota database and start one task per limiter.
+
+        Parameters:
+        ----------
+            config (QuotaHandlersConfiguration): Quota configuration.
+
+        Returns:
+        -------
+            bool: `True` if the scheduler was started, `False` if the
+            configuration is incomplete or the database is not available.
+        """
+        if self.running:
+            return True
+        if not check_configuration(config):
+            return False
+        self._config = config
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="quota-scheduler"
+        )
+        for _ in range(config.scheduler.database_reconnection_count):
+            try:
+                await self._run_in_executor(self._init_connection)
+                break
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("Can not connect to database, will try later: %s", e)
+            await asyncio.sleep(config.scheduler.database_reconnection_delay)
+        else:
+            logger.warning("Can not connect to database, skipping")
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            return False
+
+        self._tasks = [
+            asyncio.create_task(
+                self._run(limiter), name=f"quota-scheduler-{limiter.name}"
+            )
+            for limiter in config.limiters
+        ]
+        logger.info("Quota scheduler started for %d limiters", len(self._tasks))
+        return True
+
+    async def stop(self) -> None:
+        """Cancel the limiter tasks and close the database connection."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            # runs after the revocation in progress, if any
+            await self._run_in_executor(self._close_connection)
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        logger.info("Quota scheduler stopped")
+
+    async def _run_in_executor(self, function: Any, *args: Any) -> Any:
+        """Run a blocking database function in the scheduler thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, function, *args)
+
+    async def _run(self, limiter: QuotaLimiterConfiguration) -> None:
+        """Revoke quota of one limiter on its own schedule."""
+        assert self._config is not None
+        loop = asyncio.get_running_loop()
+        period = limiter_period(self._config, limiter)
+        scheduled = loop.time()
+        while True:
+            now = loop.time()
+            try:
+                await self._run_in_executor(self._revoke, limiter, now - scheduled)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("Quota revoke error: %s", e)
+            scheduled = next_run(scheduled, loop.time(), period)
+            await asyncio.sleep(max(0.0, scheduled - loop.time()))
+
+    def _init_connection(self) -> None:
+        """Connect to the quota database and create the quota table."""
+        assert self._config is not None
+        self._connection = connect(self._config)
+        if self._connection is None:
+            raise ValueError("Storage for quota limiter is not set")
+        if self._config.postgres is not None:
+            init_tables(self._connection, CREATE_QUOTA_TABLE_PG)
+        else:
+            init_tables(self._connection, CREATE_QUOTA_TABLE_SQLITE)
+
+    def _revoke(self, limiter: QuotaLimiterConfiguration, lag: float) -> None:
+        """Revoke quota of the limiter, reconnecting when the connection was lost."""
+        assert self._config is not None
+        if self._connection is None:
+            self._connection = connect(self._config)
+        try:
+            scheduled_revocation(
+                self._connection,
+                limiter,
+                get_increase_quota_statement(self._config),
+                get_reset_quota_statement(self._config),
+                self._config.scheduler.batch_size,
+                lag,
+            )
+        except Exception as e:
+            if is_connection_error(e) or is_closed_connection_error(e):
+                self._close_connection()
+            raise
+
+    def _close_connection(self) -> None:
+        """Close the database connection, ignoring already broken ones."""
+        if self._connection is None:
+            return
+        try:
+            self._connection.close()
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass  # Connection already dead
+        self._connection = None
+
+
+async def start_async_quota_scheduler(configuration: Configuration) -> None:
+    """
+    Start the quota scheduler in the service event loop when configured so.
+
+    Parameters:
+    ----------
+        configuration (Configuration): Global configuration whose `quota_handlers`
+                                       attribute is used by the scheduler.
+    """
+    if configuration.quota_handlers.scheduler.mode != "async":
+        return
+    logger.info("Starting quota scheduler in the service event loop")
+    await AsyncQuotaScheduler().start(configuration.quota_handlers)
+
+
+async def stop_async_quota_scheduler() -> None:
+    """Stop the quota scheduler running in the service event loop, if any."""
+    await AsyncQuotaScheduler().stop()
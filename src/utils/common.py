@@ -4,13 +4,16 @@ import asyncio
 from collections.abc import Callable
 from functools import wraps
 from logging import Logger
-from typing import Any, cast
+from typing import Any, Optional, cast
 
 from llama_stack.core.library_client import AsyncLlamaStackAsLibraryClient
 from llama_stack_client import AsyncLlamaStackClient
 
+import constants
 from client import AsyncLlamaStackClientHolder
 from models.config import Configuration, ModelContextProtocolServer
+from utils.registry_cache import REGISTRY_TOOLGROUPS, LlamaStackRegistryCache
+from utils.types import Singleton
 
 
 async def register_mcp_servers_async(
@@ -21,7 +24,8 @@ async def register_mcp_servers_async(
     If no MCP servers are present in the provided configuration this function returns immediately.
     Selects between a library client (initializes it) and a service client based on
     configuration.llama_stack.use_as_library_client, then registers any MCP servers not already
-    present in the client's toolgroups.
+    present in the client's toolgroups, at most
+    configuration.mcp_registration.max_concurrency of them in parallel.
 
     Parameters:
     ----------
@@ -48,17 +52,22 @@ async def register_mcp_servers_async(
             AsyncLlamaStackAsLibraryClient, AsyncLlamaStackClientHolder().get_client()
         )
         await client.initialize()
-        await _register_mcp_toolgroups_async(client, configuration.mcp_servers, logger)
     else:
         # Service client - also use async interface
         client = AsyncLlamaStackClientHolder().get_client()
-        await _register_mcp_toolgroups_async(client, configuration.mcp_servers, logger)
+    await _register_mcp_toolgroups_async(
+        client,
+        configuration.mcp_servers,
+        logger,
+        configuration.mcp_registration.max_concurrency,
+    )
 
 
 async def _register_mcp_toolgroups_async(
     client: AsyncLlamaStackClient,
     mcp_servers: list[ModelContextProtocolServer],
     logger: Logger,
+    max_concurrency: int = 8,
 ) -> None:
     """
     Register MCP (Model Context Protocol) toolgroups with a LlamaStack async client.
@@ -67,7 +76,8 @@ async def _register_mcp_toolgroups_async(
     whose `name` is not present in the client's `provider_resource_id` list. For each
     new server it calls the client's toolgroups.register with parameters:
     `toolgroup_id`=`mcp.name`, `provider_id`=`mcp.provider_id`, and
-    `mcp_endpoint` containing the server `url`.
+    `mcp_endpoint` containing the server `url`. New servers are registered
+    concurrently, at most `max_concurrency` of them at a time.
 
     This function performs network calls against the provided async client and does not
     catch exceptions raised by those calls — any exceptions from the client (e.g., RPC
@@ -81,6 +91,7 @@ async def _register_mcp_toolgroups_async(
                                                         to ensure are registered.
         logger (Logger): Logger used for debug messages about registration
                          progress.
+        max_concurrency (int): Maximum number of registrations in flight.
     """
     # Get registered tools
     registered_toolgroups = await client.toolgroups.list()
@@ -89,9 +100,10 @@ async def _register_mcp_toolgroups_async(
     ]
     logger.debug("Registered toolgroups: %s", registered_toolgroups_ids)
 
-    # Register toolgroups for MCP servers if not already registered
-    for mcp in mcp_servers:
-        if mcp.name not in registered_toolgroups_ids:
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def register(mcp: ModelContextProtocolServer) -> None:
+        async with semaphore:
             logger.debug("Registering MCP server: %s, %s", mcp.name, mcp.url)
 
             registration_params = {
@@ -101,8 +113,97 @@ async def _register_mcp_toolgroups_async(
             }
 
             await client.toolgroups.register(**registration_params)
+            LlamaStackRegistryCache().invalidate(REGISTRY_TOOLGROUPS)
             logger.debug("MCP server %s registered successfully", mcp.name)
 
+    # Register toolgroups for MCP servers if not already registered
+    await asyncio.gather(
+        *(
+            register(mcp)
+            for mcp in mcp_servers
+            if mcp.name not in registered_toolgroups_ids
+        )
+    )
+
+
+class DeferredMcpRegistration(metaclass=Singleton):
+    """Registration of MCP servers running after the service has started.
+
+    Used when `mcp_registration.deferred` is enabled: the service starts
+    accepting requests right away while MCP servers are registered in
+    background. Failed registrations are retried with exponential backoff
+    until they succeed. The readiness probe reports the service as not
+    ready until then.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without a running registration."""
+        self._task: Optional[asyncio.Task[None]] = None
+        self._error: Optional[str] = None
+
+    def start(self, logger: Logger, configuration: Configuration) -> None:
+        """Start registering MCP servers in background.
+
+        Parameters:
+        ----------
+            logger: Logger instance.
+            configuration: Configuration containing the MCP servers.
+        """
+        self._error = None
+        self._task = asyncio.create_task(self._run(logger, configuration))
+
+    async def stop(self) -> None:
+        """Cancel the registration if it is still running."""
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def status(self) -> tuple[bool, str]:
+        """Return whether MCP servers are registered.
+
+        Returns:
+        -------
+            tuple[bool, str]: True when no deferred registration is pending,
+            and a reason describing the state of the registration.
+        """
+        if self._task is None or self._task.done():
+            return True, "MCP servers registered"
+        if self._error is not None:
+            return False, f"MCP servers registration failed, retrying: {self._error}"
+        return False, "MCP servers registration in progress"
+
+    async def _run(self, logger: Logger, configuration: Configuration) -> None:
+        """Register MCP servers, retrying failed attempts.
+
+        Parameters:
+        ----------
+            logger: Logger instance.
+            configuration: Configuration containing the MCP servers.
+        """
+        delay = constants.MCP_REGISTRATION_RETRY_INITIAL_DELAY_SECONDS
+        while True:
+            try:
+                await register_mcp_servers_async(logger, configuration)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self._error = str(e)
+                logger.error(
+                    "Failed to register MCP servers, retrying in %.1f seconds: %s",
+                    delay,
+                    e,
+                )
+                await asyncio.sleep(delay)
+                delay = min(
+                    delay * 2, constants.MCP_REGISTRATION_RETRY_MAX_DELAY_SECONDS
+                )
+                continue
+            logger.info("MCP servers registered")
+            return
+
 
 def run_once_async(func: Callable) -> Callable:
     """
@@ -1,16 +1,118 @@
 """Decorator that makes sure the object is 'connected' according to it's connected predicate."""
 
+import sqlite3
 from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from functools import wraps
 from typing import Any
 
+import psycopg2
+
+from log import get_logger
+
+logger = get_logger(__name__)
+
+# errors meaning that the connection (not the statement) is broken
+CONNECTION_ERRORS = (
+    psycopg2.OperationalError,
+    psycopg2.InterfaceError,
+)
+
+
+# messages of errors raised when a connection closed before the call is used;
+# nothing was sent to the database, so the call can be safely repeated
+CLOSED_CONNECTION_MESSAGES = (
+    "closed database",  # sqlite3.ProgrammingError
+    "already closed",  # psycopg2.InterfaceError
+)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """Check if the error, or the error it was raised from, is a connection error.
+
+    Parameters:
+    ----------
+        error (BaseException): Error raised by the wrapped function, possibly
+        a `CacheError` raised from the original database error.
+
+    Returns:
+    -------
+        bool: `True` if the error was caused by a broken connection.
+    """
+    return isinstance(error, CONNECTION_ERRORS) or isinstance(
+        error.__cause__, CONNECTION_ERRORS
+    )
+
+
+def is_closed_connection_error(error: BaseException) -> bool:
+    """Check if the error was raised because the connection was already closed.
+
+    Unlike other connection errors, such an error is raised before anything
+    is sent to the database, so the call did not change any data.
+
+    Parameters:
+    ----------
+        error (BaseException): Error raised by the wrapped function, possibly
+        a `CacheError` raised from the original database error.
+
+    Returns:
+    -------
+        bool: `True` if a closed connection was used.
+    """
+    for candidate in (error, error.__cause__):
+        if isinstance(
+            candidate, (sqlite3.ProgrammingError, psycopg2.InterfaceError)
+        ) and any(message in str(candidate) for message in CLOSED_CONNECTION_MESSAGES):
+            return True
+    return False
+
+
+def _is_closed(current: Any) -> bool:
+    """Check if a connection is known to be closed (psycopg2 `closed` flag)."""
+    closed = getattr(current, "closed", 0)
+    return isinstance(closed, int) and bool(closed)
+
+
+def _reconnect_quietly(connectable: Any) -> None:
+    """Reconnect for the next call; failures are left to that call."""
+    try:
+        connectable.connect()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning("Unable to reconnect to storage: %s", e)
+
+
+def _connection_lock(connectable: Any) -> AbstractContextManager:
+    """Return the lock serializing use of the object's connection, if it has one.
+
+    Objects whose connection is also used by background threads set their
+    `connection_lock` attribute to a `threading.RLock`.
+    """
+    lock = getattr(connectable, "connection_lock", None)
+    if isinstance(lock, AbstractContextManager):
+        return lock
+    return nullcontext()
+
 
 def connection(f: Callable) -> Callable:
     """
     Ensure a connectable object is connected before invoking the wrapped function.
 
-    The returned wrapper calls `connectable.connected()` and, if that returns
-    `False`, calls `connectable.connect()` prior to delegating to the original
-    function.
+    The wrapped function is executed optimistically, without checking that
+    the connection is alive first. `connectable.connect()` is called before
+    the call only when the object has no connection at all (its `connection`
+    attribute is `None` or closed, or `connectable.connected()` returns
+    `False` for objects without that attribute).
+
+    When the call fails because the connection was already closed, nothing
+    was sent to the database, so the object is reconnected and the call is
+    retried once. Other connection errors may happen after the database
+    applied a write (e.g. while committing) and the wrapped writes are not
+    idempotent, so the object is reconnected for the next call but the call
+    is not retried.
+
+    When the object has a `connection_lock`, the lock is held for the whole
+    call, so a connection shared with background threads is never used by
+    two threads at once.
 
     Parameters:
     ----------
@@ -31,7 +133,8 @@ def connection(f: Callable) -> Callable:
     ```
     """
 
-    def wrapper(connectable: Any, *args: Any, **kwargs: Any) -> Callable:
+    @wraps(f)
+    def wrapper(connectable: Any, *args: Any, **kwargs: Any) -> Any:
         """
         Ensure the provided connectable is connected, then call the wrapped with the same arguments.
 
@@ -46,8 +149,25 @@ def connection(f: Callable) -> Callable:
         -------
                 Any: The value returned by the wrapped callable.
         """
-        if not connectable.connected():
+        with _connection_lock(connectable):
+            current = getattr(connectable, "connection", None)
+            if current is None:
+                if not connectable.connected():
+                    connectable.connect()
+            elif _is_closed(current):
+                connectable.connect()
+            try:
+                return f(connectable, *args, **kwargs)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                if is_closed_connection_error(e):
+                    logger.warning("Connection to storage closed, reconnecting: %s", e)
+                elif is_connection_error(e):
+                    logger.warning("Connection to storage lost, reconnecting: %s", e)
+                    _reconnect_quietly(connectable)
+                    raise
+                else:
+                    raise
             connectable.connect()
-        return f(connectable, *args, **kwargs)
+            return f(connectable, *args, **kwargs)
 
     return wrapper
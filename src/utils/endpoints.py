@@ -1,13 +1,15 @@
 """Utility functions for endpoint handlers."""
 
+from functools import partial
 from typing import Any, Optional
 
 from fastapi import HTTPException
 from pydantic import AnyUrl, ValidationError
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
 import constants
-from app.database import get_session
+from app.database import get_session, run_in_session
 from client import AsyncLlamaStackClientHolder
 from configuration import AppConfig, LogicError
 from log import get_logger
@@ -17,6 +19,7 @@ from models.api.responses import (
     NotFoundResponse,
 )
 from models.database.conversations import UserConversation, UserTurn
+from utils.persistence_queue import PersistenceQueue
 from utils.responses import create_new_conversation
 from utils.suid import normalize_conversation_id, to_llama_stack_conversation_id
 from utils.types import ReferencedDocument, ResponsesConversationContext, TurnSummary
@@ -49,6 +52,30 @@ def delete_conversation(conversation_id: str) -> bool:
         return False
 
 
+def _query_conversation(
+    session: Session, conversation_id: str
+) -> Optional[UserConversation]:
+    """Query a conversation by its ID using the given session."""
+    return session.query(UserConversation).filter_by(id=conversation_id).first()
+
+
+def _query_conversation_turns(session: Session, conversation_id: str) -> list[UserTurn]:
+    """Query all turns of a conversation ordered by turn number."""
+    return (
+        session.query(UserTurn)
+        .filter_by(conversation_id=conversation_id)
+        .order_by(UserTurn.turn_number)
+        .all()
+    )
+
+
+def _query_turn_by_response_id(
+    session: Session, response_id: str
+) -> Optional[UserTurn]:
+    """Query the turn that produced the given response ID."""
+    return session.query(UserTurn).filter_by(response_id=response_id).first()
+
+
 def retrieve_conversation(conversation_id: str) -> Optional[UserConversation]:
     """Retrieve a conversation from the database by its ID.
 
@@ -59,10 +86,10 @@ def retrieve_conversation(conversation_id: str) -> Optional[UserConversation]:
         Optional[UserConversation]: The conversation object if found, otherwise None.
     """
     with get_session() as session:
-        return session.query(UserConversation).filter_by(id=conversation_id).first()
+        return _query_conversation(session, conversation_id)
 
 
-def retrieve_conversation_turns(conversation_id: str) -> list[UserTurn]:
+async def retrieve_conversation_turns(conversation_id: str) -> list[UserTurn]:
     """Retrieve all turns for a conversation from the database, ordered by turn number.
 
     Args:
@@ -75,13 +102,9 @@ def retrieve_conversation_turns(conversation_id: str) -> list[UserTurn]:
         HTTPException: 500 if a database error occurs.
     """
     try:
-        with get_session() as session:
-            return (
-                session.query(UserTurn)
-                .filter_by(conversation_id=conversation_id)
-                .order_by(UserTurn.turn_number)
-                .all()
-            )
+        return await run_in_session(
+            partial(_query_conversation_turns, conversation_id=conversation_id)
+        )
     except SQLAlchemyError as e:
         logger.error(
             "Database error occurred while retrieving conversation turns for %s.",
@@ -121,7 +144,7 @@ def can_access_conversation(
         return owner_user_id == user_id
 
 
-def validate_and_retrieve_conversation(
+async def validate_and_retrieve_conversation(
     normalized_conv_id: str,
     user_id: str,
     others_allowed: bool,
@@ -129,8 +152,9 @@ def validate_and_retrieve_conversation(
     """
     Validate access and retrieve a conversation from the database.
 
-    This function performs access validation, retrieves the conversation,
-    and handles all error cases (forbidden access, not found, database errors).
+    This function retrieves the conversation with a single query, performs
+    access validation on the retrieved row, and handles all error cases
+    (forbidden access, not found, database errors).
 
     Args:
         normalized_conv_id: The normalized conversation ID to retrieve.
@@ -146,10 +170,25 @@ def validate_and_retrieve_conversation(
             - 404 Not Found: If conversation doesn't exist in database.
             - 500 Internal Server Error: If database error occurs.
     """
-    if not can_access_conversation(
-        normalized_conv_id,
-        user_id,
-        others_allowed=others_allowed,
+    # make turns still waiting in the write-behind queue visible
+    await PersistenceQueue().wait_until_persisted(normalized_conv_id)
+    try:
+        user_conversation = await run_in_session(
+            partial(_query_conversation, conversation_id=normalized_conv_id)
+        )
+    except SQLAlchemyError as e:
+        logger.error(
+            "Database error occurred while retrieving conversation %s: %s",
+            normalized_conv_id,
+            str(e),
+        )
+        response = InternalServerErrorResponse.database_error()
+        raise HTTPException(**response.model_dump()) from e
+
+    if (
+        user_conversation is not None
+        and not others_allowed
+        and user_conversation.user_id != user_id
     ):
         logger.warning(
             "User %s attempted to read conversation %s they don't have access to",
@@ -163,27 +202,15 @@ def validate_and_retrieve_conversation(
         )
         raise HTTPException(**response.model_dump())
 
-    # If reached this, user is authorized to retrieve this conversation
-    try:
-        user_conversation = retrieve_conversation(normalized_conv_id)
-        if user_conversation is None:
-            logger.error(
-                "Conversation %s not found in database.",
-                normalized_conv_id,
-            )
-            response = NotFoundResponse(
-                resource="conversation", resource_id=normalized_conv_id
-            )
-            raise HTTPException(**response.model_dump())
-
-    except SQLAlchemyError as e:
+    if user_conversation is None:
         logger.error(
-            "Database error occurred while retrieving conversation %s: %s",
+            "Conversation %s not found in database.",
             normalized_conv_id,
-            str(e),
         )
-        response = InternalServerErrorResponse.database_error()
-        raise HTTPException(**response.model_dump()) from e
+        response = NotFoundResponse(
+            resource="conversation", resource_id=normalized_conv_id
+        )
+        raise HTTPException(**response.model_dump())
 
     return user_conversation
 
@@ -219,7 +246,7 @@ async def resolve_response_context(
     # Context for the LLM passed by conversation
     if conversation_id:
         logger.info("Conversation ID specified in request: %s", conversation_id)
-        user_conversation = validate_and_retrieve_conversation(
+        user_conversation = await validate_and_retrieve_conversation(
             normalized_conv_id=normalize_conversation_id(conversation_id),
             user_id=user_id,
             others_allowed=others_allowed,
@@ -232,13 +259,13 @@ async def resolve_response_context(
 
     # Context for the LLM passed by previous response id
     if previous_response_id:
-        if not check_turn_existence(previous_response_id):
+        if not await check_turn_existence(previous_response_id):
             error_response = NotFoundResponse(
                 resource="response", resource_id=previous_response_id
             )
             raise HTTPException(**error_response.model_dump())
-        prev_user_turn = retrieve_turn_by_response_id(previous_response_id)
-        user_conversation = validate_and_retrieve_conversation(
+        prev_user_turn = await retrieve_turn_by_response_id(previous_response_id)
+        user_conversation = await validate_and_retrieve_conversation(
             normalized_conv_id=prev_user_turn.conversation_id,
             user_id=user_id,
             others_allowed=others_allowed,
@@ -274,7 +301,7 @@ async def resolve_response_context(
     )
 
 
-def retrieve_turn_by_response_id(response_id: str) -> UserTurn:
+async def retrieve_turn_by_response_id(response_id: str) -> UserTurn:
     """Retrieve a response's turn from the database by response ID.
 
     Looks up the turn that has this response_id to get its conversation.
@@ -290,24 +317,23 @@ def retrieve_turn_by_response_id(response_id: str) -> UserTurn:
         HTTPException: 404 if no turn has this response_id; 500 on database error.
     """
     try:
-        with get_session() as session:
-            turn = session.query(UserTurn).filter_by(response_id=response_id).first()
-            if turn is None:
-                logger.error("Response %s not found in database.", response_id)
-                response = NotFoundResponse(
-                    resource="response", resource_id=response_id
-                )
-                raise HTTPException(**response.model_dump())
-            return turn
+        turn = await run_in_session(
+            partial(_query_turn_by_response_id, response_id=response_id)
+        )
     except SQLAlchemyError as e:
         logger.exception(
             "Database error while retrieving turn by response_id %s", response_id
         )
         response = InternalServerErrorResponse.database_error()
         raise HTTPException(**response.model_dump()) from e
+    if turn is None:
+        logger.error("Response %s not found in database.", response_id)
+        response = NotFoundResponse(resource="response", resource_id=response_id)
+        raise HTTPException(**response.model_dump())
+    return turn
 
 
-def check_turn_existence(response_id: str) -> bool:
+async def check_turn_existence(response_id: str) -> bool:
     """Check if a turn exists for a given response ID.
 
     Args:
@@ -317,9 +343,10 @@ def check_turn_existence(response_id: str) -> bool:
         bool: True if the turn exists, False otherwise.
     """
     try:
-        with get_session() as session:
-            turn = session.query(UserTurn).filter_by(response_id=response_id).first()
-            return turn is not None
+        turn = await run_in_session(
+            partial(_query_turn_by_response_id, response_id=response_id)
+        )
+        return turn is not None
     except SQLAlchemyError as e:
         logger.exception(
             "Database error while checking turn existence for response_id %s",
@@ -0,0 +1,199 @@
+"""Shared sessions for outbound HTTP requests.
+
+JWK set fetches, MCP OAuth probes and Splunk HEC events used to open a new
+aiohttp session, and therefore a new connection and TLS handshake, for every
+request. They now borrow a long-lived session from a registry instead. There
+is one session per destination name, each with its own connection pool
+configured in the `http_clients` configuration section.
+
+Sessions are bound to the event loop they were created in; the registry is
+configured when the service starts and closes all sessions on shutdown.
+"""
+
+import asyncio
+import ssl
+from asyncio import AbstractEventLoop
+from types import SimpleNamespace
+from typing import Optional
+
+import aiohttp
+
+from log import get_logger
+from metrics.recording import (
+    record_http_client_pool_connect,
+    record_http_client_pool_connections,
+)
+from models.config import HttpClientPoolConfiguration, HttpClientsConfiguration
+from utils.types import Singleton
+
+logger = get_logger(__name__)
+
+
+def pool_trace_config(pool: str) -> aiohttp.TraceConfig:
+    """Create a trace configuration exporting metrics of a connection pool.
+
+    Parameters:
+    ----------
+        pool: Destination name of the pool used as the metric label.
+
+    Returns:
+    -------
+        aiohttp.TraceConfig: Trace configuration counting connections waiting
+        in the queue and in use, and measuring the time to open connections.
+    """
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_queued_start(
+        _session: aiohttp.ClientSession, context: SimpleNamespace, _params: object
+    ) -> None:
+        context.queued = True
+        record_http_client_pool_connections(pool, "queued", 1)
+
+    async def on_queued_end(
+        _session: aiohttp.ClientSession, context: SimpleNamespace, _params: object
+    ) -> None:
+        context.queued = False
+        record_http_client_pool_connections(pool, "queued", -1)
+
+    async def on_create_start(
+        _session: aiohttp.ClientSession, context: SimpleNamespace, _params: object
+    ) -> None:
+        context.connect_started = asyncio.get_running_loop().time()
+
+    def acquired(context: SimpleNamespace) -> None:
+        context.acquired = True
+        record_http_client_pool_connections(pool, "in_use", 1)
+
+    async def on_create_end(
+        _session: aiohttp.ClientSession, context: SimpleNamespace, _params: object
+    ) -> None:
+        duration = asyncio.get_running_loop().time() - context.connect_started
+        record_http_client_pool_connect(pool, duration)
+        acquired(context)
+
+    async def on_reuse(
+        _session: aiohttp.ClientSession, context: SimpleNamespace, _params: object
+    ) -> None:
+        acquired(context)
+
+    async def on_finished(
+        _session: aiohttp.ClientSession, context: SimpleNamespace, _params: object
+    ) -> None:
+        # requests failing while queued do not end the queued state
+        if getattr(context, "queued", False):
+            context.queued = False
+            record_http_client_pool_connections(pool, "queued", -1)
+        if getattr(context, "acquired", False):
+            context.acquired = False
+            record_http_client_pool_connections(pool, "in_use", -1)
+
+    trace_config.on_connection_queued_start.append(on_queued_start)
+    trace_config.on_connection_queued_end.append(on_queued_end)
+    trace_config.on_connection_create_start.append(on_create_start)
+    trace_config.on_connection_create_end.append(on_create_end)
+    trace_config.on_connection_reuseconn.append(on_reuse)
+    trace_config.on_request_end.append(on_finished)
+    trace_config.on_request_exception.append(on_finished)
+    return trace_config
+
+
+class HttpClientRegistry(metaclass=Singleton):
+    """Registry of long-lived HTTP sessions keyed by destination name."""
+
+    def __init__(self) -> None:
+        """Initialize the registry with default pool configuration."""
+        self._config = HttpClientsConfiguration()
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._loop: Optional[AbstractEventLoop] = None
+
+    def configure(self, config: HttpClientsConfiguration) -> None:
+        """Set configuration of sessions created from now on.
+
+        Parameters:
+        ----------
+            config: Outbound HTTP clients configuration.
+        """
+        self._config = config
+
+    def session(self, name: str) -> aiohttp.ClientSession:
+        """Return the session of the destination, creating it on first use.
+
+        Parameters:
+        ----------
+            name: Destination name of the session.
+
+        Returns:
+        -------
+            aiohttp.ClientSession: Session of the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # sessions can not be used outside of the loop they were created in
+            self._sessions = {}
+            self._loop = loop
+        session = self._sessions.get(name)
+        if session is None or session.closed:
+            session = self._create_session(name, self._config.pool(name))
+            self._sessions[name] = session
+            logger.info("Created HTTP client session %s", name)
+        return session
+
+    def clear(self) -> None:
+        """Forget all sessions without closing them."""
+        self._sessions = {}
+        self._loop = None
+
+    async def close(self) -> None:
+        """Close all sessions."""
+        sessions = list(self._sessions.values())
+        self.clear()
+        for session in sessions:
+            await session.close()
+
+    @staticmethod
+    def _create_session(
+        name: str, config: HttpClientPoolConfiguration
+    ) -> aiohttp.ClientSession:
+        """Create a session with its own connection pool."""
+        ssl_context: ssl.SSLContext | bool = config.verify_ssl
+        if config.verify_ssl and config.ca_cert_path is not None:
+            ssl_context = ssl.create_default_context(cafile=str(config.ca_cert_path))
+        connector = aiohttp.TCPConnector(
+            limit=config.max_connections,
+            limit_per_host=config.max_connections_per_host,
+            keepalive_timeout=config.keepalive_timeout,
+            ttl_dns_cache=config.dns_cache_ttl,
+            ssl=ssl_context,
+        )
+        return aiohttp.ClientSession(
+            connector=connector, trace_configs=[pool_trace_config(name)]
+        )
+
+
+def get_http_session(name: str) -> aiohttp.ClientSession:
+    """Return the shared HTTP session of the destination.
+
+    Parameters:
+    ----------
+        name: Destination name of the session.
+
+    Returns:
+    -------
+        aiohttp.ClientSession: The shared session.
+    """
+    return HttpClientRegistry().session(name)
+
+
+def open_http_clients(config: HttpClientsConfiguration) -> None:
+    """Configure the shared HTTP sessions; called on startup.
+
+    Parameters:
+    ----------
+        config: Outbound HTTP clients configuration.
+    """
+    HttpClientRegistry().configure(config)
+
+
+async def close_http_clients() -> None:
+    """Close the shared HTTP sessions; called on shutdown."""
+    await HttpClientRegistry().close()
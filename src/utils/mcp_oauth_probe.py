@@ -1,25 +1,153 @@
 """Probe MCP servers for OAuth and raise 401 with WWW-Authenticate when required.
 
 Used by endpoints that call MCP-backed services so clients receive a proper
-401 with WWW-Authenticate when an MCP server requires OAuth.
+401 with WWW-Authenticate when an MCP server requires OAuth. Probe results
+are cached, so requests do not wait for a probe of every MCP server.
 """
 
 import asyncio
+import hashlib
+import time
+from asyncio import Task
 from collections.abc import Mapping
+from dataclasses import dataclass
 from typing import Optional
 
 import aiohttp
+from cachetools import TLRUCache
 from fastapi import HTTPException
 
 import constants
 from configuration import AppConfig
 from log import get_logger
 from models.api.responses import UnauthorizedResponse
+from utils.http_clients import get_http_session
 from utils.mcp_headers import McpHeaders, build_mcp_headers
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class McpProbeResult:
+    """Outcome of an OAuth probe of an MCP server.
+
+    Attributes:
+        authorized: True when the server did not require authentication.
+        www_authenticate: WWW-Authenticate header returned with 401, if any.
+        probed_at: Monotonic time of the probe.
+        ttl: Seconds the result is valid for.
+    """
+
+    authorized: bool
+    www_authenticate: Optional[str]
+    probed_at: float
+    ttl: float
+
+
+class McpProbeCache:
+    """Cache of OAuth probe results of MCP servers.
+
+    Results are keyed by the server URL and a hash of the Authorization
+    header sent with the probe, so a client presenting new credentials is
+    probed again. Servers not requiring authentication are probed again in
+    background shortly before their result expires; results requiring
+    authentication and failed probes are kept only briefly. Concurrent
+    requests share one probe, and all probes use one shared HTTP session.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self.ttl = constants.MCP_OAUTH_PROBE_CACHE_TTL_SECONDS
+        self.negative_ttl = constants.MCP_OAUTH_PROBE_NEGATIVE_CACHE_TTL_SECONDS
+        self.refresh_ahead = constants.MCP_OAUTH_PROBE_REFRESH_AHEAD_SECONDS
+        self._results: TLRUCache[tuple[str, bytes], McpProbeResult] = TLRUCache(
+            maxsize=constants.MCP_OAUTH_PROBE_CACHE_MAX_SIZE,
+            ttu=lambda _key, result, _now: result.probed_at + result.ttl,
+            timer=time.monotonic,
+        )
+        self._probes: dict[tuple[str, bytes], Task[McpProbeResult]] = {}
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        for task in self._probes.values():
+            task.cancel()
+        self._probes.clear()
+        self._results.clear()
+
+    async def result(self, url: str, authorization: Optional[str]) -> McpProbeResult:
+        """Return the probe result of the server, probing it when not cached.
+
+        Parameters:
+        ----------
+            url: MCP server URL to probe.
+            authorization: Optional Authorization header value for the probe request.
+
+        Returns:
+        -------
+            McpProbeResult: Cached or new probe result.
+        """
+        key = (url, hashlib.sha256((authorization or "").encode("utf-8")).digest())
+        cached = self._results.get(key)
+        if cached is not None:
+            age = time.monotonic() - cached.probed_at
+            if cached.authorized and age >= self.ttl - self.refresh_ahead:
+                self._start_probe(key, url, authorization)
+            return cached
+        # a cancelled request must not cancel the probe shared with others
+        return await asyncio.shield(self._start_probe(key, url, authorization))
+
+    def _start_probe(
+        self, key: tuple[str, bytes], url: str, authorization: Optional[str]
+    ) -> Task[McpProbeResult]:
+        """Probe the server unless it is already being probed."""
+        task = self._probes.get(key)
+        if task is None:
+            task = asyncio.create_task(self._probe(key, url, authorization))
+            self._probes[key] = task
+            task.add_done_callback(lambda _: self._probes.pop(key, None))
+        return task
+
+    async def _probe(
+        self, key: tuple[str, bytes], url: str, authorization: Optional[str]
+    ) -> McpProbeResult:
+        """Probe the server and cache the result."""
+        headers: Optional[dict[str, str]] = (
+            {"authorization": authorization} if authorization is not None else None
+        )
+        authorized = False
+        www_auth: Optional[str] = None
+        try:
+            async with get_http_session(constants.HTTP_CLIENT_MCP_OAUTH_PROBE).get(
+                url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(
+                    total=constants.MCP_OAUTH_PROBE_TIMEOUT_SECONDS
+                ),
+            ) as resp:
+                if resp.status != 401:
+                    authorized = True
+                else:
+                    www_auth = resp.headers.get("WWW-Authenticate")
+                    if www_auth is None:
+                        logger.warning(
+                            "No WWW-Authenticate header received from %s", url
+                        )
+        except (aiohttp.ClientError, TimeoutError) as probe_err:
+            logger.warning("OAuth probe failed for %s: %s", url, probe_err)
+        result = McpProbeResult(
+            authorized=authorized,
+            www_authenticate=www_auth,
+            probed_at=time.monotonic(),
+            ttl=self.ttl if authorized else self.negative_ttl,
+        )
+        self._results[key] = result
+        return result
+
+
+# Global cache of probe results shared by all requests.
+_probe_cache = McpProbeCache()
+
+
 async def check_mcp_auth(
     configuration: AppConfig,
     mcp_headers: McpHeaders,
@@ -82,7 +210,8 @@ async def probe_mcp(
 ) -> None:
     """Probe MCP endpoint and raise 401 so the client can perform OAuth.
 
-    Performs an async GET to the given URL. If the response is 401 with
+    Performs an async GET to the given URL, unless a result of an earlier
+    probe with the same authorization is cached. If the response is 401 with
     WWW-Authenticate, raises HTTPException with that header. If the response
     is 401 without the header, or the probe fails (connection error, timeout),
     raises 401 without WWW-Authenticate.
@@ -103,25 +232,14 @@ async def probe_mcp(
             and includes that header; 401 without the header when the server
             returns 401 without it or when the probe fails (timeout/connection).
     """
+    result = await _probe_cache.result(url, authorization)
+    if result.authorized:
+        return
     cause = f"MCP server at {url} requires OAuth"
     error_response = UnauthorizedResponse(cause=cause)
-    headers: Optional[dict[str, str]] = (
-        {"authorization": authorization} if authorization is not None else None
+    if result.www_authenticate is None:
+        raise HTTPException(**error_response.model_dump())
+    raise HTTPException(
+        **error_response.model_dump(),
+        headers={"WWW-Authenticate": result.www_authenticate},
     )
-    try:
-        timeout = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 401:
-                    return
-                www_auth = resp.headers.get("WWW-Authenticate")
-                if www_auth is None:
-                    logger.warning("No WWW-Authenticate header received from %s", url)
-                    raise HTTPException(**error_response.model_dump())
-                raise HTTPException(
-                    **error_response.model_dump(),
-                    headers={"WWW-Authenticate": www_auth},
-                )
-    except (aiohttp.ClientError, TimeoutError) as probe_err:
-        logger.warning("OAuth probe failed for %s: %s", url, probe_err)
-        raise HTTPException(**error_response.model_dump()) from probe_err
@@ -0,0 +1,258 @@
+"""Precompiled MCP tools of configured MCP servers.
+
+Each request used to walk all configured MCP servers, resolve their headers
+from configuration and validate a new MCP tool for every server. Everything
+except client-supplied headers, the kubernetes token and headers propagated
+from the request depends only on configuration, so it is compiled into a
+plan once per server: when the configuration is loaded and when a server is
+registered dynamically. Requests only merge their own headers into the plan.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Optional
+
+from llama_stack_api.openai_responses import (
+    OpenAIResponseInputToolMCP as InputToolMCP,
+)
+
+import constants
+from log import get_logger
+from models.config import ModelContextProtocolServer
+from utils.types import Singleton
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class McpToolPlan:  # pylint: disable=too-many-instance-attributes
+    """Request independent parts of the MCP tool of one server.
+
+    Attributes:
+        server: MCP server the plan was compiled from.
+        static_headers: Authorization headers resolved from configuration.
+        static_names: Lowercase names of the static headers.
+        kubernetes_headers: Headers set to the kubernetes Bearer token.
+        required_headers: Lowercase names of authorization headers that have
+            to be supplied per request (kubernetes, client and oauth ones).
+        propagated_headers: Allowlisted request headers as (name, lowercase
+            name) pairs.
+        template: Tool with the static headers only; shared, never modified.
+    """
+
+    server: ModelContextProtocolServer
+    static_headers: dict[str, str]
+    static_names: frozenset[str]
+    kubernetes_headers: tuple[str, ...]
+    required_headers: frozenset[str]
+    propagated_headers: tuple[tuple[str, str], ...]
+    template: InputToolMCP
+
+    def headers(
+        self,
+        client_headers: Mapping[str, str],
+        request_headers: Optional[Mapping[str, str]],
+        token: Optional[str],
+    ) -> dict[str, str]:
+        """Merge request headers into the static headers of the server.
+
+        Sources in priority order (highest first) are the same as in
+        utils.mcp_headers.build_server_headers: client-supplied headers,
+        static authorization headers, the kubernetes Bearer token and headers
+        propagated from the request.
+
+        Parameters:
+        ----------
+            client_headers: Headers supplied by the client for this server.
+            request_headers: Incoming request headers with lowercase names,
+                or None when not available.
+            token: Optional Kubernetes service-account token.
+
+        Returns:
+        -------
+            dict[str, str]: Merged headers for the server.
+        """
+        headers = dict(client_headers)
+        existing = {name.lower() for name in headers}
+        for name, value in self.static_headers.items():
+            if name.lower() not in existing:
+                headers[name] = value
+        existing |= self.static_names
+        if token:
+            for name in self.kubernetes_headers:
+                if name.lower() not in existing:
+                    headers[name] = f"Bearer {token}"
+                    existing.add(name.lower())
+        if request_headers is not None:
+            for name, lower_name in self.propagated_headers:
+                header_value = request_headers.get(lower_name)
+                if header_value is not None and lower_name not in existing:
+                    headers[name] = header_value
+                    existing.add(lower_name)
+        return headers
+
+    def unresolved_headers(self, headers: Mapping[str, str]) -> frozenset[str]:
+        """Return required authorization headers missing from merged headers.
+
+        Parameters:
+        ----------
+            headers: Headers merged for one request.
+
+        Returns:
+        -------
+            frozenset[str]: Lowercase names of the missing headers; empty when
+            all required headers were resolved.
+        """
+        return self.required_headers - {name.lower() for name in headers}
+
+    def tool(
+        self,
+        client_headers: Mapping[str, str],
+        request_headers: Optional[Mapping[str, str]],
+        token: Optional[str],
+    ) -> Optional[InputToolMCP]:
+        """Return the MCP tool of the server for one request.
+
+        Parameters:
+        ----------
+            client_headers: Headers supplied by the client for this server.
+            request_headers: Incoming request headers with lowercase names,
+                or None when not available.
+            token: Optional Kubernetes service-account token.
+
+        Returns:
+        -------
+            Optional[InputToolMCP]: The tool, or None when an authorization
+            header required by the server could not be resolved.
+        """
+        if (
+            not client_headers
+            and not (token and self.kubernetes_headers)
+            and not (request_headers and self.propagated_headers)
+        ):
+            # nothing depends on the request
+            headers: dict[str, str] = self.static_headers
+            if not self.required_headers:
+                return self.template
+        else:
+            headers = self.headers(client_headers, request_headers, token)
+
+        unresolved = self.unresolved_headers(headers)
+        if unresolved:
+            logger.warning(
+                "Skipping MCP server %s: required %d auth headers but only resolved %d",
+                self.server.name,
+                len(self.server.authorization_headers),
+                len(self.server.authorization_headers) - len(unresolved),
+            )
+            return None
+        headers = dict(headers)
+        authorization = headers.pop("Authorization", None)
+        return self.template.model_copy(
+            update={"headers": headers or None, "authorization": authorization}
+        )
+
+
+def compile_mcp_tool_plan(server: ModelContextProtocolServer) -> McpToolPlan:
+    """Compile the request independent parts of the MCP tool of a server.
+
+    Parameters:
+    ----------
+        server: MCP server configuration.
+
+    Returns:
+    -------
+        McpToolPlan: The compiled plan.
+    """
+    static_headers: dict[str, str] = {}
+    kubernetes_headers: list[str] = []
+    required_headers: set[str] = set()
+    for name, value in server.resolved_authorization_headers.items():
+        match value:
+            case constants.MCP_AUTH_KUBERNETES:
+                kubernetes_headers.append(name)
+                required_headers.add(name.lower())
+            case constants.MCP_AUTH_CLIENT | constants.MCP_AUTH_OAUTH:
+                required_headers.add(name.lower())
+            case _:
+                static_headers[name] = value
+    # headers configured but not resolved from their secret files stay required
+    for name in server.authorization_headers:
+        if name not in server.resolved_authorization_headers:
+            required_headers.add(name.lower())
+
+    template_headers = dict(static_headers)
+    authorization = template_headers.pop("Authorization", None)
+    return McpToolPlan(
+        server=server,
+        static_headers=static_headers,
+        static_names=frozenset(name.lower() for name in static_headers),
+        kubernetes_headers=tuple(kubernetes_headers),
+        required_headers=frozenset(required_headers),
+        propagated_headers=tuple((name, name.lower()) for name in server.headers),
+        template=InputToolMCP(
+            type="mcp",
+            server_label=server.name,
+            server_url=server.url,
+            require_approval="never",
+            headers=template_headers or None,
+            authorization=authorization,
+        ),
+    )
+
+
+class McpToolPlans(metaclass=Singleton):
+    """Compiled MCP tool plans keyed by MCP server name."""
+
+    def __init__(self) -> None:
+        """Initialize without plans."""
+        self._plans: dict[str, McpToolPlan] = {}
+
+    def plan(self, server: ModelContextProtocolServer) -> McpToolPlan:
+        """Return the plan of the server, compiling it when missing or stale.
+
+        Parameters:
+        ----------
+            server: MCP server configuration.
+
+        Returns:
+        -------
+            McpToolPlan: The compiled plan.
+        """
+        plan = self._plans.get(server.name)
+        if plan is None or plan.server is not server:
+            plan = self.compile_server(server)
+        return plan
+
+    def compile_server(self, server: ModelContextProtocolServer) -> McpToolPlan:
+        """Compile the plan of a new or changed server.
+
+        Parameters:
+        ----------
+            server: MCP server configuration.
+
+        Returns:
+        -------
+            McpToolPlan: The compiled plan.
+        """
+        plan = compile_mcp_tool_plan(server)
+        self._plans[server.name] = plan
+        return plan
+
+    def compile(self, servers: list[ModelContextProtocolServer]) -> None:
+        """Replace all plans with plans of the servers.
+
+        Parameters:
+        ----------
+            servers: Configured MCP servers.
+        """
+        self._plans = {server.name: compile_mcp_tool_plan(server) for server in servers}
+
+    def discard(self, name: str) -> None:
+        """Drop the plan of a removed server.
+
+        Parameters:
+        ----------
+            name: MCP server name.
+        """
+        self._plans.pop(name, None)
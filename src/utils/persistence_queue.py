@@ -0,0 +1,584 @@
+"""Write-behind queue for persisting the results of streamed queries.
+
+Results of a finished query (transcript, conversation and turn rows,
+conversation cache entry and token usage history) are handed over to an
+in-process worker, so the streaming response can be closed right after the
+end event is sent. The worker groups records of concurrent requests into
+batches and stores conversation and turn rows of a whole batch in a single
+transaction; cache entries and token usage of a batch are written at once
+too. Blocking writes run in a worker thread, so they do not stall the event
+loop serving the streams.
+
+When a spool directory is configured, each record is written to disk before
+it is queued and removed once persisted, so records accepted before a crash
+are replayed on the next start. Each worker spools to its own subdirectory
+locked for its lifetime, so workers sharing the spool directory replay only
+records of workers that are gone. Steps already applied to a record are
+stored in its spool file and skipped on replay.
+"""
+
+import asyncio
+import fcntl
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy.orm import Session
+
+import constants
+from app.database import run_in_session
+from configuration import configuration
+from log import get_logger
+from models.cache_entry import CacheEntry
+from models.config import PersistenceQueueConfiguration
+from models.requests import Attachment
+from utils.query import (
+    add_user_conversation_details,
+    create_cache_entry,
+    extract_provider_and_model_from_model_id,
+    persist_user_conversation_details,
+    store_conversation_into_cache,
+    store_conversations_into_cache,
+    store_query_transcript,
+)
+from utils.suid import get_suid, normalize_conversation_id
+from utils.types import Singleton, TurnSummary
+
+logger = get_logger(__name__)
+
+PersistenceStep = Literal["transcript", "conversation", "cache", "token_usage"]
+
+
+class QueryResultsRecord(BaseModel):
+    """Results of a single query waiting to be persisted."""
+
+    user_id: str
+    conversation_id: str
+    model: str
+    started_at: str
+    completed_at: str
+    summary: TurnSummary
+    query: str
+    skip_userid_check: bool
+    attachments: Optional[list[Attachment]] = None
+    topic_summary: Optional[str] = None
+    record_token_usage: bool = Field(
+        default=True,
+        description="Whether token usage history has to be recorded for the query",
+    )
+    applied: list[PersistenceStep] = Field(
+        default_factory=list,
+        description="Persistence steps already applied, skipped when replayed",
+    )
+
+
+class PersistenceQueue(metaclass=Singleton):
+    """Bounded write-behind queue with a single batching worker."""
+
+    def __init__(self) -> None:
+        """Initialize the queue in the stopped state."""
+        self._config = PersistenceQueueConfiguration()
+        self._queue: Optional[asyncio.Queue[tuple[QueryResultsRecord, Optional[Path]]]]
+        self._queue = None
+        self._worker: Optional[asyncio.Task[None]] = None
+        self._pending: Counter[str] = Counter()
+        self._persisted: Optional[asyncio.Condition] = None
+        self._spool_dir: Optional[Path] = None
+        self._spool_lock: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        """Check whether records are accepted by the queue."""
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self, config: PersistenceQueueConfiguration) -> None:
+        """Start the worker and replay records left in the spool directory.
+
+        Parameters:
+        ----------
+            config: Persistence queue configuration.
+        """
+        if self.running:
+            return
+        self._config = config
+        if not config.enabled:
+            logger.info(
+                "Persistence queue is disabled, query results are stored inline"
+            )
+            return
+        self._queue = asyncio.Queue(maxsize=config.max_size)
+        self._persisted = asyncio.Condition()
+        self._pending.clear()
+        self._worker = asyncio.create_task(self._run())
+
+        self._claim_spool_dir()
+        for path in self._spooled_files():
+            try:
+                record = QueryResultsRecord.model_validate_json(
+                    path.read_text(encoding="utf-8")
+                )
+            except (OSError, ValidationError):
+                logger.exception("Unable to replay spooled query results %s", path)
+                continue
+            logger.info("Replaying spooled query results %s", path)
+            await self._enqueue(record, path)
+
+    async def stop(self) -> None:
+        """Persist all queued records and stop the worker.
+
+        Records left in the queue by a worker that died are persisted inline.
+        """
+        if self._worker is None or self._queue is None:
+            return
+        if self.running:
+            await self._queue.join()
+        elif not self._worker.cancelled() and self._worker.exception() is not None:
+            logger.error(
+                "Persistence queue worker died, %d queued records are stored inline",
+                self._queue.qsize(),
+                exc_info=self._worker.exception(),
+            )
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        leftovers: list[tuple[QueryResultsRecord, Optional[Path]]] = []
+        while not self._queue.empty():
+            leftovers.append(self._queue.get_nowait())
+        if leftovers:
+            try:
+                await self._persist_batch(leftovers)
+            finally:
+                await self._release(leftovers)
+        self._worker = None
+        self._queue = None
+        self._release_spool_dir()
+        logger.info("Persistence queue stopped")
+
+    async def submit(self, record: QueryResultsRecord) -> None:
+        """Hand over query results to be persisted in background.
+
+        The record is spooled to disk first when a spool directory is
+        configured. When the queue is full, the record is persisted inline so
+        the memory used by the queue stays bounded.
+
+        Parameters:
+        ----------
+            record: Query results to be persisted.
+        """
+        spool_file = self._spool(record)
+        if not self.running:
+            await self._persist_batch([(record, spool_file)])
+            return
+        await self._enqueue(record, spool_file)
+
+    async def wait_until_persisted(
+        self,
+        conversation_id: str,
+        timeout: float = constants.PERSISTENCE_QUEUE_READ_WAIT_SECONDS,
+    ) -> None:
+        """Wait until queued records of the conversation are persisted.
+
+        Lets readers of a conversation see the turn that was just streamed.
+
+        Parameters:
+        ----------
+            conversation_id: The conversation ID.
+            timeout: Maximum number of seconds to wait.
+        """
+        normalized_id = normalize_conversation_id(conversation_id)
+        if self._persisted is None or not self._pending[normalized_id]:
+            return
+        try:
+            async with self._persisted:
+                await asyncio.wait_for(
+                    self._persisted.wait_for(lambda: not self._pending[normalized_id]),
+                    timeout,
+                )
+        except TimeoutError:
+            logger.warning(
+                "Queued results of conversation %s not persisted in %s seconds",
+                normalized_id,
+                timeout,
+            )
+
+    async def _enqueue(
+        self, record: QueryResultsRecord, spool_file: Optional[Path]
+    ) -> None:
+        """Put the record to the queue or persist it inline when full."""
+        assert self._queue is not None
+        try:
+            self._queue.put_nowait((record, spool_file))
+        except asyncio.QueueFull:
+            logger.warning("Persistence queue is full, storing query results inline")
+            await self._persist_batch([(record, spool_file)])
+            return
+        self._pending[normalize_conversation_id(record.conversation_id)] += 1
+
+    async def _run(self) -> None:
+        """Take batches of records from the queue and persist them."""
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._config.batch_wait_ms / 1000
+            while len(batch) < self._config.batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except TimeoutError:
+                    break
+            try:
+                await self._persist_batch(batch)
+            except Exception:  # pylint: disable=broad-except
+                # the worker has to survive, otherwise queued records are lost
+                logger.exception(
+                    "Error persisting batch of %d query results", len(batch)
+                )
+            finally:
+                await self._release(batch)
+
+    async def _release(
+        self, batch: list[tuple[QueryResultsRecord, Optional[Path]]]
+    ) -> None:
+        """Mark records of the batch as done and wake up waiting readers."""
+        assert self._queue is not None and self._persisted is not None
+        for record, _ in batch:
+            normalized_id = normalize_conversation_id(record.conversation_id)
+            self._pending[normalized_id] -= 1
+            if self._pending[normalized_id] <= 0:
+                del self._pending[normalized_id]
+            self._queue.task_done()
+        async with self._persisted:
+            self._persisted.notify_all()
+
+    async def _persist_batch(
+        self, batch: list[tuple[QueryResultsRecord, Optional[Path]]]
+    ) -> None:
+        """Persist a batch of records; failures are logged, never raised.
+
+        Spool files are deleted only for records whose conversation details
+        were committed, so the others are replayed on the next start. Their
+        spool files are updated with the steps already applied.
+        """
+        records = [record for record, _ in batch]
+        logger.debug("Persisting batch of %d query results", len(records))
+
+        await asyncio.to_thread(_store_transcripts, records)
+        await _persist_conversation_details(records)
+        await asyncio.to_thread(_store_cache_entries, records)
+        await asyncio.to_thread(_record_token_usage, records)
+
+        for record, spool_file in batch:
+            if spool_file is None:
+                continue
+            try:
+                if "conversation" in record.applied:
+                    spool_file.unlink(missing_ok=True)
+                else:
+                    _write_spool_file(spool_file, record)
+            except OSError:
+                logger.exception(
+                    "Unable to update spooled query results %s", spool_file
+                )
+
+    def _spool(self, record: QueryResultsRecord) -> Optional[Path]:
+        """Write the record to the spool directory of the worker if there is one."""
+        if self._spool_dir is None or not self._config.enabled:
+            return None
+        # suffix keeps files of records spooled within the same second ordered
+        spool_file = self._spool_dir / f"{record.completed_at}-{get_suid()}.json"
+        try:
+            _write_spool_file(spool_file, record)
+        except OSError:
+            logger.exception("Unable to spool query results to %s", spool_file)
+            return None
+        return spool_file
+
+    def _spooled_files(self) -> list[Path]:
+        """Return records left in the spool directory of the worker, oldest first."""
+        if self._spool_dir is None:
+            return []
+        return sorted(self._spool_dir.glob("*.json"))
+
+    def _claim_spool_dir(self) -> None:
+        """Create and lock the spool directory of the worker.
+
+        Records left by workers that are gone (their directory is not locked)
+        and records spooled directly to the spool directory are moved to the
+        directory of the worker, so they are replayed exactly once.
+        """
+        if self._config.spool_path is None:
+            return
+        root = Path(self._config.spool_path)
+        name = get_suid()
+        # the directory is locked before it gets its final name, so other
+        # workers never see it unlocked
+        new_dir = root / f".{name}"
+        lock = None
+        try:
+            new_dir.mkdir(parents=True)
+            lock = os.open(new_dir / ".lock", os.O_RDWR | os.O_CREAT)
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            new_dir.rename(root / name)
+        except OSError:
+            logger.exception("Unable to create spool directory in %s", root)
+            if lock is not None:
+                os.close(lock)
+            return
+        self._spool_dir = root / name
+        self._spool_lock = lock
+
+        _move_spool_files(list(root.glob("*.json")), self._spool_dir)
+        for path in root.iterdir():
+            if (
+                path.is_dir()
+                and not path.name.startswith(".")
+                and path != self._spool_dir
+            ):
+                _adopt_spool_dir(path, self._spool_dir)
+
+    def _release_spool_dir(self) -> None:
+        """Unlock the spool directory of the worker, removing it when empty."""
+        if self._spool_dir is None or self._spool_lock is None:
+            return
+        try:
+            if not any(self._spool_dir.glob("*.json")):
+                (self._spool_dir / ".lock").unlink(missing_ok=True)
+                self._spool_dir.rmdir()
+        except OSError:
+            logger.warning("Unable to remove spool directory %s", self._spool_dir)
+        finally:
+            os.close(self._spool_lock)
+            self._spool_dir = None
+            self._spool_lock = None
+
+
+def _write_spool_file(spool_file: Path, record: QueryResultsRecord) -> None:
+    """Write the record to the spool file, replacing it atomically."""
+    spool_file.parent.mkdir(parents=True, exist_ok=True)
+    temporary_file = spool_file.with_suffix(".tmp")
+    temporary_file.write_text(record.model_dump_json(), encoding="utf-8")
+    temporary_file.replace(spool_file)
+
+
+def _move_spool_files(paths: list[Path], spool_dir: Path) -> None:
+    """Move spooled records to the spool directory of the worker."""
+    for path in paths:
+        try:
+            path.rename(spool_dir / path.name)
+        except FileNotFoundError:
+            # adopted by another worker meanwhile
+            continue
+        except OSError:
+            logger.exception("Unable to adopt spooled query results %s", path)
+
+
+def _adopt_spool_dir(path: Path, spool_dir: Path) -> None:
+    """Move records of a worker that is gone to the spool directory.
+
+    The directory of a running worker is locked, so it is left untouched.
+    """
+    try:
+        lock = os.open(path / ".lock", os.O_RDWR | os.O_CREAT)
+    except OSError:
+        logger.exception("Unable to open spool directory %s", path)
+        return
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        # locked by a running worker
+        os.close(lock)
+        return
+    try:
+        _move_spool_files(list(path.glob("*.json")), spool_dir)
+        logger.info("Adopted spooled query results of %s", path)
+        for leftover in path.iterdir():
+            leftover.unlink()
+        path.rmdir()
+    except OSError:
+        logger.exception("Unable to remove spool directory %s", path)
+    finally:
+        os.close(lock)
+
+
+def _store_transcripts(records: list[QueryResultsRecord]) -> None:
+    """Store transcripts of the records not stored yet."""
+    for record in records:
+        if "transcript" in record.applied:
+            continue
+        try:
+            store_query_transcript(
+                user_id=record.user_id,
+                conversation_id=record.conversation_id,
+                model=record.model,
+                summary=record.summary,
+                query=record.query,
+                attachments=record.attachments,
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                "Error storing transcript of conversation %s",
+                record.conversation_id,
+            )
+            continue
+        record.applied.append("transcript")
+
+
+async def _persist_conversation_details(records: list[QueryResultsRecord]) -> None:
+    """Store conversation and turn rows of all records in one transaction.
+
+    Records whose rows were committed already are skipped. When the grouped
+    transaction fails, the records are stored one by one so a single bad
+    record does not lose the others.
+    """
+    records = [record for record in records if "conversation" not in record.applied]
+    if not records:
+        return
+
+    def _add_all(session: Session) -> None:
+        for record in records:
+            provider_id, model_id = extract_provider_and_model_from_model_id(
+                record.model
+            )
+            add_user_conversation_details(
+                session,
+                user_id=record.user_id,
+                normalized_id=normalize_conversation_id(record.conversation_id),
+                started_at=record.started_at,
+                completed_at=record.completed_at,
+                model_id=model_id,
+                provider_id=provider_id,
+                topic_summary=record.topic_summary,
+                response_id=record.summary.id,
+            )
+        session.commit()
+
+    try:
+        await run_in_session(_add_all)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception(
+            "Error persisting batch of %d conversations, retrying one by one",
+            len(records),
+        )
+    else:
+        for record in records:
+            record.applied.append("conversation")
+        return
+
+    for record in records:
+        provider_id, model_id = extract_provider_and_model_from_model_id(record.model)
+        try:
+            await persist_user_conversation_details(
+                user_id=record.user_id,
+                conversation_id=record.conversation_id,
+                started_at=record.started_at,
+                completed_at=record.completed_at,
+                model_id=model_id,
+                provider_id=provider_id,
+                topic_summary=record.topic_summary,
+                response_id=record.summary.id,
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                "Error persisting conversation details of %s", record.conversation_id
+            )
+            continue
+        record.applied.append("conversation")
+
+
+def _store_cache_entries(records: list[QueryResultsRecord]) -> None:
+    """Store conversation cache entries of the records not stored yet.
+
+    When the entries cannot be stored at once, they are stored one by one.
+    """
+    records = [record for record in records if "cache" not in record.applied]
+    if not records:
+        return
+    try:
+        store_conversations_into_cache(
+            [
+                (
+                    record.user_id,
+                    record.conversation_id,
+                    _cache_entry(record),
+                    record.skip_userid_check,
+                    record.topic_summary,
+                )
+                for record in records
+            ]
+        )
+    except Exception:  # pylint: disable=broad-except
+        logger.exception(
+            "Error storing %d conversations in cache, retrying one by one",
+            len(records),
+        )
+    else:
+        for record in records:
+            record.applied.append("cache")
+        return
+
+    for record in records:
+        try:
+            store_conversation_into_cache(
+                user_id=record.user_id,
+                conversation_id=record.conversation_id,
+                cache_entry=_cache_entry(record),
+                skip_userid_check=record.skip_userid_check,
+                topic_summary=record.topic_summary,
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                "Error storing conversation %s in cache", record.conversation_id
+            )
+            continue
+        record.applied.append("cache")
+
+
+def _cache_entry(record: QueryResultsRecord) -> CacheEntry:
+    """Create the conversation cache entry of the record."""
+    return create_cache_entry(
+        model=record.model,
+        started_at=record.started_at,
+        completed_at=record.completed_at,
+        summary=record.summary,
+        query=record.query,
+    )
+
+
+def _record_token_usage(records: list[QueryResultsRecord]) -> None:
+    """Record token usage of the records not recorded yet in one batch."""
+    token_usage_history = configuration.token_usage_history
+    if token_usage_history is None:
+        return
+    records = [
+        record
+        for record in records
+        if record.record_token_usage and "token_usage" not in record.applied
+    ]
+    if not records:
+        return
+    usages = []
+    for record in records:
+        provider_id, model_id = extract_provider_and_model_from_model_id(record.model)
+        usages.append(
+            (
+                record.user_id,
+                provider_id,
+                model_id,
+                record.summary.token_usage.input_tokens,
+                record.summary.token_usage.output_tokens,
+            )
+        )
+    try:
+        token_usage_history.consume_tokens_batch(usages)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error recording token usage of %d queries", len(records))
+        return
+    for record in records:
+        record.applied.append("token_usage")
@@ -0,0 +1,422 @@
+"""Shared pools of PostgreSQL connections.
+
+The conversation cache, quota limiters and token usage history used to hold
+one psycopg2 connection each, shared by all concurrent requests of the worker.
+They now get a `PooledConnection` instead: an object with the subset of the
+psycopg2 connection interface these classes use, which borrows a connection
+from a shared pool for the lifetime of each cursor.
+
+Pools are keyed by connection parameters, so all components connecting to
+the same database with the same parameters share one pool.
+"""
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from threading import Condition, Event, Lock, Thread
+from time import monotonic
+from typing import Any, Optional
+
+import psycopg2
+from psycopg2.pool import PoolError
+
+from log import get_logger
+from metrics.recording import (
+    record_postgres_pool_acquire,
+    record_postgres_pool_acquire_timeout,
+    record_postgres_pool_connections,
+)
+from models.config import PostgreSQLDatabaseConfiguration, PostgreSQLPoolConfiguration
+
+logger = get_logger(__name__)
+
+# errors after which a connection can not be used anymore
+CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+class PostgresConnectionPool:  # pylint: disable=too-many-instance-attributes
+    """Thread-safe pool of PostgreSQL connections in autocommit mode.
+
+    Connections are opened on demand up to the maximum pool size. Connections
+    older than the maximum lifetime are replaced, and connections that failed
+    with a connection error are discarded instead of being returned to the pool.
+    When a health check interval is configured, a background thread
+    periodically pings idle connections and closes the broken ones.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connect_kwargs: dict[str, Any],
+        config: PostgreSQLPoolConfiguration,
+    ) -> None:
+        """Create the pool and open the minimum number of connections.
+
+        Parameters:
+        ----------
+            name: Pool name used in logs and metrics.
+            connect_kwargs: Keyword arguments passed to psycopg2.connect.
+            config: Pool size, lifetime and timeout settings.
+
+        Raises:
+        ------
+            psycopg2.Error: If opening the initial connections fails.
+        """
+        self.name = name
+        self.config = config
+        self._connect_kwargs = connect_kwargs
+        self._condition = Condition()
+        # idle connections with their creation time, most recently used last
+        self._idle: deque[tuple[Any, float]] = deque()
+        self._in_use = 0
+        # number of open connections, including ones being opened
+        self._size = 0
+        self._closed = False
+        self._stopped = Event()
+        self._health_checker: Optional[Thread] = None
+        try:
+            for _ in range(config.min_size):
+                self._idle.append(self._open())
+                self._size += 1
+        except Exception:
+            self.close()
+            raise
+        self._record_connections()
+        if config.health_check_interval is not None:
+            self._health_checker = Thread(
+                target=self._run_health_checks,
+                name=f"postgres-pool-health-{name}",
+                daemon=True,
+            )
+            self._health_checker.start()
+
+    def _open(self) -> tuple[Any, float]:
+        """Open a new connection in autocommit mode."""
+        logger.info("Opening connection for PostgreSQL pool %s", self.name)
+        connection = psycopg2.connect(**self._connect_kwargs)
+        connection.autocommit = True
+        return connection, monotonic()
+
+    def _expired(self, created_at: float) -> bool:
+        """Check if a connection outlived the maximum lifetime."""
+        return monotonic() - created_at > self.config.max_lifetime
+
+    def _record_connections(self) -> None:
+        """Export the number of idle and used connections."""
+        record_postgres_pool_connections(self.name, len(self._idle), self._in_use)
+
+    def getconn(self) -> tuple[Any, float]:
+        """Borrow a connection from the pool.
+
+        Returns:
+        -------
+            The connection and its creation time, both to be passed to putconn.
+
+        Raises:
+        ------
+            PoolError: If the pool is closed or no connection is free within
+            the acquire timeout.
+            psycopg2.Error: If opening a new connection fails.
+        """
+        started_at = monotonic()
+        deadline = started_at + self.config.acquire_timeout
+        to_close = []
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise PoolError(f"PostgreSQL pool {self.name} is closed")
+                connection = None
+                created_at = 0.0
+                while self._idle:
+                    connection, created_at = self._idle.pop()
+                    if not self._expired(created_at):
+                        break
+                    to_close.append(connection)
+                    self._size -= 1
+                    connection = None
+                if connection is not None:
+                    self._in_use += 1
+                    self._record_connections()
+                    break
+                if self._size < self.config.max_size:
+                    # reserve the slot, the connection is opened without the lock
+                    self._size += 1
+                    break
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    record_postgres_pool_acquire_timeout(self.name)
+                    raise PoolError(
+                        f"No connection of PostgreSQL pool {self.name} was free "
+                        f"within {self.config.acquire_timeout} seconds"
+                    )
+                self._condition.wait(remaining)
+        for expired in to_close:
+            _close_quietly(expired)
+        if connection is None:
+            try:
+                connection, created_at = self._open()
+            except BaseException:
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._in_use += 1
+                self._record_connections()
+        record_postgres_pool_acquire(self.name, monotonic() - started_at)
+        return connection, created_at
+
+    def putconn(
+        self, connection: Any, created_at: float, discard: bool = False
+    ) -> None:
+        """Return a borrowed connection to the pool.
+
+        Parameters:
+        ----------
+            connection: Connection returned by getconn.
+            created_at: Creation time returned by getconn.
+            discard: Close the connection instead of reusing it, e.g. after
+                a connection error.
+        """
+        with self._condition:
+            self._in_use -= 1
+            keep = not (discard or self._closed or self._expired(created_at))
+            if keep:
+                self._idle.append((connection, created_at))
+            else:
+                self._size -= 1
+            self._record_connections()
+            self._condition.notify()
+        if not keep:
+            _close_quietly(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for the duration of the with block.
+
+        Yields:
+        ------
+            A psycopg2 connection in autocommit mode.
+        """
+        connection, created_at = self.getconn()
+        discard = False
+        try:
+            yield connection
+        except CONNECTION_ERRORS:
+            discard = True
+            raise
+        finally:
+            self.putconn(connection, created_at, discard)
+
+    def check_idle_connections(self) -> None:
+        """Ping idle connections, closing the ones that are broken or expired.
+
+        Idle connections are borrowed for the duration of the check, so they
+        are not handed out while being pinged.
+        """
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._in_use += len(idle)
+        for connection, created_at in idle:
+            broken = False
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning(
+                    "Closing broken connection of PostgreSQL pool %s: %s", self.name, e
+                )
+                broken = True
+            self.putconn(connection, created_at, discard=broken)
+
+    def _run_health_checks(self) -> None:
+        """Check idle connections periodically until the pool is closed."""
+        while not self._stopped.wait(self.config.health_check_interval):
+            self.check_idle_connections()
+
+    def close(self) -> None:
+        """Close idle connections; borrowed connections are closed when returned."""
+        self._stopped.set()
+        with self._condition:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._record_connections()
+            self._condition.notify_all()
+        for connection in idle:
+            _close_quietly(connection)
+
+
+class PooledCursor:
+    """Cursor holding a pooled connection until the cursor is closed."""
+
+    def __init__(
+        self,
+        pool: PostgresConnectionPool,
+        connection: Any,
+        created_at: float,
+        cursor: Any,
+    ) -> None:
+        """Wrap a cursor of a connection borrowed from the pool."""
+        self._pool = pool
+        self._connection = connection
+        self._created_at = created_at
+        self._cursor = cursor
+        self._broken = False
+        self._released = False
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else (fetchone, rowcount, ...) to the cursor."""
+        return getattr(self._cursor, name)
+
+    def execute(self, *args: Any, **kwargs: Any) -> Any:
+        """Execute a statement, remembering connection errors."""
+        try:
+            return self._cursor.execute(*args, **kwargs)
+        except CONNECTION_ERRORS:
+            self._broken = True
+            raise
+
+    def close(self) -> None:
+        """Close the cursor and return the connection to the pool."""
+        if self._released:
+            return
+        self._released = True
+        try:
+            self._cursor.close()
+        except Exception:  # pylint: disable=broad-exception-caught
+            self._broken = True
+        self._pool.putconn(self._connection, self._created_at, self._broken)
+
+    def __enter__(self) -> "PooledCursor":
+        """Enter the cursor context."""
+        self._cursor = self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Leave the cursor context, returning the connection to the pool."""
+        self.close()
+
+    def __del__(self) -> None:
+        """Return the connection if the cursor was not closed explicitly."""
+        if "_released" in self.__dict__:
+            self.close()
+
+
+class PooledConnection:
+    """Connection-like facade borrowing pooled connections per cursor.
+
+    Pooled connections are in autocommit mode, so `commit` and `rollback`
+    are no-ops and `autocommit` is always `True`. Closing the facade does not
+    close the shared pool, see `close_connection_pools`.
+    """
+
+    def __init__(self, pool: PostgresConnectionPool) -> None:
+        """Create a facade for the given pool."""
+        self.pool = pool
+
+    @property
+    def autocommit(self) -> bool:
+        """Pooled connections are always in autocommit mode."""
+        return True
+
+    @autocommit.setter
+    def autocommit(self, value: bool) -> None:
+        """Ignore changes, pooled connections are always in autocommit mode."""
+
+    def cursor(self) -> PooledCursor:
+        """Borrow a connection and create a cursor on it.
+
+        Returns:
+        -------
+            Cursor returning the connection to the pool when it is closed.
+        """
+        connection, created_at = self.pool.getconn()
+        try:
+            cursor = connection.cursor()
+        except BaseException as e:
+            self.pool.putconn(
+                connection, created_at, discard=isinstance(e, CONNECTION_ERRORS)
+            )
+            raise
+        return PooledCursor(self.pool, connection, created_at, cursor)
+
+    def commit(self) -> None:
+        """Do nothing, statements are committed in autocommit mode."""
+
+    def rollback(self) -> None:
+        """Do nothing, statements are committed in autocommit mode."""
+
+    def close(self) -> None:
+        """Do nothing, the shared pool is closed on shutdown."""
+
+
+_pools: dict[tuple[tuple[str, str], ...], PostgresConnectionPool] = {}
+_pools_lock = Lock()
+
+
+def get_connection_pool(
+    config: PostgreSQLDatabaseConfiguration, **connect_kwargs: Any
+) -> PostgresConnectionPool:
+    """Get the shared pool for the given connection parameters.
+
+    The pool is created, opening its minimum number of connections, when it
+    does not exist yet; its size settings are taken from `config.pool`.
+
+    Parameters:
+    ----------
+        config: PostgreSQL configuration with the pool settings.
+        connect_kwargs: Keyword arguments passed to psycopg2.connect.
+
+    Returns:
+    -------
+        The connection pool.
+
+    Raises:
+    ------
+        psycopg2.Error: If opening the initial connections fails.
+    """
+    key = tuple(sorted((name, str(value)) for name, value in connect_kwargs.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            name = f"{config.user}@{config.host}:{config.port}/{config.db}"
+            pool = PostgresConnectionPool(name, connect_kwargs, config.pool)
+            _pools[key] = pool
+        return pool
+
+
+def pooled_connection(
+    config: PostgreSQLDatabaseConfiguration, **connect_kwargs: Any
+) -> PooledConnection:
+    """Get a connection-like facade over the shared pool.
+
+    Parameters:
+    ----------
+        config: PostgreSQL configuration with the pool settings.
+        connect_kwargs: Keyword arguments passed to psycopg2.connect.
+
+    Returns:
+    -------
+        Facade borrowing pooled connections per cursor.
+    """
+    return PooledConnection(get_connection_pool(config, **connect_kwargs))
+
+
+def close_connection_pools() -> None:
+    """Close all shared pools; called from the application lifespan shutdown."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _close_quietly(connection: Any) -> None:
+    """Close a connection, ignoring errors of already broken connections."""
+    try:
+        connection.close()
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.debug("Unable to close PostgreSQL connection", exc_info=True)
@@ -1,8 +1,12 @@
 """Utility functions for working with queries."""
 
+import asyncio
 import sqlite3
+import time
+from collections.abc import Awaitable, Iterable
 from datetime import UTC, datetime
-from typing import Optional
+from functools import partial
+from typing import Any, Optional, TypeVar
 
 import psycopg2
 from fastapi import HTTPException
@@ -17,14 +21,16 @@ from llama_stack_client.types import Shield
 from openai._exceptions import APIStatusError as OpenAIAPIStatusError
 from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
 import constants
-from app.database import get_session
+from app.database import run_in_session
 from authorization.azure_token_manager import AzureEntraIDManager
 from cache.cache_error import CacheError
 from client import AsyncLlamaStackClientHolder
 from configuration import configuration
 from log import get_logger
+from metrics import recording
 from models.api.responses import (
     AbstractErrorResponse,
     ForbiddenResponse,
@@ -50,6 +56,8 @@ from utils.types import TurnSummary
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
 
 def is_context_length_error(error_message: str) -> bool:
     """Check if an error message indicates a context length exceeded error.
@@ -64,6 +72,44 @@ def is_context_length_error(error_message: str) -> bool:
     return "context_length" in msg_lower or "context length" in msg_lower
 
 
+async def timed_preparation_stage(
+    endpoint_path: str, stage: str, awaitable: Awaitable[T]
+) -> T:
+    """Await one query preparation stage and record its duration.
+
+    Args:
+        endpoint_path: The API endpoint path for metric labeling.
+        stage: Name of the preparation stage, e.g. "moderation".
+        awaitable: The stage to await.
+
+    Returns:
+        The result of the awaited stage.
+    """
+    started = time.monotonic()
+    try:
+        return await awaitable
+    finally:
+        duration = time.monotonic() - started
+        recording.record_request_preparation_duration(endpoint_path, stage, duration)
+        logger.debug("Preparation stage %s took %.3fs", stage, duration)
+
+
+async def discard_preparation_stages(stages: Iterable[asyncio.Task[Any]]) -> None:
+    """Cancel unfinished preparation stages and wait for them to settle.
+
+    Used to drop speculative work, such as inline RAG retrieval for a query
+    that moderation blocked, or stages left running when another one failed.
+
+    Args:
+        stages: Tasks running the preparation stages.
+    """
+    pending = [stage for stage in stages if not stage.done()]
+    for stage in pending:
+        stage.cancel()
+    # also retrieves exceptions of failed stages that were never awaited
+    await asyncio.gather(*stages, return_exceptions=True)
+
+
 def store_conversation_into_cache(
     user_id: str,
     conversation_id: str,
@@ -104,6 +150,51 @@ def store_conversation_into_cache(
         )
 
 
+def store_conversations_into_cache(
+    entries: list[tuple[str, str, CacheEntry, bool, Optional[str]]],
+) -> None:
+    """
+    Store parts of several conversations into conversation history cache.
+
+    The cache entries are stored at once, so database backed caches write
+    them in one transaction. Topic summaries are set afterwards; a summary
+    that cannot be set is logged, as the entries are already stored.
+
+    Parameters:
+    ----------
+        entries (list[tuple[str, str, CacheEntry, bool, Optional[str]]]):
+            User ID, conversation ID, cache entry, skip user ID check flag
+            and optional topic summary of each conversation part, in the
+            order the parts are appended.
+    """
+    if configuration.conversation_cache_configuration.type is None:
+        logger.warning("Conversation cache is not configured")
+        return
+
+    cache = configuration.conversation_cache
+    if cache is None:
+        logger.warning("Conversation cache configured but not initialized")
+        return
+
+    cache.insert_or_append_many(
+        [
+            (user_id, conversation_id, cache_entry, skip_userid_check)
+            for user_id, conversation_id, cache_entry, skip_userid_check, _ in entries
+        ]
+    )
+    for user_id, conversation_id, _, skip_userid_check, topic_summary in entries:
+        if not topic_summary:
+            continue
+        try:
+            cache.set_topic_summary(
+                user_id, conversation_id, topic_summary, skip_userid_check
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                "Error storing topic summary of conversation %s", conversation_id
+            )
+
+
 def validate_model_provider_override(
     model: Optional[str],
     provider: Optional[str],
@@ -179,7 +270,9 @@ async def update_azure_token(
     Update the client with a fresh Azure token.
 
     Updates the client with the fresh Azure token. Should be called after
-    verifying that token refresh is needed and successful.
+    verifying that token refresh is needed and successful. The Azure API
+    base is looked up in the Llama Stack providers only when the client
+    does not pass it in its provider data yet.
 
     Args:
         client: The current AsyncLlamaStackClient instance
@@ -187,29 +280,37 @@ async def update_azure_token(
     Returns:
         AsyncLlamaStackClient: The client instance (reloaded or updated with fresh token)
     """
-    if AsyncLlamaStackClientHolder().is_library_client:
-        return await AsyncLlamaStackClientHolder().reload_library_client()
-    try:
-        providers = await client.providers.list()
-        azure_config = next(
-            p.config for p in providers if p.provider_type == "remote::azure"
-        )
-    except APIConnectionError as e:
-        error_response = ServiceUnavailableResponse(
-            backend_name="Llama Stack",
-            cause=str(e),
-        )
-        raise HTTPException(**error_response.model_dump()) from e
-    except LLSApiStatusError as e:
-        error_response = InternalServerErrorResponse.generic()
-        raise HTTPException(**error_response.model_dump()) from e
-
-    return AsyncLlamaStackClientHolder().update_provider_data(
-        {
-            "azure_api_key": AzureEntraIDManager().access_token.get_secret_value(),
-            "azure_api_base": str(azure_config.get("api_base")),
-        }
-    )
+    holder = AsyncLlamaStackClientHolder()
+    if holder.is_library_client:
+        return await holder.reload_library_client()
+
+    updates = {"azure_api_key": AzureEntraIDManager().access_token.get_secret_value()}
+    if "azure_api_base" not in holder.provider_data:
+        try:
+            providers = await client.providers.list()
+            azure_config = next(
+                p.config for p in providers if p.provider_type == "remote::azure"
+            )
+        except APIConnectionError as e:
+            error_response = ServiceUnavailableResponse(
+                backend_name="Llama Stack",
+                cause=str(e),
+            )
+            raise HTTPException(**error_response.model_dump()) from e
+        except LLSApiStatusError as e:
+            error_response = InternalServerErrorResponse.generic()
+            raise HTTPException(**error_response.model_dump()) from e
+        updates["azure_api_base"] = str(azure_config.get("api_base"))
+
+    return holder.update_provider_data(updates)
+
+
+async def push_azure_token() -> None:
+    """Pass the current Azure token to the Llama Stack client.
+
+    Used as callback of the background Azure token refresher.
+    """
+    await update_azure_token(AsyncLlamaStackClientHolder().get_client())
 
 
 def prepare_input(
@@ -242,7 +343,7 @@ def prepare_input(
     return input_text
 
 
-def store_query_results(  # pylint: disable=too-many-arguments
+async def store_query_results(  # pylint: disable=too-many-arguments
     user_id: str,
     conversation_id: str,
     model: str,
@@ -279,30 +380,19 @@ def store_query_results(  # pylint: disable=too-many-arguments
     """
     provider_id, model_id = extract_provider_and_model_from_model_id(model)
     # Store transcript if enabled
-    if is_transcripts_enabled():
-        logger.info("Storing transcript")
-        metadata = create_transcript_metadata(
-            user_id=user_id,
-            conversation_id=conversation_id,
-            model_id=model_id,
-            provider_id=provider_id,
-            query_provider=provider_id,
-            query_model=model_id,
-        )
-        transcript = create_transcript(
-            metadata=metadata,
-            redacted_query=query,
-            summary=summary,
-            attachments=attachments or [],
-        )
-        store_transcript(transcript)
-    else:
-        logger.debug("Transcript collection is disabled in the configuration")
+    store_query_transcript(
+        user_id=user_id,
+        conversation_id=conversation_id,
+        model=model,
+        summary=summary,
+        query=query,
+        attachments=attachments,
+    )
 
     # Persist conversation details
     try:
         logger.info("Persisting conversation details")
-        persist_user_conversation_details(
+        await persist_user_conversation_details(
             user_id=user_id,
             conversation_id=conversation_id,
             started_at=started_at,
@@ -318,20 +408,17 @@ def store_query_results(  # pylint: disable=too-many-arguments
         raise HTTPException(**response.model_dump()) from e
 
     # Store conversation in cache
-    cache_entry = CacheEntry(
-        query=query,
-        response=summary.llm_response,
-        provider=provider_id,
-        model=model_id,
+    cache_entry = create_cache_entry(
+        model=model,
         started_at=started_at,
         completed_at=completed_at,
-        referenced_documents=summary.referenced_documents,
-        tool_calls=summary.tool_calls,
-        tool_results=summary.tool_results,
+        summary=summary,
+        query=query,
     )
     try:
         logger.info("Storing conversation in cache")
-        store_conversation_into_cache(
+        await asyncio.to_thread(
+            store_conversation_into_cache,
             user_id=user_id,
             conversation_id=conversation_id,
             cache_entry=cache_entry,
@@ -344,11 +431,88 @@ def store_query_results(  # pylint: disable=too-many-arguments
         raise HTTPException(**response.model_dump()) from e
 
 
+def store_query_transcript(  # pylint: disable=too-many-arguments
+    *,
+    user_id: str,
+    conversation_id: str,
+    model: str,
+    summary: TurnSummary,
+    query: str,
+    attachments: Optional[list[Attachment]] = None,
+) -> None:
+    """Store the transcript of a query if transcripts are enabled.
+
+    Args:
+        user_id: The authenticated user ID
+        conversation_id: The conversation ID
+        model: The model identifier (provider/model format)
+        summary: Summary of the turn including LLM response and tool calls
+        query: The query text
+        attachments: Optional list of attachments
+    """
+    if not is_transcripts_enabled():
+        logger.debug("Transcript collection is disabled in the configuration")
+        return
+
+    logger.info("Storing transcript")
+    provider_id, model_id = extract_provider_and_model_from_model_id(model)
+    metadata = create_transcript_metadata(
+        user_id=user_id,
+        conversation_id=conversation_id,
+        model_id=model_id,
+        provider_id=provider_id,
+        query_provider=provider_id,
+        query_model=model_id,
+    )
+    transcript = create_transcript(
+        metadata=metadata,
+        redacted_query=query,
+        summary=summary,
+        attachments=attachments or [],
+    )
+    store_transcript(transcript)
+
+
+def create_cache_entry(
+    *,
+    model: str,
+    started_at: str,
+    completed_at: str,
+    summary: TurnSummary,
+    query: str,
+) -> CacheEntry:
+    """Create the conversation cache entry for a completed query.
+
+    Args:
+        model: The model identifier (provider/model format)
+        started_at: ISO formatted timestamp when the request started
+        completed_at: ISO formatted timestamp when the request completed
+        summary: Summary of the turn including LLM response and tool calls
+        query: The query text
+
+    Returns:
+        CacheEntry: Entry to append to the conversation history cache.
+    """
+    provider_id, model_id = extract_provider_and_model_from_model_id(model)
+    return CacheEntry(
+        query=query,
+        response=summary.llm_response,
+        provider=provider_id,
+        model=model_id,
+        started_at=started_at,
+        completed_at=completed_at,
+        referenced_documents=summary.referenced_documents,
+        tool_calls=summary.tool_calls,
+        tool_results=summary.tool_results,
+    )
+
+
 def consume_query_tokens(
     user_id: str,
     model_id: str,
     token_usage: TokenCounter,
-) -> None:
+    record_history: bool = True,
+) -> Optional[dict[str, int]]:
     """Consume tokens from quota limiters for a query.
 
     This function handles token consumption with proper error handling.
@@ -359,6 +523,13 @@ def consume_query_tokens(
         user_id: The authenticated user ID
         model_id: The full model identifier in "provider/model" format
         token_usage: TokenCounter object with input and output token counts
+        record_history: Whether to record the usage in token usage history;
+            disabled when the history entry is written by the persistence queue
+
+    Returns:
+        Available quotas after the consumption when they were returned by
+        the quota engine, None when they have to be read separately with
+        `get_available_quotas`.
 
     Raises:
         HTTPException: On database errors during token consumption
@@ -366,14 +537,17 @@ def consume_query_tokens(
     provider, model = extract_provider_and_model_from_model_id(model_id)
     try:
         logger.info("Consuming tokens")
-        consume_tokens(
+        return consume_tokens(
             quota_limiters=configuration.quota_limiters,
-            token_usage_history=configuration.token_usage_history,
+            token_usage_history=(
+                configuration.token_usage_history if record_history else None
+            ),
             user_id=user_id,
             input_tokens=token_usage.input_tokens,
             output_tokens=token_usage.output_tokens,
             model_id=model,
             provider_id=provider,
+            quota_engine=configuration.quota_engine,
         )
     except (psycopg2.Error, sqlite3.Error, ValueError) as e:
         logger.exception("Error consuming tokens: %s", e)
@@ -390,7 +564,7 @@ def is_transcripts_enabled() -> bool:
     return configuration.user_data_collection_configuration.transcripts_enabled
 
 
-def persist_user_conversation_details(
+async def persist_user_conversation_details(
     user_id: str,
     conversation_id: str,
     started_at: str,
@@ -421,71 +595,145 @@ def persist_user_conversation_details(
         user_id,
     )
 
-    with get_session() as session:
-        existing_conversation = (
-            session.query(UserConversation).filter_by(id=normalized_id).first()
-        )
-        if not existing_conversation:
-            conversation = UserConversation(
-                id=normalized_id,
-                user_id=user_id,
-                last_used_model=model_id,
-                last_used_provider=provider_id,
-                topic_summary=topic_summary or "",
-                message_count=1,
-                # For new conversation either current response or None if moderation-blocked
-                last_response_id=(
-                    response_id if not is_moderation_id(response_id) else None
-                ),
-            )
-            session.add(conversation)
-            logger.debug(
-                "Associated conversation %s to user %s", normalized_id, user_id
-            )
-        else:
-            existing_conversation.last_used_model = model_id
-            existing_conversation.last_used_provider = provider_id
-            existing_conversation.last_message_at = datetime.now(UTC)
-            existing_conversation.message_count += 1
-            logger.debug(
-                "Updating existing conversation in DB - ID: %s, User: %s, Messages: %d",
-                normalized_id,
-                user_id,
-                existing_conversation.message_count,
-            )
-            # Update last response id only if not moderation-blocked
-            if not is_moderation_id(response_id):
-                existing_conversation.last_response_id = response_id
-
-        max_turn_number = (
-            session.query(func.max(UserTurn.turn_number))
-            .filter_by(conversation_id=normalized_id)
-            .scalar()
-        )
-        turn_number = (max_turn_number or 0) + 1
-        turn = UserTurn(
-            conversation_id=normalized_id,
-            turn_number=turn_number,
-            started_at=datetime.fromisoformat(started_at),
-            completed_at=datetime.fromisoformat(completed_at),
-            provider=provider_id,
-            model=model_id,
+    await run_in_session(
+        partial(
+            _persist_user_conversation_details,
+            user_id=user_id,
+            normalized_id=normalized_id,
+            started_at=started_at,
+            completed_at=completed_at,
+            model_id=model_id,
+            provider_id=provider_id,
+            topic_summary=topic_summary,
             response_id=response_id,
         )
-        session.add(turn)
+    )
+
+
+def _persist_user_conversation_details(  # pylint: disable=too-many-arguments
+    session: Session,
+    *,
+    user_id: str,
+    normalized_id: str,
+    started_at: str,
+    completed_at: str,
+    model_id: str,
+    provider_id: str,
+    topic_summary: Optional[str],
+    response_id: str,
+) -> None:
+    """Upsert the conversation row and append a new turn, then commit."""
+    add_user_conversation_details(
+        session,
+        user_id=user_id,
+        normalized_id=normalized_id,
+        started_at=started_at,
+        completed_at=completed_at,
+        model_id=model_id,
+        provider_id=provider_id,
+        topic_summary=topic_summary,
+        response_id=response_id,
+    )
+    session.commit()
+    logger.debug("Successfully committed conversation %s to database", normalized_id)
+
+
+def add_user_conversation_details(  # pylint: disable=too-many-arguments
+    session: Session,
+    *,
+    user_id: str,
+    normalized_id: str,
+    started_at: str,
+    completed_at: str,
+    model_id: str,
+    provider_id: str,
+    topic_summary: Optional[str],
+    response_id: str,
+) -> None:
+    """Upsert the conversation row and append a new turn without committing.
+
+    Lets callers group several turns into one transaction. Pending changes
+    of the session are flushed before the lookups, so turns of the same
+    conversation added earlier in the session are taken into account.
+    """
+    # the session does not autoflush; without flushing, a second turn of the
+    # same conversation would not see the rows added for the first one
+    session.flush()
+    existing_conversation = (
+        session.query(UserConversation).filter_by(id=normalized_id).first()
+    )
+    if not existing_conversation:
+        conversation = UserConversation(
+            id=normalized_id,
+            user_id=user_id,
+            last_used_model=model_id,
+            last_used_provider=provider_id,
+            topic_summary=topic_summary or "",
+            message_count=1,
+            # For new conversation either current response or None if moderation-blocked
+            last_response_id=(
+                response_id if not is_moderation_id(response_id) else None
+            ),
+        )
+        session.add(conversation)
+        logger.debug("Associated conversation %s to user %s", normalized_id, user_id)
+    else:
+        existing_conversation.last_used_model = model_id
+        existing_conversation.last_used_provider = provider_id
+        existing_conversation.last_message_at = datetime.now(UTC)
+        existing_conversation.message_count += 1
         logger.debug(
-            "Created conversation turn - Conversation: %s, Turn: %d",
+            "Updating existing conversation in DB - ID: %s, User: %s, Messages: %d",
             normalized_id,
-            turn_number,
+            user_id,
+            existing_conversation.message_count,
         )
+        # Update last response id only if not moderation-blocked
+        if not is_moderation_id(response_id):
+            existing_conversation.last_response_id = response_id
+
+    max_turn_number = (
+        session.query(func.max(UserTurn.turn_number))
+        .filter_by(conversation_id=normalized_id)
+        .scalar()
+    )
+    turn_number = (max_turn_number or 0) + 1
+    turn = UserTurn(
+        conversation_id=normalized_id,
+        turn_number=turn_number,
+        started_at=datetime.fromisoformat(started_at),
+        completed_at=datetime.fromisoformat(completed_at),
+        provider=provider_id,
+        model=model_id,
+        response_id=response_id,
+    )
+    session.add(turn)
+    logger.debug(
+        "Created conversation turn - Conversation: %s, Turn: %d",
+        normalized_id,
+        turn_number,
+    )
 
+
+def _update_conversation_topic_summary(
+    session: Session, normalized_id: str, topic_summary: str
+) -> None:
+    """Store the topic summary on an existing conversation using the given session."""
+    existing = session.query(UserConversation).filter_by(id=normalized_id).first()
+    if existing:
+        existing.topic_summary = topic_summary
         session.commit()
+        logger.debug("Updated topic summary for conversation %s", normalized_id)
+    else:
         logger.debug(
-            "Successfully committed conversation %s to database", normalized_id
+            "No conversation found for topic summary update: id=%s, "
+            "topic_summary_len=%d",
+            normalized_id,
+            len(topic_summary),
         )
 
 
-def update_conversation_topic_summary(
+async def update_conversation_topic_summary(
     conversation_id: str,
     topic_summary: str,
     user_id: Optional[str] = None,
@@ -501,19 +749,13 @@ def update_conversation_topic_summary(
         skip_userid_check: Whether to skip user ID validation for cache operations.
     """
     normalized_id = normalize_conversation_id(conversation_id)
-    with get_session() as session:
-        existing = session.query(UserConversation).filter_by(id=normalized_id).first()
-        if existing:
-            existing.topic_summary = topic_summary
-            session.commit()
-            logger.debug("Updated topic summary for conversation %s", normalized_id)
-        else:
-            logger.debug(
-                "No conversation found for topic summary update: id=%s, "
-                "topic_summary_len=%d",
-                normalized_id,
-                len(topic_summary),
-            )
+    await run_in_session(
+        partial(
+            _update_conversation_topic_summary,
+            normalized_id=normalized_id,
+            topic_summary=topic_summary,
+        )
+    )
 
     if (
         user_id
@@ -521,8 +763,12 @@ def update_conversation_topic_summary(
         and configuration.conversation_cache is not None
     ):
         try:
-            configuration.conversation_cache.set_topic_summary(
-                user_id, conversation_id, topic_summary, skip_userid_check
+            await asyncio.to_thread(
+                configuration.conversation_cache.set_topic_summary,
+                user_id,
+                conversation_id,
+                topic_summary,
+                skip_userid_check,
             )
         except Exception as e:  # pylint: disable=broad-except
             logger.warning(
@@ -8,6 +8,7 @@ from fastapi import HTTPException
 
 from log import get_logger
 from models.api.responses import InternalServerErrorResponse, QuotaExceededResponse
+from quota.quota_engine import QuotaEngine
 from quota.quota_exceed_error import QuotaExceedError
 from quota.quota_limiter import QuotaLimiter
 from quota.token_usage_history import TokenUsageHistory
@@ -24,7 +25,8 @@ def consume_tokens(
     output_tokens: int,
     model_id: str,
     provider_id: str,
-) -> None:
+    quota_engine: Optional[QuotaEngine] = None,
+) -> Optional[dict[str, int]]:
     """Consume tokens from cluster and/or user quotas.
 
     Parameters:
@@ -36,11 +38,36 @@ def consume_tokens(
         output_tokens: Number of output tokens to consume.
         model_id: Model identification
         provider_id: Provider identification
+        quota_engine: Optional engine consuming tokens from all quota
+            limiters and recording token usage history in one transaction
 
     Returns:
     -------
-        None
+        Available quotas after the consumption when consumed by the quota
+        engine, None otherwise.
     """
+    if quota_engine is not None:
+        # aggregated token usage history is written in batches, not together
+        # with the quota
+        record_history = (
+            token_usage_history is not None and token_usage_history.aggregation is None
+        )
+        quotas = quota_engine.consume_tokens(
+            subject_id=user_id,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            provider=provider_id if record_history else None,
+            model=model_id if record_history else None,
+        )
+        if token_usage_history is not None and not record_history:
+            token_usage_history.consume_tokens(
+                user_id=user_id,
+                provider=provider_id,
+                model=model_id,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+            )
+        return quotas
     # record token usage history
     if token_usage_history is not None:
         token_usage_history.consume_tokens(
@@ -57,15 +84,21 @@ def consume_tokens(
             output_tokens=output_tokens,
             subject_id=user_id,
         )
+    return None
 
 
-def check_tokens_available(quota_limiters: list[QuotaLimiter], user_id: str) -> None:
+def check_tokens_available(
+    quota_limiters: list[QuotaLimiter],
+    user_id: str,
+    quota_engine: Optional[QuotaEngine] = None,
+) -> None:
     """Check if tokens are available for user.
 
     Parameters:
     ----------
         quota_limiters: List of quota limiter instances to check.
         user_id: Identifier of the user to check quota for.
+        quota_engine: Optional engine checking all quota limiters with one query.
 
     Returns:
     -------
@@ -77,9 +110,12 @@ def check_tokens_available(quota_limiters: list[QuotaLimiter], user_id: str) ->
             or status 429 if quota is exceeded.
     """
     try:
-        # check available tokens using all configured quota limiters
-        for quota_limiter in quota_limiters:
-            quota_limiter.ensure_available_quota(subject_id=user_id)
+        if quota_engine is not None:
+            quota_engine.ensure_available_quota(user_id)
+        else:
+            # check available tokens using all configured quota limiters
+            for quota_limiter in quota_limiters:
+                quota_limiter.ensure_available_quota(subject_id=user_id)
     except (psycopg2.Error, sqlite3.Error) as pg_error:
         message = "Error communicating with quota database backend"
         logger.error(message)
@@ -94,12 +130,14 @@ def check_tokens_available(quota_limiters: list[QuotaLimiter], user_id: str) ->
 def get_available_quotas(
     quota_limiters: list[QuotaLimiter],
     user_id: str,
+    quota_engine: Optional[QuotaEngine] = None,
 ) -> dict[str, int]:
     """Get quota available from all quota limiters.
 
     Args:
         quota_limiters: List of quota limiter instances to query.
         user_id: Identifier of the user to get quotas for.
+        quota_engine: Optional engine reading all quotas with one query.
 
     Returns:
         Dictionary mapping quota limiter class names to available token counts.
@@ -107,6 +145,14 @@ def get_available_quotas(
     Raises:
         HTTPException: With status 500 if database communication fails.
     """
+    if quota_engine is not None:
+        try:
+            return quota_engine.available_quotas(user_id)
+        except (psycopg2.Error, sqlite3.Error) as e:
+            logger.exception("Database error getting available quotas.")
+            response = InternalServerErrorResponse.database_error()
+            raise HTTPException(**response.model_dump()) from e
+
     available_quotas: dict[str, int] = {}
 
     # retrieve available tokens using all configured quota limiters
@@ -0,0 +1,244 @@
+"""Process-wide cache of Llama Stack registry listings.
+
+Models, shields, vector stores and toolgroups registered in Llama Stack
+change rarely, yet a single query used to list some of them several times.
+This module keeps the listings in memory for a short time so that the
+request hot path does not pay a backend round trip for each lookup.
+"""
+
+import asyncio
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from llama_stack_client import AsyncLlamaStackClient
+from llama_stack_client.types import (
+    ModelListResponse,
+    ShieldListResponse,
+    ToolgroupListResponse,
+)
+from llama_stack_client.types.vector_store import VectorStore
+
+import constants
+from log import get_logger
+from utils.types import Singleton
+
+logger = get_logger(__name__)
+
+REGISTRY_MODELS = "models"
+REGISTRY_SHIELDS = "shields"
+REGISTRY_VECTOR_STORES = "vector_stores"
+REGISTRY_TOOLGROUPS = "toolgroups"
+REGISTRY_KINDS = (
+    REGISTRY_MODELS,
+    REGISTRY_SHIELDS,
+    REGISTRY_VECTOR_STORES,
+    REGISTRY_TOOLGROUPS,
+)
+
+
+@dataclass
+class RegistryCacheEntry:
+    """One cached registry listing.
+
+    Attributes:
+        value: Listing returned by Llama Stack.
+        fetched_at: Monotonic timestamp of the fetch.
+        client_ref: Weak reference to the client the listing was fetched
+            with; listings are only served to the same client.
+    """
+
+    value: Any
+    fetched_at: float
+    client_ref: weakref.ref
+
+
+class LlamaStackRegistryCache(metaclass=Singleton):
+    """TTL cache of Llama Stack registry listings with single-flight loading.
+
+    Entries are served until they are older than the TTL. Once an entry
+    enters the refresh-ahead window, a background task refetches it while
+    the current value is still returned. Concurrent misses for the same
+    listing share one backend call. Entries are tied to the client instance
+    that fetched them, so a replaced or reloaded client never sees stale
+    data from its predecessor.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: dict[str, RegistryCacheEntry] = {}
+        self._inflight: dict[tuple[str, int, int], asyncio.Task[Any]] = {}
+        self._generations: dict[str, int] = {}
+        self.ttl = constants.LLAMA_STACK_REGISTRY_CACHE_TTL_SECONDS
+        self.refresh_ahead = constants.LLAMA_STACK_REGISTRY_CACHE_REFRESH_AHEAD_SECONDS
+
+    async def models(
+        self, client: AsyncLlamaStackClient, force_refresh: bool = False
+    ) -> ModelListResponse:
+        """Return the models registered in Llama Stack.
+
+        Parameters:
+        ----------
+            client: Llama Stack client used on cache miss.
+            force_refresh: Bypass the cached value and refetch.
+
+        Returns:
+        -------
+            ModelListResponse: Registered models.
+        """
+        return await self._get(
+            REGISTRY_MODELS, client, client.models.list, force_refresh
+        )
+
+    async def shields(
+        self, client: AsyncLlamaStackClient, force_refresh: bool = False
+    ) -> ShieldListResponse:
+        """Return the shields registered in Llama Stack.
+
+        Parameters:
+        ----------
+            client: Llama Stack client used on cache miss.
+            force_refresh: Bypass the cached value and refetch.
+
+        Returns:
+        -------
+            ShieldListResponse: Registered shields.
+        """
+        return await self._get(
+            REGISTRY_SHIELDS, client, client.shields.list, force_refresh
+        )
+
+    async def vector_stores(
+        self, client: AsyncLlamaStackClient, force_refresh: bool = False
+    ) -> list[VectorStore]:
+        """Return the vector stores known to Llama Stack.
+
+        Parameters:
+        ----------
+            client: Llama Stack client used on cache miss.
+            force_refresh: Bypass the cached value and refetch.
+
+        Returns:
+        -------
+            list[VectorStore]: Vector stores from the first listing page.
+        """
+
+        async def _fetch() -> list[VectorStore]:
+            page = await client.vector_stores.list()
+            return page.data
+
+        return await self._get(REGISTRY_VECTOR_STORES, client, _fetch, force_refresh)
+
+    async def toolgroups(
+        self, client: AsyncLlamaStackClient, force_refresh: bool = False
+    ) -> ToolgroupListResponse:
+        """Return the toolgroups registered in Llama Stack.
+
+        Parameters:
+        ----------
+            client: Llama Stack client used on cache miss.
+            force_refresh: Bypass the cached value and refetch.
+
+        Returns:
+        -------
+            ToolgroupListResponse: Registered toolgroups.
+        """
+        return await self._get(
+            REGISTRY_TOOLGROUPS, client, client.toolgroups.list, force_refresh
+        )
+
+    def invalidate(self, *kinds: str) -> None:
+        """Drop cached listings so the next lookup refetches them.
+
+        Listings being fetched at the time of invalidation are not stored.
+
+        Parameters:
+        ----------
+            kinds: Listings to drop (e.g. REGISTRY_TOOLGROUPS); all when empty.
+        """
+        for kind in kinds or REGISTRY_KINDS:
+            self._generations[kind] = self._generations.get(kind, 0) + 1
+            self._entries.pop(kind, None)
+        logger.debug("Invalidated Llama Stack registry cache: %s", kinds or "all")
+
+    def rebind(
+        self, old_client: AsyncLlamaStackClient, new_client: AsyncLlamaStackClient
+    ) -> None:
+        """Keep listings valid for a client copied from the one that fetched them.
+
+        Used when the client is copied only to change request headers; it
+        still talks to the same Llama Stack instance.
+
+        Parameters:
+        ----------
+            old_client: Client the listings were fetched with.
+            new_client: Client that replaces it.
+        """
+        for entry in self._entries.values():
+            if entry.client_ref() is old_client:
+                entry.client_ref = weakref.ref(new_client)
+
+    async def _get(
+        self,
+        kind: str,
+        client: AsyncLlamaStackClient,
+        fetch: Callable[[], Awaitable[Any]],
+        force_refresh: bool,
+    ) -> Any:
+        """Serve a listing from cache or load it, refreshing ahead of expiry."""
+        entry = self._entries.get(kind)
+        if not force_refresh and entry is not None and entry.client_ref() is client:
+            age = time.monotonic() - entry.fetched_at
+            if age < self.ttl:
+                if age >= self.ttl - self.refresh_ahead:
+                    self._start_load(kind, client, fetch)
+                return entry.value
+        return await asyncio.shield(self._start_load(kind, client, fetch))
+
+    def _start_load(
+        self,
+        kind: str,
+        client: AsyncLlamaStackClient,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> asyncio.Task[Any]:
+        """Return the in-flight load for the listing, starting one if needed."""
+        generation = self._generations.get(kind, 0)
+        key = (kind, id(client), generation)
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            return task
+
+        task = asyncio.create_task(self._load(kind, generation, client, fetch))
+        self._inflight[key] = task
+
+        def _done(finished: asyncio.Task[Any]) -> None:
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+            # retrieve the exception so background refreshes never leak it
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.warning(
+                    "Failed to load Llama Stack %s: %s", kind, finished.exception()
+                )
+
+        task.add_done_callback(_done)
+        return task
+
+    async def _load(
+        self,
+        kind: str,
+        generation: int,
+        client: AsyncLlamaStackClient,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Fetch a listing and store it unless it was invalidated meanwhile."""
+        value = await fetch()
+        if self._generations.get(kind, 0) == generation:
+            self._entries[kind] = RegistryCacheEntry(
+                value=value,
+                fetched_at=time.monotonic(),
+                client_ref=weakref.ref(client),
+            )
+            logger.debug("Cached Llama Stack %s listing", kind)
+        return value
@@ -2,8 +2,9 @@
 
 # pylint: disable=too-many-lines
 
+import asyncio
 import json
-from collections.abc import Mapping, Sequence
+from collections.abc import Coroutine, Mapping, Sequence
 from typing import Any, Optional, cast
 
 from fastapi import HTTPException
@@ -101,17 +102,15 @@ from models.common.responses.responses_api_params import ResponsesApiParams
 from models.config import ByokRag
 from models.database.conversations import UserConversation
 from models.requests import QueryRequest
-from utils.mcp_headers import (
-    McpHeaders,
-    build_mcp_headers,
-    find_unresolved_auth_headers,
-)
+from utils.mcp_headers import McpHeaders
+from utils.mcp_tool_plans import McpToolPlans
 from utils.prompts import get_system_prompt, get_topic_summary_system_prompt
 from utils.query import (
     extract_provider_and_model_from_model_id,
     handle_known_apistatus_errors,
     prepare_input,
 )
+from utils.registry_cache import LlamaStackRegistryCache
 from utils.suid import to_llama_stack_conversation_id
 from utils.token_counter import TokenCounter
 from utils.types import (
@@ -126,6 +125,10 @@ from utils.types import (
 
 logger = get_logger(__name__)
 
+# Topic summary tasks running alongside or after the main response; kept
+# referenced so they are not garbage collected and cancelled on shutdown
+_background_topic_summary_tasks: list[asyncio.Task[Any]] = []
+
 
 async def get_vector_store_ids(
     client: AsyncLlamaStackClient,
@@ -152,8 +155,8 @@ async def get_vector_store_ids(
         return vector_store_ids
 
     try:
-        vector_stores = await client.vector_stores.list()
-        return [vector_store.id for vector_store in vector_stores.data]
+        vector_stores = await LlamaStackRegistryCache().vector_stores(client)
+        return [vector_store.id for vector_store in vector_stores]
     except APIConnectionError as e:
         error_response = ServiceUnavailableResponse(
             backend_name="Llama Stack",
@@ -202,6 +205,84 @@ async def get_topic_summary(  # pylint: disable=too-many-nested-blocks
     return extract_text_from_response_items(response.output)
 
 
+def track_background_topic_summary_task(task: asyncio.Task[Any]) -> None:
+    """Keep a topic summary task referenced until it is finished.
+
+    Tracked tasks are cancelled by shutdown_background_topic_summary_tasks.
+
+    Args:
+        task: The task generating (or storing) a topic summary
+    """
+    _background_topic_summary_tasks.append(task)
+    task.add_done_callback(_background_topic_summary_tasks.remove)
+
+
+def start_topic_summary(summary: Coroutine[Any, Any, str]) -> asyncio.Task[str]:
+    """Start topic summary generation concurrently with the main response.
+
+    The topic summary depends only on the question, so it does not need to
+    wait for the main LLM response. The returned task is joined by
+    join_topic_summary and must be cancelled if the response is abandoned.
+
+    Args:
+        summary: Coroutine generating the topic summary, usually get_topic_summary()
+
+    Returns:
+        The task generating the topic summary
+    """
+    task = asyncio.create_task(summary)
+    track_background_topic_summary_task(task)
+    task.add_done_callback(_retrieve_topic_summary_error)
+    return task
+
+
+def _retrieve_topic_summary_error(task: asyncio.Task[str]) -> None:
+    """Mark the error of an abandoned topic summary task as retrieved."""
+    if not task.cancelled():
+        task.exception()
+
+
+async def join_topic_summary(
+    task: asyncio.Task[str],
+    timeout: float = constants.TOPIC_SUMMARY_JOIN_TIMEOUT_SECONDS,
+) -> Optional[str]:
+    """Wait for a topic summary started by start_topic_summary.
+
+    Args:
+        task: The task generating the topic summary
+        timeout: Maximum number of seconds to wait for the topic summary
+
+    Returns:
+        The topic summary, or None if it was not generated in time
+
+    Raises:
+        HTTPException: If the topic summary generation failed
+    """
+    try:
+        return await asyncio.wait_for(task, timeout)
+    except TimeoutError:
+        logger.warning("Topic summary not generated in %s seconds", timeout)
+        return None
+
+
+async def shutdown_background_topic_summary_tasks() -> None:
+    """Cancel and await outstanding background topic summary tasks on shutdown.
+
+    Ensures graceful shutdown so in-flight topic summary generation can be
+    cleaned up. Called from the application lifespan shutdown phase.
+    """
+    tasks = list(_background_topic_summary_tasks)
+    if not tasks:
+        return
+    logger.debug(
+        "Shutting down %d outstanding background topic summary task(s)",
+        len(tasks),
+    )
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
 async def prepare_tools(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     client: AsyncLlamaStackClient,
     vector_store_ids: Optional[list[str]],
@@ -336,27 +417,38 @@ async def prepare_responses_params(  # pylint: disable=too-many-arguments,too-ma
         if query_request.model and query_request.provider
         else None
     )
-    model = await select_model_for_responses(request_model, client, user_conversation)
 
-    if not await check_model_configured(client, model):
-        _, model_id = extract_provider_and_model_from_model_id(model)
-        error_response = NotFoundResponse(resource="model", resource_id=model_id)
-        raise HTTPException(**error_response.model_dump())
+    # Prepare tools for responses API while the model is being resolved
+    tools_task = asyncio.create_task(
+        prepare_tools(
+            client,
+            query_request.vector_store_ids,
+            query_request.no_tools,
+            token,
+            mcp_headers,
+            request_headers,
+        )
+    )
+    try:
+        model = await select_model_for_responses(
+            request_model, client, user_conversation
+        )
+
+        if not await check_model_configured(client, model):
+            _, model_id = extract_provider_and_model_from_model_id(model)
+            error_response = NotFoundResponse(resource="model", resource_id=model_id)
+            raise HTTPException(**error_response.model_dump())
+
+        tools = await tools_task
+    finally:
+        if not tools_task.done():
+            tools_task.cancel()
+            await asyncio.gather(tools_task, return_exceptions=True)
 
     # Use system prompt from request or default one
     system_prompt = get_system_prompt(query_request.system_prompt)
     logger.debug("Using system prompt: %s", system_prompt)
 
-    # Prepare tools for responses API
-    tools = await prepare_tools(
-        client,
-        query_request.vector_store_ids,
-        query_request.no_tools,
-        token,
-        mcp_headers,
-        request_headers,
-    )
-
     # Prepare input for Responses API
     # Adds inline RAG context and attachments
     input_text = prepare_input(query_request, inline_rag_context)
@@ -694,9 +786,9 @@ async def get_mcp_tools(
 ) -> list[InputToolMCP]:
     """Convert MCP servers to tools format for Responses API.
 
-    Fully delegates header assembly to ``build_mcp_headers``, which handles static
-    config tokens, the kubernetes Bearer token, client/oauth client-provided headers,
-    and propagated request headers.
+    Tools are built from plans precompiled per MCP server (see
+    ``utils.mcp_tool_plans``); only client-provided headers, the kubernetes Bearer
+    token and propagated request headers are merged in per request.
 
     Args:
         token: Optional Kubernetes service-account token for ``kubernetes`` auth headers.
@@ -712,41 +804,29 @@ async def get_mcp_tools(
         HTTPException: 401 with WWW-Authenticate header when an MCP server uses OAuth,
             no headers are passed, and the server responds with 401 and WWW-Authenticate.
     """
-    complete_headers = build_mcp_headers(
-        configuration, mcp_headers or {}, request_headers, token
-    )
+    plans = McpToolPlans()
+    client_headers = mcp_headers or {}
+    lower_request_headers = _lower_header_names(request_headers)
 
     tools: list[InputToolMCP] = []
     for mcp_server in configuration.mcp_servers:
-        headers: dict[str, str] = dict(complete_headers.get(mcp_server.name, {}))
-
-        # Skip server if any configured auth header could not be resolved.
-        unresolved = find_unresolved_auth_headers(
-            mcp_server.authorization_headers, headers
-        )
-        if unresolved:
-            logger.warning(
-                "Skipping MCP server %s: required %d auth headers but only resolved %d",
-                mcp_server.name,
-                len(mcp_server.authorization_headers),
-                len(mcp_server.authorization_headers) - len(unresolved),
-            )
-            continue
-
-        authorization = headers.pop("Authorization", None)
-        tools.append(
-            InputToolMCP(
-                type="mcp",
-                server_label=mcp_server.name,
-                server_url=mcp_server.url,
-                require_approval="never",
-                headers=headers if headers else None,
-                authorization=authorization,
-            )
+        tool = plans.plan(mcp_server).tool(
+            client_headers.get(mcp_server.name, {}), lower_request_headers, token
         )
+        if tool is not None:
+            tools.append(tool)
     return tools
 
 
+def _lower_header_names(
+    request_headers: Optional[Mapping[str, str]],
+) -> Optional[dict[str, str]]:
+    """Return request headers keyed by lowercase names for header propagation."""
+    if request_headers is None:
+        return None
+    return {name.lower(): value for name, value in request_headers.items()}
+
+
 def apply_mcp_headers_to_explicit_tools(
     tools: list[InputTool],
     token: Optional[str] = None,
@@ -767,9 +847,8 @@ def apply_mcp_headers_to_explicit_tools(
     if not tools:
         return tools
 
-    complete_headers = build_mcp_headers(
-        configuration, mcp_headers or {}, request_headers, token
-    )
+    client_headers = mcp_headers or {}
+    lower_request_headers = _lower_header_names(request_headers)
     servers_by_name = {s.name: s for s in configuration.mcp_servers}
 
     out: list[InputTool] = []
@@ -784,10 +863,11 @@ def apply_mcp_headers_to_explicit_tools(
             out.append(tool)
             continue
 
-        headers: dict[str, str] = dict(complete_headers.get(mcp_server.name, {}))
-        unresolved = find_unresolved_auth_headers(
-            mcp_server.authorization_headers, headers
+        plan = McpToolPlans().plan(mcp_server)
+        headers = plan.headers(
+            client_headers.get(mcp_server.name, {}), lower_request_headers, token
         )
+        unresolved = plan.unresolved_headers(headers)
         if unresolved:
             logger.warning(
                 "Skipping explicit MCP tool %s: required %d auth headers but only resolved %d",
@@ -1301,7 +1381,7 @@ async def check_model_configured(
         HTTPException: If there's a connection error or other API error
     """
     try:
-        models = await client.models.list()
+        models = await LlamaStackRegistryCache().models(client)
         for model in models:
             if model.id == model_id:
                 return True
@@ -1367,7 +1447,7 @@ async def select_model_for_responses(
 
     # 3. Fetch models list and select the first LLM model (model_type="llm")
     try:
-        models = await client.models.list()
+        models = await LlamaStackRegistryCache().models(client)
     except APIConnectionError as e:
         error_response = ServiceUnavailableResponse(
             backend_name="Llama Stack",
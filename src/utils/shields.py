@@ -1,5 +1,6 @@
 """Utility functions for working with Llama Stack shields."""
 
+import asyncio
 from typing import Any, Optional
 
 from fastapi import HTTPException
@@ -11,7 +12,7 @@ from llama_stack_client import (
 from llama_stack_client import (
     APIStatusError as LLSApiStatusError,
 )
-from llama_stack_client.types import ShieldListResponse
+from llama_stack_client.types import CreateResponse, Shield, ShieldListResponse
 from openai._exceptions import APIStatusError as OpenAIAPIStatusError
 
 from configuration import AppConfig
@@ -26,6 +27,7 @@ from models.api.responses import (
 )
 from models.requests import QueryRequest
 from utils.query import handle_known_apistatus_errors
+from utils.registry_cache import LlamaStackRegistryCache
 from utils.types import (
     ShieldModerationBlocked,
     ShieldModerationPassed,
@@ -47,7 +49,9 @@ async def get_available_shields(client: AsyncLlamaStackClient) -> list[str]:
     -------
         list[str]: List of available shield identifiers; empty if no shields are available.
     """
-    available_shields = [shield.identifier for shield in await client.shields.list()]
+    available_shields = [
+        shield.identifier for shield in await LlamaStackRegistryCache().shields(client)
+    ]
     if not available_shields:
         logger.info("No available shields. Disabling safety")
     else:
@@ -128,8 +132,11 @@ async def run_shield_moderation(
     """
     Run shield moderation on input text.
 
-    Iterates through configured shields and runs moderation checks.
-    Raises HTTPException if shield model is not found.
+    Runs moderation checks of all selected shields concurrently and evaluates
+    them as they complete. The first shield in configuration order that flags
+    the content is reported as soon as all shields configured before it have
+    passed, and the remaining moderation calls are cancelled. Raises
+    HTTPException if shield model is not found.
 
     Parameters:
     ----------
@@ -148,7 +155,12 @@ async def run_shield_moderation(
         HTTPException: If shield's provider_resource_id is not configured or model not found.
     """
     shields_to_run = await get_shields_for_request(client, shield_ids)
-    available_models = {model.id for model in await client.models.list()}
+    if not shields_to_run:
+        return ShieldModerationPassed()
+
+    available_models = {
+        model.id for model in await LlamaStackRegistryCache().models(client)
+    }
     for shield in shields_to_run:
         # Lightspeed safety providers configure their model internally
         # so provider_resource_id is not necessarily a valid model ID.
@@ -162,40 +174,114 @@ async def run_shield_moderation(
             )
             raise HTTPException(**response.model_dump())
 
-        try:
-            moderation_result = await client.moderations.create(
-                input=input_text, model=shield.provider_resource_id
-            )
-        except APIConnectionError as e:
-            error_response = ServiceUnavailableResponse(
-                backend_name="Llama Stack",
-                cause=str(e),
-            )
-            raise HTTPException(**error_response.model_dump()) from e
-        except (LLSApiStatusError, OpenAIAPIStatusError) as e:
-            error_response = handle_known_apistatus_errors(
-                e, shield.provider_resource_id or ""
-            )
-            raise HTTPException(**error_response.model_dump()) from e
-
-        if moderation_result.results and moderation_result.results[0].flagged:
-            result = moderation_result.results[0]
-            recording.record_llm_validation_error(endpoint_path)
-            logger.warning(
-                "Shield '%s' flagged content: categories=%s",
-                shield.identifier,
-                result.categories,
+    moderations = [
+        asyncio.create_task(_run_moderation(client, shield, input_text))
+        for shield in shields_to_run
+    ]
+    positions = {moderation: index for index, moderation in enumerate(moderations)}
+    results: dict[int, tuple[Shield, CreateResponse]] = {}
+    pending = set(moderations)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
             )
-            violation_message = result.user_message or DEFAULT_VIOLATION_MESSAGE
-            return ShieldModerationBlocked(
-                message=violation_message,
-                moderation_id=moderation_result.id,
-                refusal_response=create_refusal_response(violation_message),
+            for moderation in done:
+                results[positions[moderation]] = moderation.result()
+            # the first flagging shield in configuration order is reported,
+            # so only shields configured before it are waited for
+            first_flagged = min(
+                (
+                    index
+                    for index, (_, moderation_result) in results.items()
+                    if moderation_result.results
+                    and moderation_result.results[0].flagged
+                ),
+                default=None,
             )
+            if first_flagged is None or any(
+                positions[moderation] < first_flagged for moderation in pending
+            ):
+                continue
+            return _blocked_result(*results[first_flagged], endpoint_path)
+    finally:
+        for moderation in moderations:
+            moderation.cancel()
+        await asyncio.gather(*moderations, return_exceptions=True)
 
     return ShieldModerationPassed()
 
 
+def _blocked_result(
+    shield: Shield, moderation_result: CreateResponse, endpoint_path: str
+) -> ShieldModerationBlocked:
+    """
+    Create the result of a moderation blocked by the shield.
+
+    Parameters:
+    ----------
+        shield: The shield that flagged the content.
+        moderation_result: The moderation result returned by the shield.
+        endpoint_path: The API endpoint path for metric labeling.
+
+    Returns:
+    -------
+        ShieldModerationBlocked: Result with the violation message.
+    """
+    result = moderation_result.results[0]
+    recording.record_llm_validation_error(endpoint_path)
+    logger.warning(
+        "Shield '%s' flagged content: categories=%s",
+        shield.identifier,
+        result.categories,
+    )
+    violation_message = result.user_message or DEFAULT_VIOLATION_MESSAGE
+    return ShieldModerationBlocked(
+        message=violation_message,
+        moderation_id=moderation_result.id,
+        refusal_response=create_refusal_response(violation_message),
+    )
+
+
+async def _run_moderation(
+    client: AsyncLlamaStackClient, shield: Shield, input_text: str
+) -> tuple[Shield, CreateResponse]:
+    """
+    Run moderation of the input text with a single shield.
+
+    Parameters:
+    ----------
+        client: The Llama Stack client.
+        shield: The shield whose model moderates the text.
+        input_text: The text to moderate.
+
+    Returns:
+    -------
+        tuple[Shield, CreateResponse]: The shield and the moderation result
+        returned by Llama Stack.
+
+    Raises:
+    ------
+        HTTPException: If Llama Stack is unreachable or returns an error status.
+    """
+    try:
+        moderation_result = await client.moderations.create(
+            input=input_text, model=shield.provider_resource_id
+        )
+    except APIConnectionError as e:
+        error_response = ServiceUnavailableResponse(
+            backend_name="Llama Stack",
+            cause=str(e),
+        )
+        raise HTTPException(**error_response.model_dump()) from e
+    except (LLSApiStatusError, OpenAIAPIStatusError) as e:
+        error_response = handle_known_apistatus_errors(
+            e, shield.provider_resource_id or ""
+        )
+        raise HTTPException(**error_response.model_dump()) from e
+    return shield, moderation_result
+
+
 async def append_turn_to_conversation(
     client: AsyncLlamaStackClient,
     conversation_id: str,
@@ -271,7 +357,9 @@ async def get_shields_for_request(
     if shield_ids == []:
         return []
     try:
-        configured_shields: ShieldListResponse = await client.shields.list()
+        configured_shields: ShieldListResponse = (
+            await LlamaStackRegistryCache().shields(client)
+        )
         if shield_ids is None:
             return configured_shields
         requested = set(shield_ids)
@@ -0,0 +1,146 @@
+"""Process-wide catalog of tools offered by Llama Stack toolgroups.
+
+The /tools endpoint used to list the tools of every toolgroup on each
+request, one toolgroup after another. Normalized tool listings are kept in
+memory for a short time instead. Listings are keyed by toolgroup and by a
+hash of the headers they were fetched with, as MCP servers may offer
+different tools depending on the credentials of the caller. The catalog is
+invalidated when MCP servers are registered or removed.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import weakref
+from asyncio import Task
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from cachetools import TTLCache
+from llama_stack_client import AsyncLlamaStackClient
+
+import constants
+from log import get_logger
+from utils.types import Singleton
+
+logger = get_logger(__name__)
+
+ToolList = list[dict[str, Any]]
+
+
+@dataclass
+class ToolCatalogEntry:
+    """Cached tools of one toolgroup.
+
+    Attributes:
+        tools: Normalized tool dicts; shared by all requests, never modified.
+        client_ref: Weak reference to the client the tools were listed with;
+            tools are only served to the same client.
+    """
+
+    tools: ToolList
+    client_ref: weakref.ref
+
+
+def _headers_digest(headers: Mapping[str, str]) -> bytes:
+    """Hash the headers a toolgroup listing is fetched with."""
+    return hashlib.sha256(json.dumps(sorted(headers.items())).encode("utf-8")).digest()
+
+
+class ToolCatalog(metaclass=Singleton):
+    """TTL cache of toolgroup tool listings with single-flight loading."""
+
+    def __init__(self) -> None:
+        """Initialize an empty catalog."""
+        self._entries: TTLCache[tuple[str, bytes], ToolCatalogEntry] = TTLCache(
+            maxsize=constants.TOOL_CATALOG_CACHE_MAX_SIZE,
+            ttl=constants.TOOL_CATALOG_CACHE_TTL_SECONDS,
+            timer=time.monotonic,
+        )
+        self._loads: dict[tuple[str, bytes, int], Task[ToolList]] = {}
+        self._generation = 0
+
+    async def tools(
+        self,
+        client: AsyncLlamaStackClient,
+        toolgroup_id: str,
+        headers: Mapping[str, str],
+        load: Callable[[], Awaitable[ToolList]],
+    ) -> ToolList:
+        """Return the tools of the toolgroup, listing them when not cached.
+
+        Parameters:
+        ----------
+            client: Llama Stack client the tools are listed with.
+            toolgroup_id: Toolgroup identifier.
+            headers: Headers (including Authorization) sent with the listing.
+            load: Coroutine function listing and normalizing the tools.
+
+        Returns:
+        -------
+            ToolList: Normalized tool dicts; they must not be modified.
+        """
+        key = (toolgroup_id, _headers_digest(headers))
+        entry = self._entries.get(key)
+        if entry is not None and entry.client_ref() is client:
+            return entry.tools
+        # a cancelled request must not cancel the listing shared with others
+        return await asyncio.shield(self._start_load(key, client, load))
+
+    def invalidate(self, toolgroup_id: Optional[str] = None) -> None:
+        """Drop cached tools so the next lookup lists them again.
+
+        Listings being fetched at the time of invalidation are not stored.
+
+        Parameters:
+        ----------
+            toolgroup_id: Toolgroup whose tools are dropped; all when None.
+        """
+        self._generation += 1
+        if toolgroup_id is None:
+            self._entries.clear()
+        else:
+            for key in [key for key in self._entries if key[0] == toolgroup_id]:
+                self._entries.pop(key, None)
+        logger.debug("Invalidated tool catalog: %s", toolgroup_id or "all")
+
+    def _start_load(
+        self,
+        key: tuple[str, bytes],
+        client: AsyncLlamaStackClient,
+        load: Callable[[], Awaitable[ToolList]],
+    ) -> Task[ToolList]:
+        """Return the in-flight listing of the tools, starting one if needed."""
+        load_key = (*key, self._generation)
+        task = self._loads.get(load_key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            return task
+        task = asyncio.create_task(self._load(key, self._generation, client, load))
+        self._loads[load_key] = task
+
+        def _done(finished: Task[ToolList]) -> None:
+            if self._loads.get(load_key) is finished:
+                del self._loads[load_key]
+            # retrieve the exception so listings nobody waits for never leak it
+            if not finished.cancelled():
+                finished.exception()
+
+        task.add_done_callback(_done)
+        return task
+
+    async def _load(
+        self,
+        key: tuple[str, bytes],
+        generation: int,
+        client: AsyncLlamaStackClient,
+        load: Callable[[], Awaitable[ToolList]],
+    ) -> ToolList:
+        """List the tools and store them unless invalidated meanwhile."""
+        tools = await load()
+        if self._generation == generation:
+            self._entries[key] = ToolCatalogEntry(
+                tools=tools, client_ref=weakref.ref(client)
+            )
+        return tools
@@ -1,5 +1,6 @@
 """Common types for the project."""
 
+from datetime import datetime
 from typing import Annotated, Any, Literal, Optional
 
 from llama_stack_api import ImageContentItem, TextContentItem
@@ -270,3 +271,15 @@ class Transcript(BaseModel):
     attachments: list[dict[str, Any]] = Field(default_factory=list)
     tool_calls: list[dict[str, Any]] = Field(default_factory=list)
     tool_results: list[dict[str, Any]] = Field(default_factory=list)
+
+
+class TokenUsageBucket(BaseModel):
+    """Token usage of one user, provider and model in one time bucket."""
+
+    user_id: str = Field(description="User who used the tokens")
+    provider: str = Field(description="Provider of the model")
+    model: str = Field(description="Model that processed the tokens")
+    bucket: datetime = Field(description="Start of the hour or day")
+    input_tokens: int = Field(description="Number of input tokens")
+    output_tokens: int = Field(description="Number of output tokens")
+    requests: int = Field(description="Number of requests")
@@ -1,12 +1,19 @@
 """Fixtures used by benchmarks."""
 
 from pathlib import Path
+from typing import Optional
 
 import psycopg2
 import pytest
 
 from app import database
 from configuration import AppConfig, configuration
+from models.config import (
+    PostgreSQLDatabaseConfiguration,
+    QuotaHandlersConfiguration,
+    QuotaLimiterConfiguration,
+    SQLiteDatabaseConfiguration,
+)
 
 
 @pytest.fixture(name="configuration_filename_sqlite")
@@ -70,7 +77,10 @@ def sqlite_database_fixture(configuration_filename_sqlite: str, tmp_path: Path)
     database.create_tables()
 
 
-def drop_postgres_tables(configuration: AppConfig) -> None:
+def drop_postgres_tables(
+    configuration: AppConfig,
+    tables: tuple[str, ...] = ("user_turn", "user_conversation"),
+) -> None:
     """Drop postgres tables used by benchmarks.
 
     The tables will be re-created so every benchmark start with fresh DB.
@@ -90,8 +100,8 @@ def drop_postgres_tables(configuration: AppConfig) -> None:
     # try to drop tables used by benchmarks
     try:
         with conn.cursor() as cursor:
-            cursor.execute("DROP TABLE IF EXISTS user_turn;")
-            cursor.execute("DROP TABLE IF EXISTS user_conversation;")
+            for table in tables:
+                cursor.execute(f"DROP TABLE IF EXISTS {table};")
         conn.commit()
     finally:
         # closing the connection
@@ -125,3 +135,83 @@ def postgres_database_fixture(configuration_filename_postgres: str) -> None:
     # initialize database session and create tables
     database.initialize_database()
     database.create_tables()
+
+
+def quota_configuration(
+    sqlite: Optional[SQLiteDatabaseConfiguration] = None,
+    postgres: Optional[PostgreSQLDatabaseConfiguration] = None,
+) -> QuotaHandlersConfiguration:
+    """Create quota configuration with one user limiter and token usage history.
+
+    Parameters:
+    ----------
+        sqlite (Optional[SQLiteDatabaseConfiguration]): SQLite database to store quota in.
+        postgres (Optional[PostgreSQLDatabaseConfiguration]): PostgreSQL
+        database to store quota in.
+
+    Returns:
+    -------
+        QuotaHandlersConfiguration: Quota configuration used by benchmarks.
+    """
+    return QuotaHandlersConfiguration(
+        sqlite=sqlite,
+        postgres=postgres,
+        limiters=[
+            QuotaLimiterConfiguration(
+                type="user_limiter",
+                name="user_daily_limits",
+                initial_quota=1_000_000_000,
+                quota_increase=1000,
+                # SQLite and PostgreSQL express the period differently
+                period="1 day" if postgres is not None else "-1 day",
+            )
+        ],
+        enable_token_history=True,
+    )  # pyright: ignore[reportCallIssue]
+
+
+@pytest.fixture(name="sqlite_quota")
+def sqlite_quota_fixture(tmp_path: Path) -> QuotaHandlersConfiguration:
+    """Prepare quota configuration storing quota in a temporary SQLite database.
+
+    Parameters:
+    ----------
+        tmp_path (Path): pytest-provided temporary directory for creating the DB file.
+
+    Returns:
+    -------
+        QuotaHandlersConfiguration: Quota configuration with empty database.
+    """
+    sqlite = SQLiteDatabaseConfiguration(db_path=str(tmp_path / "quota.db"))
+    return quota_configuration(sqlite=sqlite)
+
+
+@pytest.fixture(name="postgres_quota")
+def postgres_quota_fixture(
+    configuration_filename_postgres: str,
+) -> QuotaHandlersConfiguration:
+    """Prepare quota configuration storing quota in the benchmark postgres database.
+
+    Quota and token usage tables are dropped first, so every benchmark
+    starts with empty tables.
+
+    Parameters:
+    ----------
+        configuration_filename_postgres (str): Path to the YAML configuration file to load.
+
+    Returns:
+    -------
+        QuotaHandlersConfiguration: Quota configuration with empty database.
+
+    Raises:
+    ------
+        AssertionError: If the configuration does not include an postgres configuration.
+    """
+    configuration.load_configuration(configuration_filename_postgres)
+    postgres = configuration.database_configuration.postgres
+    assert postgres is not None
+
+    drop_postgres_tables(
+        configuration, ("quota_limits", "token_usage", "token_usage_rollup")
+    )
+    return quota_configuration(postgres=postgres)
@@ -0,0 +1,338 @@
+"""Benchmarks for quota limiters, token usage history and quota revocation."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from itertools import count
+from threading import local
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from models.config import (
+    QuotaHandlersConfiguration,
+    TokenUsageAggregationConfiguration,
+)
+from quota.sql import (
+    CREATE_QUOTA_TABLE_PG,
+    CREATE_QUOTA_TABLE_SQLITE,
+    INCREASE_QUOTA_STATEMENT_PG,
+    INCREASE_QUOTA_STATEMENT_SQLITE,
+    INIT_QUOTA_PG,
+    INIT_QUOTA_SQLITE,
+    RESET_QUOTA_STATEMENT_PG,
+    RESET_QUOTA_STATEMENT_SQLITE,
+)
+from quota.token_usage_history import TokenUsageHistory
+from quota.user_quota_limiter import UserQuotaLimiter
+from runners.quota_scheduler import init_tables, quota_revocation
+
+from .data_generators import generate_model_for_provider, generate_provider
+
+# quota assigned to every subject, high enough not to be exhausted by benchmarks
+INITIAL_QUOTA = 1_000_000_000
+
+# number of callers (service workers) running at the same time
+CONCURRENT_CALLERS = 8
+
+# all subjects are due for quota revocation when revoked at this time
+REVOKED_LONG_AGO = datetime(2000, 1, 1, tzinfo=UTC)
+
+# limiters of concurrent callers, one per thread
+callers = local()
+
+
+def subject_id(index: int) -> str:
+    """Return ID of the seeded subject with the given index."""
+    return f"user-{index}"
+
+
+def middle_subject_id(subjects_count: int) -> str:
+    """Return ID of a subject in the middle of the seeded subjects.
+
+    The subject does not exist yet in an empty database; its quota is then
+    initialized by the first benchmarked call.
+    """
+    return subject_id(subjects_count // 2)
+
+
+def create_quota_limiter(configuration: QuotaHandlersConfiguration) -> UserQuotaLimiter:
+    """Create user quota limiter storing quota in the configured database."""
+    return UserQuotaLimiter(configuration, INITIAL_QUOTA, INITIAL_QUOTA)
+
+
+def seed_quota(
+    configuration: QuotaHandlersConfiguration,
+    limiter: UserQuotaLimiter,
+    subjects_count: int,
+) -> None:
+    """Store quota of the given number of users in one transaction.
+
+    All stored quota is due for revocation, so quota revocation benchmarks
+    update every seeded row.
+
+    Parameters:
+    ----------
+        configuration (QuotaHandlersConfiguration): Quota configuration.
+        limiter (UserQuotaLimiter): Limiter connected to the quota database.
+        subjects_count (int): Number of users to store quota for.
+
+    Returns:
+    -------
+        None
+    """
+    statement = INIT_QUOTA_PG if configuration.postgres else INIT_QUOTA_SQLITE
+    rows = [
+        (subject_id(index), "u", INITIAL_QUOTA, INITIAL_QUOTA, REVOKED_LONG_AGO)
+        for index in range(subjects_count)
+    ]
+    cursor = limiter.connection.cursor()
+    cursor.execute("BEGIN")
+    cursor.executemany(statement, rows)
+    cursor.execute("COMMIT")
+    cursor.close()
+
+
+def seed_token_usage_history(
+    configuration: QuotaHandlersConfiguration, subjects_count: int
+) -> None:
+    """Store token usage of the given number of users in one batch.
+
+    Parameters:
+    ----------
+        configuration (QuotaHandlersConfiguration): Quota configuration.
+        subjects_count (int): Number of users to store token usage for.
+
+    Returns:
+    -------
+        None
+    """
+    aggregated = configuration.model_copy(
+        update={"token_history_aggregation": TokenUsageAggregationConfiguration()}
+    )
+    history = TokenUsageHistory(aggregated)
+    for index in range(subjects_count):
+        provider = generate_provider()
+        model = generate_model_for_provider(provider)
+        history.consume_tokens(subject_id(index), provider, model, 100, 200)
+    history.close()
+
+
+def concurrent_callers(configuration: QuotaHandlersConfiguration) -> ThreadPoolExecutor:
+    """Create executor running calls of concurrent callers.
+
+    Every caller has its own limiter and database connection, the same way
+    every service worker does; the limiter is available in the submitted
+    calls as `callers.limiter`.
+
+    Parameters:
+    ----------
+        configuration (QuotaHandlersConfiguration): Quota configuration.
+
+    Returns:
+    -------
+        ThreadPoolExecutor: Executor with one thread per caller.
+    """
+
+    def init_caller() -> None:
+        callers.limiter = create_quota_limiter(configuration)
+
+    return ThreadPoolExecutor(max_workers=CONCURRENT_CALLERS, initializer=init_caller)
+
+
+def check_and_consume(subject: str) -> None:
+    """Check and consume quota of one user the same way a request does."""
+    callers.limiter.ensure_available_quota(subject)
+    callers.limiter.consume_tokens(10, 20, subject)
+
+
+def benchmark_ensure_available_quota(
+    benchmark: BenchmarkFixture,
+    configuration: QuotaHandlersConfiguration,
+    subjects_count: int,
+) -> None:
+    """Prepare DB and benchmark checking quota of one user.
+
+    Parameters:
+    ----------
+        benchmark (BenchmarkFixture): pytest-benchmark fixture to run the measurement.
+        configuration (QuotaHandlersConfiguration): Quota configuration.
+        subjects_count (int): Number of users to pre-populate before benchmarking.
+
+    Returns:
+    -------
+        None
+    """
+    limiter = create_quota_limiter(configuration)
+    seed_quota(configuration, limiter, subjects_count)
+    benchmark(limiter.ensure_available_quota, middle_subject_id(subjects_count))
+
+
+def benchmark_consume_tokens(
+    benchmark: BenchmarkFixture,
+    configuration: QuotaHandlersConfiguration,
+    subjects_count: int,
+) -> None:
+    """Prepare DB and benchmark consuming tokens of one user.
+
+    Parameters:
+    ----------
+        benchmark (BenchmarkFixture): pytest-benchmark fixture to run the measurement.
+        configuration (QuotaHandlersConfiguration): Quota configuration.
+        subjects_count (int): Number of users to pre-populate before benchmarking.
+
+    Returns:
+    -------
+        None
+    """
+    limiter = create_quota_limiter(configuration)
+    seed_quota(configuration, limiter, subjects_count)
+    benchmark(limiter.consume_tokens, 10, 20, middle_subject_id(subjects_count))
+
+
+def benchmark_init_quota(
+    benchmark: BenchmarkFixture,
+    configuration: QuotaHandlersConfiguration,
+    subjects_count: int,
+) -> None:
+    """Prepare DB and benchmark the first quota check of a new user.
+
+    Every benchmarked call checks quota of a user without quota stored in
+    the database yet, so the quota is initialized by the call.
+
+    Parameters:
+    ----------
+        benchmark (BenchmarkFixture): pytest-benchmark fixture to run the measurement.
+        configuration (QuotaHandlersConfiguration): Quota configuration.
+        subjects_count (int): Number of users to pre-populate before benchmarking.
+
+    Returns:
+    -------
+        None
+    """
+    limiter = create_quota_limiter(configuration)
+    seed_quota(configuration, limiter, subjects_count)
+    new_subjects = count()
+    benchmark(lambda: limiter.ensure_available_quota(f"new-user-{next(new_subjects)}"))
+
+
+def benchmark_consume_tokens_concurrently(
+    benchmark: BenchmarkFixture,
+    configuration: QuotaHandlersConfiguration,
+    subjects_count: int,
+) -> None:
+    """Prepare DB and benchmark checking and consuming quota by concurrent callers.
+
+    Parameters:
+    ----------
+        benchmark (BenchmarkFixture): pytest-benchmark fixture to run the measurement.
+        configuration (QuotaHandlersConfiguration): Quota configuration.
+        subjects_count (int): Number of users to pre-populate before benchmarking.
+
+    Returns:
+    -------
+        None
+    """
+    limiter = create_quota_limiter(configuration)
+    seed_quota(configuration, limiter, subjects_count)
+    # every caller works with a different user, if there are enough users
+    subjects = [
+        subject_id(index * subjects_count // CONCURRENT_CALLERS)
+        for index in range(CONCURRENT_CALLERS)
+    ]
+    # quota of users missing in an empty database is initialized before the
+    # benchmark, so concurrent callers do not initialize it at the same time
+    for subject in set(subjects):
+        limiter.ensure_available_quota(subject)
+
+    def run() -> None:
+        futures = [executor.submit(check_and_consume, subject) for subject in subjects]
+        for future in futures:
+            future.result()
+
+    with concurrent_callers(configuration) as executor:
+        benchmark(run)
+
+
+def benchmark_token_usage_history(
+    benchmark: BenchmarkFixture,
+    configuration: QuotaHandlersConfiguration,
+    subjects_count: int,
+) -> None:
+    """Prepare DB and benchmark recording token usage of one user.
+
+    Parameters:
+    ----------
+        benchmark (BenchmarkFixture): pytest-benchmark fixture to run the measurement.
+        configuration (QuotaHandlersConfiguration): Quota configuration; token
+        usage is aggregated when it configures token history aggregation.
+        subjects_count (int): Number of users to pre-populate before benchmarking.
+
+    Returns:
+    -------
+        None
+    """
+    seed_token_usage_history(configuration, subjects_count)
+    history = TokenUsageHistory(configuration)
+    try:
+        benchmark(
+            history.consume_tokens,
+            middle_subject_id(subjects_count),
+            "openai",
+            "gpt-4o-mini",
+            100,
+            200,
+        )
+    finally:
+        history.close()
+
+
+def benchmark_quota_revocation(
+    benchmark: BenchmarkFixture,
+    configuration: QuotaHandlersConfiguration,
+    subjects_count: int,
+) -> None:
+    """Prepare DB and benchmark quota revocation of all users.
+
+    Before every round all quota is made due for revocation again, so every
+    round increases and resets quota of all users.
+
+    Parameters:
+    ----------
+        benchmark (BenchmarkFixture): pytest-benchmark fixture to run the measurement.
+        configuration (QuotaHandlersConfiguration): Quota configuration with
+        one user limiter.
+        subjects_count (int): Number of users to pre-populate before benchmarking.
+
+    Returns:
+    -------
+        None
+    """
+    limiter = create_quota_limiter(configuration)
+    seed_quota(configuration, limiter, subjects_count)
+    if configuration.postgres is not None:
+        create_table = CREATE_QUOTA_TABLE_PG
+        statements = (INCREASE_QUOTA_STATEMENT_PG, RESET_QUOTA_STATEMENT_PG)
+        make_due = "UPDATE quota_limits SET revoked_at=%s"
+    else:
+        create_table = CREATE_QUOTA_TABLE_SQLITE
+        statements = (INCREASE_QUOTA_STATEMENT_SQLITE, RESET_QUOTA_STATEMENT_SQLITE)
+        make_due = "UPDATE quota_limits SET revoked_at=?"
+    # the scheduler creates the index used by quota revocation
+    connection = limiter.connection
+    init_tables(connection, create_table)
+
+    def setup() -> None:
+        cursor = connection.cursor()
+        cursor.execute(make_due, (REVOKED_LONG_AGO,))
+        cursor.close()
+
+    benchmark.pedantic(
+        quota_revocation,
+        args=(
+            connection,
+            configuration.limiters[0],
+            *statements,
+            configuration.scheduler.batch_size,
+        ),
+        setup=setup,
+        rounds=10,
+    )
@@ -0,0 +1,184 @@
+"""Benchmarks of per-request MCP tool building with many configured MCP servers."""
+
+import asyncio
+from collections.abc import Generator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import pytest
+from llama_stack_api.openai_responses import (
+    OpenAIResponseInputToolMCP as InputToolMCP,
+)
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from models.config import ModelContextProtocolServer
+from utils import responses
+from utils.mcp_headers import (
+    McpHeaders,
+    build_mcp_headers,
+    find_unresolved_auth_headers,
+)
+from utils.mcp_tool_plans import McpToolPlans
+from utils.responses import get_mcp_tools
+
+# number of configured MCP servers
+SERVER_COUNTS = [20, 50]
+
+# headers of the incoming request, some of them propagated to MCP servers
+REQUEST_HEADERS = {
+    "Content-Type": "application/json",
+    "User-Agent": "benchmark",
+    "X-Request-ID": "req-1",
+    "X-Tenant": "tenant-1",
+}
+
+
+def make_servers(count: int, secret_file: Path) -> list[ModelContextProtocolServer]:
+    """Create MCP servers with a mix of public, static, kubernetes and client auth.
+
+    Parameters:
+    ----------
+        count (int): Number of servers to create.
+        secret_file (Path): File with a static secret.
+
+    Returns:
+    -------
+        list[ModelContextProtocolServer]: Configured MCP servers.
+    """
+    auth_variants: list[dict[str, str]] = [
+        {},
+        {"Authorization": str(secret_file)},
+        {"Authorization": "kubernetes"},
+        {"Authorization": "client"},
+    ]
+    return [
+        ModelContextProtocolServer(
+            name=f"server-{i}",
+            url=f"http://mcp-{i}.example.com/mcp",
+            authorization_headers=auth_variants[i % len(auth_variants)],
+            headers=["X-Request-ID", "X-Tenant"] if i % 2 else [],
+        )
+        for i in range(count)
+    ]
+
+
+async def get_mcp_tools_per_request(
+    config: Any,
+    token: Optional[str],
+    mcp_headers: McpHeaders,
+    request_headers: dict[str, str],
+) -> list[InputToolMCP]:
+    """Build MCP tools resolving all servers per request, without plans.
+
+    Parameters:
+    ----------
+        config: Configuration with MCP servers.
+        token (Optional[str]): Kubernetes token.
+        mcp_headers (McpHeaders): Client-supplied headers keyed by server name.
+        request_headers (dict[str, str]): Incoming request headers.
+
+    Returns:
+    -------
+        list[InputToolMCP]: MCP tools.
+    """
+    complete_headers = build_mcp_headers(config, mcp_headers, request_headers, token)
+    tools: list[InputToolMCP] = []
+    for mcp_server in config.mcp_servers:
+        headers = dict(complete_headers.get(mcp_server.name, {}))
+        if find_unresolved_auth_headers(mcp_server.authorization_headers, headers):
+            continue
+        authorization = headers.pop("Authorization", None)
+        tools.append(
+            InputToolMCP(
+                type="mcp",
+                server_label=mcp_server.name,
+                server_url=mcp_server.url,
+                require_approval="never",
+                headers=headers if headers else None,
+                authorization=authorization,
+            )
+        )
+    return tools
+
+
+@pytest.fixture(name="event_loop_runner")
+def event_loop_runner_fixture() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    """Provide an event loop running the benchmarked coroutines.
+
+    Yields:
+    ------
+        asyncio.AbstractEventLoop: The event loop.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(name="mcp_config")
+def mcp_config_fixture(
+    request: pytest.FixtureRequest,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> SimpleNamespace:
+    """Configure MCP servers used by get_mcp_tools.
+
+    Parameters:
+    ----------
+        request (pytest.FixtureRequest): Request with the number of servers.
+        tmp_path (Path): Directory for the static secret.
+        monkeypatch (pytest.MonkeyPatch): Used to replace the configuration.
+
+    Returns:
+    -------
+        SimpleNamespace: Configuration with MCP servers.
+    """
+    secret_file = tmp_path / "secret"
+    secret_file.write_text("static-secret", encoding="utf-8")
+    config = SimpleNamespace(mcp_servers=make_servers(request.param, secret_file))
+    monkeypatch.setattr(responses, "configuration", config)
+    McpToolPlans().compile(config.mcp_servers)
+    return config
+
+
+@pytest.mark.parametrize("mcp_config", SERVER_COUNTS, indirect=True)
+@pytest.mark.parametrize("precompiled", [False, True])
+def test_get_mcp_tools(
+    mcp_config: SimpleNamespace,
+    precompiled: bool,
+    event_loop_runner: asyncio.AbstractEventLoop,
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark building MCP tools of one request.
+
+    Parameters:
+    ----------
+        mcp_config (SimpleNamespace): Configuration with MCP servers.
+        precompiled (bool): Use precompiled plans (get_mcp_tools) or resolve
+            every server per request.
+        event_loop_runner (asyncio.AbstractEventLoop): Loop running the calls.
+        benchmark (BenchmarkFixture): pytest-benchmark fixture.
+
+    Returns:
+    -------
+        None
+    """
+    servers_count = len(mcp_config.mcp_servers)
+    benchmark.group = f"get_mcp_tools-{servers_count}"
+    mcp_headers = {
+        server.name: {"Authorization": "client-token"}
+        for server in mcp_config.mcp_servers
+        if server.authorization_headers.get("Authorization") == "client"
+    }
+
+    def build() -> list[InputToolMCP]:
+        if precompiled:
+            coroutine = get_mcp_tools("k8s-token", mcp_headers, REQUEST_HEADERS)
+        else:
+            coroutine = get_mcp_tools_per_request(
+                mcp_config, "k8s-token", mcp_headers, REQUEST_HEADERS
+            )
+        return event_loop_runner.run_until_complete(coroutine)
+
+    tools = benchmark(build)
+    assert len(tools) == servers_count
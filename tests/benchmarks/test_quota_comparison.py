@@ -0,0 +1,186 @@
+"""Benchmarks to compare performances of quota handling in SQLite and PostgreSQL databases."""
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from models.config import TokenUsageAggregationConfiguration
+
+from .quota_benchmarks import (
+    benchmark_consume_tokens,
+    benchmark_consume_tokens_concurrently,
+    benchmark_ensure_available_quota,
+    benchmark_init_quota,
+    benchmark_quota_revocation,
+    benchmark_token_usage_history,
+)
+
+QUOTA_FIXTURES = ["sqlite_quota", "postgres_quota"]
+
+# number of subjects with quota stored in database before benchmarks
+SUBJECTS_COUNTS = [0, 100, 10000]
+
+
+@pytest.mark.parametrize("subjects_count", SUBJECTS_COUNTS)
+@pytest.mark.parametrize("quota_fixture", QUOTA_FIXTURES)
+def test_ensure_available_quota(
+    request: pytest.FixtureRequest,
+    quota_fixture: str,
+    subjects_count: int,
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark for checking available quota of one user.
+
+    Parameters:
+    ----------
+        request (pytest.FixtureRequest): Request used to get the quota fixture.
+        quota_fixture (str): Fixture preparing quota configuration and database.
+        subjects_count (int): Number of users stored before the benchmark.
+        benchmark (BenchmarkFixture): pytest-benchmark fixture.
+
+    Returns:
+    -------
+        None
+    """
+    benchmark.group = f"ensure_available_quota-{subjects_count}"
+    benchmark_ensure_available_quota(
+        benchmark, request.getfixturevalue(quota_fixture), subjects_count
+    )
+
+
+@pytest.mark.parametrize("subjects_count", SUBJECTS_COUNTS)
+@pytest.mark.parametrize("quota_fixture", QUOTA_FIXTURES)
+def test_consume_tokens(
+    request: pytest.FixtureRequest,
+    quota_fixture: str,
+    subjects_count: int,
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark for consuming tokens of one user.
+
+    Parameters:
+    ----------
+        request (pytest.FixtureRequest): Request used to get the quota fixture.
+        quota_fixture (str): Fixture preparing quota configuration and database.
+        subjects_count (int): Number of users stored before the benchmark.
+        benchmark (BenchmarkFixture): pytest-benchmark fixture.
+
+    Returns:
+    -------
+        None
+    """
+    benchmark.group = f"consume_tokens-{subjects_count}"
+    benchmark_consume_tokens(
+        benchmark, request.getfixturevalue(quota_fixture), subjects_count
+    )
+
+
+@pytest.mark.parametrize("subjects_count", SUBJECTS_COUNTS)
+@pytest.mark.parametrize("quota_fixture", QUOTA_FIXTURES)
+def test_init_quota(
+    request: pytest.FixtureRequest,
+    quota_fixture: str,
+    subjects_count: int,
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark for the first quota check of a new user.
+
+    Parameters:
+    ----------
+        request (pytest.FixtureRequest): Request used to get the quota fixture.
+        quota_fixture (str): Fixture preparing quota configuration and database.
+        subjects_count (int): Number of users stored before the benchmark.
+        benchmark (BenchmarkFixture): pytest-benchmark fixture.
+
+    Returns:
+    -------
+        None
+    """
+    benchmark.group = f"init_quota-{subjects_count}"
+    benchmark_init_quota(
+        benchmark, request.getfixturevalue(quota_fixture), subjects_count
+    )
+
+
+@pytest.mark.parametrize("subjects_count", SUBJECTS_COUNTS)
+@pytest.mark.parametrize("quota_fixture", QUOTA_FIXTURES)
+def test_consume_tokens_concurrently(
+    request: pytest.FixtureRequest,
+    quota_fixture: str,
+    subjects_count: int,
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark for checking and consuming quota by concurrent callers.
+
+    Parameters:
+    ----------
+        request (pytest.FixtureRequest): Request used to get the quota fixture.
+        quota_fixture (str): Fixture preparing quota configuration and database.
+        subjects_count (int): Number of users stored before the benchmark.
+        benchmark (BenchmarkFixture): pytest-benchmark fixture.
+
+    Returns:
+    -------
+        None
+    """
+    benchmark.group = f"consume_tokens_concurrently-{subjects_count}"
+    benchmark_consume_tokens_concurrently(
+        benchmark, request.getfixturevalue(quota_fixture), subjects_count
+    )
+
+
+@pytest.mark.parametrize("aggregated", [False, True])
+@pytest.mark.parametrize("subjects_count", SUBJECTS_COUNTS)
+@pytest.mark.parametrize("quota_fixture", QUOTA_FIXTURES)
+def test_token_usage_history(
+    request: pytest.FixtureRequest,
+    quota_fixture: str,
+    subjects_count: int,
+    aggregated: bool,
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark for recording token usage of one user.
+
+    Parameters:
+    ----------
+        request (pytest.FixtureRequest): Request used to get the quota fixture.
+        quota_fixture (str): Fixture preparing quota configuration and database.
+        subjects_count (int): Number of users stored before the benchmark.
+        aggregated (bool): Whether token usage is aggregated in memory.
+        benchmark (BenchmarkFixture): pytest-benchmark fixture.
+
+    Returns:
+    -------
+        None
+    """
+    configuration = request.getfixturevalue(quota_fixture)
+    if aggregated:
+        configuration.token_history_aggregation = TokenUsageAggregationConfiguration()
+    benchmark.group = f"token_usage_history-{subjects_count}-aggregated={aggregated}"
+    benchmark_token_usage_history(benchmark, configuration, subjects_count)
+
+
+@pytest.mark.parametrize("subjects_count", SUBJECTS_COUNTS)
+@pytest.mark.parametrize("quota_fixture", QUOTA_FIXTURES)
+def test_quota_revocation(
+    request: pytest.FixtureRequest,
+    quota_fixture: str,
+    subjects_count: int,
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark for quota revocation statements run by the quota scheduler.
+
+    Parameters:
+    ----------
+        request (pytest.FixtureRequest): Request used to get the quota fixture.
+        quota_fixture (str): Fixture preparing quota configuration and database.
+        subjects_count (int): Number of users stored before the benchmark.
+        benchmark (BenchmarkFixture): pytest-benchmark fixture.
+
+    Returns:
+    -------
+        None
+    """
+    benchmark.group = f"quota_revocation-{subjects_count}"
+    benchmark_quota_revocation(
+        benchmark, request.getfixturevalue(quota_fixture), subjects_count
+    )
@@ -952,7 +952,7 @@ class TestGetConversationEndpoint:
         mock_session_context.__enter__.return_value = mock_session
         mock_session_context.__exit__.return_value = None
         mocker.patch(
-            "utils.endpoints.get_session",
+            "app.database.get_session",
             return_value=mock_session_context,
         )
 
@@ -1008,7 +1008,7 @@ class TestGetConversationEndpoint:
         mock_session_context.__enter__.return_value = mock_session
         mock_session_context.__exit__.return_value = None
         mocker.patch(
-            "utils.endpoints.get_session",
+            "app.database.get_session",
             return_value=mock_session_context,
         )
 
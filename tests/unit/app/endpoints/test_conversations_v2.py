@@ -2,6 +2,7 @@
 
 """Unit tests for the /conversations REST API endpoints."""
 
+import threading
 from datetime import UTC, datetime
 from typing import Any, cast
 
@@ -400,6 +401,29 @@ class TestGetConversationsListEndpoint:
         assert response is not None
         assert len(response.conversations) == 0
 
+    @pytest.mark.asyncio
+    async def test_cache_is_read_off_event_loop(
+        self, mocker: MockerFixture, mock_configuration: MockType
+    ) -> None:
+        """Test that the cache, possibly waiting for a pooled connection, runs in a thread."""
+        mock_authorization_resolvers(mocker)
+        mocker.patch("app.endpoints.conversations_v2.configuration", mock_configuration)
+        threads: list[int] = []
+
+        def list_conversations(*_args: Any) -> list[ConversationData]:
+            threads.append(threading.get_ident())
+            return []
+
+        mock_configuration.conversation_cache.list.side_effect = list_conversations
+
+        await get_conversations_list_endpoint_handler(
+            request=mocker.Mock(),
+            auth=MOCK_AUTH,
+        )
+
+        assert len(threads) == 1
+        assert threads[0] != threading.get_ident()
+
     @pytest.mark.asyncio
     async def test_with_skip_userid_check(
         self, mocker: MockerFixture, mock_configuration: MockType
@@ -337,3 +337,27 @@ class TestCheckDefaultModelAvailable:
 
         assert available is False
         assert "not found in model registry" in reason
+
+
+@pytest.mark.asyncio
+async def test_readiness_probe_fails_while_mcp_servers_are_registered(
+    mocker: MockerFixture,
+) -> None:
+    """Test the readiness endpoint fails until deferred MCP registration finishes."""
+    mock_authorization_resolvers(mocker)
+    mocker.patch(
+        "app.endpoints.health.DeferredMcpRegistration.status",
+        return_value=(False, "MCP servers registration in progress"),
+    )
+    mock_get_providers_health_statuses = mocker.patch(
+        "app.endpoints.health.get_providers_health_statuses"
+    )
+    mock_response = mocker.Mock()
+    auth: AuthTuple = ("test_user_id", "test_user", True, "test_token")
+
+    response = await readiness_probe_get_method(auth=auth, response=mock_response)
+
+    assert response.ready is False
+    assert response.reason == "MCP servers registration in progress"
+    assert mock_response.status_code == 503
+    mock_get_providers_health_statuses.assert_not_called()
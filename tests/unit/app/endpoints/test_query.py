@@ -2,6 +2,7 @@
 # pyright: reportCallIssue=false
 """Unit tests for the /query (v2) REST API endpoint using Responses API."""
 
+import asyncio
 from typing import Any
 
 import pytest
@@ -16,11 +17,13 @@ from models.common.responses.responses_api_params import ResponsesApiParams
 from models.database.conversations import UserConversation
 from models.requests import Attachment, QueryRequest
 from models.responses import QueryResponse
+from utils.shields import create_refusal_response
 from utils.token_counter import TokenCounter
 from utils.types import (
     RAGChunk,
     RAGContext,
     ReferencedDocument,
+    ShieldModerationBlocked,
     ShieldModerationPassed,
     ToolCallSummary,
     ToolResultSummary,
@@ -163,7 +166,7 @@ class TestQueryEndpointHandler:
             "app.endpoints.query.normalize_conversation_id", return_value="123"
         )
         mocker.patch("app.endpoints.query.store_query_results")
-        mocker.patch("app.endpoints.query.consume_query_tokens")
+        mocker.patch("app.endpoints.query.consume_query_tokens", return_value=None)
         mocker.patch("app.endpoints.query.get_available_quotas", return_value={})
 
         response = await query_endpoint_handler(
@@ -246,7 +249,7 @@ class TestQueryEndpointHandler:
             new=mocker.AsyncMock(return_value=mock_turn_summary),
         )
         mocker.patch("app.endpoints.query.store_query_results")
-        mocker.patch("app.endpoints.query.consume_query_tokens")
+        mocker.patch("app.endpoints.query.consume_query_tokens", return_value=None)
         mocker.patch("app.endpoints.query.get_available_quotas", return_value={})
 
         response = await query_endpoint_handler(
@@ -264,6 +267,172 @@ class TestQueryEndpointHandler:
         assert response.referenced_documents[0].doc_title == "Inline Doc"
         assert response.referenced_documents[1].doc_title == "Tool Doc"
 
+    def _patch_preparation(
+        self,
+        mocker: MockerFixture,
+        setup_configuration: AppConfig,
+        moderation_result: Any,
+        build_rag_context: Any,
+    ) -> Any:
+        """Patch the query pipeline around the preparation stages.
+
+        Returns:
+            The mocked responses API parameters returned by the pipeline.
+        """
+        mocker.patch("app.endpoints.query.configuration", setup_configuration)
+        mocker.patch("app.endpoints.query.check_configuration_loaded")
+        mocker.patch("app.endpoints.query.check_tokens_available")
+        mocker.patch("app.endpoints.query.validate_model_provider_override")
+        mock_client_holder = mocker.Mock()
+        mock_client_holder.get_client.return_value = mocker.AsyncMock(
+            spec=AsyncLlamaStackClient
+        )
+        mocker.patch(
+            "app.endpoints.query.AsyncLlamaStackClientHolder",
+            return_value=mock_client_holder,
+        )
+        mocker.patch(
+            "app.endpoints.query.run_shield_moderation",
+            new=mocker.AsyncMock(return_value=moderation_result),
+        )
+        mocker.patch("app.endpoints.query.build_rag_context", new=build_rag_context)
+
+        mock_responses_params = mocker.Mock(spec=ResponsesApiParams)
+        mock_responses_params.model = "provider1/model1"
+        mock_responses_params.conversation = "conv_123"
+        mock_responses_params.tools = None
+        mocker.patch(
+            "app.endpoints.query.prepare_responses_params",
+            new=mocker.AsyncMock(return_value=mock_responses_params),
+        )
+        mocker.patch(
+            "app.endpoints.query.retrieve_response",
+            new=mocker.AsyncMock(return_value=TurnSummary()),
+        )
+        mocker.patch(
+            "app.endpoints.query.get_topic_summary",
+            new=mocker.AsyncMock(return_value=None),
+        )
+        mocker.patch("app.endpoints.query.store_query_results")
+        mocker.patch("app.endpoints.query.consume_query_tokens", return_value=None)
+        mocker.patch("app.endpoints.query.get_available_quotas", return_value={})
+        return mock_responses_params
+
+    @pytest.mark.asyncio
+    async def test_query_injects_inline_rag_context_into_input(
+        self,
+        dummy_request: Request,
+        setup_configuration: AppConfig,
+        mocker: MockerFixture,
+    ) -> None:
+        """Test that speculatively built RAG context is used when moderation passes."""
+        mock_responses_params = self._patch_preparation(
+            mocker,
+            setup_configuration,
+            ShieldModerationPassed(),
+            mocker.AsyncMock(return_value=RAGContext(context_text="RAG context")),
+        )
+
+        await query_endpoint_handler(
+            request=dummy_request,
+            query_request=QueryRequest(query="What is Kubernetes?"),
+            auth=MOCK_AUTH,
+            mcp_headers={},
+        )
+
+        assert mock_responses_params.input == "What is Kubernetes?\n\nRAG context"
+
+    @pytest.mark.asyncio
+    async def test_query_blocked_discards_speculative_rag(
+        self,
+        dummy_request: Request,
+        setup_configuration: AppConfig,
+        mocker: MockerFixture,
+    ) -> None:
+        """Test that RAG retrieval is cancelled when moderation blocks the query."""
+        rag_cancelled = asyncio.Event()
+
+        async def slow_rag(*_args: Any, **_kwargs: Any) -> RAGContext:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                rag_cancelled.set()
+                raise
+            return RAGContext(context_text="RAG context")
+
+        blocked = ShieldModerationBlocked(
+            message="Blocked",
+            moderation_id="mod_123",
+            refusal_response=create_refusal_response("Blocked"),
+        )
+        mock_responses_params = self._patch_preparation(
+            mocker, setup_configuration, blocked, slow_rag
+        )
+
+        response = await asyncio.wait_for(
+            query_endpoint_handler(
+                request=dummy_request,
+                query_request=QueryRequest(query="What is Kubernetes?"),
+                auth=MOCK_AUTH,
+                mcp_headers={},
+            ),
+            1,
+        )
+
+        assert isinstance(response, QueryResponse)
+        assert rag_cancelled.is_set()
+        assert mock_responses_params.input == "What is Kubernetes?"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("rejecting_check", "status_code"),
+        [
+            ("check_tokens_available", 429),
+            ("validate_and_retrieve_conversation", 403),
+        ],
+    )
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    async def test_query_rejected_does_not_start_moderation_or_rag(
+        self,
+        dummy_request: Request,
+        setup_configuration: AppConfig,
+        mocker: MockerFixture,
+        rejecting_check: str,
+        status_code: int,
+    ) -> None:
+        """Test that moderation and RAG do not start for a rejected query."""
+        mock_build_rag_context = mocker.AsyncMock(return_value=RAGContext())
+        self._patch_preparation(
+            mocker,
+            setup_configuration,
+            ShieldModerationPassed(),
+            mock_build_rag_context,
+        )
+        mock_run_shield_moderation = mocker.patch(
+            "app.endpoints.query.run_shield_moderation",
+            new=mocker.AsyncMock(return_value=ShieldModerationPassed()),
+        )
+        mocker.patch(
+            f"app.endpoints.query.{rejecting_check}",
+            side_effect=HTTPException(status_code=status_code, detail="Rejected"),
+        )
+        dummy_request.state.authorized_actions = set()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await query_endpoint_handler(
+                request=dummy_request,
+                query_request=QueryRequest(
+                    query="What is Kubernetes?",
+                    conversation_id="123e4567-e89b-12d3-a456-426614174000",
+                ),
+                auth=MOCK_AUTH,
+                mcp_headers={},
+            )
+
+        assert exc_info.value.status_code == status_code
+        mock_run_shield_moderation.assert_not_called()
+        mock_build_rag_context.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_successful_query_with_conversation(
         self,
@@ -318,7 +487,7 @@ class TestQueryEndpointHandler:
             new=mocker.AsyncMock(return_value=TurnSummary()),
         )
         mocker.patch("app.endpoints.query.store_query_results")
-        mocker.patch("app.endpoints.query.consume_query_tokens")
+        mocker.patch("app.endpoints.query.consume_query_tokens", return_value=None)
         mocker.patch("app.endpoints.query.get_available_quotas", return_value={})
 
         response = await query_endpoint_handler(
@@ -401,7 +570,7 @@ class TestQueryEndpointHandler:
             "app.endpoints.query.normalize_conversation_id", return_value="123"
         )
         mocker.patch("app.endpoints.query.store_query_results")
-        mocker.patch("app.endpoints.query.consume_query_tokens")
+        mocker.patch("app.endpoints.query.consume_query_tokens", return_value=None)
         mocker.patch("app.endpoints.query.get_available_quotas", return_value={})
 
         await query_endpoint_handler(
@@ -467,7 +636,7 @@ class TestQueryEndpointHandler:
             "app.endpoints.query.normalize_conversation_id", return_value="123"
         )
         mocker.patch("app.endpoints.query.store_query_results")
-        mocker.patch("app.endpoints.query.consume_query_tokens")
+        mocker.patch("app.endpoints.query.consume_query_tokens", return_value=None)
         mocker.patch("app.endpoints.query.get_available_quotas", return_value={})
 
         await query_endpoint_handler(
@@ -532,22 +701,11 @@ class TestQueryEndpointHandler:
         mock_azure_manager = mocker.Mock()
         mock_azure_manager.is_entra_id_configured = True
         mock_azure_manager.is_token_expired = True
-        mock_azure_manager.refresh_token.return_value = True
+        mock_azure_manager.refresh_token_async = mocker.AsyncMock(return_value=True)
         mocker.patch(
             "app.endpoints.query.AzureEntraIDManager", return_value=mock_azure_manager
         )
 
-        mock_updated_client = mocker.AsyncMock(spec=AsyncLlamaStackClient)
-        mock_response_obj_updated = mocker.Mock()
-        mock_response_obj_updated.output = []
-        mock_updated_client.responses = mocker.Mock()
-        mock_updated_client.responses.create = mocker.AsyncMock(
-            return_value=mock_response_obj_updated
-        )
-        mock_update_token = mocker.patch(
-            "app.endpoints.query.update_azure_token",
-            new=mocker.AsyncMock(return_value=mock_updated_client),
-        )
         mocker.patch(
             "app.endpoints.query.get_topic_summary",
             new=mocker.AsyncMock(return_value=None),
@@ -563,7 +721,7 @@ class TestQueryEndpointHandler:
             "app.endpoints.query.normalize_conversation_id", return_value="123"
         )
         mocker.patch("app.endpoints.query.store_query_results")
-        mocker.patch("app.endpoints.query.consume_query_tokens")
+        mocker.patch("app.endpoints.query.consume_query_tokens", return_value=None)
         mocker.patch("app.endpoints.query.get_available_quotas", return_value={})
 
         await query_endpoint_handler(
@@ -573,7 +731,7 @@ class TestQueryEndpointHandler:
             mcp_headers={},
         )
 
-        mock_update_token.assert_called_once()
+        mock_azure_manager.refresh_token_async.assert_awaited_once()
 
 
 class TestRetrieveResponse:
@@ -478,13 +478,8 @@ class TestResponsesEndpointHandler:
         mock_azure = mocker.Mock()
         mock_azure.is_entra_id_configured = True
         mock_azure.is_token_expired = True
-        mock_azure.refresh_token.return_value = True
+        mock_azure.refresh_token_async = mocker.AsyncMock(return_value=True)
         mocker.patch(f"{MODULE}.AzureEntraIDManager", return_value=mock_azure)
-        updated_client = mocker.AsyncMock(spec=AsyncLlamaStackClient)
-        mock_update_token = mocker.patch(
-            f"{MODULE}.update_azure_token",
-            new=mocker.AsyncMock(return_value=updated_client),
-        )
         _patch_rag(mocker)
         _patch_moderation(mocker, decision="passed")
         mocker.patch(
@@ -504,7 +499,7 @@ class TestResponsesEndpointHandler:
             auth=MOCK_AUTH,
             mcp_headers={},
         )
-        mock_update_token.assert_called_once()
+        mock_azure.refresh_token_async.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_responses_structured_input_appends_rag_message(
@@ -835,7 +830,7 @@ class TestHandleNonStreamingResponse:
             f"{MODULE}.extract_token_usage",
             return_value=mocker.Mock(input_tokens=1, output_tokens=2),
         )
-        mocker.patch(f"{MODULE}.consume_query_tokens")
+        mocker.patch(f"{MODULE}.consume_query_tokens", return_value=None)
         mocker.patch(
             f"{MODULE}.build_turn_summary",
             return_value=mocker.Mock(referenced_documents=[]),
@@ -912,7 +907,7 @@ class TestHandleNonStreamingResponse:
             f"{MODULE}.extract_token_usage",
             return_value=mocker.Mock(input_tokens=1, output_tokens=2),
         )
-        mocker.patch(f"{MODULE}.consume_query_tokens")
+        mocker.patch(f"{MODULE}.consume_query_tokens", return_value=None)
         mocker.patch(
             f"{MODULE}.build_turn_summary",
             return_value=mocker.Mock(referenced_documents=[]),
@@ -1225,7 +1220,7 @@ class TestHandleStreamingResponse:
         mocker.patch(f"{MODULE}.configuration", minimal_config)
         mocker.patch(f"{MODULE}.get_available_quotas", return_value={})
         mocker.patch(f"{MODULE}.extract_token_usage", return_value=mocker.Mock())
-        mocker.patch(f"{MODULE}.consume_query_tokens")
+        mocker.patch(f"{MODULE}.consume_query_tokens", return_value=None)
         mocker.patch(f"{MODULE}.extract_vector_store_ids_from_tools", return_value=[])
         mocker.patch(
             f"{MODULE}.build_turn_summary",
@@ -1312,7 +1307,7 @@ class TestHandleStreamingResponse:
         mocker.patch(f"{MODULE}.configuration", minimal_config)
         mocker.patch(f"{MODULE}.get_available_quotas", return_value={})
         mocker.patch(f"{MODULE}.extract_token_usage", return_value=mocker.Mock())
-        mocker.patch(f"{MODULE}.consume_query_tokens")
+        mocker.patch(f"{MODULE}.consume_query_tokens", return_value=None)
         mocker.patch(f"{MODULE}.extract_vector_store_ids_from_tools", return_value=[])
         mocker.patch(
             f"{MODULE}.build_turn_summary",
@@ -1392,7 +1387,7 @@ class TestHandleStreamingResponse:
         mocker.patch(f"{MODULE}.configuration", minimal_config)
         mocker.patch(f"{MODULE}.get_available_quotas", return_value={})
         mocker.patch(f"{MODULE}.extract_token_usage", return_value=mocker.Mock())
-        mocker.patch(f"{MODULE}.consume_query_tokens")
+        mocker.patch(f"{MODULE}.consume_query_tokens", return_value=None)
         mocker.patch(f"{MODULE}.extract_vector_store_ids_from_tools", return_value=[])
         mocker.patch(
             f"{MODULE}.build_turn_summary",
@@ -1478,7 +1473,7 @@ class TestHandleStreamingResponse:
         mocker.patch(f"{MODULE}.configuration", minimal_config)
         mocker.patch(f"{MODULE}.get_available_quotas", return_value={})
         mocker.patch(f"{MODULE}.extract_token_usage", return_value=mocker.Mock())
-        mocker.patch(f"{MODULE}.consume_query_tokens")
+        mocker.patch(f"{MODULE}.consume_query_tokens", return_value=None)
         mocker.patch(f"{MODULE}.extract_vector_store_ids_from_tools", return_value=[])
         mocker.patch(
             f"{MODULE}.build_turn_summary",
@@ -2304,7 +2299,7 @@ class TestSanitizesOutputAndModel:
             f"{MODULE}.extract_token_usage",
             return_value=mocker.Mock(input_tokens=1, output_tokens=2),
         )
-        mocker.patch(f"{MODULE}.consume_query_tokens")
+        mocker.patch(f"{MODULE}.consume_query_tokens", return_value=None)
         mocker.patch(
             f"{MODULE}.build_turn_summary",
             return_value=mocker.Mock(
@@ -2430,7 +2425,7 @@ class TestSanitizesOutputAndModel:
         mocker.patch(f"{MODULE}.configuration", mock_config)
         mocker.patch(f"{MODULE}.get_available_quotas", return_value={})
         mocker.patch(f"{MODULE}.extract_token_usage", return_value=mocker.Mock())
-        mocker.patch(f"{MODULE}.consume_query_tokens")
+        mocker.patch(f"{MODULE}.consume_query_tokens", return_value=None)
         mocker.patch(f"{MODULE}.extract_vector_store_ids_from_tools", return_value=[])
         mocker.patch(
             f"{MODULE}.build_turn_summary",
@@ -2556,7 +2551,7 @@ class TestMcpEventsFilteredUnconditionally:
         mocker.patch(f"{MODULE}.configuration", mock_config)
         mocker.patch(f"{MODULE}.get_available_quotas", return_value={})
         mocker.patch(f"{MODULE}.extract_token_usage", return_value=mocker.Mock())
-        mocker.patch(f"{MODULE}.consume_query_tokens")
+        mocker.patch(f"{MODULE}.consume_query_tokens", return_value=None)
         mocker.patch(f"{MODULE}.extract_vector_store_ids_from_tools", return_value=[])
         mocker.patch(
             f"{MODULE}.build_turn_summary",
@@ -2652,7 +2647,7 @@ class TestMcpEventsFilteredUnconditionally:
         mocker.patch(f"{MODULE}.configuration", minimal_config)
         mocker.patch(f"{MODULE}.get_available_quotas", return_value={})
         mocker.patch(f"{MODULE}.extract_token_usage", return_value=mocker.Mock())
-        mocker.patch(f"{MODULE}.consume_query_tokens")
+        mocker.patch(f"{MODULE}.consume_query_tokens", return_value=None)
         mocker.patch(f"{MODULE}.extract_vector_store_ids_from_tools", return_value=[])
         mocker.patch(
             f"{MODULE}.build_turn_summary",
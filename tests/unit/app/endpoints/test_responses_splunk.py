@@ -202,6 +202,34 @@ class TestQueueResponsesSplunkEvent:
         done_callback(mock_task)
         assert mock_task not in _background_splunk_tasks
 
+    @pytest.mark.parametrize("fire_and_forget", [False, True])
+    def test_queues_event_in_running_exporter(
+        self,
+        mock_background_tasks: Any,
+        mocker: MockerFixture,
+        fire_and_forget: bool,
+    ) -> None:
+        """Verify events go to the Splunk exporter queue when it is running."""
+        mocker.patch(f"{MODULE}.build_responses_event", return_value={"built": True})
+        mock_queue = mocker.patch(f"{MODULE}.queue_splunk_event", return_value=True)
+        mock_create_task = mocker.patch("asyncio.create_task")
+
+        _queue_responses_splunk_event(
+            background_tasks=mock_background_tasks,
+            input_text="user question",
+            response_text="llm answer",
+            conversation_id="conv_abc",
+            model="provider/model1",
+            rh_identity_context=("org1", "sys1"),
+            inference_time=1.23,
+            sourcetype="responses_completed",
+            fire_and_forget=fire_and_forget,
+        )
+
+        mock_queue.assert_called_once_with({"built": True}, "responses_completed")
+        mock_background_tasks.add_task.assert_not_called()
+        mock_create_task.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # Tests 2-8: Integration tests for telemetry hook paths
@@ -400,7 +428,7 @@ class TestSplunkTelemetryHooks:
             f"{MODULE}.extract_token_usage",
             return_value=mocker.Mock(input_tokens=100, output_tokens=50),
         )
-        mocker.patch(f"{MODULE}.consume_query_tokens")
+        mocker.patch(f"{MODULE}.consume_query_tokens", return_value=None)
         mocker.patch(
             f"{MODULE}.extract_text_from_response_items",
             return_value="Model reply",
@@ -627,7 +655,7 @@ class TestSplunkTelemetryHooks:
             f"{MODULE}.extract_token_usage",
             return_value=mocker.Mock(input_tokens=100, output_tokens=50),
         )
-        mocker.patch(f"{MODULE}.consume_query_tokens")
+        mocker.patch(f"{MODULE}.consume_query_tokens", return_value=None)
         mocker.patch(f"{MODULE}.extract_vector_store_ids_from_tools", return_value=[])
         mock_turn_summary = TurnSummary(referenced_documents=[])
         mock_token_usage = mocker.Mock()
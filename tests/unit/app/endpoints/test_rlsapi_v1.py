@@ -923,6 +923,33 @@ async def test_infer_queues_splunk_event_on_success(
     assert call_args[0][2] == "infer_with_llm"
 
 
+@pytest.mark.asyncio
+async def test_infer_queues_splunk_event_in_running_exporter(
+    mocker: MockerFixture,
+    mock_configuration: AppConfig,
+    mock_llm_response: None,
+    mock_auth_resolvers: None,
+    mock_request_factory: Callable[..., Any],
+    mock_background_tasks: Any,
+) -> None:
+    """Test that Splunk events go to the exporter queue when it is running."""
+    mock_queue = mocker.patch(
+        "app.endpoints.rlsapi_v1.queue_splunk_event", return_value=True
+    )
+
+    await infer_endpoint(
+        infer_request=RlsapiV1InferRequest(question="How do I list files?"),
+        request=mock_request_factory(),
+        background_tasks=mock_background_tasks,
+        auth=MOCK_AUTH,
+    )
+
+    mock_queue.assert_called_once()
+    assert mock_queue.call_args[0][0]["question"] == "How do I list files?"
+    assert mock_queue.call_args[0][1] == "infer_with_llm"
+    mock_background_tasks.add_task.assert_not_called()
+
+
 # --- Test _resolve_quota_subject ---
 
 
@@ -1028,6 +1055,7 @@ def mock_quota_config_fixture(
         config_mock.customization = mock_configuration.customization
         config_mock.rlsapi_v1 = rlsapi_v1_mock
         config_mock.quota_limiters = []
+        config_mock.quota_engine = None
         mocker.patch("app.endpoints.rlsapi_v1.configuration", config_mock)
 
     return _set
@@ -1055,7 +1083,7 @@ async def test_infer_quota_check_called_when_configured(
     )
 
     assert isinstance(response, RlsapiV1InferResponse)
-    mock_check.assert_called_once_with([], "mock_user_id")
+    mock_check.assert_called_once_with([], "mock_user_id", None)
     mock_consume.assert_called_once()
 
 
@@ -1156,7 +1184,7 @@ async def test_infer_quota_with_rh_identity_subject(
         auth=MOCK_AUTH,
     )
 
-    mock_check.assert_called_once_with([], expected_subject)
+    mock_check.assert_called_once_with([], expected_subject, None)
     mock_consume.assert_called_once()
     assert mock_consume.call_args.kwargs["user_id"] == expected_subject
 
@@ -1197,7 +1225,7 @@ async def test_infer_quota_shield_blocked_does_not_consume_tokens(
     )
 
     assert response.data.text == "Blocked by moderation"
-    mock_check.assert_called_once_with([], "mock_user_id")
+    mock_check.assert_called_once_with([], "mock_user_id", None)
     mock_consume.assert_not_called()
 
 
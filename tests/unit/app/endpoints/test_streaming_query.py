@@ -425,6 +425,62 @@ class TestStreamingQueryEndpointHandler:
         assert isinstance(response, StreamingResponse)
         assert response.media_type == "text/event-stream"
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("rejecting_check", "status_code"),
+        [
+            ("check_tokens_available", 429),
+            ("validate_and_retrieve_conversation", 403),
+        ],
+    )
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    async def test_streaming_query_rejected_does_not_start_moderation_or_rag(
+        self,
+        dummy_request: Request,  # pylint: disable=redefined-outer-name
+        setup_configuration: AppConfig,
+        mocker: MockerFixture,
+        rejecting_check: str,
+        status_code: int,
+    ) -> None:
+        """Test that moderation and RAG do not start for a rejected streaming query."""
+        mocker.patch("app.endpoints.streaming_query.configuration", setup_configuration)
+        mocker.patch("app.endpoints.streaming_query.check_configuration_loaded")
+        mocker.patch("app.endpoints.streaming_query.check_tokens_available")
+        mocker.patch("app.endpoints.streaming_query.validate_model_provider_override")
+        mocker.patch("app.endpoints.streaming_query.AsyncLlamaStackClientHolder")
+        mock_build_rag_context = mocker.patch(
+            "app.endpoints.streaming_query.build_rag_context",
+            new=mocker.AsyncMock(return_value=RAGContext()),
+        )
+        mock_run_shield_moderation = mocker.patch(
+            "app.endpoints.streaming_query.run_shield_moderation",
+            new=mocker.AsyncMock(return_value=ShieldModerationPassed()),
+        )
+        mock_prepare_responses_params = mocker.patch(
+            "app.endpoints.streaming_query.prepare_responses_params",
+            new=mocker.AsyncMock(),
+        )
+        mocker.patch(
+            f"app.endpoints.streaming_query.{rejecting_check}",
+            side_effect=HTTPException(status_code=status_code, detail="Rejected"),
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await streaming_query_endpoint_handler(
+                request=dummy_request,
+                query_request=QueryRequest(
+                    query="What is Kubernetes?",
+                    conversation_id="123e4567-e89b-12d3-a456-426614174000",
+                ),  # pyright: ignore[reportCallIssue]
+                auth=MOCK_AUTH_STREAMING,
+                mcp_headers={},
+            )
+
+        assert exc_info.value.status_code == status_code
+        mock_run_shield_moderation.assert_not_called()
+        mock_build_rag_context.assert_not_called()
+        mock_prepare_responses_params.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_streaming_query_text_media_type_header(
         self,
@@ -750,18 +806,12 @@ class TestStreamingQueryEndpointHandler:
         mock_azure_manager = mocker.Mock()
         mock_azure_manager.is_entra_id_configured = True
         mock_azure_manager.is_token_expired = True
-        mock_azure_manager.refresh_token.return_value = True
+        mock_azure_manager.refresh_token_async = mocker.AsyncMock(return_value=True)
         mocker.patch(
             "app.endpoints.streaming_query.AzureEntraIDManager",
             return_value=mock_azure_manager,
         )
 
-        mock_updated_client = mocker.AsyncMock(spec=AsyncLlamaStackClient)
-        mock_update_token = mocker.patch(
-            "app.endpoints.streaming_query.update_azure_token",
-            new=mocker.AsyncMock(return_value=mock_updated_client),
-        )
-
         mocker.patch(
             "app.endpoints.streaming_query.extract_provider_and_model_from_model_id",
             return_value=("azure", "model1"),
@@ -803,7 +853,7 @@ class TestStreamingQueryEndpointHandler:
             mcp_headers={},
         )
 
-        mock_update_token.assert_called_once()
+        mock_azure_manager.refresh_token_async.assert_awaited_once()
 
 
 class TestCreateResponseGenerator:
@@ -1145,7 +1195,9 @@ class TestGenerateResponse:
         mock_config = mocker.Mock()
         mock_config.quota_limiters = []
         mocker.patch("app.endpoints.streaming_query.configuration", mock_config)
-        mocker.patch("app.endpoints.streaming_query.consume_query_tokens")
+        mocker.patch(
+            "app.endpoints.streaming_query.consume_query_tokens", return_value=None
+        )
         mocker.patch(
             "app.endpoints.streaming_query.get_available_quotas", return_value={}
         )
@@ -1164,6 +1216,68 @@ class TestGenerateResponse:
         assert any("start" in item for item in result)
         assert any("end" in item for item in result)
 
+    @pytest.mark.asyncio
+    async def test_generate_response_queues_query_results(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test that results are handed to the write-behind queue when running."""
+
+        async def mock_generator() -> AsyncIterator[str]:
+            yield "data: token\n\n"
+
+        mock_context = mocker.Mock(spec=ResponseGeneratorContext)
+        mock_context.conversation_id = "conv_123"
+        mock_context.user_id = "user_123"
+        mock_context.query_request = QueryRequest(
+            query="test", generate_topic_summary=False
+        )  # pyright: ignore[reportCallIssue]
+        mock_context.started_at = "2024-01-01T00:00:00Z"
+        mock_context.skip_userid_check = False
+        mock_context.request_id = "123e4567-e89b-12d3-a456-426614174000"
+        mock_context.client = mocker.AsyncMock(spec=AsyncLlamaStackClient)
+
+        mock_responses_params = mocker.Mock(spec=ResponsesApiParams)
+        mock_responses_params.model = "provider1/model1"
+
+        mock_turn_summary = TurnSummary()
+        mock_turn_summary.token_usage = TokenCounter(input_tokens=10, output_tokens=5)
+
+        mock_config = mocker.Mock()
+        mock_config.quota_limiters = []
+        mocker.patch("app.endpoints.streaming_query.configuration", mock_config)
+        mock_consume = mocker.patch(
+            "app.endpoints.streaming_query.consume_query_tokens", return_value=None
+        )
+        mocker.patch(
+            "app.endpoints.streaming_query.get_available_quotas", return_value={}
+        )
+        mock_store = mocker.patch("app.endpoints.streaming_query.store_query_results")
+        mock_queue = mocker.Mock()
+        mock_queue.running = True
+        mock_queue.submit = mocker.AsyncMock()
+        mocker.patch(
+            "app.endpoints.streaming_query.PersistenceQueue", return_value=mock_queue
+        )
+
+        result = [
+            item
+            async for item in generate_response(
+                mock_generator(),
+                mock_context,
+                mock_responses_params,
+                mock_turn_summary,
+            )
+        ]
+
+        assert "end" in result[-1]
+        mock_store.assert_not_called()
+        assert mock_consume.call_args.kwargs["record_history"] is False
+        mock_queue.submit.assert_awaited_once()
+        record = mock_queue.submit.call_args.args[0]
+        assert record.conversation_id == "conv_123"
+        assert record.model == "provider1/model1"
+        assert record.summary is mock_turn_summary
+
     @pytest.mark.asyncio
     async def test_generate_response_with_topic_summary(
         self, mocker: MockerFixture
@@ -1196,7 +1310,9 @@ class TestGenerateResponse:
         mock_config = mocker.Mock()
         mock_config.quota_limiters = []
         mocker.patch("app.endpoints.streaming_query.configuration", mock_config)
-        mocker.patch("app.endpoints.streaming_query.consume_query_tokens")
+        mocker.patch(
+            "app.endpoints.streaming_query.consume_query_tokens", return_value=None
+        )
         mocker.patch(
             "app.endpoints.streaming_query.get_available_quotas", return_value={}
         )
@@ -1234,7 +1350,7 @@ class TestGenerateResponse:
         mock_context.inline_rag_context = RAGContext()
         mock_context.user_id = "user_123"
         mock_context.query_request = QueryRequest(
-            query="test"
+            query="test", generate_topic_summary=False
         )  # pyright: ignore[reportCallIssue]
         mock_context.started_at = "2024-01-01T00:00:00Z"
         mock_context.skip_userid_check = False
@@ -1277,7 +1393,7 @@ class TestGenerateResponse:
         mock_context.inline_rag_context = RAGContext()
         mock_context.user_id = "user_123"
         mock_context.query_request = QueryRequest(
-            query="test"
+            query="test", generate_topic_summary=False
         )  # pyright: ignore[reportCallIssue]
         mock_context.started_at = "2024-01-01T00:00:00Z"
         mock_context.skip_userid_check = False
@@ -1323,7 +1439,7 @@ class TestGenerateResponse:
         mock_context.inline_rag_context = RAGContext()
         mock_context.user_id = "user_123"
         mock_context.query_request = QueryRequest(
-            query="test", media_type=MEDIA_TYPE_JSON
+            query="test", media_type=MEDIA_TYPE_JSON, generate_topic_summary=False
         )  # pyright: ignore[reportCallIssue]
         mock_context.request_id = "123e4567-e89b-12d3-a456-426614174000"
 
@@ -1371,7 +1487,7 @@ class TestGenerateResponse:
         mock_context.inline_rag_context = RAGContext()
         mock_context.user_id = "user_123"
         mock_context.query_request = QueryRequest(
-            query="test", media_type=MEDIA_TYPE_JSON
+            query="test", media_type=MEDIA_TYPE_JSON, generate_topic_summary=False
         )  # pyright: ignore[reportCallIssue]
         mock_context.request_id = "123e4567-e89b-12d3-a456-426614174000"
 
@@ -1515,7 +1631,9 @@ class TestGenerateResponse:
         mock_turn_summary = TurnSummary()
         mock_turn_summary.token_usage = TokenCounter(input_tokens=10, output_tokens=5)
 
-        mocker.patch("app.endpoints.streaming_query.consume_query_tokens")
+        mocker.patch(
+            "app.endpoints.streaming_query.consume_query_tokens", return_value=None
+        )
         get_topic_summary_mock = mocker.patch(
             "app.endpoints.streaming_query.get_topic_summary",
             new=mocker.AsyncMock(return_value="Kubernetes container orchestration"),
@@ -1595,7 +1713,9 @@ class TestGenerateResponse:
         mock_turn_summary = TurnSummary()
         mock_turn_summary.token_usage = TokenCounter(input_tokens=10, output_tokens=5)
 
-        mocker.patch("app.endpoints.streaming_query.consume_query_tokens")
+        mocker.patch(
+            "app.endpoints.streaming_query.consume_query_tokens", return_value=None
+        )
         mocker.patch(
             "app.endpoints.streaming_query.get_topic_summary",
             new=mocker.AsyncMock(side_effect=Exception("err")),
@@ -1662,7 +1782,9 @@ class TestGenerateResponse:
         mock_turn_summary = TurnSummary()
         mock_turn_summary.token_usage = TokenCounter(input_tokens=10, output_tokens=5)
 
-        mocker.patch("app.endpoints.streaming_query.consume_query_tokens")
+        mocker.patch(
+            "app.endpoints.streaming_query.consume_query_tokens", return_value=None
+        )
         get_topic_summary_mock = mocker.patch(
             "app.endpoints.streaming_query.get_topic_summary",
             new=mocker.AsyncMock(return_value="Docker containerization"),
@@ -1721,7 +1843,9 @@ class TestGenerateResponse:
 
         mock_turn_summary = TurnSummary()
 
-        mocker.patch("app.endpoints.streaming_query.consume_query_tokens")
+        mocker.patch(
+            "app.endpoints.streaming_query.consume_query_tokens", return_value=None
+        )
         store_query_results_mock = mocker.patch(
             "app.endpoints.streaming_query.store_query_results"
         )
@@ -1780,7 +1904,9 @@ class TestGenerateResponse:
 
         mock_turn_summary = TurnSummary()
 
-        mocker.patch("app.endpoints.streaming_query.consume_query_tokens")
+        mocker.patch(
+            "app.endpoints.streaming_query.consume_query_tokens", return_value=None
+        )
         store_query_results_mock = mocker.patch(
             "app.endpoints.streaming_query.store_query_results"
         )
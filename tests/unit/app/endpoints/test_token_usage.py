@@ -0,0 +1,107 @@
+"""Unit tests for the /token-usage REST API endpoint."""
+
+import sqlite3
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import HTTPException, Request, status
+from pytest_mock import MockerFixture
+
+from app.endpoints.token_usage import token_usage_endpoint_handler
+from authentication.interface import AuthTuple
+from configuration import AppConfig
+from tests.unit.utils.auth_helpers import mock_authorization_resolvers
+from utils.types import TokenUsageBucket
+
+AUTH: AuthTuple = ("test_user_id", "test_user", True, "test_token")
+
+
+def create_request() -> Request:
+    """Create HTTP request mock required by URL endpoint handler."""
+    return Request(scope={"type": "http"})
+
+
+@pytest.mark.asyncio
+async def test_token_usage_endpoint_handler(
+    mocker: MockerFixture, minimal_config: AppConfig
+) -> None:
+    """Test that token usage is read from the rollups."""
+    mock_authorization_resolvers(mocker)
+    history = mocker.Mock()
+    bucket = TokenUsageBucket(
+        user_id="u1",
+        provider="p",
+        model="m",
+        bucket=datetime(2025, 10, 1, tzinfo=UTC),
+        input_tokens=10,
+        output_tokens=20,
+        requests=2,
+    )
+    history.usage.return_value = [bucket]
+    minimal_config._token_usage_history = history  # pylint: disable=protected-access
+    mocker.patch("app.endpoints.token_usage.configuration", minimal_config)
+    start = datetime(2025, 10, 1, tzinfo=UTC)
+
+    response = await token_usage_endpoint_handler(
+        auth=AUTH,
+        request=create_request(),
+        user_id="u1",
+        start=start,
+        end=None,
+        granularity="hour",
+    )
+
+    assert response.granularity == "hour"
+    assert response.usage == [bucket]
+    history.usage.assert_called_once_with(
+        user_id="u1", start=start, end=None, granularity="hour"
+    )
+
+
+@pytest.mark.asyncio
+async def test_token_usage_endpoint_handler_not_configured(
+    mocker: MockerFixture, minimal_config: AppConfig
+) -> None:
+    """Test that an error is returned when token usage history is disabled."""
+    mock_authorization_resolvers(mocker)
+    mocker.patch("app.endpoints.token_usage.configuration", minimal_config)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await token_usage_endpoint_handler(
+            auth=AUTH,
+            request=create_request(),
+            user_id=None,
+            start=None,
+            end=None,
+            granularity="day",
+        )
+
+    assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert exc_info.value.detail["response"] == (  # type: ignore
+        "Token usage history not configured"
+    )
+
+
+@pytest.mark.asyncio
+async def test_token_usage_endpoint_handler_database_error(
+    mocker: MockerFixture, minimal_config: AppConfig
+) -> None:
+    """Test that database errors are returned as internal server errors."""
+    mock_authorization_resolvers(mocker)
+    history = mocker.Mock()
+    history.usage.side_effect = sqlite3.OperationalError("no such table")
+    minimal_config._token_usage_history = history  # pylint: disable=protected-access
+    mocker.patch("app.endpoints.token_usage.configuration", minimal_config)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await token_usage_endpoint_handler(
+            auth=AUTH,
+            request=create_request(),
+            user_id=None,
+            start=None,
+            end=None,
+            granularity="day",
+        )
+
+    assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert exc_info.value.detail["response"] == "Database query failed"  # type: ignore
@@ -2,6 +2,7 @@
 
 """Unit tests for tools endpoint."""
 
+from collections.abc import Generator
 from pathlib import Path
 from typing import Any
 
@@ -26,11 +27,20 @@ from models.config import (
     UserDataCollection,
 )
 from models.responses import ToolsResponse
+from utils.tool_catalog import ToolCatalog
 
 # Shared mock auth tuple with 4 fields as expected by the application
 MOCK_AUTH: AuthTuple = ("mock_user_id", "mock_username", False, "mock_token")
 
 
+@pytest.fixture(autouse=True)
+def empty_tool_catalog() -> Generator[None, None, None]:
+    """Start every test with an empty tool catalog."""
+    ToolCatalog().invalidate()
+    yield
+    ToolCatalog().invalidate()
+
+
 @pytest.fixture
 def mock_configuration() -> Configuration:
     """Create a mock configuration with MCP servers."""
@@ -242,6 +252,43 @@ async def test_tools_endpoint_success(
     )
 
 
+@pytest.mark.asyncio
+async def test_tools_endpoint_serves_cached_tools(
+    mocker: MockerFixture,
+    mock_configuration: Configuration,  # pylint: disable=redefined-outer-name
+    mock_tools_response: list[MockType],  # pylint: disable=redefined-outer-name
+) -> None:
+    """Test that tools are listed once and listed again after invalidation."""
+    app_config = AppConfig()
+    app_config._configuration = mock_configuration
+    mocker.patch("app.endpoints.tools.configuration", app_config)
+    mocker.patch("app.endpoints.tools.authorize", lambda _: lambda func: func)
+
+    mock_client_holder = mocker.patch("app.endpoints.tools.AsyncLlamaStackClientHolder")
+    mock_client = mocker.AsyncMock()
+    mock_client_holder.return_value.get_client.return_value = mock_client
+
+    mock_toolgroup = mocker.Mock()
+    mock_toolgroup.identifier = "filesystem-tools"
+    mock_toolgroup.provider_id = "model-context-protocol"
+    mock_toolgroup.type = "tool_group"
+    mock_client.toolgroups.list.return_value = [mock_toolgroup]
+    mock_client.tools.list.return_value = [mock_tools_response[0]]
+
+    for _ in range(2):
+        response = await tools.tools_endpoint_handler.__wrapped__(  # pyright: ignore
+            mocker.Mock(), MOCK_AUTH, {}
+        )
+        assert [tool["identifier"] for tool in response.tools] == ["filesystem_read"]
+    assert mock_client.tools.list.call_count == 1
+
+    ToolCatalog().invalidate("filesystem-tools")
+    await tools.tools_endpoint_handler.__wrapped__(  # pyright: ignore
+        mocker.Mock(), MOCK_AUTH, {}
+    )
+    assert mock_client.tools.list.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_tools_endpoint_no_mcp_servers(mocker: MockerFixture) -> None:
     """Test tools endpoint with no MCP servers configured."""
@@ -263,6 +263,109 @@ class TestCreatePostgresEngine:
             database._create_postgres_engine(config)
 
 
+class TestCreatePostgresAsyncEngine:
+    """Test cases for _create_postgres_async_engine function."""
+
+    @pytest.mark.parametrize(
+        ("ssl_mode", "expected"),
+        [
+            ("disable", False),
+            ("prefer", "prefer"),
+            ("require", "require"),
+            ("verify-full", "verify-full"),
+        ],
+    )
+    def test_ssl_mode_without_ca_cert(
+        self,
+        mocker: MockerFixture,
+        base_postgres_config: PostgreSQLDatabaseConfiguration,
+        ssl_mode: str,
+        expected: bool | str,
+    ) -> None:
+        """Test that the SSL mode is passed to asyncpg."""
+        mock_create_async_engine = mocker.patch("app.database.create_async_engine")
+        config = base_postgres_config.model_copy(update={"ssl_mode": ssl_mode})
+
+        database._create_postgres_async_engine(config)
+
+        call_args = mock_create_async_engine.call_args
+        assert call_args[1]["connect_args"]["ssl"] == expected
+
+    @pytest.mark.parametrize(
+        ("ssl_mode", "check_hostname"),
+        [
+            ("require", False),
+            ("verify-ca", False),
+            ("verify-full", True),
+        ],
+    )
+    def test_ca_cert_verifies_server(
+        self,
+        mocker: MockerFixture,
+        base_postgres_config: PostgreSQLDatabaseConfiguration,
+        ssl_mode: str,
+        check_hostname: bool,
+    ) -> None:
+        """Test that the CA certificate is loaded into the SSL context."""
+        mock_create_async_engine = mocker.patch("app.database.create_async_engine")
+        mock_create_context = mocker.patch("app.database.ssl.create_default_context")
+
+        with tempfile.NamedTemporaryFile() as cert_file:
+            config = base_postgres_config.model_copy(
+                update={"ssl_mode": ssl_mode, "ca_cert_path": cert_file.name}
+            )
+
+            database._create_postgres_async_engine(config)
+
+            mock_create_context.assert_called_once_with(cafile=cert_file.name)
+        context = mock_create_async_engine.call_args[1]["connect_args"]["ssl"]
+        assert context is mock_create_context.return_value
+        assert context.check_hostname is check_hostname
+
+    @pytest.mark.parametrize("ssl_mode", ["disable", "prefer"])
+    def test_ca_cert_ignored_without_verification(
+        self,
+        mocker: MockerFixture,
+        base_postgres_config: PostgreSQLDatabaseConfiguration,
+        ssl_mode: str,
+    ) -> None:
+        """Test that the CA certificate is not used by modes not verifying the server."""
+        mock_create_async_engine = mocker.patch("app.database.create_async_engine")
+        mock_create_context = mocker.patch("app.database.ssl.create_default_context")
+
+        with tempfile.NamedTemporaryFile() as cert_file:
+            config = base_postgres_config.model_copy(
+                update={"ssl_mode": ssl_mode, "ca_cert_path": cert_file.name}
+            )
+
+            database._create_postgres_async_engine(config)
+
+        mock_create_context.assert_not_called()
+        ssl_arg = mock_create_async_engine.call_args[1]["connect_args"]["ssl"]
+        assert ssl_arg == (False if ssl_mode == "disable" else ssl_mode)
+
+    def test_gss_encryption_required_keeps_synchronous_engine(
+        self,
+        mocker: MockerFixture,
+        base_postgres_config: PostgreSQLDatabaseConfiguration,
+    ) -> None:
+        """Test that no async engine is created when GSS encryption is required."""
+        mocker.patch.object(database, "async_engine", None)
+        mocker.patch.object(database, "async_session_local", None)
+        mock_configuration = mocker.patch("app.database.configuration")
+        mock_configuration.database_configuration.db_type = "postgres"
+        mock_configuration.database_configuration.config = (
+            base_postgres_config.model_copy(update={"gss_encmode": "require"})
+        )
+        mock_create = mocker.patch("app.database._create_postgres_async_engine")
+
+        database.initialize_async_database()
+
+        mock_create.assert_not_called()
+        assert database.async_engine is None
+        assert database.async_session_local is None
+
+
 @pytest.mark.usefixtures("reset_database_state")
 class TestInitializeDatabase:
     """Test cases for initialize_database function."""
@@ -28,6 +28,7 @@ from app.endpoints import (
     shields,
     stream_interrupt,
     streaming_query,
+    token_usage,
     tools,
     vector_stores,
 )
@@ -116,7 +117,7 @@ def test_include_routers() -> None:
     include_routers(app)
 
     # are all routers added?
-    assert len(app.routers) == 24
+    assert len(app.routers) == 25
     assert root.router in app.get_routers()
     assert info.router in app.get_routers()
     assert models.router in app.get_routers()
@@ -129,6 +130,7 @@ def test_include_routers() -> None:
     assert query.router in app.get_routers()
     assert streaming_query.router in app.get_routers()
     assert config.router in app.get_routers()
+    assert token_usage.router in app.get_routers()
     assert feedback.router in app.get_routers()
     assert health.router in app.get_routers()
     assert authorized.router in app.get_routers()
@@ -148,7 +150,7 @@ def test_check_prefixes() -> None:
 
     Verify that include_routers registers the expected routers with their configured URL prefixes.
 
-    Asserts that 24 routers are registered on a MockFastAPI instance and that
+    Asserts that 25 routers are registered on a MockFastAPI instance and that
     each router's prefix matches the expected value (e.g., root, health,
     authorized, metrics use an empty prefix; most API routers use "/v1";
     conversations_v2 uses "/v2").
@@ -157,7 +159,7 @@ def test_check_prefixes() -> None:
     include_routers(app)
 
     # are all routers added?
-    assert len(app.routers) == 24
+    assert len(app.routers) == 25
     assert app.get_router_prefix(root.router) == ""
     assert app.get_router_prefix(info.router) == "/v1"
     assert app.get_router_prefix(models.router) == "/v1"
@@ -171,6 +173,7 @@ def test_check_prefixes() -> None:
     assert app.get_router_prefix(query.router) == "/v1"
     assert app.get_router_prefix(streaming_query.router) == "/v1"
     assert app.get_router_prefix(config.router) == "/v1"
+    assert app.get_router_prefix(token_usage.router) == "/v1"
     assert app.get_router_prefix(feedback.router) == "/v1"
     assert app.get_router_prefix(health.router) == ""
     assert app.get_router_prefix(authorized.router) == ""
@@ -1,18 +1,19 @@
-# pylint: disable=redefined-outer-name
+# pylint: disable=redefined-outer-name,too-many-lines
 
 """Unit tests for functions defined in authentication/jwk_token.py"""
 
+import asyncio
 import time
 from collections.abc import Generator
 from typing import Any, cast
 
 import pytest
-from authlib.jose import JsonWebKey, JsonWebToken
+from authlib.jose import JsonWebKey, JsonWebToken, JWTClaims
 from fastapi import HTTPException, Request
 from pydantic import AnyHttpUrl
 from pytest_mock import MockerFixture
 
-from authentication.jwk_token import JwkTokenAuthDependency, _jwk_cache
+from authentication.jwk_token import JwkTokenAuthDependency, _jwk_cache, jwt
 from models.config import JwkConfiguration, JwtConfiguration
 
 TEST_USER_ID = "test-user-123"
@@ -925,3 +926,96 @@ async def test_multi_key_no_kid(
 
     auth_tuple = await dependency(dummy_request(token3))
     ensure_test_user_id_and_name(auth_tuple, token3)
+
+
+@pytest.mark.asyncio
+async def test_verified_claims_are_cached(
+    mocker: MockerFixture,
+    default_jwk_configuration: JwkConfiguration,
+    mocked_signing_keys_server: Any,
+    valid_token: str,
+) -> None:
+    """Test that repeated requests with the same token skip signature verification."""
+    decode = mocker.spy(jwt, "decode")
+    dependency = JwkTokenAuthDependency(default_jwk_configuration)
+
+    for _ in range(3):
+        ensure_test_user_id_and_name(
+            await dependency(dummy_request(valid_token)), valid_token
+        )
+
+    assert decode.call_count == 1
+    # one shared session fetched the keys once
+    mocked_signing_keys_server.assert_called_once()
+    mocked_signing_keys_server.return_value.get.assert_called_once()
+
+
+def test_claims_of_expired_tokens_are_not_cached() -> None:
+    """Test that claims are cached only until the token expires."""
+    url = "https://example.com/jwks.json"
+    _jwk_cache.store_claims("expired", url, JWTClaims({"exp": time.time() - 1}, {}))
+    _jwk_cache.store_claims("valid", url, JWTClaims({"exp": time.time() + 60}, {}))
+
+    assert _jwk_cache.claims("expired", url) is None
+    assert _jwk_cache.claims("valid", url) is not None
+    assert _jwk_cache.claims("valid", "https://other.com/jwks.json") is None
+
+
+@pytest.mark.asyncio
+async def test_unknown_key_refetches_keys(
+    mocker: MockerFixture,
+    default_jwk_configuration: JwkConfiguration,
+    single_key_set: list[dict[str, Any]],
+    another_single_key_set: list[dict[str, Any]],
+    valid_token: str,
+) -> None:
+    """Test that a token signed by a rotated key triggers a rate-limited refetch."""
+    # the server does not serve the signing key yet
+    server = make_signing_server(mocker, another_single_key_set, ["RS256"])
+    dependency = JwkTokenAuthDependency(default_jwk_configuration)
+    get = server.return_value.get
+
+    # keys were fetched just now, so they are not refetched
+    with pytest.raises(HTTPException) as exc_info:
+        await dependency(dummy_request(valid_token))
+    assert exc_info.value.status_code == 401
+    assert get.call_count == 1
+
+    # the key was rotated in, and enough time passed for a refetch
+    response = get.return_value.__aenter__.return_value
+    response.json.return_value = {
+        "keys": [
+            {
+                **single_key_set[0]["private_key"].as_dict(private=False),
+                "kid": single_key_set[0]["kid"],
+                "alg": "RS256",
+            }
+        ]
+    }
+    mocker.patch.object(_jwk_cache, "refetch_interval", 0)
+
+    ensure_test_user_id_and_name(
+        await dependency(dummy_request(valid_token)), valid_token
+    )
+    assert get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_keys_are_refreshed_in_background(
+    mocker: MockerFixture, mocked_signing_keys_server: Any
+) -> None:
+    """Test that keys close to expiry are returned while being refreshed."""
+    url = "https://example.com/jwks.json"
+    get = mocked_signing_keys_server.return_value.get
+    key_set = await _jwk_cache.key_set(url)
+    assert await _jwk_cache.key_set(url) is key_set
+    assert get.call_count == 1
+
+    # move the keys into the refresh-ahead window
+    mocker.patch.object(_jwk_cache, "ttl", _jwk_cache.refresh_ahead)
+    assert await _jwk_cache.key_set(url) is key_set
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert get.call_count == 2
+    assert await _jwk_cache.key_set(url) is not key_set
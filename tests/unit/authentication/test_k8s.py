@@ -2,7 +2,12 @@
 
 # pylint: disable=too-many-arguments,too-many-positional-arguments,too-few-public-methods,protected-access,too-many-lines
 
+import asyncio
+import base64
+import json
 import os
+import time
+from collections.abc import Generator
 from http import HTTPStatus
 from typing import Optional, cast
 
@@ -21,11 +26,37 @@ from authentication.k8s import (
     K8SAuthDependency,
     K8sClientSingleton,
     K8sConfigurationError,
+    K8sReviewCache,
     get_user_info,
+    token_expiry,
 )
 from configuration import AppConfig
 
 
+@pytest.fixture(autouse=True)
+def clear_review_cache() -> Generator[None, None, None]:
+    """Start and finish every test with no cached Kubernetes reviews."""
+    K8sReviewCache().clear()
+    yield
+    K8sReviewCache().clear()
+
+
+def make_request(token: str) -> Request:
+    """Create a request authenticated with the bearer token."""
+    return Request(
+        scope={
+            "type": "http",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        }
+    )
+
+
+def make_jwt(expiry: float) -> str:
+    """Create an unsigned JWT expiring at the given UNIX time."""
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": expiry}).encode())
+    return f"header.{payload.decode().rstrip('=')}.signature"
+
+
 class MockK8sResponseStatus:
     """Mock Kubernetes Response Status.
 
@@ -1135,3 +1166,132 @@ def test_get_user_info_api_error_handling(
     detail = cast(dict[str, str], exc_info.value.detail)
     assert detail["response"] == expected_response
     assert expected_cause_fragment in detail["cause"]
+
+
+@pytest.mark.asyncio
+async def test_auth_dependency_caches_reviews(mocker: MockerFixture) -> None:
+    """Test that repeated requests with the same token do not call the API server."""
+    dependency = K8SAuthDependency()
+    mock_authn_api = mocker.patch("authentication.k8s.K8sClientSingleton.get_authn_api")
+    mock_authz_api = mocker.patch("authentication.k8s.K8sClientSingleton.get_authz_api")
+    mock_authn_api.return_value.create_token_review.return_value = MockK8sResponse(
+        authenticated=True, username="valid-user", uid="valid-uid", groups=["group"]
+    )
+    mock_authz_api.return_value.create_subject_access_review.return_value = (
+        MockK8sResponse(allowed=True)
+    )
+
+    for _ in range(3):
+        user_uid, username, _, token = await dependency(make_request("valid-token"))
+        assert (user_uid, username, token) == ("valid-uid", "valid-user", "valid-token")
+
+    assert mock_authn_api.return_value.create_token_review.call_count == 1
+    assert mock_authz_api.return_value.create_subject_access_review.call_count == 1
+
+    # other virtual paths need their own access review
+    await K8SAuthDependency(virtual_path="/other")(make_request("valid-token"))
+    assert mock_authz_api.return_value.create_subject_access_review.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_auth_dependency_caches_rejected_tokens_briefly(
+    mocker: MockerFixture,
+) -> None:
+    """Test that rejected tokens are cached for the negative TTL only."""
+    dependency = K8SAuthDependency()
+    mock_authn_api = mocker.patch("authentication.k8s.K8sClientSingleton.get_authn_api")
+    mock_authn_api.return_value.create_token_review.return_value = MockK8sResponse(
+        authenticated=False
+    )
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            await dependency(make_request("invalid-token"))
+        assert exc_info.value.status_code == 401
+    assert mock_authn_api.return_value.create_token_review.call_count == 1
+
+    cache = K8sReviewCache()
+    negative_ttl, cache.negative_ttl = cache.negative_ttl, 0
+    try:
+        cache.clear()
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await dependency(make_request("invalid-token"))
+    finally:
+        cache.negative_ttl = negative_ttl
+    assert mock_authn_api.return_value.create_token_review.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_auth_dependency_does_not_cache_api_failures(
+    mocker: MockerFixture,
+) -> None:
+    """Test that unavailable Kubernetes API is asked again on the next request."""
+    dependency = K8SAuthDependency()
+    mock_authn_api = mocker.patch("authentication.k8s.K8sClientSingleton.get_authn_api")
+    mock_authn_api.return_value.create_token_review.side_effect = ApiException(
+        status=HTTPStatus.SERVICE_UNAVAILABLE, reason="Service Unavailable"
+    )
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            await dependency(make_request("valid-token"))
+        assert exc_info.value.status_code == 503
+    assert mock_authn_api.return_value.create_token_review.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_auth_dependency_reviews_concurrent_requests_once(
+    mocker: MockerFixture,
+) -> None:
+    """Test that concurrent requests with the same token share one review."""
+    dependency = K8SAuthDependency()
+    mock_authz_api = mocker.patch("authentication.k8s.K8sClientSingleton.get_authz_api")
+    mock_authz_api.return_value.create_subject_access_review.return_value = (
+        MockK8sResponse(allowed=True)
+    )
+
+    def slow_user_info(_token: str) -> MockK8sResponseStatus:
+        time.sleep(0.05)
+        return MockK8sResponseStatus(True, True, "valid-user", "valid-uid", ["g"])
+
+    mock_user_info = mocker.patch(
+        "authentication.k8s.get_user_info", side_effect=slow_user_info
+    )
+
+    results = await asyncio.gather(
+        *(dependency(make_request("valid-token")) for _ in range(5))
+    )
+
+    assert {result[0] for result in results} == {"valid-uid"}
+    mock_user_info.assert_called_once_with("valid-token")
+
+
+@pytest.mark.asyncio
+async def test_auth_dependency_does_not_cache_past_token_expiry(
+    mocker: MockerFixture,
+) -> None:
+    """Test that reviews of an expired token are not cached."""
+    dependency = K8SAuthDependency()
+    mock_authz_api = mocker.patch("authentication.k8s.K8sClientSingleton.get_authz_api")
+    mock_authz_api.return_value.create_subject_access_review.return_value = (
+        MockK8sResponse(allowed=True)
+    )
+    mock_user_info = mocker.patch(
+        "authentication.k8s.get_user_info",
+        return_value=MockK8sResponseStatus(True, True, "user", "uid", ["g"]),
+    )
+    token = make_jwt(time.time() - 10)
+
+    await dependency(make_request(token))
+    await dependency(make_request(token))
+
+    assert mock_user_info.call_count == 2
+
+
+def test_token_expiry() -> None:
+    """Test reading expiry from JWT tokens and ignoring other tokens."""
+    assert token_expiry(make_jwt(1234567890)) == 1234567890.0
+    assert token_expiry("opaque-token") is None
+    assert token_expiry("a.bm90LWpzb24.c") is None
+    assert token_expiry(f"a.{base64.urlsafe_b64encode(b'[1]').decode()}.c") is None
@@ -2,6 +2,7 @@
 
 # pylint: disable=protected-access
 
+import asyncio
 import logging
 import time
 from collections.abc import Generator
@@ -13,6 +14,7 @@ from azure.core.exceptions import ClientAuthenticationError
 from pydantic import SecretStr
 from pytest_mock import MockerFixture
 
+import constants
 from authorization import azure_token_manager
 from authorization.azure_token_manager import (
     TOKEN_EXPIRATION_LEEWAY,
@@ -39,6 +41,18 @@ def reset_singleton() -> Generator[None, None, None]:
     yield
 
 
+def mock_async_credential(mocker: MockerFixture, **get_token: Any) -> Any:
+    """Patch the async Azure credential, returning the mocked get_token."""
+    credential = mocker.AsyncMock()
+    credential.__aenter__.return_value = credential
+    credential.get_token = mocker.AsyncMock(**get_token)
+    mocker.patch(
+        "authorization.azure_token_manager.AsyncClientSecretCredential",
+        return_value=credential,
+    )
+    return credential.get_token
+
+
 @pytest.fixture(name="token_manager")
 def token_manager_fixture() -> AzureEntraIDManager:
     """Return a fresh AzureEntraIDTokenManager instance."""
@@ -162,3 +176,187 @@ class TestAzureEntraIDTokenManager:
             "authorization.azure_token_manager.time.time", return_value=now + 20
         )
         assert token_manager.is_token_expired
+
+    async def test_refresh_token_async_success(
+        self,
+        token_manager: AzureEntraIDManager,
+        dummy_config: AzureEntraIdConfiguration,
+        mocker: MockerFixture,
+    ) -> None:
+        """Refresh the token using the async Azure credential."""
+        token_manager.set_config(dummy_config)
+        get_token = mock_async_credential(
+            mocker, return_value=AccessToken("token_value", int(time.time()) + 3600)
+        )
+
+        assert await token_manager.refresh_token_async() is True
+        assert token_manager.access_token.get_secret_value() == "token_value"
+        assert not token_manager.is_token_expired
+        get_token.assert_awaited_once_with(dummy_config.scope)
+
+    async def test_refresh_token_async_failure(
+        self,
+        token_manager: AzureEntraIDManager,
+        dummy_config: AzureEntraIdConfiguration,
+        mocker: MockerFixture,
+    ) -> None:
+        """Return False when the async token retrieval fails."""
+        token_manager.set_config(dummy_config)
+        mock_async_credential(mocker, side_effect=ClientAuthenticationError("fail"))
+
+        assert await token_manager.refresh_token_async() is False
+        assert token_manager.is_token_expired
+
+    async def test_refresh_token_async_single_flight(
+        self,
+        token_manager: AzureEntraIDManager,
+        dummy_config: AzureEntraIdConfiguration,
+        mocker: MockerFixture,
+    ) -> None:
+        """Concurrent callers share one token refresh."""
+        token_manager.set_config(dummy_config)
+        retrieved = asyncio.Event()
+
+        async def get_token(*_args: Any) -> AccessToken:
+            await retrieved.wait()
+            return AccessToken("token_value", int(time.time()) + 3600)
+
+        mock_get_token = mock_async_credential(mocker, side_effect=get_token)
+        callers = [
+            asyncio.create_task(token_manager.refresh_token_async()) for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        retrieved.set()
+
+        assert await asyncio.gather(*callers) == [True] * 5
+        mock_get_token.assert_awaited_once()
+
+    async def test_refresh_token_async_raises_without_config(
+        self, token_manager: AzureEntraIDManager
+    ) -> None:
+        """Raise ValueError when refresh_token_async is called without config."""
+        with pytest.raises(ValueError, match="Azure Entra ID configuration not set"):
+            await token_manager.refresh_token_async()
+
+    async def test_refresher_passes_new_tokens_before_expiry(
+        self,
+        token_manager: AzureEntraIDManager,
+        dummy_config: AzureEntraIdConfiguration,
+        mocker: MockerFixture,
+    ) -> None:
+        """Refresh the token ahead of expiry and pass it to the callback."""
+        token_manager.set_config(dummy_config)
+        mocker.patch.object(constants, "AZURE_TOKEN_REFRESH_AHEAD_SECONDS", 3600.0)
+        mock_async_credential(
+            mocker,
+            side_effect=lambda *_: AccessToken(
+                "token_value", int(time.time()) + TOKEN_EXPIRATION_LEEWAY + 1
+            ),
+        )
+        pushed = asyncio.Queue[str]()
+
+        async def on_refresh() -> None:
+            await pushed.put(token_manager.access_token.get_secret_value())
+
+        await token_manager.start_refresher(on_refresh)
+        try:
+            # the first token is refreshed in the middle of its lifetime
+            assert await asyncio.wait_for(pushed.get(), 1) == "token_value"
+            assert await asyncio.wait_for(pushed.get(), 2) == "token_value"
+        finally:
+            await token_manager.stop_refresher()
+
+    @pytest.mark.parametrize(
+        ("lifetime", "expected_sleep"),
+        [
+            (3600, 3600 - TOKEN_EXPIRATION_LEEWAY - 300),
+            (100 + TOKEN_EXPIRATION_LEEWAY, 50),
+        ],
+    )
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    async def test_refresher_refreshes_before_expiry(
+        self,
+        token_manager: AzureEntraIDManager,
+        dummy_config: AzureEntraIdConfiguration,
+        mocker: MockerFixture,
+        lifetime: int,
+        expected_sleep: int,
+    ) -> None:
+        """Refresh the token once, before it expires."""
+        token_manager.set_config(dummy_config)
+        mocker.patch.object(constants, "AZURE_TOKEN_REFRESH_AHEAD_SECONDS", 300.0)
+        clock = [1_000_000.0]
+        sleeps: list[float] = []
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+            clock[0] += delay
+
+        refreshed_at: list[float] = []
+
+        async def fake_refresh() -> bool:
+            refreshed_at.append(clock[0])
+            # stops the refresher
+            raise asyncio.CancelledError
+
+        mocker.patch(
+            "authorization.azure_token_manager.time.time", side_effect=lambda: clock[0]
+        )
+        mocker.patch("authorization.azure_token_manager.asyncio.sleep", fake_sleep)
+        mocker.patch.object(token_manager, "refresh_token_async", fake_refresh)
+        token_manager._update_access_token("token_value", int(clock[0]) + lifetime)
+
+        with pytest.raises(asyncio.CancelledError):
+            await token_manager._run_refresher()
+
+        assert sleeps == [expected_sleep]
+        assert refreshed_at == [clock[0]]
+        assert not token_manager.is_token_expired
+        assert refreshed_at[0] < token_manager._expires_on
+
+    async def test_refresher_retries_failures(
+        self,
+        token_manager: AzureEntraIDManager,
+        dummy_config: AzureEntraIdConfiguration,
+        mocker: MockerFixture,
+    ) -> None:
+        """Retry failed refreshes until a token is retrieved."""
+        token_manager.set_config(dummy_config)
+        mocker.patch.object(constants, "AZURE_TOKEN_RETRY_INITIAL_DELAY_SECONDS", 0.01)
+        get_token = mock_async_credential(
+            mocker,
+            side_effect=[
+                ClientAuthenticationError("fail"),
+                ClientAuthenticationError("fail"),
+                AccessToken("token_value", int(time.time()) + 3600),
+            ],
+        )
+        refreshed = asyncio.Event()
+
+        async def on_refresh() -> None:
+            refreshed.set()
+
+        await token_manager.start_refresher(on_refresh)
+        try:
+            await asyncio.wait_for(refreshed.wait(), 1)
+        finally:
+            await token_manager.stop_refresher()
+        assert get_token.await_count == 3
+        assert token_manager.access_token.get_secret_value() == "token_value"
+
+    async def test_failed_callback_expires_token(
+        self,
+        token_manager: AzureEntraIDManager,
+        dummy_config: AzureEntraIdConfiguration,
+        mocker: MockerFixture,
+    ) -> None:
+        """Token not passed to the client is refreshed again."""
+        token_manager.set_config(dummy_config)
+        mock_async_credential(
+            mocker, return_value=AccessToken("token_value", int(time.time()) + 3600)
+        )
+        token_manager._on_refresh = mocker.AsyncMock(side_effect=RuntimeError("fail"))
+
+        with pytest.raises(RuntimeError):
+            await token_manager.refresh_token_async()
+        assert token_manager.is_token_expired
@@ -7,10 +7,16 @@ from contextlib import nullcontext as does_not_raise
 from typing import Any
 
 import pytest
+from pytest_mock import MockerFixture
 
 import constants
 from authentication.interface import AuthTuple
-from authorization.resolvers import GenericAccessResolver, JwtRolesResolver
+from authorization import resolvers
+from authorization.resolvers import (
+    GenericAccessResolver,
+    JwtRolesResolver,
+    compile_jsonpath,
+)
 from models.config import AccessRule, Action, JsonPathOperator, JwtRoleRule
 
 
@@ -57,7 +63,7 @@ def claims_to_auth_tuple(claims: dict) -> AuthTuple:
     return ("user", "token", False, claims_to_token(claims))
 
 
-class TestJwtRolesResolver:
+class TestJwtRolesResolver:  # pylint: disable=too-many-public-methods
     """Test cases for JwtRolesResolver."""
 
     @pytest.fixture
@@ -368,6 +374,51 @@ class TestJwtRolesResolver:
             # just that no exception is raised
             assert len(await employee_resolver.resolve_roles(guest_tuple)) == 0
 
+    @pytest.mark.asyncio
+    async def test_jsonpath_is_parsed_once(self, mocker: MockerFixture) -> None:
+        """Test that JSONPath expressions are parsed at construction only."""
+        compile_jsonpath.cache_clear()
+        parse = mocker.spy(resolvers, "parse")
+        resolver = JwtRolesResolver(
+            [
+                JwtRoleRule(
+                    jsonpath="$.realm_access.roles[*]",
+                    operator=JsonPathOperator.CONTAINS,
+                    value="redhat:employees",
+                    roles=["employee"],
+                )
+            ]
+        )
+        for org_id in range(3):
+            auth = claims_to_auth_tuple(
+                {"realm_access": {"roles": ["redhat:employees"]}, "org_id": org_id}
+            )
+            assert await resolver.resolve_roles(auth) == {"employee"}
+        assert parse.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_resolved_roles_are_cached(
+        self,
+        employee_resolver: JwtRolesResolver,
+        employee_claims: dict[str, Any],
+        mocker: MockerFixture,
+    ) -> None:
+        """Test that roles of the same claims are resolved only once."""
+        get_claims = mocker.spy(resolvers, "unsafe_get_claims")
+        auth = claims_to_auth_tuple(employee_claims)
+
+        roles = await employee_resolver.resolve_roles(auth)
+        roles.add("modified")
+        assert await employee_resolver.resolve_roles(auth) == {"employee"}
+        assert get_claims.call_count == 1
+
+        # different claims are resolved again
+        other_claims = {**employee_claims, "realm_access": {"roles": []}}
+        assert not await employee_resolver.resolve_roles(
+            claims_to_auth_tuple(other_claims)
+        )
+        assert get_claims.call_count == 2
+
 
 class TestGenericAccessResolver:
     """Test cases for GenericAccessResolver."""
@@ -465,3 +516,21 @@ class TestGenericAccessResolver:
         resolver = GenericAccessResolver(multi_role_access_rules)
         actions = resolver.get_actions({"user", "moderator"})
         assert actions == {Action.QUERY, Action.GET_MODELS, Action.FEEDBACK}
+
+    def test_actions_are_cached_per_role_set(
+        self, multi_role_access_rules: list[AccessRule]
+    ) -> None:
+        """Test that actions of a role set are computed once and not shared."""
+        resolver = GenericAccessResolver(multi_role_access_rules)
+        actions = resolver.get_actions({"user", "moderator"})
+        actions.add(Action.ADMIN)
+
+        # pylint: disable=protected-access
+        resolver._access_lookup.clear()
+        assert resolver.get_actions({"moderator", "user"}) == {
+            Action.QUERY,
+            Action.GET_MODELS,
+            Action.FEEDBACK,
+        }
+        assert resolver.check_access(Action.FEEDBACK, {"moderator", "user"}) is True
+        assert resolver.get_actions({"user"}) == set()
@@ -11,6 +11,7 @@ from cache.in_memory_cache import InMemoryCache
 from cache.noop_cache import NoopCache
 from cache.postgres_cache import PostgresCache
 from cache.sqlite_cache import SQLiteCache
+from cache.tiered_cache import TieredCache
 from constants import (
     CACHE_TYPE_MEMORY,
     CACHE_TYPE_NOOP,
@@ -19,6 +20,7 @@ from constants import (
 )
 from models.config import (
     ConversationHistoryConfiguration,
+    ConversationReadCacheConfig,
     InMemoryCacheConfig,
     PostgreSQLDatabaseConfiguration,
     SQLiteDatabaseConfiguration,
@@ -174,6 +176,19 @@ def test_conversation_cache_sqlite(
     assert isinstance(cache, SQLiteCache)
 
 
+def test_conversation_cache_sqlite_read_cache(tmpdir: Path) -> None:
+    """Check if SQLiteCache is wrapped in TieredCache when read cache is configured."""
+    db_path = str(tmpdir / "test.sqlite")
+    cc = ConversationHistoryConfiguration(
+        type=CACHE_TYPE_SQLITE,
+        sqlite=SQLiteDatabaseConfiguration(db_path=db_path),
+        read_cache=ConversationReadCacheConfig(),  # pyright: ignore[reportCallIssue]
+    )  # pyright: ignore[reportCallIssue]
+    cache = CacheFactory.conversation_cache(cc)
+    assert isinstance(cache, TieredCache)
+    assert isinstance(cache.backend, SQLiteCache)
+
+
 def test_conversation_cache_sqlite_improper_config(tmpdir: Path) -> None:
     """Check if memory cache configuration is checked in cache factory.
 
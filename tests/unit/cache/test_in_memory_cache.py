@@ -0,0 +1,246 @@
+"""Unit tests for InMemoryCache class."""
+
+from typing import Optional
+
+import pytest
+from pytest_mock import MockerFixture
+
+from cache.in_memory_cache import InMemoryCache
+from models.cache_entry import CacheEntry
+from models.config import InMemoryCacheConfig
+from utils import suid
+
+USER_ID = suid.get_suid()
+CONVERSATION_ID = suid.get_suid()
+USER_PROVIDED_USER_ID = "test-user1"
+cache_entry_1 = CacheEntry(
+    query="user message1",
+    response="AI message1",
+    provider="foo",
+    model="bar",
+    started_at="2025-10-03T09:31:25Z",
+    completed_at="2025-10-03T09:31:29Z",
+)
+cache_entry_2 = CacheEntry(
+    query="user message2",
+    response="AI message2",
+    provider="foo",
+    model="bar",
+    started_at="2025-10-03T09:31:25Z",
+    completed_at="2025-10-03T09:31:29Z",
+)
+
+
+@pytest.fixture(name="cache_fixture")
+def cache() -> InMemoryCache:
+    """Fixture with constructed and initialized in memory cache object.
+
+    Returns:
+        InMemoryCache: An initialized InMemoryCache instance ready for tests.
+    """
+    c = InMemoryCache(InMemoryCacheConfig(max_entries=10))
+    c.initialize_cache()
+    return c
+
+
+def test_connect(cache_fixture: InMemoryCache) -> None:
+    """Test the behavior of connect method."""
+    cache_fixture.connect()
+    assert cache_fixture.connected()
+
+
+def test_get_nonexistent_conversation(cache_fixture: InMemoryCache) -> None:
+    """Test how non-existent items are handled by the cache."""
+    assert cache_fixture.get(USER_ID, CONVERSATION_ID) == []
+
+
+def test_insert_or_append(cache_fixture: InMemoryCache) -> None:
+    """Test that appended entries are returned in insertion order."""
+    cache_fixture.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_1)
+    cache_fixture.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_2)
+
+    assert cache_fixture.get(USER_ID, CONVERSATION_ID) == [
+        cache_entry_1,
+        cache_entry_2,
+    ]
+
+
+def test_insert_or_append_skip_user_id_check(cache_fixture: InMemoryCache) -> None:
+    """Test that a non-UUID user ID is accepted when the check is skipped."""
+    cache_fixture.insert_or_append(
+        USER_PROVIDED_USER_ID, CONVERSATION_ID, cache_entry_1, True
+    )
+
+    assert cache_fixture.get(USER_PROVIDED_USER_ID, CONVERSATION_ID, True) == [
+        cache_entry_1
+    ]
+
+
+def test_conversations_are_isolated_per_user(cache_fixture: InMemoryCache) -> None:
+    """Test that users can not read conversations of other users."""
+    cache_fixture.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_1)
+
+    assert cache_fixture.get(suid.get_suid(), CONVERSATION_ID) == []
+
+
+def test_delete_existing_conversation(cache_fixture: InMemoryCache) -> None:
+    """Test deleting an existing conversation."""
+    cache_fixture.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_1)
+
+    assert cache_fixture.delete(USER_ID, CONVERSATION_ID) is True
+    assert cache_fixture.get(USER_ID, CONVERSATION_ID) == []
+    assert cache_fixture.list(USER_ID) == []
+
+
+def test_delete_nonexistent_conversation(cache_fixture: InMemoryCache) -> None:
+    """Test deleting a conversation that doesn't exist."""
+    assert cache_fixture.delete(USER_ID, CONVERSATION_ID) is False
+
+
+def test_list_conversations(cache_fixture: InMemoryCache) -> None:
+    """Test that conversations are listed from the most recent one."""
+    conversation_id_1 = suid.get_suid()
+    conversation_id_2 = suid.get_suid()
+
+    cache_fixture.insert_or_append(USER_ID, conversation_id_1, cache_entry_1)
+    cache_fixture.insert_or_append(USER_ID, conversation_id_2, cache_entry_2)
+    cache_fixture.set_topic_summary(USER_ID, conversation_id_2, "Topic")
+    cache_fixture.insert_or_append(USER_ID, conversation_id_1, cache_entry_2)
+
+    conversations = cache_fixture.list(USER_ID)
+
+    assert [c.conversation_id for c in conversations] == [
+        conversation_id_1,
+        conversation_id_2,
+    ]
+    assert conversations[0].topic_summary is None
+    assert conversations[1].topic_summary == "Topic"
+    assert (
+        conversations[0].last_message_timestamp
+        >= conversations[1].last_message_timestamp
+    )
+
+
+def test_set_topic_summary_keeps_conversation_order(
+    cache_fixture: InMemoryCache,
+) -> None:
+    """Test that setting a topic summary does not reorder conversations."""
+    conversation_id_1 = suid.get_suid()
+    conversation_id_2 = suid.get_suid()
+
+    cache_fixture.insert_or_append(USER_ID, conversation_id_1, cache_entry_1)
+    cache_fixture.insert_or_append(USER_ID, conversation_id_2, cache_entry_2)
+    before = cache_fixture.list(USER_ID)
+    cache_fixture.set_topic_summary(USER_ID, conversation_id_1, "Topic")
+
+    conversations = cache_fixture.list(USER_ID)
+
+    assert [c.conversation_id for c in conversations] == [
+        conversation_id_2,
+        conversation_id_1,
+    ]
+    assert conversations[1].topic_summary == "Topic"
+    assert conversations[1].last_message_timestamp == before[1].last_message_timestamp
+
+
+def test_set_topic_summary_creates_conversation(cache_fixture: InMemoryCache) -> None:
+    """Test that setting a topic summary creates a missing conversation."""
+    cache_fixture.set_topic_summary(USER_ID, CONVERSATION_ID, "Topic")
+
+    conversations = cache_fixture.list(USER_ID)
+
+    assert [c.conversation_id for c in conversations] == [CONVERSATION_ID]
+    assert conversations[0].topic_summary == "Topic"
+    assert cache_fixture.get(USER_ID, CONVERSATION_ID) == []
+
+
+def test_list_no_conversations(cache_fixture: InMemoryCache) -> None:
+    """Test listing conversations for a user with no conversations."""
+    assert cache_fixture.list(USER_ID) == []
+
+
+def test_evict_least_recently_used_conversation() -> None:
+    """Test that the least recently used conversation is evicted first."""
+    c = InMemoryCache(InMemoryCacheConfig(max_entries=2))
+    conversation_id_1 = suid.get_suid()
+    conversation_id_2 = suid.get_suid()
+    conversation_id_3 = suid.get_suid()
+
+    c.insert_or_append(USER_ID, conversation_id_1, cache_entry_1)
+    c.insert_or_append(USER_ID, conversation_id_2, cache_entry_1)
+    # reading the first conversation makes the second one least recently used
+    c.get(USER_ID, conversation_id_1)
+    c.insert_or_append(USER_ID, conversation_id_3, cache_entry_1)
+
+    assert c.get(USER_ID, conversation_id_1) == [cache_entry_1]
+    assert not c.get(USER_ID, conversation_id_2)
+    assert c.get(USER_ID, conversation_id_3) == [cache_entry_1]
+
+
+def test_evict_by_size() -> None:
+    """Test that conversations are evicted when the size limit is exceeded."""
+    size = len(cache_entry_1.model_dump_json())
+    c = InMemoryCache(InMemoryCacheConfig(max_entries=100, max_bytes=size * 2))
+    conversation_ids = [suid.get_suid() for _ in range(3)]
+
+    for conversation_id in conversation_ids:
+        c.insert_or_append(USER_ID, conversation_id, cache_entry_1)
+
+    assert [conversation.conversation_id for conversation in c.list(USER_ID)] == [
+        conversation_ids[2],
+        conversation_ids[1],
+    ]
+
+
+def test_trim_oversized_conversation() -> None:
+    """Test that the oldest entries of the only conversation are dropped."""
+    c = InMemoryCache(InMemoryCacheConfig(max_entries=1))
+
+    c.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_1)
+    c.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_2)
+
+    assert c.get(USER_ID, CONVERSATION_ID) == [cache_entry_2]
+
+
+def test_expired_conversation(mocker: MockerFixture) -> None:
+    """Test that conversations not used for the TTL expire."""
+    monotonic = mocker.patch("cache.in_memory_cache.monotonic", return_value=100.0)
+    c = InMemoryCache(InMemoryCacheConfig(max_entries=10, ttl_seconds=60))
+    c.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_1)
+
+    monotonic.return_value = 150.0
+    assert c.get(USER_ID, CONVERSATION_ID) == [cache_entry_1]
+
+    monotonic.return_value = 211.0
+    assert c.list(USER_ID) == []
+    assert not c.get(USER_ID, CONVERSATION_ID)
+
+
+def test_ready(cache_fixture: InMemoryCache) -> None:
+    """Test if in memory cache always report ready."""
+    assert cache_fixture.ready()
+
+
+improper_user_uuids = [
+    None,
+    "",
+    " ",
+    ":",
+    "foo:bar",
+    "ffffffff-ffff-ffff-ffff-fffffffffff",  # UUID-like string with missing chararacter
+]
+
+
+@pytest.mark.parametrize("uuid", improper_user_uuids)
+def test_list_improper_user_id(
+    cache_fixture: InMemoryCache, uuid: Optional[str]
+) -> None:
+    """Test list with invalid user ID."""
+    with pytest.raises(ValueError, match=f"Invalid user ID {uuid}"):
+        cache_fixture.list(uuid)  # pyright: ignore[reportArgumentType]
+
+
+def test_get_improper_conversation_id(cache_fixture: InMemoryCache) -> None:
+    """Test how improper conversation ID is handled."""
+    with pytest.raises(ValueError, match="Invalid conversation ID"):
+        cache_fixture.get(USER_ID, "this-is-not-valid-uuid")
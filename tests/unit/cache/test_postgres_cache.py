@@ -431,6 +431,49 @@ def test_insert_or_append_operation_operation_error(
         cache.insert_or_append(USER_ID_1, CONVERSATION_ID_1, cache_entry_1, False)
 
 
+def test_insert_or_append_many_sends_one_batch(
+    postgres_cache_config_fixture: PostgreSQLDatabaseConfiguration,
+    mocker: MockerFixture,
+) -> None:
+    """Test that entries of several conversations are sent in one batch."""
+    # prevent real connection to PG instance
+    mocker.patch("psycopg2.connect")
+    cache = PostgresCache(postgres_cache_config_fixture)
+    execute_batch = mocker.patch("cache.postgres_cache.execute_batch")
+
+    cache.insert_or_append_many(
+        [
+            (USER_ID_1, CONVERSATION_ID_1, cache_entry_1, False),
+            (USER_ID_1, CONVERSATION_ID_1, cache_entry_2, False),
+        ]
+    )
+
+    execute_batch.assert_called_once()
+    statement, params = execute_batch.call_args.args[1:]
+    assert "clock_timestamp()" in statement
+    assert [row[4] for row in params] == ["user message1", "user message2"]
+    assert execute_batch.call_args.kwargs["page_size"] == 2
+
+
+def test_insert_or_append_many_operation_error(
+    postgres_cache_config_fixture: PostgreSQLDatabaseConfiguration,
+    mocker: MockerFixture,
+) -> None:
+    """Test that database errors of the batch are reported as cache errors."""
+    # prevent real connection to PG instance
+    mocker.patch("psycopg2.connect")
+    cache = PostgresCache(postgres_cache_config_fixture)
+    mocker.patch(
+        "cache.postgres_cache.execute_batch",
+        side_effect=psycopg2.DatabaseError("boom"),
+    )
+
+    with pytest.raises(CacheError, match="insert_or_append_many"):
+        cache.insert_or_append_many(
+            [(USER_ID_1, CONVERSATION_ID_1, cache_entry_1, False)]
+        )
+
+
 def test_delete_when_disconnected(
     postgres_cache_config_fixture: PostgreSQLDatabaseConfiguration,
     mocker: MockerFixture,
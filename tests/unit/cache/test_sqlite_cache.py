@@ -1,6 +1,7 @@
 """Unit tests for SQLite cache implementation."""
 
 import sqlite3
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -305,6 +306,40 @@ def test_get_operation_after_insert_or_append(tmpdir: Path) -> None:
     assert lst[1] == cache_entry_2
 
 
+def test_get_operation_after_insert_or_append_many(tmpdir: Path) -> None:
+    """Test that entries stored at once are appended in order."""
+    cache = create_cache(tmpdir)
+
+    cache.insert_or_append_many(
+        [
+            (USER_ID_1, CONVERSATION_ID_1, cache_entry_1, False),
+            (USER_ID_1, CONVERSATION_ID_1, cache_entry_2, False),
+            (USER_ID_2, CONVERSATION_ID_2, cache_entry_2, False),
+        ]
+    )
+
+    assert cache.get(USER_ID_1, CONVERSATION_ID_1, False) == [
+        cache_entry_1,
+        cache_entry_2,
+    ]
+    assert cache.get(USER_ID_2, CONVERSATION_ID_2, False) == [cache_entry_2]
+    assert len(cache.list(USER_ID_1, False)) == 1
+
+
+def test_insert_or_append_many_from_other_thread(tmpdir: Path) -> None:
+    """Test that entries can be stored from a thread other than the creator."""
+    cache = create_cache(tmpdir)
+
+    thread = threading.Thread(
+        target=cache.insert_or_append_many,
+        args=([(USER_ID_1, CONVERSATION_ID_1, cache_entry_1, False)],),
+    )
+    thread.start()
+    thread.join()
+
+    assert cache.get(USER_ID_1, CONVERSATION_ID_1, False) == [cache_entry_1]
+
+
 def test_get_operation_after_delete(tmpdir: Path) -> None:
     """Test the get() method called after delete() one.
 
@@ -0,0 +1,131 @@
+"""Unit tests for TieredCache class."""
+
+from pytest_mock import MockerFixture
+
+from cache.in_memory_cache import InMemoryCache
+from cache.tiered_cache import TieredCache
+from models.cache_entry import CacheEntry
+from models.config import ConversationReadCacheConfig, InMemoryCacheConfig
+from utils import suid
+
+USER_ID = suid.get_suid()
+CONVERSATION_ID = suid.get_suid()
+cache_entry_1 = CacheEntry(
+    query="user message1",
+    response="AI message1",
+    provider="foo",
+    model="bar",
+    started_at="2025-10-03T09:31:25Z",
+    completed_at="2025-10-03T09:31:29Z",
+)
+cache_entry_2 = CacheEntry(
+    query="user message2",
+    response="AI message2",
+    provider="foo",
+    model="bar",
+    started_at="2025-10-03T09:31:25Z",
+    completed_at="2025-10-03T09:31:29Z",
+)
+
+
+def create_cache(
+    mocker: MockerFixture, max_conversations: int = 10
+) -> tuple[TieredCache, InMemoryCache]:
+    """Create a tiered cache in front of a spied in-memory cache."""
+    backend = InMemoryCache(InMemoryCacheConfig(max_entries=100))
+    mocker.spy(backend, "get")
+    mocker.spy(backend, "list")
+    config = ConversationReadCacheConfig(
+        max_conversations=max_conversations
+    )  # pyright: ignore[reportCallIssue]
+    return TieredCache(backend, config), backend
+
+
+def test_get_reads_backend_once(mocker: MockerFixture) -> None:
+    """Test that the conversation history is read from the backend once."""
+    cache, backend = create_cache(mocker)
+    backend.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_1)
+
+    assert cache.get(USER_ID, CONVERSATION_ID) == [cache_entry_1]
+    assert cache.get(USER_ID, CONVERSATION_ID) == [cache_entry_1]
+    assert backend.get.call_count == 1  # pyright: ignore[reportFunctionMemberAccess]
+
+
+def test_insert_or_append_writes_through(mocker: MockerFixture) -> None:
+    """Test that appended entries are written to the backend and cached history."""
+    cache, backend = create_cache(mocker)
+    cache.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_1)
+    cache.get(USER_ID, CONVERSATION_ID)
+
+    cache.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_2)
+
+    assert cache.get(USER_ID, CONVERSATION_ID) == [cache_entry_1, cache_entry_2]
+    assert backend.get(USER_ID, CONVERSATION_ID) == [cache_entry_1, cache_entry_2]
+    assert backend.get.call_count == 2  # pyright: ignore[reportFunctionMemberAccess]
+
+
+def test_insert_or_append_many_writes_through(mocker: MockerFixture) -> None:
+    """Test that entries stored at once are written through to the backend."""
+    cache, backend = create_cache(mocker)
+    cache.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_1)
+    cache.get(USER_ID, CONVERSATION_ID)
+    cache.list(USER_ID)
+
+    cache.insert_or_append_many([(USER_ID, CONVERSATION_ID, cache_entry_2, False)])
+
+    assert cache.get(USER_ID, CONVERSATION_ID) == [cache_entry_1, cache_entry_2]
+    assert backend.get(USER_ID, CONVERSATION_ID) == [cache_entry_1, cache_entry_2]
+    cache.list(USER_ID)
+    assert backend.list.call_count == 2  # pyright: ignore[reportFunctionMemberAccess]
+
+
+def test_list_invalidated_by_changes(mocker: MockerFixture) -> None:
+    """Test that the cached conversation list is refreshed after changes."""
+    cache, backend = create_cache(mocker)
+    cache.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_1)
+
+    assert cache.list(USER_ID)[0].topic_summary is None
+    assert cache.list(USER_ID)[0].topic_summary is None
+    assert backend.list.call_count == 1  # pyright: ignore[reportFunctionMemberAccess]
+
+    cache.set_topic_summary(USER_ID, CONVERSATION_ID, "Topic")
+
+    assert cache.list(USER_ID)[0].topic_summary == "Topic"
+    assert backend.list.call_count == 2  # pyright: ignore[reportFunctionMemberAccess]
+
+
+def test_delete_drops_cached_data(mocker: MockerFixture) -> None:
+    """Test that deleted conversations are removed from the read cache."""
+    cache, _ = create_cache(mocker)
+    cache.insert_or_append(USER_ID, CONVERSATION_ID, cache_entry_1)
+    cache.get(USER_ID, CONVERSATION_ID)
+    cache.list(USER_ID)
+
+    assert cache.delete(USER_ID, CONVERSATION_ID) is True
+
+    assert cache.get(USER_ID, CONVERSATION_ID) == []
+    assert cache.list(USER_ID) == []
+
+
+def test_evict_least_recently_used(mocker: MockerFixture) -> None:
+    """Test that the read cache holds a bounded number of conversations."""
+    cache, backend = create_cache(mocker, max_conversations=1)
+    other_conversation_id = suid.get_suid()
+
+    cache.get(USER_ID, CONVERSATION_ID)
+    cache.get(USER_ID, other_conversation_id)
+    cache.get(USER_ID, CONVERSATION_ID)
+
+    assert backend.get.call_count == 3  # pyright: ignore[reportFunctionMemberAccess]
+
+
+def test_delegates_to_backend(mocker: MockerFixture) -> None:
+    """Test that connection handling is delegated to the backend."""
+    cache, backend = create_cache(mocker)
+    connect = mocker.spy(backend, "connect")
+
+    cache.connect()
+
+    connect.assert_called_once()
+    assert cache.connected()
+    assert cache.ready()
@@ -8,6 +8,9 @@ import pytest
 from pytest_mock import AsyncMockType, MockerFixture
 
 from configuration import AppConfig
+from quota.quota_lease import release_quota_leases
+from quota.token_usage_history import flush_token_usage_histories
+from utils.postgres_pool import close_connection_pools
 
 type AgentFixtures = Generator[
     tuple[
@@ -72,3 +75,12 @@ def minimal_config_fixture() -> AppConfig:
         }
     )
     return cfg
+
+
+@pytest.fixture(autouse=True)
+def close_postgres_pools() -> Generator[None, None, None]:
+    """Drop shared PostgreSQL pools, quota leases and aggregated token usage after tests."""
+    yield
+    release_quota_leases()
+    flush_token_usage_histories()
+    close_connection_pools()
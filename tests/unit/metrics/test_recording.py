@@ -194,6 +194,16 @@ def recording_logger_fixture(mocker: MockerFixture) -> MockType:
             duration=1.5,
             warning_message="Failed to update LLM inference duration metric",
         ),
+        HistogramRecorderCase(
+            metric_path=(
+                "metrics.recording.metrics.request_preparation_duration_seconds"
+            ),
+            recorder=recording.record_request_preparation_duration,
+            args=("/v1/query", "moderation", 0.25),
+            labels=("/v1/query", "moderation"),
+            duration=0.25,
+            warning_message="Failed to update request preparation duration metric",
+        ),
     ],
 )
 def test_histogram_recorders_observe_metrics_and_log_errors(
@@ -216,3 +226,33 @@ def test_histogram_recorders_observe_metrics_and_log_errors(
     recording_logger.warning.assert_called_once_with(
         case.warning_message, exc_info=True
     )
+
+
+def test_record_quota_scheduler_run_sets_gauges(mocker: MockerFixture) -> None:
+    """Test that a quota scheduler run sets the last run, rows and lag gauges."""
+    mock_last_run = mocker.patch(
+        "metrics.recording.metrics.quota_scheduler_last_run_timestamp_seconds"
+    )
+    mock_rows = mocker.patch("metrics.recording.metrics.quota_scheduler_rows_updated")
+    mock_lag = mocker.patch("metrics.recording.metrics.quota_scheduler_lag_seconds")
+
+    recording.record_quota_scheduler_run("user monthly", 1000.0, 42, 0.5)
+
+    mock_last_run.labels.assert_called_once_with("user monthly")
+    mock_last_run.labels.return_value.set.assert_called_once_with(1000.0)
+    mock_rows.labels.return_value.set.assert_called_once_with(42)
+    mock_lag.labels.return_value.set.assert_called_once_with(0.5)
+
+
+def test_record_quota_scheduler_run_logs_metric_errors(
+    mocker: MockerFixture, recording_logger: MockType
+) -> None:
+    """Test that quota scheduler metric failures are logged and swallowed."""
+    mock_rows = mocker.patch("metrics.recording.metrics.quota_scheduler_rows_updated")
+    mock_rows.labels.return_value.set.side_effect = ValueError("bad")
+
+    recording.record_quota_scheduler_run("user monthly", 1000.0, 42, 0.5)
+
+    recording_logger.warning.assert_called_once_with(
+        "Failed to update quota scheduler metrics", exc_info=True
+    )
@@ -9,6 +9,7 @@ from pytest_subtests import SubTests
 import constants
 from models.config import (
     ConversationHistoryConfiguration,
+    ConversationReadCacheConfig,
     InMemoryCacheConfig,
     PostgreSQLDatabaseConfiguration,
     SQLiteDatabaseConfiguration,
@@ -277,3 +278,27 @@ def test_conversation_type_postgres_wrong_config() -> None:
             type=constants.CACHE_TYPE_POSTGRES,
             postgres=PostgreSQLDatabaseConfiguration(),  # pyright: ignore[reportCallIssue]
         )  # pyright: ignore[reportCallIssue]
+
+
+def test_conversation_cache_read_cache(subtests: SubTests) -> None:
+    """Test that the read cache can be used with database backends only."""
+    with subtests.test(msg="SQLite cache"):
+        c = ConversationHistoryConfiguration(
+            type=constants.CACHE_TYPE_SQLITE,  # pyright: ignore[reportArgumentType]
+            sqlite=SQLiteDatabaseConfiguration(db_path="path"),
+            read_cache=ConversationReadCacheConfig(),  # pyright: ignore[reportCallIssue]
+        )
+        assert c.read_cache is not None
+        assert c.read_cache.max_conversations == 1000  # pylint: disable=no-member
+        assert c.read_cache.ttl_seconds is None  # pylint: disable=no-member
+
+    with subtests.test(msg="Memory cache"):
+        with pytest.raises(
+            ValidationError,
+            match="Read cache can be used with SQLite or PostgreSQL cache only",
+        ):
+            _ = ConversationHistoryConfiguration(
+                type=constants.CACHE_TYPE_MEMORY,  # pyright: ignore[reportArgumentType]
+                memory=InMemoryCacheConfig(max_entries=100),
+                read_cache=ConversationReadCacheConfig(),  # pyright: ignore[reportCallIssue]
+            )
@@ -181,12 +181,20 @@ def test_dump_configuration(tmp_path: Path) -> None:
                     "gss_encmode": "disable",
                     "namespace": "public",
                     "ca_cert_path": None,
+                    "pool": {
+                        "min_size": 1,
+                        "max_size": 10,
+                        "max_lifetime": 3600,
+                        "acquire_timeout": 30,
+                        "health_check_interval": None,
+                    },
                 },
             },
             "authorization": None,
             "conversation_cache": {
                 "memory": None,
                 "postgres": None,
+                "read_cache": None,
                 "sqlite": None,
                 "type": None,
             },
@@ -197,10 +205,14 @@ def test_dump_configuration(tmp_path: Path) -> None:
                 "limiters": [],
                 "scheduler": {
                     "period": 1,
+                    "mode": "thread",
+                    "batch_size": 1000,
                     "database_reconnection_count": 10,
                     "database_reconnection_delay": 1,
                 },
                 "enable_token_history": False,
+                "lease": None,
+                "token_history_aggregation": None,
             },
             "a2a_state": {
                 "sqlite": None,
@@ -220,6 +232,28 @@ def test_dump_configuration(tmp_path: Path) -> None:
                 "allow_verbose_infer": False,
                 "quota_subject": None,
             },
+            "mcp_registration": {
+                "max_concurrency": 8,
+                "deferred": False,
+            },
+            "persistence_queue": {
+                "enabled": False,
+                "max_size": 1000,
+                "batch_size": 50,
+                "batch_wait_ms": 50,
+                "spool_path": None,
+            },
+            "http_clients": {
+                "default": {
+                    "max_connections": 100,
+                    "max_connections_per_host": 0,
+                    "keepalive_timeout": 30,
+                    "dns_cache_ttl": 300,
+                    "verify_ssl": True,
+                    "ca_cert_path": None,
+                },
+                "pools": {},
+            },
             "splunk": None,
             "deployment_environment": "development",
         }
@@ -524,12 +558,20 @@ def test_dump_configuration_with_quota_limiters(tmp_path: Path) -> None:
                     "gss_encmode": "disable",
                     "namespace": "public",
                     "ca_cert_path": None,
+                    "pool": {
+                        "min_size": 1,
+                        "max_size": 10,
+                        "max_lifetime": 3600,
+                        "acquire_timeout": 30,
+                        "health_check_interval": None,
+                    },
                 },
             },
             "authorization": None,
             "conversation_cache": {
                 "memory": None,
                 "postgres": None,
+                "read_cache": None,
                 "sqlite": None,
                 "type": None,
             },
@@ -542,6 +584,7 @@ def test_dump_configuration_with_quota_limiters(tmp_path: Path) -> None:
                         "initial_quota": 1,
                         "name": "user_monthly_limits",
                         "period": "2 seconds",
+                        "scheduler_period": None,
                         "quota_increase": 10,
                         "type": "user_limiter",
                     },
@@ -549,16 +592,21 @@ def test_dump_configuration_with_quota_limiters(tmp_path: Path) -> None:
                         "initial_quota": 2,
                         "name": "cluster_monthly_limits",
                         "period": "1 month",
+                        "scheduler_period": None,
                         "quota_increase": 20,
                         "type": "cluster_limiter",
                     },
                 ],
                 "scheduler": {
                     "period": 10,
+                    "mode": "thread",
+                    "batch_size": 1000,
                     "database_reconnection_count": 10,
                     "database_reconnection_delay": 1,
                 },
                 "enable_token_history": True,
+                "lease": None,
+                "token_history_aggregation": None,
             },
             "a2a_state": {
                 "sqlite": None,
@@ -578,6 +626,28 @@ def test_dump_configuration_with_quota_limiters(tmp_path: Path) -> None:
                 "allow_verbose_infer": False,
                 "quota_subject": None,
             },
+            "mcp_registration": {
+                "max_concurrency": 8,
+                "deferred": False,
+            },
+            "persistence_queue": {
+                "enabled": False,
+                "max_size": 1000,
+                "batch_size": 50,
+                "batch_wait_ms": 50,
+                "spool_path": None,
+            },
+            "http_clients": {
+                "default": {
+                    "max_connections": 100,
+                    "max_connections_per_host": 0,
+                    "keepalive_timeout": 30,
+                    "dns_cache_ttl": 300,
+                    "verify_ssl": True,
+                    "ca_cert_path": None,
+                },
+                "pools": {},
+            },
             "splunk": None,
             "deployment_environment": "development",
         }
@@ -759,12 +829,20 @@ def test_dump_configuration_with_quota_limiters_different_values(
                     "gss_encmode": "disable",
                     "namespace": "public",
                     "ca_cert_path": None,
+                    "pool": {
+                        "min_size": 1,
+                        "max_size": 10,
+                        "max_lifetime": 3600,
+                        "acquire_timeout": 30,
+                        "health_check_interval": None,
+                    },
                 },
             },
             "authorization": None,
             "conversation_cache": {
                 "memory": None,
                 "postgres": None,
+                "read_cache": None,
                 "sqlite": None,
                 "type": None,
             },
@@ -777,6 +855,7 @@ def test_dump_configuration_with_quota_limiters_different_values(
                         "initial_quota": 1,
                         "name": "user_monthly_limits",
                         "period": "2 seconds",
+                        "scheduler_period": None,
                         "quota_increase": 10,
                         "type": "user_limiter",
                     },
@@ -784,16 +863,21 @@ def test_dump_configuration_with_quota_limiters_different_values(
                         "initial_quota": 2,
                         "name": "cluster_monthly_limits",
                         "period": "1 month",
+                        "scheduler_period": None,
                         "quota_increase": 20,
                         "type": "cluster_limiter",
                     },
                 ],
                 "scheduler": {
                     "period": 10,
+                    "mode": "thread",
+                    "batch_size": 1000,
                     "database_reconnection_count": 123,
                     "database_reconnection_delay": 456,
                 },
                 "enable_token_history": True,
+                "lease": None,
+                "token_history_aggregation": None,
             },
             "a2a_state": {
                 "sqlite": None,
@@ -813,6 +897,28 @@ def test_dump_configuration_with_quota_limiters_different_values(
                 "allow_verbose_infer": False,
                 "quota_subject": None,
             },
+            "mcp_registration": {
+                "max_concurrency": 8,
+                "deferred": False,
+            },
+            "persistence_queue": {
+                "enabled": False,
+                "max_size": 1000,
+                "batch_size": 50,
+                "batch_wait_ms": 50,
+                "spool_path": None,
+            },
+            "http_clients": {
+                "default": {
+                    "max_connections": 100,
+                    "max_connections_per_host": 0,
+                    "keepalive_timeout": 30,
+                    "dns_cache_ttl": 300,
+                    "verify_ssl": True,
+                    "ca_cert_path": None,
+                },
+                "pools": {},
+            },
             "splunk": None,
             "deployment_environment": "development",
         }
@@ -974,12 +1080,20 @@ def test_dump_configuration_byok(tmp_path: Path) -> None:
                     "gss_encmode": "disable",
                     "namespace": "foo",
                     "ca_cert_path": None,
+                    "pool": {
+                        "min_size": 1,
+                        "max_size": 10,
+                        "max_lifetime": 3600,
+                        "acquire_timeout": 30,
+                        "health_check_interval": None,
+                    },
                 },
             },
             "authorization": None,
             "conversation_cache": {
                 "memory": None,
                 "postgres": None,
+                "read_cache": None,
                 "sqlite": None,
                 "type": None,
             },
@@ -1000,10 +1114,14 @@ def test_dump_configuration_byok(tmp_path: Path) -> None:
                 "limiters": [],
                 "scheduler": {
                     "period": 1,
+                    "mode": "thread",
+                    "batch_size": 1000,
                     "database_reconnection_count": 10,
                     "database_reconnection_delay": 1,
                 },
                 "enable_token_history": False,
+                "lease": None,
+                "token_history_aggregation": None,
             },
             "a2a_state": {
                 "sqlite": None,
@@ -1023,6 +1141,28 @@ def test_dump_configuration_byok(tmp_path: Path) -> None:
                 "allow_verbose_infer": False,
                 "quota_subject": None,
             },
+            "mcp_registration": {
+                "max_concurrency": 8,
+                "deferred": False,
+            },
+            "persistence_queue": {
+                "enabled": False,
+                "max_size": 1000,
+                "batch_size": 50,
+                "batch_wait_ms": 50,
+                "spool_path": None,
+            },
+            "http_clients": {
+                "default": {
+                    "max_connections": 100,
+                    "max_connections_per_host": 0,
+                    "keepalive_timeout": 30,
+                    "dns_cache_ttl": 300,
+                    "verify_ssl": True,
+                    "ca_cert_path": None,
+                },
+                "pools": {},
+            },
             "splunk": None,
             "deployment_environment": "development",
         }
@@ -1179,12 +1319,20 @@ def test_dump_configuration_pg_namespace(tmp_path: Path) -> None:
                     "gss_encmode": "disable",
                     "ca_cert_path": None,
                     "namespace": "foo",
+                    "pool": {
+                        "min_size": 1,
+                        "max_size": 10,
+                        "max_lifetime": 3600,
+                        "acquire_timeout": 30,
+                        "health_check_interval": None,
+                    },
                 },
             },
             "authorization": None,
             "conversation_cache": {
                 "memory": None,
                 "postgres": None,
+                "read_cache": None,
                 "sqlite": None,
                 "type": None,
             },
@@ -1195,10 +1343,14 @@ def test_dump_configuration_pg_namespace(tmp_path: Path) -> None:
                 "limiters": [],
                 "scheduler": {
                     "period": 1,
+                    "mode": "thread",
+                    "batch_size": 1000,
                     "database_reconnection_count": 10,
                     "database_reconnection_delay": 1,
                 },
                 "enable_token_history": False,
+                "lease": None,
+                "token_history_aggregation": None,
             },
             "a2a_state": {
                 "sqlite": None,
@@ -1218,6 +1370,28 @@ def test_dump_configuration_pg_namespace(tmp_path: Path) -> None:
                 "allow_verbose_infer": False,
                 "quota_subject": None,
             },
+            "mcp_registration": {
+                "max_concurrency": 8,
+                "deferred": False,
+            },
+            "persistence_queue": {
+                "enabled": False,
+                "max_size": 1000,
+                "batch_size": 50,
+                "batch_wait_ms": 50,
+                "spool_path": None,
+            },
+            "http_clients": {
+                "default": {
+                    "max_connections": 100,
+                    "max_connections_per_host": 0,
+                    "keepalive_timeout": 30,
+                    "dns_cache_ttl": 300,
+                    "verify_ssl": True,
+                    "ca_cert_path": None,
+                },
+                "pools": {},
+            },
             "splunk": None,
             "deployment_environment": "development",
         }
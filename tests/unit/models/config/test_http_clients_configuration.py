@@ -0,0 +1,38 @@
+"""Unit tests for HttpClientsConfiguration model."""
+
+import pytest
+from pydantic import ValidationError
+
+from models.config import HttpClientPoolConfiguration, HttpClientsConfiguration
+
+
+def test_default_values() -> None:
+    """Test default HttpClientsConfiguration has expected values."""
+    cfg = HttpClientsConfiguration()
+    assert cfg.pools == {}  # pylint: disable=no-member
+    assert cfg.default.max_connections == 100  # pylint: disable=no-member
+    assert cfg.default.max_connections_per_host == 0  # pylint: disable=no-member
+    assert cfg.default.keepalive_timeout == 30  # pylint: disable=no-member
+    assert cfg.default.dns_cache_ttl == 300  # pylint: disable=no-member
+    assert cfg.default.verify_ssl is True  # pylint: disable=no-member
+    assert cfg.default.ca_cert_path is None  # pylint: disable=no-member
+
+
+def test_pool_configuration() -> None:
+    """Test that configured pools override the default pool configuration."""
+    jwk = HttpClientPoolConfiguration(max_connections=5)
+    cfg = HttpClientsConfiguration(pools={"jwk": jwk})
+    assert cfg.pool("jwk") is jwk
+    assert cfg.pool("splunk") is cfg.default
+
+
+def test_invalid_pool_configuration() -> None:
+    """Test that pools need at least one connection."""
+    with pytest.raises(ValidationError):
+        HttpClientPoolConfiguration(max_connections=0)
+
+
+def test_missing_ca_cert_file() -> None:
+    """Test that the CA certificate file must exist."""
+    with pytest.raises(ValidationError):
+        HttpClientPoolConfiguration(ca_cert_path="/nonexistent/ca.crt")
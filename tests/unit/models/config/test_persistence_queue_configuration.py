@@ -0,0 +1,41 @@
+"""Unit tests for PersistenceQueueConfiguration model."""
+
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from models.config import PersistenceQueueConfiguration
+
+
+def test_default_configuration() -> None:
+    """Test the default persistence queue configuration."""
+    config = PersistenceQueueConfiguration()
+
+    assert config.enabled is False
+    assert config.max_size == 1000
+    assert config.batch_size == 50
+    assert config.batch_wait_ms == 50
+    assert config.spool_path is None
+
+
+def test_spool_path(tmp_path: Path) -> None:
+    """Test that a writable spool directory is accepted."""
+    spool_path = str(tmp_path / "spool")
+
+    config = PersistenceQueueConfiguration(spool_path=spool_path)
+
+    assert config.spool_path == spool_path
+
+
+@pytest.mark.parametrize("field", ["max_size", "batch_size"])
+def test_non_positive_sizes_are_rejected(field: str) -> None:
+    """Test that queue and batch sizes have to be positive."""
+    with pytest.raises(ValidationError, match=field):
+        PersistenceQueueConfiguration(**{field: 0})
+
+
+def test_negative_batch_wait_is_rejected() -> None:
+    """Test that batch wait can not be negative."""
+    with pytest.raises(ValidationError, match="batch_wait_ms"):
+        PersistenceQueueConfiguration(batch_wait_ms=-1)
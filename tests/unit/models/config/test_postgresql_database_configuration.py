@@ -10,7 +10,7 @@ from constants import (
     POSTGRES_DEFAULT_GSS_ENCMODE,
     POSTGRES_DEFAULT_SSL_MODE,
 )
-from models.config import PostgreSQLDatabaseConfiguration
+from models.config import PostgreSQLDatabaseConfiguration, PostgreSQLPoolConfiguration
 
 
 def test_postgresql_database_configuration() -> None:
@@ -121,3 +121,21 @@ def test_postgresql_database_configuration_ca_cert_path(subtests: SubTests) -> N
                 port=1234,
                 ca_cert_path=Path("not a file"),
             )  # pyright: ignore[reportCallIssue]
+
+
+def test_postgresql_database_configuration_pool(subtests: SubTests) -> None:
+    """Test the connection pool settings of PostgreSQLDatabaseConfiguration."""
+    with subtests.test(msg="Default pool"):
+        c = PostgreSQLDatabaseConfiguration(
+            db="db", user="user", password="password"
+        )  # pyright: ignore[reportCallIssue]
+        assert c.pool.min_size == 1  # pylint: disable=no-member
+        assert c.pool.max_size == 10  # pylint: disable=no-member
+        assert c.pool.max_lifetime == 3600  # pylint: disable=no-member
+        assert c.pool.acquire_timeout == 30  # pylint: disable=no-member
+
+    with subtests.test(msg="Min size greater than max size"):
+        with pytest.raises(
+            ValidationError, match="Pool min_size must not be greater than max_size"
+        ):
+            PostgreSQLPoolConfiguration(min_size=5, max_size=2)
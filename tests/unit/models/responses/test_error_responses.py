@@ -611,6 +611,18 @@ class TestInternalServerErrorResponse:
             == "Conversation cache is not configured or unavailable."
         )
 
+    def test_factory_token_usage_history_unavailable(self) -> None:
+        """Test InternalServerErrorResponse.token_usage_history_unavailable() factory method."""
+        response = InternalServerErrorResponse.token_usage_history_unavailable()
+        assert isinstance(response, AbstractErrorResponse)
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert isinstance(response.detail, DetailModel)
+        assert response.detail.response == "Token usage history not configured"
+        assert (
+            response.detail.cause
+            == "Token usage history is not enabled or unavailable."
+        )
+
     def test_factory_database_error(self) -> None:
         """Test InternalServerErrorResponse.database_error() factory method."""
         response = InternalServerErrorResponse.database_error()
@@ -634,7 +646,7 @@ class TestInternalServerErrorResponse:
 
         # Verify example count matches schema examples count
         assert len(examples) == expected_count
-        assert expected_count == 9
+        assert expected_count == 10
 
         # Verify all labeled examples are present
         assert "internal" in examples
@@ -642,6 +654,7 @@ class TestInternalServerErrorResponse:
         assert "feedback storage" in examples
         assert "query" in examples
         assert "conversation cache" in examples
+        assert "token usage history" in examples
         assert "database" in examples
         assert "cluster version not found" in examples
         assert "cluster version permission denied" in examples
@@ -1,13 +1,28 @@
 """Unit tests for Splunk HEC client."""
 
+# pylint: disable=protected-access
+
+import gzip
+import json
+import os
+from collections.abc import AsyncGenerator
 from pathlib import Path
 from typing import Any, Optional
 
 import aiohttp
 import pytest
+from prometheus_client import REGISTRY
 from pytest_mock import MockerFixture
 
-from observability.splunk import _read_token_from_file, send_splunk_event
+import constants
+from models.config import SplunkConfiguration
+from observability import splunk
+from observability.splunk import (
+    SplunkExporter,
+    _read_token_from_file,
+    queue_splunk_event,
+    send_splunk_event,
+)
 
 
 @pytest.fixture(name="mock_splunk_config")
@@ -133,8 +148,7 @@ async def test_sends_event_successfully(
     """Test event is sent successfully to Splunk HEC."""
     mock_config = mocker.patch("observability.splunk.configuration")
     mock_config.splunk = mock_splunk_config
-    mock_client = mocker.patch("observability.splunk.aiohttp.ClientSession")
-    mock_client.return_value.__aenter__.return_value = mock_session
+    mocker.patch("observability.splunk.get_http_session", return_value=mock_session)
 
     await send_splunk_event({"question": "test"}, "infer_with_llm")
 
@@ -157,7 +171,7 @@ async def test_sends_event_successfully(
         ),
         (
             lambda s: setattr(
-                s.return_value.__aenter__, "side_effect", aiohttp.ClientError()
+                s.post.return_value.__aenter__, "side_effect", aiohttp.ClientError()
             ),
         ),
     ],
@@ -177,11 +191,183 @@ async def test_logs_warning_on_error(
 
     mock_config = mocker.patch("observability.splunk.configuration")
     mock_config.splunk = mock_splunk_config
-    mock_client = mocker.patch("observability.splunk.aiohttp.ClientSession")
-    error_setup(mock_client)
-    mock_client.return_value.__aenter__.return_value = mock_session
+    mocker.patch("observability.splunk.get_http_session", return_value=mock_session)
+    error_setup(mock_session)
     mock_logger = mocker.patch("observability.splunk.logger")
 
     await send_splunk_event({"test": "event"}, "test_sourcetype")
 
     mock_logger.warning.assert_called()
+
+
+@pytest.fixture(name="exporter")
+async def exporter_fixture() -> AsyncGenerator[SplunkExporter, None]:
+    """Use a stopped exporter in every exporter test."""
+    SplunkExporter._instances.pop(SplunkExporter, None)  # type: ignore[attr-defined]
+    exporter = SplunkExporter()
+    yield exporter
+    await exporter.stop()
+    SplunkExporter._instances.pop(SplunkExporter, None)  # type: ignore[attr-defined]
+
+
+def _exporter_config(tmp_path: Path, **kwargs: Any) -> SplunkConfiguration:
+    """Create an enabled Splunk configuration with a token file."""
+    token_file = tmp_path / "token"
+    token_file.write_text("test-hec-token")
+    return SplunkConfiguration(
+        enabled=True,
+        url="https://splunk.example.com:8088/services/collector",
+        token_path=token_file,
+        index="test_index",
+        **kwargs,
+    )
+
+
+def _sent_events(session: Any) -> list[list[dict[str, Any]]]:
+    """Decompress the batches posted by the exporter."""
+    return [
+        [json.loads(line) for line in gzip.decompress(c.kwargs["data"]).splitlines()]
+        for c in session.post.call_args_list
+    ]
+
+
+def _dropped(reason: str) -> float:
+    """Return the number of dropped events counted for the reason."""
+    return (
+        REGISTRY.get_sample_value("ls_splunk_events_dropped_total", {"reason": reason})
+        or 0.0
+    )
+
+
+async def test_queue_event_when_exporter_stopped(exporter: SplunkExporter) -> None:
+    """Test that events are not queued when the exporter is not running."""
+    assert not exporter.running
+    assert queue_splunk_event({"test": "event"}, "infer_with_llm") is False
+
+
+async def test_exporter_not_started_when_disabled(exporter: SplunkExporter) -> None:
+    """Test that the exporter does not run without enabled configuration."""
+    await exporter.start(None)
+    assert not exporter.running
+    await exporter.start(SplunkConfiguration())  # pyright: ignore[reportCallIssue]
+    assert not exporter.running
+
+
+async def test_exporter_sends_events_in_batches(
+    mocker: MockerFixture,
+    tmp_path: Path,
+    mock_session: Any,
+    exporter: SplunkExporter,
+) -> None:
+    """Test that queued events are sent in compressed batches."""
+    mocker.patch("observability.splunk.get_http_session", return_value=mock_session)
+    await exporter.start(_exporter_config(tmp_path, batch_size=2))
+
+    for i in range(3):
+        assert queue_splunk_event({"n": i}, "infer_with_llm")
+    await exporter.stop()
+
+    assert mock_session.post.call_count == 2
+    call = mock_session.post.call_args
+    assert call.kwargs["headers"]["Authorization"] == "Splunk test-hec-token"
+    assert call.kwargs["headers"]["Content-Encoding"] == "gzip"
+    batches = _sent_events(mock_session)
+    assert [[e["event"]["n"] for e in batch] for batch in batches] == [[0, 1], [2]]
+    assert batches[0][0]["sourcetype"] == "infer_with_llm"
+    assert batches[0][0]["index"] == "test_index"
+
+
+async def test_exporter_flushes_after_interval(
+    mocker: MockerFixture,
+    tmp_path: Path,
+    mock_session: Any,
+    exporter: SplunkExporter,
+) -> None:
+    """Test that a batch that is not full is sent after the flush interval."""
+    mocker.patch("observability.splunk.get_http_session", return_value=mock_session)
+    await exporter.start(_exporter_config(tmp_path, flush_interval_ms=10))
+
+    queue_splunk_event({"test": "event"}, "infer_with_llm")
+    assert exporter._queue is not None
+    await exporter._queue.join()
+
+    mock_session.post.assert_called_once()
+    assert exporter.running
+
+
+async def test_exporter_drops_events_when_full(
+    mocker: MockerFixture,
+    tmp_path: Path,
+    mock_session: Any,
+    exporter: SplunkExporter,
+) -> None:
+    """Test that events overflowing the queue are dropped and counted."""
+    mocker.patch("observability.splunk.get_http_session", return_value=mock_session)
+    await exporter.start(_exporter_config(tmp_path, queue_size=1))
+    dropped_before = _dropped("overflow")
+
+    for _ in range(3):
+        assert queue_splunk_event({"test": "event"}, "infer_with_llm")
+
+    assert _dropped("overflow") == dropped_before + 2
+
+
+async def test_exporter_retries_failed_requests(
+    mocker: MockerFixture,
+    tmp_path: Path,
+    exporter: SplunkExporter,
+) -> None:
+    """Test that retryable failures are retried and then dropped."""
+    mocker.patch.object(constants, "SPLUNK_RETRY_INITIAL_DELAY_SECONDS", 0)
+    unavailable = mocker.AsyncMock(status=503)
+    unavailable.text.return_value = "busy"
+    session = mocker.AsyncMock(spec=aiohttp.ClientSession)
+    session.post.return_value.__aenter__.side_effect = [
+        aiohttp.ClientError(),
+        unavailable,
+        mocker.AsyncMock(status=200),
+        unavailable,
+        unavailable,
+        unavailable,
+    ]
+    mocker.patch("observability.splunk.get_http_session", return_value=session)
+    await exporter.start(_exporter_config(tmp_path, batch_size=1, max_retries=2))
+    dropped_before = _dropped("send_failed")
+
+    queue_splunk_event({"n": 1}, "infer_with_llm")
+    queue_splunk_event({"n": 2}, "infer_with_llm")
+    await exporter.stop()
+
+    # the first event is sent by the third request, the second one is dropped
+    assert session.post.call_count == 6
+    assert _dropped("send_failed") == dropped_before + 1
+
+
+async def test_exporter_rereads_changed_token(
+    mocker: MockerFixture,
+    tmp_path: Path,
+    mock_session: Any,
+    exporter: SplunkExporter,
+) -> None:
+    """Test that the token is cached until the token file changes."""
+    mocker.patch("observability.splunk.get_http_session", return_value=mock_session)
+    read_token = mocker.spy(splunk, "_read_token_from_file")
+    config = _exporter_config(tmp_path, flush_interval_ms=0)
+    await exporter.start(config)
+    assert exporter._queue is not None
+
+    for _ in range(2):
+        queue_splunk_event({"test": "event"}, "infer_with_llm")
+        await exporter._queue.join()
+    assert read_token.call_count == 1
+
+    token_file = Path(str(config.token_path))
+    token_file.write_text("rotated-token", encoding="utf-8")
+    mtime = token_file.stat().st_mtime_ns + 1_000_000_000
+    os.utime(token_file, ns=(mtime, mtime))
+    queue_splunk_event({"test": "event"}, "infer_with_llm")
+    await exporter._queue.join()
+
+    assert read_token.call_count == 2
+    headers = mock_session.post.call_args.kwargs["headers"]
+    assert headers["Authorization"] == "Splunk rotated-token"
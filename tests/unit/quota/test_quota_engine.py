@@ -0,0 +1,120 @@
+"""Unit tests for QuotaEngine class."""
+
+from pathlib import Path
+
+import pytest
+from pydantic import SecretStr
+from pytest_mock import MockerFixture
+
+from models.config import (
+    PostgreSQLDatabaseConfiguration,
+    QuotaHandlersConfiguration,
+    QuotaLeaseConfiguration,
+    SQLiteDatabaseConfiguration,
+)
+from quota.cluster_quota_limiter import ClusterQuotaLimiter
+from quota.quota_engine import QuotaEngine
+from quota.quota_exceed_error import QuotaExceedError
+from quota.token_usage_history import TokenUsageHistory
+from quota.user_quota_limiter import UserQuotaLimiter
+
+
+def create_engine(
+    tmp_path: Path, user_quota: int = 100, cluster_quota: int = 1000
+) -> tuple[QuotaEngine, QuotaHandlersConfiguration]:
+    """Create quota engine for a user and a cluster limiter stored in SQLite."""
+    configuration = QuotaHandlersConfiguration(
+        sqlite=SQLiteDatabaseConfiguration(db_path=str(tmp_path / "quota.db")),
+        enable_token_history=True,
+    )  # pyright: ignore[reportCallIssue]
+    limiters = [
+        UserQuotaLimiter(configuration, user_quota, 0),
+        ClusterQuotaLimiter(configuration, cluster_quota, 0),
+    ]
+    engine = QuotaEngine.create(configuration, limiters)  # pyright: ignore
+    assert engine is not None
+    return engine, configuration
+
+
+def test_available_quotas_initializes_missing_rows(tmp_path: Path) -> None:
+    """Test that quota of all limiters is read and initialized."""
+    engine, _ = create_engine(tmp_path)
+
+    assert engine.available_quotas("foo") == {
+        "UserQuotaLimiter": 100,
+        "ClusterQuotaLimiter": 1000,
+    }
+    assert engine.available_quotas("foo") == {
+        "UserQuotaLimiter": 100,
+        "ClusterQuotaLimiter": 1000,
+    }
+
+
+def test_consume_tokens_returns_updated_quotas(tmp_path: Path) -> None:
+    """Test that tokens are consumed from all limiters and history is recorded."""
+    engine, configuration = create_engine(tmp_path)
+    history = TokenUsageHistory(configuration)
+    engine.ensure_available_quota("foo")
+
+    quotas = engine.consume_tokens("foo", 10, 20, provider="p", model="m")
+
+    assert quotas == {"UserQuotaLimiter": 70, "ClusterQuotaLimiter": 970}
+    assert engine.available_quotas("foo") == quotas
+    cursor = history.connection.cursor()  # pyright: ignore[reportOptionalMemberAccess]
+    cursor.execute("SELECT input_tokens, output_tokens FROM token_usage")
+    assert cursor.fetchall() == [(10, 20)]
+    cursor.close()
+    assert [bucket.input_tokens for bucket in history.usage(user_id="foo")] == [10]
+
+
+def test_ensure_available_quota_raises_for_exhausted_limiter(tmp_path: Path) -> None:
+    """Test that the check fails when any limiter has no quota left."""
+    engine, _ = create_engine(tmp_path, user_quota=100, cluster_quota=10)
+    engine.ensure_available_quota("foo")
+    engine.consume_tokens("foo", 10, 0)
+
+    with pytest.raises(QuotaExceedError, match="Cluster has no available tokens"):
+        engine.ensure_available_quota("foo")
+
+
+def test_consume_tokens_single_statement_pg(mocker: MockerFixture) -> None:
+    """Test that PostgreSQL consumption and history use one statement."""
+    mocker.patch("psycopg2.connect")
+    configuration = QuotaHandlersConfiguration(
+        postgres=PostgreSQLDatabaseConfiguration(
+            db="db", user="user", password=SecretStr("password")
+        ),  # pyright: ignore[reportCallIssue]
+    )  # pyright: ignore[reportCallIssue]
+    limiters = [
+        UserQuotaLimiter(configuration, 100, 0),
+        ClusterQuotaLimiter(configuration, 1000, 0),
+    ]
+    engine = QuotaEngine.create(configuration, limiters)  # pyright: ignore
+    assert engine is not None
+    engine.connection = mocker.MagicMock()
+    cursor = engine.connection.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = [("foo", "u", 70), ("", "c", 970)]
+
+    quotas = engine.consume_tokens("foo", 10, 20, provider="p", model="m")
+
+    assert quotas == {"UserQuotaLimiter": 70, "ClusterQuotaLimiter": 970}
+    cursor.execute.assert_called_once()
+    statement, params = cursor.execute.call_args.args
+    assert "WITH consumed AS" in statement
+    assert "history AS" in statement
+    assert "rollup AS" in statement
+    assert params["id_0"] == "foo" and params["subject_0"] == "u"
+    assert params["id_1"] == "" and params["subject_1"] == "c"
+    assert params["tokens_0"] == params["tokens_1"] == 30
+
+
+def test_create_without_engine(tmp_path: Path) -> None:
+    """Test that no engine is created without limiters or with leased quota."""
+    configuration = QuotaHandlersConfiguration(
+        sqlite=SQLiteDatabaseConfiguration(db_path=str(tmp_path / "quota.db")),
+        lease=QuotaLeaseConfiguration(),
+    )  # pyright: ignore[reportCallIssue]
+
+    assert QuotaEngine.create(configuration, []) is None
+    limiter = UserQuotaLimiter(configuration, 100, 0)
+    assert QuotaEngine.create(configuration, [limiter]) is None
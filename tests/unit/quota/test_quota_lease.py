@@ -0,0 +1,252 @@
+"""Unit tests for leased quota."""
+
+import sqlite3
+from pathlib import Path
+from threading import Thread
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from models.config import (
+    QuotaHandlersConfiguration,
+    QuotaLeaseConfiguration,
+    SQLiteDatabaseConfiguration,
+)
+from quota.quota_exceed_error import QuotaExceedError
+from quota.quota_lease import release_quota_leases
+from quota.user_quota_limiter import UserQuotaLimiter
+
+# pylint: disable=protected-access
+
+
+def create_quota_limiter(
+    initial_quota: int = 1000, size: int = 100, db_path: str = ":memory:"
+) -> UserQuotaLimiter:
+    """Create a user quota limiter leasing quota from SQLite (in-memory by default)."""
+    configuration = QuotaHandlersConfiguration(
+        sqlite=SQLiteDatabaseConfiguration(db_path=db_path),
+        lease=QuotaLeaseConfiguration(size=size, refill_interval=3600),
+    )  # pyright: ignore[reportCallIssue]
+    return UserQuotaLimiter(configuration, initial_quota, 0)
+
+
+def stored_quota(quota_limiter: UserQuotaLimiter, subject_id: str) -> int:
+    """Read quota stored in the database, bypassing the leases."""
+    cursor = quota_limiter.connection.cursor()
+    cursor.execute(
+        "SELECT available FROM quota_limits WHERE id=? AND subject=?",
+        (subject_id, quota_limiter.subject_type),
+    )
+    value = cursor.fetchone()[0]
+    cursor.close()
+    return value
+
+
+def test_lease_is_taken_on_first_check() -> None:
+    """Test that the first check leases a block of quota."""
+    quota_limiter = create_quota_limiter()
+
+    quota_limiter.ensure_available_quota("foo")
+
+    assert stored_quota(quota_limiter, "foo") == 900
+    assert quota_limiter.available_quota("foo") == 1000
+
+
+def test_checks_and_consumption_do_not_access_database(mocker: MockerFixture) -> None:
+    """Test that leased quota is enforced and consumed in memory."""
+    quota_limiter = create_quota_limiter()
+    quota_limiter.ensure_available_quota("foo")
+    exchange = mocker.spy(quota_limiter.leases, "_exchange")
+    consume = mocker.spy(quota_limiter, "_consume_tokens")
+
+    quota_limiter.consume_tokens(30, 20, "foo")
+    quota_limiter.ensure_available_quota("foo")
+
+    exchange.assert_not_called()
+    consume.assert_not_called()
+    assert stored_quota(quota_limiter, "foo") == 900
+    assert quota_limiter.available_quota("foo") == 950
+
+
+def test_exhausted_lease_raises_quota_exceed() -> None:
+    """Test that a subject cannot use more than the leased quota."""
+    quota_limiter = create_quota_limiter(initial_quota=100, size=100)
+    quota_limiter.ensure_available_quota("foo")
+    quota_limiter.consume_tokens(60, 50, "foo")
+
+    with pytest.raises(QuotaExceedError):
+        quota_limiter.ensure_available_quota("foo")
+
+
+def test_exhausted_lease_is_renewed_synchronously() -> None:
+    """Test that an exhausted lease does not fail while the database has quota."""
+    quota_limiter = create_quota_limiter(initial_quota=1000, size=100)
+    quota_limiter.ensure_available_quota("foo")
+    quota_limiter.consume_tokens(100, 0, "foo")
+
+    # the lease is not expired yet, the refill thread did not run
+    quota_limiter.ensure_available_quota("foo")
+
+    assert quota_limiter.leases is not None
+    assert quota_limiter.leases._leases["foo"].remaining == 100
+    assert stored_quota(quota_limiter, "foo") == 800
+
+
+def test_unused_lease_is_dropped_after_reset() -> None:
+    """Test that quota leased before a reset is not added to the new period."""
+    quota_limiter = create_quota_limiter(initial_quota=1000, size=100)
+    quota_limiter.ensure_available_quota("foo")
+    quota_limiter.consume_tokens(10, 0, "foo")
+    # the quota scheduler resets the quota and starts a new period
+    cursor = quota_limiter.connection.cursor()
+    cursor.execute(
+        "UPDATE quota_limits SET available=1000, revoked_at='2999-01-01' WHERE id=?",
+        ("foo",),
+    )
+    cursor.close()
+
+    release_quota_leases()
+
+    assert stored_quota(quota_limiter, "foo") == 1000
+
+
+def test_refill_tops_up_low_lease() -> None:
+    """Test that a lease below the threshold is refilled from the database."""
+    quota_limiter = create_quota_limiter()
+    quota_limiter.ensure_available_quota("foo")
+    quota_limiter.consume_tokens(90, 0, "foo")
+    assert quota_limiter.leases is not None
+
+    quota_limiter.leases.refill()
+
+    assert quota_limiter.leases._leases["foo"].remaining == 100
+    assert stored_quota(quota_limiter, "foo") == 810
+
+
+def test_overspent_quota_is_charged() -> None:
+    """Test that tokens consumed over the lease are charged to the database."""
+    quota_limiter = create_quota_limiter(initial_quota=150, size=100)
+    quota_limiter.ensure_available_quota("foo")
+    quota_limiter.consume_tokens(120, 0, "foo")
+    assert quota_limiter.leases is not None
+
+    quota_limiter.leases.refill()
+
+    assert quota_limiter.leases._leases["foo"].remaining == 30
+    assert stored_quota(quota_limiter, "foo") == 0
+
+
+def test_unused_lease_is_returned(mocker: MockerFixture) -> None:
+    """Test that leases not used for the TTL are returned."""
+    monotonic = mocker.patch("quota.quota_lease.monotonic", return_value=1000.0)
+    quota_limiter = create_quota_limiter()
+    quota_limiter.ensure_available_quota("foo")
+    quota_limiter.consume_tokens(10, 0, "foo")
+    assert quota_limiter.leases is not None
+
+    monotonic.return_value = 2000.0
+    quota_limiter.leases.refill()
+
+    assert "foo" not in quota_limiter.leases._leases
+    assert stored_quota(quota_limiter, "foo") == 990
+    # without a lease, tokens are consumed in the database
+    quota_limiter.consume_tokens(10, 0, "foo")
+    assert stored_quota(quota_limiter, "foo") == 980
+
+
+def test_unused_lease_is_returned_by_refill_thread(
+    mocker: MockerFixture, tmp_path: Path
+) -> None:
+    """Test that the refill thread returns leased quota to a SQLite database file."""
+    db_path = str(tmp_path / "quota.db")
+    monotonic = mocker.patch("quota.quota_lease.monotonic", return_value=1000.0)
+    quota_limiter = create_quota_limiter(db_path=db_path)
+    quota_limiter.ensure_available_quota("foo")
+    quota_limiter.consume_tokens(10, 0, "foo")
+    assert quota_limiter.leases is not None
+
+    monotonic.return_value = 2000.0
+    # the connection was opened by this thread, refills run in another one
+    refiller = Thread(target=quota_limiter.leases.refill)
+    refiller.start()
+    refiller.join()
+
+    assert "foo" not in quota_limiter.leases._leases
+    with sqlite3.connect(db_path) as connection:
+        stored = connection.execute(
+            "SELECT available FROM quota_limits WHERE id=?", ("foo",)
+        ).fetchone()[0]
+    assert stored == 990
+
+
+def test_quota_is_kept_when_release_fails(mocker: MockerFixture) -> None:
+    """Test that quota that cannot be returned stays leased."""
+    monotonic = mocker.patch("quota.quota_lease.monotonic", return_value=1000.0)
+    quota_limiter = create_quota_limiter()
+    quota_limiter.ensure_available_quota("foo")
+    quota_limiter.consume_tokens(10, 0, "foo")
+    assert quota_limiter.leases is not None
+    mocker.patch.object(
+        quota_limiter.leases, "_exchange", side_effect=sqlite3.OperationalError
+    )
+
+    monotonic.return_value = 2000.0
+    quota_limiter.leases.refill()
+
+    assert quota_limiter.leases._leases["foo"].remaining == 90
+    assert stored_quota(quota_limiter, "foo") == 900
+
+
+def test_expired_lease_is_renewed(mocker: MockerFixture) -> None:
+    """Test that an expired lease picks up changes made to the database."""
+    monotonic = mocker.patch("quota.quota_lease.monotonic", return_value=1000.0)
+    quota_limiter = create_quota_limiter(initial_quota=100, size=100)
+    quota_limiter.ensure_available_quota("foo")
+    quota_limiter.consume_tokens(100, 0, "foo")
+    quota_limiter.increase_by = 50
+    quota_limiter.increase_quota("foo")
+
+    monotonic.return_value = 1061.0
+    quota_limiter.ensure_available_quota("foo")
+
+    assert quota_limiter.available_quota("foo") == 50
+
+
+def test_leases_returned_on_shutdown() -> None:
+    """Test that unused leased quota is returned on shutdown."""
+    quota_limiter = create_quota_limiter()
+    quota_limiter.ensure_available_quota("foo")
+    quota_limiter.consume_tokens(10, 0, "foo")
+
+    release_quota_leases()
+
+    assert stored_quota(quota_limiter, "foo") == 990
+
+
+def test_exchange_retries_concurrent_change(mocker: MockerFixture) -> None:
+    """Test that the exchange is retried when the quota changes concurrently."""
+    quota_limiter = create_quota_limiter()
+    quota_limiter._init_quota("foo")
+    original = quota_limiter._read_quota_period
+    calls: list[int] = []
+
+    def read_and_change(statement: str, subject_id: str) -> tuple[int, Any]:
+        available, period = original(statement, subject_id)
+        if not calls:
+            # simulate consumption by another worker
+            cursor = quota_limiter.connection.cursor()
+            cursor.execute(
+                "UPDATE quota_limits SET available=available-5 WHERE id=?",
+                (subject_id,),
+            )
+            cursor.close()
+        calls.append(available)
+        return available, period
+
+    mocker.patch.object(quota_limiter, "_read_quota_period", read_and_change)
+
+    granted, available, _ = quota_limiter.exchange_quota("foo", 0, 100)
+    assert (granted, available) == (100, 895)
+    assert calls == [1000, 995]
+    assert stored_quota(quota_limiter, "foo") == 895
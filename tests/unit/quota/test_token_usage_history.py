@@ -0,0 +1,186 @@
+"""Unit tests for TokenUsageHistory class."""
+
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from models.config import (
+    QuotaHandlersConfiguration,
+    SQLiteDatabaseConfiguration,
+    TokenUsageAggregationConfiguration,
+)
+from quota.token_usage_history import (
+    TokenUsageHistory,
+    flush_token_usage_histories,
+    token_usage_record,
+)
+
+
+def create_history(
+    tmp_path: Path, aggregation: TokenUsageAggregationConfiguration | None = None
+) -> TokenUsageHistory:
+    """Create token usage history stored in SQLite."""
+    configuration = QuotaHandlersConfiguration(
+        sqlite=SQLiteDatabaseConfiguration(db_path=str(tmp_path / "history.db")),
+        enable_token_history=True,
+        token_history_aggregation=aggregation,
+    )  # pyright: ignore[reportCallIssue]
+    return TokenUsageHistory(configuration)
+
+
+def read_totals(history: TokenUsageHistory) -> list[tuple]:
+    """Read token usage totals."""
+    cursor = history.connection.cursor()  # pyright: ignore[reportOptionalMemberAccess]
+    cursor.execute(
+        "SELECT user_id, model, input_tokens, output_tokens FROM token_usage "
+        "ORDER BY user_id, model"
+    )
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def test_token_usage_record_buckets() -> None:
+    """Test that usage is assigned to UTC hour and day buckets."""
+    record = token_usage_record(
+        "u1", "p", "m", 1, 2, datetime(2025, 10, 1, 13, 45, 10, tzinfo=UTC)
+    )
+    assert record["hour"] == datetime(2025, 10, 1, 13, tzinfo=UTC)
+    assert record["day"] == datetime(2025, 10, 1, tzinfo=UTC)
+    assert record["requests"] == 1
+
+
+def test_consume_tokens_updates_totals_and_rollups(tmp_path: Path) -> None:
+    """Test that every request updates totals and both rollups."""
+    history = create_history(tmp_path)
+
+    history.consume_tokens("u1", "p", "m1", 10, 20)
+    history.consume_tokens("u1", "p", "m1", 1, 2)
+    history.consume_tokens("u2", "p", "m2", 5, 5)
+
+    assert read_totals(history) == [("u1", "m1", 11, 22), ("u2", "m2", 5, 5)]
+    daily = history.usage(user_id="u1")
+    assert len(daily) == 1
+    assert (daily[0].input_tokens, daily[0].output_tokens) == (11, 22)
+    assert daily[0].requests == 2
+    hourly = history.usage(granularity="hour")
+    assert {bucket.user_id for bucket in hourly} == {"u1", "u2"}
+    assert hourly[0].bucket.minute == 0
+
+
+def test_consume_tokens_batch_is_written_at_once(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Test that usage of several requests is written in one transaction."""
+    history = create_history(tmp_path)
+    write = mocker.spy(history, "_write")
+
+    history.consume_tokens_batch(
+        [("u1", "p", "m1", 10, 20), ("u1", "p", "m1", 1, 2), ("u2", "p", "m2", 5, 5)]
+    )
+
+    write.assert_called_once()
+    assert read_totals(history) == [("u1", "m1", 11, 22), ("u2", "m2", 5, 5)]
+    assert [bucket.requests for bucket in history.usage(user_id="u1")] == [2]
+
+
+def test_consume_tokens_batch_is_aggregated(tmp_path: Path) -> None:
+    """Test that usage of several requests is added to the aggregated usage."""
+    history = create_history(
+        tmp_path, TokenUsageAggregationConfiguration(flush_interval=3600)
+    )
+
+    history.consume_tokens_batch([("u1", "p", "m1", 10, 20), ("u1", "p", "m1", 1, 2)])
+    assert not read_totals(history)
+
+    history.flush()
+
+    assert read_totals(history) == [("u1", "m1", 11, 22)]
+    assert [bucket.requests for bucket in history.usage(user_id="u1")] == [2]
+
+
+def test_usage_time_range(tmp_path: Path) -> None:
+    """Test that usage is filtered by the bucket time range."""
+    history = create_history(tmp_path)
+    history.consume_tokens("u1", "p", "m1", 10, 20)
+    now = datetime.now(tz=UTC)
+
+    assert len(history.usage(start=now - timedelta(days=1))) == 1
+    assert not history.usage(start=now + timedelta(days=1))
+    assert not history.usage(end=now - timedelta(days=1))
+
+
+def test_aggregated_usage_is_written_in_batches(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Test that aggregated usage is written on flush only."""
+    history = create_history(
+        tmp_path, TokenUsageAggregationConfiguration(flush_interval=3600)
+    )
+    write = mocker.spy(history, "_write")
+
+    for _ in range(3):
+        history.consume_tokens("u1", "p", "m1", 10, 20)
+    history.consume_tokens("u2", "p", "m2", 1, 1)
+    assert not read_totals(history)
+
+    history.flush()
+
+    write.assert_called_once()
+    assert len(write.call_args.args[0]) == 2
+    assert read_totals(history) == [("u1", "m1", 30, 60), ("u2", "m2", 1, 1)]
+    assert [bucket.requests for bucket in history.usage(user_id="u1")] == [3]
+
+
+def test_aggregated_usage_is_written_by_background_thread(tmp_path: Path) -> None:
+    """Test that the background thread writes aggregated usage to SQLite."""
+    history = create_history(
+        tmp_path,
+        TokenUsageAggregationConfiguration(flush_interval=3600, max_pending=1),
+    )
+
+    # the connection was opened by this thread, the flush runs in another one
+    history.consume_tokens("u1", "p", "m1", 10, 20)
+    deadline = time.monotonic() + 5
+    totals: list[tuple] = []
+    while not totals and time.monotonic() < deadline:
+        time.sleep(0.01)
+        with history.connection_lock:
+            totals = read_totals(history)
+
+    assert totals == [("u1", "m1", 10, 20)]
+    history.close()
+
+
+def test_aggregated_usage_kept_when_write_fails(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Test that usage is kept in memory when it cannot be written."""
+    history = create_history(
+        tmp_path, TokenUsageAggregationConfiguration(flush_interval=3600)
+    )
+    history.consume_tokens("u1", "p", "m1", 10, 20)
+    mocker.patch.object(history, "_write", side_effect=ValueError("broken"))
+
+    with pytest.raises(ValueError, match="broken"):
+        history.flush()
+    history.consume_tokens("u1", "p", "m1", 1, 1)
+    mocker.stopall()
+    history.flush()
+
+    assert read_totals(history) == [("u1", "m1", 11, 21)]
+
+
+def test_aggregated_usage_flushed_on_shutdown(tmp_path: Path) -> None:
+    """Test that aggregated usage is written when the service shuts down."""
+    history = create_history(
+        tmp_path, TokenUsageAggregationConfiguration(flush_interval=3600)
+    )
+    history.consume_tokens("u1", "p", "m1", 10, 20)
+
+    flush_token_usage_histories()
+
+    assert read_totals(history) == [("u1", "m1", 10, 20)]
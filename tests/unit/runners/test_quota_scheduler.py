@@ -0,0 +1,161 @@
+"""Unit tests for the quota scheduler runner."""
+
+import asyncio
+import sqlite3
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from models.config import (
+    QuotaHandlersConfiguration,
+    QuotaLimiterConfiguration,
+    QuotaSchedulerConfiguration,
+    SQLiteDatabaseConfiguration,
+)
+from quota.sql import CREATE_QUOTA_TABLE_SQLITE, RESET_QUOTA_STATEMENT_SQLITE
+from runners.quota_scheduler import (
+    AsyncQuotaScheduler,
+    init_tables,
+    limiter_period,
+    next_run,
+    start_quota_scheduler,
+    update_in_batches,
+)
+
+
+def create_config(
+    db_path: Path, scheduler_period: int | None = None, mode: str = "async"
+) -> QuotaHandlersConfiguration:
+    """Create quota configuration with one user limiter stored in SQLite."""
+    return QuotaHandlersConfiguration(
+        sqlite=SQLiteDatabaseConfiguration(db_path=str(db_path)),
+        limiters=[
+            QuotaLimiterConfiguration(
+                type="user_limiter",
+                name="user_daily",
+                initial_quota=100,
+                quota_increase=0,
+                period="-1 day",
+                scheduler_period=scheduler_period,
+            )
+        ],
+        scheduler=QuotaSchedulerConfiguration(
+            mode=mode, batch_size=2
+        ),  # pyright: ignore[reportCallIssue]
+    )  # pyright: ignore[reportCallIssue]
+
+
+def create_quota_rows(db_path: Path, count: int) -> sqlite3.Connection:
+    """Create quota rows whose period was reached long ago."""
+    connection = sqlite3.connect(db_path)
+    init_tables(connection, CREATE_QUOTA_TABLE_SQLITE)
+    connection.executemany(
+        "INSERT INTO quota_limits VALUES (?, 'u', 100, 0, NULL, '2000-01-01 00:00:00')",
+        [(f"user{index}",) for index in range(count)],
+    )
+    connection.commit()
+    return connection
+
+
+@pytest.fixture(name="scheduler")
+async def scheduler_fixture() -> AsyncGenerator[AsyncQuotaScheduler, None]:
+    """Provide the async quota scheduler and stop it after the test."""
+    scheduler = AsyncQuotaScheduler()
+    yield scheduler
+    await scheduler.stop()
+
+
+def test_next_run_keeps_schedule() -> None:
+    """Test that runs stay on schedule and missed runs are skipped."""
+    assert next_run(0.0, 1.0, 10.0) == 10.0
+    assert next_run(0.0, 35.0, 10.0) == 40.0
+
+
+def test_limiter_period(tmp_path: Path) -> None:
+    """Test that the limiter period overrides the scheduler period."""
+    config = create_config(tmp_path / "quota.db", scheduler_period=60)
+    assert limiter_period(config, config.limiters[0]) == 60
+
+    config = create_config(tmp_path / "quota.db")
+    assert limiter_period(config, config.limiters[0]) == 1
+
+
+def test_update_in_batches(tmp_path: Path) -> None:
+    """Test that quota is reset in batches until all rows are changed."""
+    connection = create_quota_rows(tmp_path / "quota.db", 5)
+    cursor = connection.execute(
+        "SELECT name FROM sqlite_master WHERE type='index' "
+        "AND name='quota_limits_revoked_at'"
+    )
+    assert cursor.fetchone() is not None
+
+    rows = update_in_batches(
+        connection, RESET_QUOTA_STATEMENT_SQLITE, "u", 100, "-1 day", 2
+    )
+
+    assert rows == 5
+    cursor = connection.execute("SELECT DISTINCT available FROM quota_limits")
+    assert cursor.fetchall() == [(100,)]
+    # revoked rows are not changed again until the period is reached
+    assert (
+        update_in_batches(
+            connection, RESET_QUOTA_STATEMENT_SQLITE, "u", 100, "-1 day", 2
+        )
+        == 0
+    )
+    connection.close()
+
+
+async def test_async_scheduler_revokes_quota(
+    tmp_path: Path, mocker: MockerFixture, scheduler: AsyncQuotaScheduler
+) -> None:
+    """Test that the async scheduler revokes quota and records metrics."""
+    db_path = tmp_path / "quota.db"
+    create_quota_rows(db_path, 3).close()
+    record = mocker.patch(
+        "runners.quota_scheduler.recording.record_quota_scheduler_run"
+    )
+
+    assert await scheduler.start(create_config(db_path, scheduler_period=60))
+    assert scheduler.running
+    for _ in range(100):
+        if record.called:
+            break
+        await asyncio.sleep(0.01)
+
+    record.assert_called_once()
+    limiter, _, rows, lag = record.call_args.args
+    assert (limiter, rows) == ("user_daily", 3)
+    assert lag >= 0
+
+    await scheduler.stop()
+    assert not scheduler.running
+
+
+async def test_async_scheduler_without_limiters(
+    tmp_path: Path, scheduler: AsyncQuotaScheduler
+) -> None:
+    """Test that the async scheduler is not started without limiters."""
+    config = create_config(tmp_path / "quota.db")
+    config.limiters = []
+
+    assert not await scheduler.start(config)
+    assert not scheduler.running
+
+
+def test_thread_not_started_in_async_mode(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Test that no scheduler thread is started in the async mode."""
+    thread = mocker.patch("runners.quota_scheduler.Thread")
+    configuration = mocker.Mock()
+
+    configuration.quota_handlers = create_config(tmp_path / "quota.db")
+    start_quota_scheduler(configuration)
+    thread.assert_not_called()
+
+    configuration.quota_handlers = create_config(tmp_path / "quota.db", mode="thread")
+    start_quota_scheduler(configuration)
+    thread.return_value.start.assert_called_once()
@@ -205,6 +205,25 @@ class TestCheckModelAvailable:
         assert available is True
         assert "is available" in reason
 
+    @pytest.mark.asyncio
+    async def test_model_found_after_cache_refresh(
+        self,
+        mocker: MockerFixture,
+        holder_with_mock_client: tuple[AsyncLlamaStackClientHolder, Any],
+    ) -> None:
+        """Test a stale cached model listing is refetched before giving up."""
+        holder, mock_client = holder_with_mock_client
+        mock_client.models.list.side_effect = [
+            [self._make_model(mocker, "other/model")],
+            [self._make_model(mocker, self.EXPECTED_MODEL_ID)],
+        ]
+
+        available, reason = await holder.check_model_available(self.EXPECTED_MODEL_ID)
+
+        assert available is True
+        assert "is available" in reason
+        assert mock_client.models.list.await_count == 2
+
     @pytest.mark.asyncio
     async def test_model_not_found_service_client(
         self,
@@ -282,7 +301,12 @@ class TestCheckModelAvailable:
 
         wrong_model = self._make_model(mocker, "other/model")
         correct_model = self._make_model(mocker, self.EXPECTED_MODEL_ID)
-        mock_client.models.list.side_effect = [[wrong_model], [correct_model]]
+        # cached listing, forced refetch before reload, listing after reload
+        mock_client.models.list.side_effect = [
+            [wrong_model],
+            [wrong_model],
+            [correct_model],
+        ]
 
         available, reason = await holder.check_model_available(self.EXPECTED_MODEL_ID)
 
@@ -8,6 +8,7 @@ from typing import Any
 
 import pytest
 from pydantic import ValidationError
+from pytest_mock import MockerFixture
 
 import constants
 from cache.in_memory_cache import InMemoryCache
@@ -499,6 +500,33 @@ def test_user_data_collection_configuration_not_loaded() -> None:
         assert c is not None
 
 
+def test_dynamic_mcp_servers_invalidate_tool_catalog(mocker: MockerFixture) -> None:
+    """Test that adding and removing MCP servers drops their cached tools."""
+    tool_catalog = mocker.patch("configuration.ToolCatalog").return_value
+    cfg = AppConfig()
+    cfg.init_from_dict(
+        {
+            "name": "test",
+            "service": {"host": "localhost", "port": 8080},
+            "llama_stack": {
+                "api_key": "test-key",
+                "url": "http://localhost:8321",
+                "use_as_library_client": False,
+            },
+            "user_data_collection": {"feedback_enabled": False},
+        }
+    )
+
+    cfg.add_mcp_server(
+        ModelContextProtocolServer(name="dynamic", url="http://localhost:3000")
+    )
+    tool_catalog.invalidate.assert_called_once_with("dynamic")
+
+    cfg.remove_mcp_server("dynamic")
+    assert tool_catalog.invalidate.call_count == 2
+    assert cfg.mcp_servers == []
+
+
 def test_mcp_servers_not_loaded() -> None:
     """Test that accessing mcp_servers before loading raises an error."""
     cfg = AppConfig()
@@ -1,5 +1,7 @@
 """Test module for utils/common.py."""
 
+import asyncio
+from collections.abc import Generator
 from logging import Logger
 
 import pytest
@@ -9,15 +11,64 @@ from pytest_mock import MockerFixture
 from models.config import (
     Configuration,
     LlamaStackConfiguration,
+    McpRegistrationConfiguration,
     ModelContextProtocolServer,
     ServiceConfiguration,
     UserDataCollection,
 )
 from utils.common import (
+    DeferredMcpRegistration,
     register_mcp_servers_async,
 )
 
 
+def make_configuration(
+    mcp_servers: list[ModelContextProtocolServer], max_concurrency: int = 8
+) -> Configuration:
+    """Create configuration with MCP servers and a service Llama Stack client."""
+    return Configuration(
+        name="test",
+        service=ServiceConfiguration(
+            host="localhost",
+            port=1234,
+            base_url=None,
+            auth_enabled=True,
+            workers=10,
+            color_log=True,
+            access_log=True,
+            root_path="/.",
+        ),
+        llama_stack=LlamaStackConfiguration(
+            use_as_library_client=False,
+            url=AnyHttpUrl("http://localhost:8321"),
+            library_client_config_path=None,
+            api_key=None,
+            timeout=60,
+        ),
+        user_data_collection=UserDataCollection(
+            feedback_enabled=False,
+            feedback_storage=None,
+            transcripts_enabled=False,
+            transcripts_storage=None,
+        ),
+        mcp_servers=mcp_servers,
+        mcp_registration=McpRegistrationConfiguration(max_concurrency=max_concurrency),
+        customization=None,
+    )  # pyright: ignore[reportCallIssue]
+
+
+@pytest.fixture(name="deferred_registration")
+def deferred_registration_fixture() -> Generator[DeferredMcpRegistration, None, None]:
+    """Provide a fresh DeferredMcpRegistration singleton."""
+    DeferredMcpRegistration._instances.pop(  # pylint: disable=protected-access
+        DeferredMcpRegistration, None
+    )
+    yield DeferredMcpRegistration()
+    DeferredMcpRegistration._instances.pop(  # pylint: disable=protected-access
+        DeferredMcpRegistration, None
+    )
+
+
 @pytest.mark.asyncio
 async def test_register_mcp_servers_empty_list(mocker: MockerFixture) -> None:
     """Test register_mcp_servers with empty MCP servers list."""
@@ -412,3 +463,113 @@ async def test_register_mcp_servers_async_with_library_client(
         provider_id="model-context-protocol",
         mcp_endpoint={"uri": "http://localhost:8080"},
     )
+
+
+@pytest.mark.asyncio
+async def test_register_mcp_servers_concurrently_with_bounded_parallelism(
+    mocker: MockerFixture,
+) -> None:
+    """Test that MCP servers are registered concurrently up to max_concurrency."""
+    mock_logger = mocker.Mock(spec=Logger)
+    mock_client = mocker.AsyncMock()
+    mocker.patch(
+        "client.AsyncLlamaStackClientHolder.get_client", return_value=mock_client
+    )
+    mock_client.toolgroups.list.return_value = []
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def register(**_kwargs: object) -> None:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    mock_client.toolgroups.register.side_effect = register
+    servers = [
+        ModelContextProtocolServer(name=f"server-{i}", url=f"http://localhost:{i}")
+        for i in range(5)
+    ]
+
+    await register_mcp_servers_async(
+        mock_logger, make_configuration(servers, max_concurrency=2)
+    )
+
+    assert mock_client.toolgroups.register.call_count == 5
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_deferred_mcp_registration_reports_status(
+    mocker: MockerFixture, deferred_registration: DeferredMcpRegistration
+) -> None:
+    """Test that deferred registration is reported as pending until it finishes."""
+    registered = asyncio.Event()
+    release = asyncio.Event()
+
+    async def register(*_args: object) -> None:
+        registered.set()
+        await release.wait()
+
+    mocker.patch("utils.common.register_mcp_servers_async", side_effect=register)
+
+    assert deferred_registration.status() == (True, "MCP servers registered")
+
+    deferred_registration.start(mocker.Mock(spec=Logger), make_configuration([]))
+    await registered.wait()
+    assert deferred_registration.status() == (
+        False,
+        "MCP servers registration in progress",
+    )
+
+    release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert deferred_registration.status() == (True, "MCP servers registered")
+
+
+@pytest.mark.asyncio
+async def test_deferred_mcp_registration_retries_failures(
+    mocker: MockerFixture, deferred_registration: DeferredMcpRegistration
+) -> None:
+    """Test that a failed deferred registration is retried and reported."""
+    mocker.patch("constants.MCP_REGISTRATION_RETRY_INITIAL_DELAY_SECONDS", 0.01)
+    mock_register = mocker.patch(
+        "utils.common.register_mcp_servers_async",
+        side_effect=[RuntimeError("llama stack down"), None],
+    )
+
+    deferred_registration.start(mocker.Mock(spec=Logger), make_configuration([]))
+    await asyncio.sleep(0)
+    ready, reason = deferred_registration.status()
+    assert ready is False
+    assert "llama stack down" in reason
+
+    for _ in range(100):
+        if deferred_registration.status()[0]:
+            break
+        await asyncio.sleep(0.01)
+    assert deferred_registration.status()[0] is True
+    assert mock_register.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_deferred_mcp_registration_stop_cancels_registration(
+    mocker: MockerFixture, deferred_registration: DeferredMcpRegistration
+) -> None:
+    """Test that stopping cancels a registration still in progress."""
+
+    async def register(*_args: object) -> None:
+        await asyncio.sleep(60)
+
+    mocker.patch("utils.common.register_mcp_servers_async", side_effect=register)
+
+    deferred_registration.start(mocker.Mock(spec=Logger), make_configuration([]))
+    await asyncio.sleep(0)
+    assert deferred_registration.status()[0] is False
+
+    await deferred_registration.stop()
+
+    assert deferred_registration.status() == (True, "MCP servers registered")
@@ -1,7 +1,11 @@
 """Unit tests for the connection decorator."""
 
+import sqlite3
+
+import psycopg2
 import pytest
 
+from cache.cache_error import CacheError
 from utils.connection_decorator import connection
 
 
@@ -56,3 +60,168 @@ def test_connection_decorator_on_connection_exception() -> None:
     with pytest.raises(SomeActionException, match="some_action error!"):
         # this method should autoconnect
         c.some_action()
+
+
+class PooledConnectable:
+    """Connectable holding a connection, failing the first N actions."""
+
+    def __init__(self, error: Exception, failures: int = 1):
+        """Initialize connectable with an open connection."""
+        self.connection: object = object()
+        self.error = error
+        self.failures = failures
+        self.connected_calls = 0
+        self.connect_calls = 0
+        self.action_calls = 0
+
+    def connected(self) -> bool:
+        """Predicate if connection is alive."""
+        self.connected_calls += 1
+        return True
+
+    def connect(self) -> None:
+        """Connect."""
+        self.connect_calls += 1
+        self.connection = object()
+
+    @connection
+    def some_action(self) -> str:
+        """Perform any action, failing with the configured error first."""
+        self.action_calls += 1
+        if self.action_calls <= self.failures:
+            raise self.error
+        return "result"
+
+
+def test_connection_decorator_does_not_ping_open_connection() -> None:
+    """Test that open connections are not checked before each call."""
+    c = PooledConnectable(SomeActionException(), failures=0)
+
+    assert c.some_action() == "result"
+    assert c.connected_calls == 0
+    assert c.connect_calls == 0
+
+
+def test_connection_decorator_reconnects_on_closed_connection() -> None:
+    """Test that the call is retried once after reconnecting a closed connection."""
+    c = PooledConnectable(
+        sqlite3.ProgrammingError("Cannot operate on a closed database.")
+    )
+
+    assert c.some_action() == "result"
+    assert c.connect_calls == 1
+    assert c.action_calls == 2
+
+
+def test_connection_decorator_does_not_retry_lost_connection() -> None:
+    """Test that a call failing on a lost connection is not repeated.
+
+    The database may have applied the write before the connection was lost.
+    """
+    c = PooledConnectable(psycopg2.OperationalError("server closed the connection"))
+
+    with pytest.raises(psycopg2.OperationalError):
+        c.some_action()
+    assert c.action_calls == 1
+    # reconnected for the next call
+    assert c.connect_calls == 1
+    assert c.some_action() == "result"
+
+
+def test_connection_decorator_does_not_retry_programming_errors() -> None:
+    """Test that programming errors on an open connection are not retried."""
+    c = PooledConnectable(sqlite3.ProgrammingError("Error binding parameter 1"))
+
+    with pytest.raises(sqlite3.ProgrammingError, match="binding"):
+        c.some_action()
+    assert c.connect_calls == 0
+    assert c.action_calls == 1
+
+
+def test_connection_decorator_reconnects_closed_connection_before_call() -> None:
+    """Test that a connection known to be closed is replaced before the call."""
+
+    class ClosedConnection:  # pylint: disable=too-few-public-methods
+        """Connection with psycopg2's closed flag set."""
+
+        closed = 1
+
+    c = PooledConnectable(SomeActionException(), failures=0)
+    c.connection = ClosedConnection()
+
+    assert c.some_action() == "result"
+    assert c.connect_calls == 1
+    assert c.action_calls == 1
+
+
+def test_connection_decorator_reconnects_on_wrapped_connection_error() -> None:
+    """Test that errors raised from connection errors are retried too."""
+    error = CacheError("PostgresCache.delete")
+    error.__cause__ = psycopg2.InterfaceError("connection already closed")
+    c = PooledConnectable(error)
+
+    assert c.some_action() == "result"
+    assert c.connect_calls == 1
+
+
+def test_connection_decorator_retries_once() -> None:
+    """Test that a second connection error is propagated."""
+    c = PooledConnectable(
+        psycopg2.InterfaceError("connection already closed"), failures=2
+    )
+
+    with pytest.raises(psycopg2.InterfaceError, match="already closed"):
+        c.some_action()
+    assert c.action_calls == 2
+
+
+def test_connection_decorator_does_not_retry_other_errors() -> None:
+    """Test that other errors are propagated without reconnecting."""
+    c = PooledConnectable(SomeActionException("some_action error!"))
+
+    with pytest.raises(SomeActionException, match="some_action error!"):
+        c.some_action()
+    assert c.connect_calls == 0
+    assert c.action_calls == 1
+
+
+class RecordingLock:
+    """Lock recording whether it is held."""
+
+    def __init__(self) -> None:
+        """Initialize released lock."""
+        self.held = False
+
+    def __enter__(self) -> "RecordingLock":
+        """Acquire the lock."""
+        self.held = True
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Release the lock."""
+        self.held = False
+
+
+class LockedConnectable(PooledConnectable):
+    """Connectable whose connection is shared with other threads."""
+
+    def __init__(self) -> None:
+        """Initialize connectable with a connection lock."""
+        super().__init__(SomeActionException(), failures=0)
+        self.connection_lock = RecordingLock()
+        self.locked_in_action = False
+
+    @connection
+    def some_action(self) -> str:
+        """Perform any action, recording whether the lock is held."""
+        self.locked_in_action = self.connection_lock.held
+        return "result"
+
+
+def test_connection_decorator_holds_connection_lock() -> None:
+    """Test that the connection lock is held for the whole call."""
+    c = LockedConnectable()
+
+    assert c.some_action() == "result"
+    assert c.locked_in_action
+    assert not c.connection_lock.held
@@ -166,7 +166,8 @@ class TestCreateReferencedDocuments:
 class TestValidateAndRetrieveConversation:
     """Tests for validate_and_retrieve_conversation function."""
 
-    def test_successful_retrieval(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_successful_retrieval(self, mocker: MockerFixture) -> None:
         """Test successful conversation retrieval when user has access."""
         normalized_conv_id = "123e4567-e89b-12d3-a456-426614174000"
         user_id = "user-123"
@@ -175,12 +176,9 @@ class TestValidateAndRetrieveConversation:
         mock_conversation.id = normalized_conv_id
         mock_conversation.user_id = user_id
 
-        mocker.patch("utils.endpoints.can_access_conversation", return_value=True)
-        mocker.patch(
-            "utils.endpoints.retrieve_conversation", return_value=mock_conversation
-        )
+        mocker.patch("utils.endpoints.run_in_session", return_value=mock_conversation)
 
-        result = endpoints.validate_and_retrieve_conversation(
+        result = await endpoints.validate_and_retrieve_conversation(
             normalized_conv_id=normalized_conv_id,
             user_id=user_id,
             others_allowed=False,
@@ -188,16 +186,21 @@ class TestValidateAndRetrieveConversation:
 
         assert result == mock_conversation
 
-    def test_forbidden_access(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_forbidden_access(self, mocker: MockerFixture) -> None:
         """Test that 403 Forbidden is raised when user doesn't have access."""
         normalized_conv_id = "123e4567-e89b-12d3-a456-426614174000"
         user_id = "user-123"
 
-        mocker.patch("utils.endpoints.can_access_conversation", return_value=False)
+        mock_conversation = mocker.Mock(spec=UserConversation)
+        mock_conversation.id = normalized_conv_id
+        mock_conversation.user_id = "other-user"
+
+        mocker.patch("utils.endpoints.run_in_session", return_value=mock_conversation)
         mocker.patch("utils.endpoints.logger")
 
         with pytest.raises(HTTPException) as exc_info:
-            endpoints.validate_and_retrieve_conversation(
+            await endpoints.validate_and_retrieve_conversation(
                 normalized_conv_id=normalized_conv_id,
                 user_id=user_id,
                 others_allowed=False,
@@ -209,17 +212,17 @@ class TestValidateAndRetrieveConversation:
         assert "response" in exc_info.value.detail
         assert "cause" in exc_info.value.detail
 
-    def test_conversation_not_found(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_conversation_not_found(self, mocker: MockerFixture) -> None:
         """Test that 404 Not Found is raised when conversation doesn't exist."""
         normalized_conv_id = "123e4567-e89b-12d3-a456-426614174000"
         user_id = "user-123"
 
-        mocker.patch("utils.endpoints.can_access_conversation", return_value=True)
-        mocker.patch("utils.endpoints.retrieve_conversation", return_value=None)
+        mocker.patch("utils.endpoints.run_in_session", return_value=None)
         mocker.patch("utils.endpoints.logger")
 
         with pytest.raises(HTTPException) as exc_info:
-            endpoints.validate_and_retrieve_conversation(
+            await endpoints.validate_and_retrieve_conversation(
                 normalized_conv_id=normalized_conv_id,
                 user_id=user_id,
                 others_allowed=False,
@@ -231,20 +234,20 @@ class TestValidateAndRetrieveConversation:
         assert "response" in exc_info.value.detail
         assert "cause" in exc_info.value.detail
 
-    def test_database_error(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_database_error(self, mocker: MockerFixture) -> None:
         """Test that 500 Internal Server Error is raised on database error."""
         normalized_conv_id = "123e4567-e89b-12d3-a456-426614174000"
         user_id = "user-123"
 
-        mocker.patch("utils.endpoints.can_access_conversation", return_value=True)
         mocker.patch(
-            "utils.endpoints.retrieve_conversation",
+            "utils.endpoints.run_in_session",
             side_effect=SQLAlchemyError("Database connection error", None, None),
         )
         mocker.patch("utils.endpoints.logger")
 
         with pytest.raises(HTTPException) as exc_info:
-            endpoints.validate_and_retrieve_conversation(
+            await endpoints.validate_and_retrieve_conversation(
                 normalized_conv_id=normalized_conv_id,
                 user_id=user_id,
                 others_allowed=False,
@@ -256,7 +259,8 @@ class TestValidateAndRetrieveConversation:
         assert "response" in exc_info.value.detail
         assert "cause" in exc_info.value.detail
 
-    def test_successful_retrieval_with_others_allowed(
+    @pytest.mark.asyncio
+    async def test_successful_retrieval_with_others_allowed(
         self, mocker: MockerFixture
     ) -> None:
         """Test successful retrieval when others_allowed is True."""
@@ -267,12 +271,9 @@ class TestValidateAndRetrieveConversation:
         mock_conversation.id = normalized_conv_id
         mock_conversation.user_id = "other-user"  # Different user
 
-        mocker.patch("utils.endpoints.can_access_conversation", return_value=True)
-        mocker.patch(
-            "utils.endpoints.retrieve_conversation", return_value=mock_conversation
-        )
+        mocker.patch("utils.endpoints.run_in_session", return_value=mock_conversation)
 
-        result = endpoints.validate_and_retrieve_conversation(
+        result = await endpoints.validate_and_retrieve_conversation(
             normalized_conv_id=normalized_conv_id,
             user_id=user_id,
             others_allowed=True,  # Allow access to others' conversations
@@ -281,6 +282,30 @@ class TestValidateAndRetrieveConversation:
         assert result == mock_conversation
 
 
+class TestRetrieveTurnByResponseId:
+    """Tests for retrieve_turn_by_response_id function."""
+
+    @pytest.mark.asyncio
+    async def test_turn_found(self, mocker: MockerFixture) -> None:
+        """Test that the turn is returned when it exists."""
+        mock_turn = mocker.Mock(spec=UserTurn)
+        mocker.patch("utils.endpoints.run_in_session", return_value=mock_turn)
+
+        result = await endpoints.retrieve_turn_by_response_id("resp_1")
+
+        assert result == mock_turn
+
+    @pytest.mark.asyncio
+    async def test_turn_not_found(self, mocker: MockerFixture) -> None:
+        """Test that 404 Not Found is raised when no turn has the response ID."""
+        mocker.patch("utils.endpoints.run_in_session", return_value=None)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await endpoints.retrieve_turn_by_response_id("resp_1")
+
+        assert exc_info.value.status_code == 404
+
+
 class TestResolveResponseContext:
     """Tests for resolve_response_context function."""
 
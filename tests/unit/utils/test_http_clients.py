@@ -0,0 +1,99 @@
+"""Unit tests for shared outbound HTTP sessions."""
+
+# pylint: disable=protected-access
+
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from prometheus_client import REGISTRY
+
+from models.config import HttpClientPoolConfiguration, HttpClientsConfiguration
+from utils.http_clients import HttpClientRegistry, get_http_session
+
+
+@pytest.fixture(name="registry", autouse=True)
+def registry_fixture() -> Generator[HttpClientRegistry, None, None]:
+    """Use a registry without sessions in every test."""
+    HttpClientRegistry._instances.pop(HttpClientRegistry, None)  # type: ignore[attr-defined]
+    registry = HttpClientRegistry()
+    yield registry
+    HttpClientRegistry._instances.pop(HttpClientRegistry, None)  # type: ignore[attr-defined]
+
+
+@pytest.fixture(name="server")
+async def server_fixture(
+    registry: HttpClientRegistry,
+) -> AsyncGenerator[TestServer, None]:
+    """Start a local HTTP server answering every request with 200."""
+
+    async def handler(_request: web.Request) -> web.Response:
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await registry.close()
+    await server.close()
+
+
+def metric(name: str, labels: dict[str, str]) -> float:
+    """Return the current value of a metric sample."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_sessions_are_shared_per_destination(
+    registry: HttpClientRegistry,
+) -> None:
+    """Test that each destination has one long-lived session."""
+    registry.configure(
+        HttpClientsConfiguration(
+            pools={"jwk": HttpClientPoolConfiguration(max_connections=5)}
+        )
+    )
+
+    jwk_session = get_http_session("jwk")
+    assert get_http_session("jwk") is jwk_session
+    other_session = get_http_session("splunk")
+    assert other_session is not jwk_session
+
+    assert jwk_session.connector is not None
+    assert jwk_session.connector.limit == 5
+    assert other_session.connector is not None
+    assert other_session.connector.limit == 100
+    await registry.close()
+
+
+async def test_close_closes_sessions(registry: HttpClientRegistry) -> None:
+    """Test that closed sessions are replaced by new ones."""
+    session = get_http_session("jwk")
+
+    await registry.close()
+
+    assert session.closed
+    assert get_http_session("jwk") is not session
+    await registry.close()
+
+
+async def test_pool_metrics(server: TestServer) -> None:
+    """Test that connections are counted and reused."""
+    connects = {"pool": "metrics-test"}
+    in_use = {"pool": "metrics-test", "state": "in_use"}
+    connected_before = metric(
+        "ls_http_client_pool_connect_duration_seconds_count", connects
+    )
+
+    for _ in range(3):
+        async with get_http_session("metrics-test").get(server.make_url("/")) as resp:
+            assert resp.status == 200
+            await resp.text()
+
+    # one connection was opened and kept alive for the following requests
+    assert (
+        metric("ls_http_client_pool_connect_duration_seconds_count", connects)
+        == connected_before + 1
+    )
+    assert metric("ls_http_client_pool_connections", in_use) == 0
@@ -0,0 +1,132 @@
+"""Unit tests for MCP OAuth probes."""
+
+# pylint: disable=protected-access
+
+import asyncio
+from collections.abc import Generator
+from typing import Any, Optional
+
+import aiohttp
+import pytest
+from fastapi import HTTPException
+from pytest_mock import MockerFixture
+
+from utils import mcp_oauth_probe
+from utils.mcp_oauth_probe import McpProbeCache, probe_mcp
+
+URL = "http://mcp.example.com/mcp"
+
+
+@pytest.fixture(name="probe_cache", autouse=True)
+def probe_cache_fixture(mocker: MockerFixture) -> Generator[McpProbeCache, None, None]:
+    """Use an empty probe cache in every test."""
+    cache = McpProbeCache()
+    mocker.patch.object(mcp_oauth_probe, "_probe_cache", cache)
+    yield cache
+    cache.clear()
+
+
+def mock_session(
+    mocker: MockerFixture,
+    status: int = 200,
+    headers: Optional[dict[str, str]] = None,
+    error: Optional[Exception] = None,
+) -> Any:
+    """Patch the shared probe session, returning the mocked get method."""
+    response = mocker.Mock(status=status, headers=headers or {})
+    get = mocker.MagicMock()
+    if error is not None:
+        get.return_value.__aenter__.side_effect = error
+    else:
+        get.return_value.__aenter__.return_value = response
+    session = mocker.Mock(get=get)
+    mocker.patch("utils.mcp_oauth_probe.get_http_session", return_value=session)
+    return get
+
+
+async def test_probe_server_without_oauth(mocker: MockerFixture) -> None:
+    """Test that probes of servers not requiring OAuth pass."""
+    get = mock_session(mocker, status=200)
+
+    await probe_mcp(URL, authorization="Bearer token")
+
+    get.assert_called_once()
+    assert get.call_args.args == (URL,)
+    assert get.call_args.kwargs["headers"] == {"authorization": "Bearer token"}
+
+
+async def test_probe_server_requiring_oauth(mocker: MockerFixture) -> None:
+    """Test that 401 with WWW-Authenticate is passed to the client."""
+    mock_session(mocker, status=401, headers={"WWW-Authenticate": 'Bearer realm="x"'})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await probe_mcp(URL)
+
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.headers == {"WWW-Authenticate": 'Bearer realm="x"'}
+
+
+async def test_probe_failure(mocker: MockerFixture) -> None:
+    """Test that failed probes raise 401 without WWW-Authenticate."""
+    mock_session(mocker, error=aiohttp.ClientConnectionError("refused"))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await probe_mcp(URL)
+
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.headers is None
+
+
+async def test_probe_results_are_cached(mocker: MockerFixture) -> None:
+    """Test that servers are probed once per authorization."""
+    get = mock_session(mocker, status=200)
+
+    await probe_mcp(URL, authorization="Bearer token")
+    await probe_mcp(URL, authorization="Bearer token")
+    assert get.call_count == 1
+
+    # new credentials are probed again
+    await probe_mcp(URL, authorization="Bearer other")
+    assert get.call_count == 2
+
+
+async def test_oauth_required_is_cached_briefly(
+    mocker: MockerFixture, probe_cache: McpProbeCache
+) -> None:
+    """Test that results requiring OAuth expire after the negative TTL."""
+    get = mock_session(mocker, status=401)
+    probe_cache.negative_ttl = 0.01
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await probe_mcp(URL)
+    assert get.call_count == 1
+
+    await asyncio.sleep(0.02)
+    with pytest.raises(HTTPException):
+        await probe_mcp(URL)
+    assert get.call_count == 2
+
+
+async def test_concurrent_requests_share_probe(mocker: MockerFixture) -> None:
+    """Test that concurrent requests wait for one probe."""
+    get = mock_session(mocker, status=200)
+
+    await asyncio.gather(*(probe_mcp(URL) for _ in range(5)))
+
+    assert get.call_count == 1
+
+
+async def test_result_is_refreshed_in_background(
+    mocker: MockerFixture, probe_cache: McpProbeCache
+) -> None:
+    """Test that results about to expire are served and probed again."""
+    get = mock_session(mocker, status=200)
+    await probe_mcp(URL)
+
+    # every cached result is due for refresh now
+    probe_cache.refresh_ahead = probe_cache.ttl
+    await probe_mcp(URL)
+    await asyncio.gather(*probe_cache._probes.values())
+
+    assert get.call_count == 2
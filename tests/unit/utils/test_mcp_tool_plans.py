@@ -0,0 +1,137 @@
+"""Unit tests for precompiled MCP tool plans."""
+
+# pylint: disable=protected-access
+
+from collections.abc import Generator
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from models.config import ModelContextProtocolServer
+from utils.mcp_headers import build_server_headers, find_unresolved_auth_headers
+from utils.mcp_tool_plans import McpToolPlans, compile_mcp_tool_plan
+
+
+@pytest.fixture(name="plans", autouse=True)
+def plans_fixture() -> Generator[McpToolPlans, None, None]:
+    """Use plans compiled by the test only."""
+    McpToolPlans._instances.pop(McpToolPlans, None)  # type: ignore[attr-defined]
+    plans = McpToolPlans()
+    yield plans
+    McpToolPlans._instances.pop(McpToolPlans, None)  # type: ignore[attr-defined]
+
+
+@pytest.fixture(name="secret_file")
+def secret_file_fixture(tmp_path: Path) -> Path:
+    """Create a file with a static secret."""
+    secret_file = tmp_path / "secret"
+    secret_file.write_text("static-secret", encoding="utf-8")
+    return secret_file
+
+
+def test_static_server_shares_template() -> None:
+    """Test that tools of servers without request headers are not copied."""
+    server = ModelContextProtocolServer(name="fs", url="http://localhost:3000")
+    plan = compile_mcp_tool_plan(server)
+
+    tool = plan.tool({}, None, None)
+
+    assert tool is plan.template
+    assert tool is not None
+    assert tool.server_label == "fs"
+    assert tool.server_url == "http://localhost:3000"
+    assert tool.require_approval == "never"
+    assert tool.headers is None
+    assert tool.authorization is None
+
+
+def test_static_authorization_is_compiled(secret_file: Path) -> None:
+    """Test that secrets read from files are part of the template."""
+    server = ModelContextProtocolServer(
+        name="fs",
+        url="http://localhost:3000",
+        authorization_headers={
+            "Authorization": str(secret_file),
+            "X-Key": str(secret_file),
+        },
+    )
+    plan = compile_mcp_tool_plan(server)
+
+    tool = plan.tool({}, None, "k8s-token")
+
+    assert tool is plan.template
+    assert tool is not None
+    assert tool.authorization == "static-secret"
+    assert tool.headers == {"X-Key": "static-secret"}
+
+
+@pytest.mark.parametrize(
+    ("client_headers", "request_headers", "token"),
+    [
+        ({}, None, None),
+        ({}, None, "k8s-token"),
+        ({"X-Client": "client-value"}, None, None),
+        ({"authorization": "client-token"}, None, "k8s-token"),
+        ({}, {"x-request-id": "req-1", "x-other": "other"}, "k8s-token"),
+        ({"X-Request-ID": "client-id"}, {"x-request-id": "req-1"}, None),
+    ],
+    ids=[
+        "nothing",
+        "token",
+        "client",
+        "client_overrides_token",
+        "propagated",
+        "client_overrides_propagated",
+    ],
+)
+def test_headers_match_build_server_headers(
+    secret_file: Path,
+    client_headers: dict[str, str],
+    request_headers: Optional[dict[str, str]],
+    token: Optional[str],
+) -> None:
+    """Test that plans merge headers like build_server_headers does."""
+    server = ModelContextProtocolServer(
+        name="mixed",
+        url="http://localhost:3000",
+        authorization_headers={
+            "Authorization": "kubernetes",
+            "X-Client": "client",
+            "X-Static": str(secret_file),
+        },
+        headers=["X-Request-ID"],
+    )
+    plan = compile_mcp_tool_plan(server)
+
+    expected = build_server_headers(server, client_headers, request_headers, token)
+    headers = plan.headers(client_headers, request_headers, token)
+    assert headers == expected
+    assert plan.unresolved_headers(headers) == {
+        name.lower()
+        for name in find_unresolved_auth_headers(server.authorization_headers, expected)
+    }
+
+    tool = plan.tool(client_headers, request_headers, token)
+    if plan.unresolved_headers(headers):
+        assert tool is None
+    else:
+        assert tool is not None
+        assert tool.authorization == expected.get("Authorization")
+
+
+def test_plans_follow_configuration(plans: McpToolPlans) -> None:
+    """Test that plans are compiled again for new server objects."""
+    server = ModelContextProtocolServer(name="fs", url="http://localhost:3000")
+    plans.compile([server])
+    plan = plans.plan(server)
+    assert plans.plan(server) is plan
+
+    # a server registered again under the same name gets a new plan
+    replacement = ModelContextProtocolServer(name="fs", url="http://localhost:4000")
+    new_plan = plans.plan(replacement)
+    assert new_plan is not plan
+    assert new_plan.template.server_url == "http://localhost:4000"
+
+    plans.discard("fs")
+    assert "fs" not in plans._plans
@@ -0,0 +1,397 @@
+"""Unit tests for the write-behind persistence queue."""
+
+import asyncio
+import fcntl
+import os
+import threading
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models.config import PersistenceQueueConfiguration
+from models.database.base import Base
+from models.database.conversations import UserConversation, UserTurn
+from utils.persistence_queue import PersistenceQueue, QueryResultsRecord
+from utils.token_counter import TokenCounter
+from utils.types import TurnSummary
+
+
+def _record(conversation_id: str = "conv-1") -> QueryResultsRecord:
+    """Create query results record for the given conversation."""
+    return QueryResultsRecord(
+        user_id="user-1",
+        conversation_id=conversation_id,
+        model="provider/model",
+        started_at="2026-01-01T00:00:00Z",
+        completed_at="2026-01-01T00:00:05Z",
+        summary=TurnSummary(
+            id="resp-1",
+            llm_response="answer",
+            token_usage=TokenCounter(input_tokens=10, output_tokens=20),
+        ),
+        query="question",
+        skip_userid_check=False,
+    )
+
+
+@pytest.fixture(name="queue")
+async def queue_fixture() -> AsyncGenerator[PersistenceQueue, None]:
+    """Provide the persistence queue and make sure it is stopped afterwards."""
+    queue = PersistenceQueue()
+    yield queue
+    await queue.stop()
+    queue._config = PersistenceQueueConfiguration()  # pylint: disable=protected-access
+
+
+@pytest.fixture(name="storage")
+def storage_fixture(mocker: MockerFixture) -> dict[str, Any]:
+    """Patch all storages the queue writes to."""
+    session = mocker.Mock()
+
+    async def run_in_session(func: Any) -> Any:
+        return func(session)
+
+    token_usage_history = mocker.Mock()
+    mocker.patch(
+        "utils.persistence_queue.configuration",
+        mocker.Mock(token_usage_history=token_usage_history),
+    )
+    return {
+        "session": session,
+        "run_in_session": mocker.patch(
+            "utils.persistence_queue.run_in_session", side_effect=run_in_session
+        ),
+        "add_details": mocker.patch(
+            "utils.persistence_queue.add_user_conversation_details"
+        ),
+        "persist_details": mocker.patch(
+            "utils.persistence_queue.persist_user_conversation_details"
+        ),
+        "transcript": mocker.patch("utils.persistence_queue.store_query_transcript"),
+        "cache": mocker.patch("utils.persistence_queue.store_conversations_into_cache"),
+        "cache_one": mocker.patch(
+            "utils.persistence_queue.store_conversation_into_cache"
+        ),
+        "token_usage_history": token_usage_history,
+    }
+
+
+def test_persistence_queue_is_singleton() -> None:
+    """Test that the persistence queue is shared process-wide."""
+    assert PersistenceQueue() is PersistenceQueue()
+
+
+async def test_disabled_queue_is_not_running(queue: PersistenceQueue) -> None:
+    """Test that a disabled queue does not start its worker."""
+    await queue.start(PersistenceQueueConfiguration(enabled=False))
+    assert not queue.running
+
+
+async def test_records_are_persisted_in_one_transaction(
+    queue: PersistenceQueue, storage: dict[str, Any]
+) -> None:
+    """Test that records submitted together are committed in one batch."""
+    await queue.start(PersistenceQueueConfiguration(enabled=True, batch_wait_ms=100))
+    assert queue.running
+
+    for conversation_id in ("conv-1", "conv-2", "conv-3"):
+        await queue.submit(_record(conversation_id))
+    await queue.stop()
+
+    assert not queue.running
+    storage["run_in_session"].assert_awaited_once()
+    storage["session"].commit.assert_called_once()
+    assert storage["add_details"].call_count == 3
+    assert storage["transcript"].call_count == 3
+    # cache entries and token usage of the batch are written at once
+    storage["cache"].assert_called_once()
+    assert [entry[1] for entry in storage["cache"].call_args.args[0]] == [
+        "conv-1",
+        "conv-2",
+        "conv-3",
+    ]
+    storage["token_usage_history"].consume_tokens_batch.assert_called_once_with(
+        [("user-1", "provider", "model", 10, 20)] * 3
+    )
+
+
+async def test_batch_size_limits_transaction(
+    queue: PersistenceQueue, storage: dict[str, Any]
+) -> None:
+    """Test that batches are not larger than configured."""
+    await queue.start(
+        PersistenceQueueConfiguration(enabled=True, batch_size=2, batch_wait_ms=100)
+    )
+
+    for conversation_id in ("conv-1", "conv-2", "conv-3"):
+        await queue.submit(_record(conversation_id))
+    await queue.stop()
+
+    assert storage["session"].commit.call_count == 2
+    assert storage["add_details"].call_count == 3
+
+
+async def test_failed_batch_is_persisted_one_by_one(
+    queue: PersistenceQueue, storage: dict[str, Any]
+) -> None:
+    """Test the fallback to per-record transactions when a batch fails."""
+    storage["session"].commit.side_effect = SQLAlchemyError("boom")
+    storage["persist_details"].side_effect = [SQLAlchemyError("boom"), None]
+    await queue.start(PersistenceQueueConfiguration(enabled=True, batch_wait_ms=100))
+
+    await queue.submit(_record("conv-1"))
+    await queue.submit(_record("conv-2"))
+    await queue.stop()
+
+    assert storage["persist_details"].await_count == 2
+    # remaining side effects still run for all records
+    assert len(storage["cache"].call_args.args[0]) == 2
+
+
+async def test_submit_without_worker_persists_inline(
+    queue: PersistenceQueue, storage: dict[str, Any]
+) -> None:
+    """Test that records are stored immediately when the queue is not running."""
+    await queue.submit(_record())
+
+    storage["add_details"].assert_called_once()
+    storage["cache"].assert_called_once()
+
+
+async def test_full_queue_persists_inline(
+    queue: PersistenceQueue, storage: dict[str, Any]
+) -> None:
+    """Test that a full queue applies backpressure by storing inline."""
+    await queue.start(
+        PersistenceQueueConfiguration(enabled=True, max_size=1, batch_wait_ms=100)
+    )
+
+    await queue.submit(_record("conv-1"))
+    await queue.submit(_record("conv-2"))
+    storage["add_details"].assert_called_once()
+
+    await queue.stop()
+    assert storage["add_details"].call_count == 2
+
+
+async def test_token_usage_history_can_be_skipped(
+    queue: PersistenceQueue, storage: dict[str, Any]
+) -> None:
+    """Test that token usage is not recorded twice."""
+    record = _record()
+    record.record_token_usage = False
+
+    await queue.submit(record)
+
+    storage["token_usage_history"].consume_tokens_batch.assert_not_called()
+
+
+async def test_wait_until_persisted(
+    queue: PersistenceQueue, storage: dict[str, Any]
+) -> None:
+    """Test that readers wait for queued writes of their conversation."""
+    await queue.start(PersistenceQueueConfiguration(enabled=True, batch_wait_ms=100))
+    await queue.submit(_record("conv_0123"))
+
+    storage["add_details"].assert_not_called()
+    await asyncio.wait_for(queue.wait_until_persisted("0123"), 1)
+    storage["add_details"].assert_called_once()
+
+
+async def test_wait_until_persisted_times_out(
+    queue: PersistenceQueue, storage: dict[str, Any]
+) -> None:
+    """Test that readers do not wait longer than the timeout."""
+    release = asyncio.Event()
+
+    async def blocked_session(_func: Any) -> None:
+        await release.wait()
+
+    storage["run_in_session"].side_effect = blocked_session
+    await queue.start(PersistenceQueueConfiguration(enabled=True, batch_wait_ms=0))
+    await queue.submit(_record())
+
+    await queue.wait_until_persisted("conv-1", timeout=0.01)
+    release.set()
+
+
+async def test_spooled_records_are_replayed(
+    queue: PersistenceQueue, storage: dict[str, Any], tmp_path: Path
+) -> None:
+    """Test that records spooled by a worker that is gone survive a restart."""
+    (tmp_path / "gone").mkdir()
+    (tmp_path / "gone" / "1.json").write_text(
+        _record("conv-1").model_dump_json(), encoding="utf-8"
+    )
+    (tmp_path / "2.json").write_text(
+        _record("conv-2").model_dump_json(), encoding="utf-8"
+    )
+
+    await queue.start(
+        PersistenceQueueConfiguration(enabled=True, spool_path=str(tmp_path))
+    )
+    await queue.stop()
+
+    assert storage["add_details"].call_count == 2
+    assert not list(tmp_path.iterdir())
+
+
+async def test_spool_of_running_worker_is_not_replayed(
+    queue: PersistenceQueue, storage: dict[str, Any], tmp_path: Path
+) -> None:
+    """Test that records spooled by another running worker are left to it."""
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "1.json").write_text(_record().model_dump_json(), encoding="utf-8")
+    lock = os.open(other / ".lock", os.O_RDWR | os.O_CREAT)
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        await queue.start(
+            PersistenceQueueConfiguration(enabled=True, spool_path=str(tmp_path))
+        )
+        await queue.stop()
+    finally:
+        os.close(lock)
+
+    storage["add_details"].assert_not_called()
+    assert (other / "1.json").exists()
+
+
+async def test_replay_skips_applied_steps(
+    queue: PersistenceQueue, storage: dict[str, Any], tmp_path: Path
+) -> None:
+    """Test that only steps not applied before the restart are replayed."""
+    storage["session"].commit.side_effect = SQLAlchemyError("boom")
+    storage["persist_details"].side_effect = SQLAlchemyError("boom")
+    config = PersistenceQueueConfiguration(enabled=True, spool_path=str(tmp_path))
+    await queue.start(config)
+    await queue.submit(_record())
+    await queue.stop()
+
+    spooled = list(tmp_path.glob("*/*.json"))
+    assert len(spooled) == 1
+    record = QueryResultsRecord.model_validate_json(spooled[0].read_text("utf-8"))
+    assert record.applied == ["transcript", "cache", "token_usage"]
+
+    storage["session"].commit.side_effect = None
+    await queue.start(config)
+    await queue.stop()
+
+    assert storage["add_details"].call_count == 2
+    storage["transcript"].assert_called_once()
+    storage["cache"].assert_called_once()
+    storage["token_usage_history"].consume_tokens_batch.assert_called_once()
+    assert not list(tmp_path.iterdir())
+
+
+async def test_turns_of_new_conversation_are_persisted_in_one_batch(
+    queue: PersistenceQueue, mocker: MockerFixture
+) -> None:
+    """Test that two turns of the same new conversation commit in one batch."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine, autoflush=False)
+
+    async def run_in_session(func: Any) -> Any:
+        return func(session)
+
+    mocker.patch("utils.persistence_queue.run_in_session", side_effect=run_in_session)
+    persist_details = mocker.patch(
+        "utils.persistence_queue.persist_user_conversation_details"
+    )
+    mocker.patch("utils.persistence_queue.store_query_transcript")
+    mocker.patch("utils.persistence_queue.store_conversations_into_cache")
+    mocker.patch(
+        "utils.persistence_queue.configuration",
+        mocker.Mock(token_usage_history=None),
+    )
+    await queue.start(PersistenceQueueConfiguration(enabled=True, batch_wait_ms=100))
+
+    await queue.submit(_record("conv-1"))
+    await queue.submit(_record("conv-1"))
+    await queue.stop()
+
+    # the batch did not fall back to per-record transactions
+    persist_details.assert_not_called()
+    conversation = session.query(UserConversation).filter_by(id="conv-1").one()
+    assert conversation.message_count == 2
+    turns = session.query(UserTurn.turn_number).order_by(UserTurn.turn_number).all()
+    assert [turn_number for (turn_number,) in turns] == [1, 2]
+
+
+async def test_worker_survives_unexpected_errors(
+    queue: PersistenceQueue, storage: dict[str, Any]
+) -> None:
+    """Test that errors other than database ones do not stop the worker."""
+    storage["run_in_session"].side_effect = RuntimeError("no session")
+    storage["persist_details"].side_effect = RuntimeError("no session")
+    storage["cache"].side_effect = RuntimeError("cache down")
+    await queue.start(PersistenceQueueConfiguration(enabled=True, batch_wait_ms=0))
+
+    await queue.submit(_record("conv-1"))
+    await asyncio.wait_for(queue.wait_until_persisted("conv-1"), 10)
+    assert queue.running
+
+    await queue.submit(_record("conv-2"))
+    await queue.stop()
+    assert storage["persist_details"].await_count == 2
+
+
+async def test_spool_file_is_kept_until_record_is_committed(
+    queue: PersistenceQueue, storage: dict[str, Any], tmp_path: Path
+) -> None:
+    """Test that records which were not committed stay in the spool directory."""
+    storage["session"].commit.side_effect = SQLAlchemyError("boom")
+    storage["persist_details"].side_effect = SQLAlchemyError("boom")
+    await queue.start(
+        PersistenceQueueConfiguration(enabled=True, spool_path=str(tmp_path))
+    )
+
+    await queue.submit(_record())
+    await asyncio.wait_for(queue.wait_until_persisted("conv-1"), 10)
+
+    assert len(list(tmp_path.glob("*/*.json"))) == 1
+
+
+async def test_blocking_writes_run_in_worker_thread(
+    queue: PersistenceQueue, storage: dict[str, Any]
+) -> None:
+    """Test that transcript, cache and token usage writes leave the event loop."""
+    loop_thread = threading.get_ident()
+    threads: list[int] = []
+    for name in ("transcript", "cache"):
+        storage[name].side_effect = lambda *_args, **_kwargs: threads.append(
+            threading.get_ident()
+        )
+    storage["token_usage_history"].consume_tokens_batch.side_effect = (
+        lambda *_args: threads.append(threading.get_ident())
+    )
+
+    await queue.submit(_record())
+
+    assert len(threads) == 3
+    assert loop_thread not in threads
+
+
+async def test_stop_persists_records_left_by_dead_worker(
+    queue: PersistenceQueue, storage: dict[str, Any]
+) -> None:
+    """Test that records queued when the worker died are not dropped."""
+    await queue.start(PersistenceQueueConfiguration(enabled=True, batch_wait_ms=100))
+    await queue.submit(_record())
+    worker = queue._worker  # pylint: disable=protected-access
+    assert worker is not None
+    worker.cancel()
+    await asyncio.gather(worker, return_exceptions=True)
+    assert not queue.running
+
+    await queue.stop()
+
+    storage["add_details"].assert_called_once()
+    await asyncio.wait_for(queue.wait_until_persisted("conv-1"), 1)
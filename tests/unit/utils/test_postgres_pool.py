@@ -0,0 +1,188 @@
+"""Unit tests for shared PostgreSQL connection pools."""
+
+import psycopg2
+import pytest
+from psycopg2.pool import PoolError
+from pydantic import SecretStr
+from pytest_mock import MockerFixture
+
+from models.config import PostgreSQLDatabaseConfiguration, PostgreSQLPoolConfiguration
+from utils.postgres_pool import (
+    PostgresConnectionPool,
+    close_connection_pools,
+    get_connection_pool,
+    pooled_connection,
+)
+
+
+def create_config(**pool: int) -> PostgreSQLDatabaseConfiguration:
+    """Create PostgreSQL configuration with the given pool settings."""
+    return PostgreSQLDatabaseConfiguration(
+        db="db",
+        user="user",
+        password=SecretStr("password"),
+        pool=PostgreSQLPoolConfiguration(**pool),
+    )  # pyright: ignore[reportCallIssue]
+
+
+def test_pool_opens_min_size_connections(mocker: MockerFixture) -> None:
+    """Test that the minimum number of connections is opened eagerly."""
+    connect = mocker.patch("psycopg2.connect")
+
+    pool = PostgresConnectionPool(
+        "test", {"dbname": "db"}, PostgreSQLPoolConfiguration(min_size=2)
+    )
+
+    assert connect.call_count == 2
+    connect.assert_called_with(dbname="db")
+    assert connect.return_value.autocommit is True
+    pool.close()
+
+
+def test_pool_reuses_returned_connection(mocker: MockerFixture) -> None:
+    """Test that a returned connection is borrowed again."""
+    connect = mocker.patch("psycopg2.connect")
+    pool = PostgresConnectionPool("test", {}, PostgreSQLPoolConfiguration())
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert connect.call_count == 1
+
+
+def test_pool_opens_connections_on_demand(mocker: MockerFixture) -> None:
+    """Test that concurrent borrowers get distinct connections."""
+    mocker.patch("psycopg2.connect", side_effect=lambda **_: mocker.MagicMock())
+    pool = PostgresConnectionPool(
+        "test", {}, PostgreSQLPoolConfiguration(min_size=0, max_size=2)
+    )
+
+    with pool.connection() as first, pool.connection() as second:
+        assert first is not second
+
+
+def test_pool_acquire_timeout(mocker: MockerFixture) -> None:
+    """Test that borrowing from an exhausted pool times out."""
+    mocker.patch("psycopg2.connect")
+    mocker.patch("utils.postgres_pool.monotonic", side_effect=[0.0, 100.0])
+    timeouts = mocker.patch("utils.postgres_pool.record_postgres_pool_acquire_timeout")
+    pool = PostgresConnectionPool(
+        "test", {}, PostgreSQLPoolConfiguration(min_size=0, max_size=1)
+    )
+    pool._size = 1  # pylint: disable=protected-access
+
+    with pytest.raises(PoolError, match="was free within 30 seconds"):
+        pool.getconn()
+    timeouts.assert_called_once_with("test")
+
+
+def test_pool_discards_broken_connection(mocker: MockerFixture) -> None:
+    """Test that connections failing with connection errors are replaced."""
+    connect = mocker.patch(
+        "psycopg2.connect", side_effect=lambda **_: mocker.MagicMock()
+    )
+    pool = PostgresConnectionPool("test", {}, PostgreSQLPoolConfiguration())
+
+    with pytest.raises(psycopg2.OperationalError):
+        with pool.connection() as broken:
+            raise psycopg2.OperationalError("server closed the connection")
+    with pool.connection() as connection:
+        assert connection is not broken
+
+    broken.close.assert_called_once()
+    assert connect.call_count == 2
+
+
+def test_pool_replaces_expired_connection(mocker: MockerFixture) -> None:
+    """Test that connections older than the maximum lifetime are replaced."""
+    mocker.patch("psycopg2.connect", side_effect=lambda **_: mocker.MagicMock())
+    monotonic = mocker.patch("utils.postgres_pool.monotonic", return_value=0.0)
+    pool = PostgresConnectionPool(
+        "test", {}, PostgreSQLPoolConfiguration(max_lifetime=60)
+    )
+    with pool.connection() as old:
+        pass
+
+    monotonic.return_value = 61.0
+    with pool.connection() as new:
+        assert new is not old
+    old.close.assert_called_once()
+
+
+def test_pooled_connection_cursor(mocker: MockerFixture) -> None:
+    """Test that a pooled cursor holds its connection until it is closed."""
+    connect = mocker.patch("psycopg2.connect")
+    connection = pooled_connection(create_config(), dbname="db")
+    mock_cursor = connect.return_value.cursor.return_value.__enter__.return_value
+    mock_cursor.rowcount = 1
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        assert cursor.rowcount == 1
+        assert connection.pool._in_use == 1  # pylint: disable=protected-access
+
+    mock_cursor.execute.assert_called_once_with("SELECT 1")
+    assert connection.pool._in_use == 0  # pylint: disable=protected-access
+
+
+def test_pools_are_shared(mocker: MockerFixture) -> None:
+    """Test that the same connection parameters share one pool."""
+    mocker.patch("psycopg2.connect")
+    config = create_config()
+
+    pool = get_connection_pool(config, dbname="db")
+
+    assert get_connection_pool(config, dbname="db") is pool
+    assert get_connection_pool(config, dbname="other") is not pool
+    assert pool.name == "user@localhost:5432/db"
+
+    close_connection_pools()
+    assert get_connection_pool(config, dbname="db") is not pool
+
+
+def test_pool_creation_error(mocker: MockerFixture) -> None:
+    """Test that connection errors are propagated when the pool is created."""
+    mocker.patch(
+        "psycopg2.connect", side_effect=psycopg2.OperationalError("can not connect")
+    )
+
+    with pytest.raises(psycopg2.OperationalError, match="can not connect"):
+        get_connection_pool(create_config(), dbname="db")
+
+
+def test_pool_health_check_closes_broken_connections(mocker: MockerFixture) -> None:
+    """Test that idle connections failing the health check are closed."""
+    mocker.patch("psycopg2.connect", side_effect=lambda **_: mocker.MagicMock())
+    pool = PostgresConnectionPool("test", {}, PostgreSQLPoolConfiguration(min_size=2))
+    healthy, broken = [c for c, _ in pool._idle]  # pylint: disable=protected-access
+    broken.cursor.return_value.__enter__.return_value.execute.side_effect = (
+        psycopg2.OperationalError("server closed the connection")
+    )
+
+    pool.check_idle_connections()
+
+    broken.close.assert_called_once()
+    healthy.close.assert_not_called()
+    assert [c for c, _ in pool._idle] == [healthy]  # pylint: disable=protected-access
+    assert pool._in_use == 0  # pylint: disable=protected-access
+    pool.close()
+
+
+def test_pool_health_check_thread(mocker: MockerFixture) -> None:
+    """Test that the health check thread runs only when configured."""
+    mocker.patch("psycopg2.connect")
+
+    pool = PostgresConnectionPool("test", {}, PostgreSQLPoolConfiguration())
+    assert pool._health_checker is None  # pylint: disable=protected-access
+
+    pool = PostgresConnectionPool(
+        "test", {}, PostgreSQLPoolConfiguration(health_check_interval=60)
+    )
+    checker = pool._health_checker  # pylint: disable=protected-access
+    assert checker is not None and checker.is_alive()
+    pool.close()
+    checker.join(timeout=5)
+    assert not checker.is_alive()
@@ -2,6 +2,7 @@
 
 # pylint: disable=too-many-lines
 
+import asyncio
 import sqlite3
 from typing import Any
 
@@ -27,6 +28,7 @@ from models.requests import Attachment, QueryRequest
 from tests.unit import config_dict
 from utils.query import (
     consume_query_tokens,
+    discard_preparation_stages,
     extract_provider_and_model_from_model_id,
     handle_known_apistatus_errors,
     is_input_shield,
@@ -36,6 +38,7 @@ from utils.query import (
     prepare_input,
     store_conversation_into_cache,
     store_query_results,
+    timed_preparation_stage,
     update_azure_token,
     validate_attachments_metadata,
     validate_model_provider_override,
@@ -74,6 +77,62 @@ def mock_models_fixture() -> ModelListResponse:
     return [model1, model2]
 
 
+class TestPreparationStages:
+    """Tests for timed_preparation_stage and discard_preparation_stages."""
+
+    @pytest.mark.asyncio
+    async def test_timed_preparation_stage_records_duration(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test that the stage result is returned and its duration recorded."""
+        mock_record = mocker.patch(
+            "utils.query.recording.record_request_preparation_duration"
+        )
+
+        async def stage() -> str:
+            return "result"
+
+        result = await timed_preparation_stage("/query", "moderation", stage())
+
+        assert result == "result"
+        mock_record.assert_called_once()
+        assert mock_record.call_args.args[:2] == ("/query", "moderation")
+
+    @pytest.mark.asyncio
+    async def test_timed_preparation_stage_records_failed_stage(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test that a failing stage is recorded and its error propagated."""
+        mock_record = mocker.patch(
+            "utils.query.recording.record_request_preparation_duration"
+        )
+
+        async def stage() -> None:
+            raise HTTPException(status_code=401)
+
+        with pytest.raises(HTTPException):
+            await timed_preparation_stage("/query", "mcp_auth", stage())
+        mock_record.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_discard_preparation_stages(self) -> None:
+        """Test that pending stages are cancelled and failed ones settled."""
+
+        async def failing() -> None:
+            raise RuntimeError("boom")
+
+        finished = asyncio.create_task(asyncio.sleep(0, result="done"))
+        failed = asyncio.create_task(failing())
+        pending = asyncio.create_task(asyncio.sleep(10))
+        await asyncio.wait([finished, failed])
+
+        await discard_preparation_stages([finished, failed, pending])
+
+        assert finished.result() == "done"
+        assert pending.cancelled()
+        assert isinstance(failed.exception(), RuntimeError)
+
+
 class TestStoreConversationIntoCache:
     """Tests for store_conversation_into_cache function."""
 
@@ -373,7 +432,8 @@ class TestIsTranscriptsEnabled:
 class TestPersistUserConversationDetails:
     """Tests for persist_user_conversation_details function."""
 
-    def test_create_new_conversation(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_create_new_conversation(self, mocker: MockerFixture) -> None:
         """Test creating a new conversation."""
         mock_session = mocker.Mock()
 
@@ -394,11 +454,12 @@ class TestPersistUserConversationDetails:
             return mock_max_query
 
         mock_session.query.side_effect = query_side_effect
-        mock_session.__enter__ = mocker.Mock(return_value=mock_session)
-        mock_session.__exit__ = mocker.Mock(return_value=None)
-        mocker.patch("utils.query.get_session", return_value=mock_session)
+        mocker.patch(
+            "utils.query.run_in_session",
+            side_effect=lambda func: func(mock_session),
+        )
 
-        persist_user_conversation_details(
+        await persist_user_conversation_details(
             user_id="user1",
             conversation_id="conv1",
             started_at="2024-01-01T00:00:00Z",
@@ -412,7 +473,8 @@ class TestPersistUserConversationDetails:
         mock_session.add.assert_called()
         mock_session.commit.assert_called_once()
 
-    def test_update_existing_conversation(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_update_existing_conversation(self, mocker: MockerFixture) -> None:
         """Test updating an existing conversation."""
         existing_conv = UserConversation(
             id="conv1",
@@ -442,11 +504,12 @@ class TestPersistUserConversationDetails:
             return mock_max_query
 
         mock_session.query.side_effect = query_side_effect
-        mock_session.__enter__ = mocker.Mock(return_value=mock_session)
-        mock_session.__exit__ = mocker.Mock(return_value=None)
-        mocker.patch("utils.query.get_session", return_value=mock_session)
+        mocker.patch(
+            "utils.query.run_in_session",
+            side_effect=lambda func: func(mock_session),
+        )
 
-        persist_user_conversation_details(
+        await persist_user_conversation_details(
             user_id="user1",
             conversation_id="conv1",
             started_at="2024-01-01T00:00:00Z",
@@ -462,7 +525,8 @@ class TestPersistUserConversationDetails:
         assert existing_conv.message_count == 6
         mock_session.commit.assert_called_once()
 
-    def test_create_new_conversation_with_existing_turns(
+    @pytest.mark.asyncio
+    async def test_create_new_conversation_with_existing_turns(
         self, mocker: MockerFixture
     ) -> None:
         """Test creating a new conversation when there are existing turns."""
@@ -486,11 +550,12 @@ class TestPersistUserConversationDetails:
             return mock_max_query
 
         mock_session.query.side_effect = query_side_effect
-        mock_session.__enter__ = mocker.Mock(return_value=mock_session)
-        mock_session.__exit__ = mocker.Mock(return_value=None)
-        mocker.patch("utils.query.get_session", return_value=mock_session)
+        mocker.patch(
+            "utils.query.run_in_session",
+            side_effect=lambda func: func(mock_session),
+        )
 
-        persist_user_conversation_details(
+        await persist_user_conversation_details(
             user_id="user1",
             conversation_id="conv1",
             started_at="2024-01-01T00:00:00Z",
@@ -578,6 +643,7 @@ class TestUpdateAzureToken:
         """Test updating token with remote client."""
         mock_client_holder = mocker.Mock()
         mock_client_holder.is_library_client = False
+        mock_client_holder.provider_data = {}
         mock_client_holder.update_provider_data = mocker.Mock(
             return_value="updated_client"
         )
@@ -608,11 +674,42 @@ class TestUpdateAzureToken:
         result = await update_azure_token(mock_client)
         assert result == "updated_client"
 
+    @pytest.mark.asyncio
+    async def test_update_with_known_api_base(self, mocker: MockerFixture) -> None:
+        """Test that providers are not listed when the API base is already known."""
+        mock_client_holder = mocker.Mock()
+        mock_client_holder.is_library_client = False
+        mock_client_holder.provider_data = {"azure_api_base": "https://api.example.com"}
+        mock_client_holder.update_provider_data = mocker.Mock(
+            return_value="updated_client"
+        )
+        mocker.patch(
+            "utils.query.AsyncLlamaStackClientHolder", return_value=mock_client_holder
+        )
+        mocker.patch(
+            "utils.query.AzureEntraIDManager",
+            return_value=mocker.Mock(
+                access_token=mocker.Mock(
+                    get_secret_value=mocker.Mock(return_value="token")
+                )
+            ),
+        )
+        mock_client = mocker.AsyncMock()
+
+        result = await update_azure_token(mock_client)
+
+        assert result == "updated_client"
+        mock_client.providers.list.assert_not_called()
+        mock_client_holder.update_provider_data.assert_called_once_with(
+            {"azure_api_key": "token"}
+        )
+
     @pytest.mark.asyncio
     async def test_update_with_connection_error(self, mocker: MockerFixture) -> None:
         """Test updating token raises HTTPException on connection error."""
         mock_client_holder = mocker.Mock()
         mock_client_holder.is_library_client = False
+        mock_client_holder.provider_data = {}
         mocker.patch(
             "utils.query.AsyncLlamaStackClientHolder", return_value=mock_client_holder
         )
@@ -633,6 +730,7 @@ class TestUpdateAzureToken:
         """Test updating token raises HTTPException on API status error."""
         mock_client_holder = mocker.Mock()
         mock_client_holder.is_library_client = False
+        mock_client_holder.provider_data = {}
         mocker.patch(
             "utils.query.AsyncLlamaStackClientHolder", return_value=mock_client_holder
         )
@@ -652,7 +750,8 @@ class TestUpdateAzureToken:
 class TestStoreQueryResults:
     """Tests for store_query_results function."""
 
-    def test_store_query_results_success(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_store_query_results_success(self, mocker: MockerFixture) -> None:
         """Test successful storage of query results."""
         mocker.patch("utils.query.is_transcripts_enabled", return_value=False)
         mock_persist = mocker.patch("utils.query.persist_user_conversation_details")
@@ -664,7 +763,7 @@ class TestStoreQueryResults:
 
         query_request = QueryRequest(query="test")  # pyright: ignore[reportCallIssue]
 
-        store_query_results(
+        await store_query_results(
             user_id="user1",
             conversation_id="conv1",
             model="provider1/model1",
@@ -680,7 +779,10 @@ class TestStoreQueryResults:
         mock_persist.assert_called_once()
         mock_store_cache.assert_called_once()
 
-    def test_store_query_results_transcript_error(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_store_query_results_transcript_error(
+        self, mocker: MockerFixture
+    ) -> None:
         """Test storage raises HTTPException on transcript error."""
         mocker.patch("utils.query.is_transcripts_enabled", return_value=True)
         error_response = InternalServerErrorResponse.generic()
@@ -696,7 +798,7 @@ class TestStoreQueryResults:
         query_request = QueryRequest(query="test")  # pyright: ignore[reportCallIssue]
 
         with pytest.raises(HTTPException) as exc_info:
-            store_query_results(
+            await store_query_results(
                 user_id="user1",
                 conversation_id="conv1",
                 model="provider1/model1",
@@ -709,7 +811,10 @@ class TestStoreQueryResults:
             )
         assert exc_info.value.status_code == 500
 
-    def test_store_query_results_sqlalchemy_error(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_store_query_results_sqlalchemy_error(
+        self, mocker: MockerFixture
+    ) -> None:
         """Test storage raises HTTPException on SQLAlchemy error."""
         mocker.patch("utils.query.is_transcripts_enabled", return_value=False)
         mocker.patch(
@@ -724,7 +829,7 @@ class TestStoreQueryResults:
         query_request = QueryRequest(query="test")  # pyright: ignore[reportCallIssue]
 
         with pytest.raises(HTTPException) as exc_info:
-            store_query_results(
+            await store_query_results(
                 user_id="user1",
                 conversation_id="conv1",
                 model="provider1/model1",
@@ -737,7 +842,8 @@ class TestStoreQueryResults:
             )
         assert exc_info.value.status_code == 500
 
-    def test_store_query_results_cache_error(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_store_query_results_cache_error(self, mocker: MockerFixture) -> None:
         """Test storage raises HTTPException on cache error."""
         mocker.patch("utils.query.is_transcripts_enabled", return_value=False)
         mocker.patch("utils.query.persist_user_conversation_details")
@@ -753,7 +859,7 @@ class TestStoreQueryResults:
         query_request = QueryRequest(query="test")  # pyright: ignore[reportCallIssue]
 
         with pytest.raises(HTTPException) as exc_info:
-            store_query_results(
+            await store_query_results(
                 user_id="user1",
                 conversation_id="conv1",
                 model="provider1/model1",
@@ -766,7 +872,8 @@ class TestStoreQueryResults:
             )
         assert exc_info.value.status_code == 500
 
-    def test_store_query_results_value_error(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_store_query_results_value_error(self, mocker: MockerFixture) -> None:
         """Test storage raises HTTPException on ValueError."""
         mocker.patch("utils.query.is_transcripts_enabled", return_value=False)
         mocker.patch("utils.query.persist_user_conversation_details")
@@ -782,7 +889,7 @@ class TestStoreQueryResults:
         query_request = QueryRequest(query="test")  # pyright: ignore[reportCallIssue]
 
         with pytest.raises(HTTPException) as exc_info:
-            store_query_results(
+            await store_query_results(
                 user_id="user1",
                 conversation_id="conv1",
                 model="provider1/model1",
@@ -795,7 +902,10 @@ class TestStoreQueryResults:
             )
         assert exc_info.value.status_code == 500
 
-    def test_store_query_results_psycopg2_error(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_store_query_results_psycopg2_error(
+        self, mocker: MockerFixture
+    ) -> None:
         """Test storage raises HTTPException on psycopg2 error."""
         mocker.patch("utils.query.is_transcripts_enabled", return_value=False)
         mocker.patch("utils.query.persist_user_conversation_details")
@@ -811,7 +921,7 @@ class TestStoreQueryResults:
         query_request = QueryRequest(query="test")  # pyright: ignore[reportCallIssue]
 
         with pytest.raises(HTTPException) as exc_info:
-            store_query_results(
+            await store_query_results(
                 user_id="user1",
                 conversation_id="conv1",
                 model="provider1/model1",
@@ -824,7 +934,10 @@ class TestStoreQueryResults:
             )
         assert exc_info.value.status_code == 500
 
-    def test_store_query_results_sqlite_error(self, mocker: MockerFixture) -> None:
+    @pytest.mark.asyncio
+    async def test_store_query_results_sqlite_error(
+        self, mocker: MockerFixture
+    ) -> None:
         """Test storage raises HTTPException on sqlite3 error."""
         mocker.patch("utils.query.is_transcripts_enabled", return_value=False)
         mocker.patch("utils.query.persist_user_conversation_details")
@@ -840,7 +953,7 @@ class TestStoreQueryResults:
         query_request = QueryRequest(query="test")  # pyright: ignore[reportCallIssue]
 
         with pytest.raises(HTTPException) as exc_info:
-            store_query_results(
+            await store_query_results(
                 user_id="user1",
                 conversation_id="conv1",
                 model="provider1/model1",
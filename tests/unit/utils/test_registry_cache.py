@@ -0,0 +1,199 @@
+"""Unit tests for the Llama Stack registry cache."""
+
+import asyncio
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from utils.registry_cache import (
+    REGISTRY_MODELS,
+    REGISTRY_VECTOR_STORES,
+    LlamaStackRegistryCache,
+)
+
+
+@pytest.fixture(name="registry")
+def registry_fixture() -> Generator[LlamaStackRegistryCache, None, None]:
+    """Provide the registry cache with default timing and no entries."""
+    registry = LlamaStackRegistryCache()
+    ttl, refresh_ahead = registry.ttl, registry.refresh_ahead
+    registry.invalidate()
+    yield registry
+    registry.ttl, registry.refresh_ahead = ttl, refresh_ahead
+    registry.invalidate()
+
+
+@pytest.fixture(name="client")
+def client_fixture(mocker: MockerFixture) -> Any:
+    """Provide a mocked Llama Stack client."""
+    client = mocker.AsyncMock()
+    client.models.list.return_value = ["model"]
+    client.shields.list.return_value = ["shield"]
+    client.toolgroups.list.return_value = ["toolgroup"]
+    client.vector_stores.list.return_value = mocker.Mock(data=["vector_store"])
+    return client
+
+
+def test_registry_cache_is_singleton() -> None:
+    """Test that the registry cache is shared process-wide."""
+    assert LlamaStackRegistryCache() is LlamaStackRegistryCache()
+
+
+async def test_listings_are_cached(
+    registry: LlamaStackRegistryCache, client: Any
+) -> None:
+    """Test that repeated lookups hit Llama Stack only once per listing."""
+    for _ in range(3):
+        assert await registry.models(client) == ["model"]
+        assert await registry.shields(client) == ["shield"]
+        assert await registry.toolgroups(client) == ["toolgroup"]
+        assert await registry.vector_stores(client) == ["vector_store"]
+
+    client.models.list.assert_awaited_once()
+    client.shields.list.assert_awaited_once()
+    client.toolgroups.list.assert_awaited_once()
+    client.vector_stores.list.assert_awaited_once()
+
+
+async def test_force_refresh(registry: LlamaStackRegistryCache, client: Any) -> None:
+    """Test that force_refresh bypasses and replaces the cached listing."""
+    await registry.models(client)
+    client.models.list.return_value = ["new-model"]
+
+    assert await registry.models(client, force_refresh=True) == ["new-model"]
+    assert await registry.models(client) == ["new-model"]
+    assert client.models.list.await_count == 2
+
+
+async def test_expired_entry_is_refetched(
+    registry: LlamaStackRegistryCache, client: Any
+) -> None:
+    """Test that entries older than the TTL are fetched again."""
+    registry.ttl = 0
+    registry.refresh_ahead = 0
+
+    await registry.models(client)
+    await registry.models(client)
+
+    assert client.models.list.await_count == 2
+
+
+async def test_refresh_ahead_serves_cached_value(
+    registry: LlamaStackRegistryCache, client: Any
+) -> None:
+    """Test that entries near expiry are served and refreshed in background."""
+    registry.refresh_ahead = registry.ttl
+    await registry.models(client)
+    client.models.list.return_value = ["new-model"]
+
+    assert await registry.models(client) == ["model"]
+    await asyncio.sleep(0)
+    assert await registry.models(client) == ["new-model"]
+
+
+async def test_background_refresh_failure_keeps_value(
+    registry: LlamaStackRegistryCache, client: Any
+) -> None:
+    """Test that a failed background refresh keeps serving the cached value."""
+    registry.refresh_ahead = registry.ttl
+    await registry.models(client)
+    client.models.list.side_effect = RuntimeError("boom")
+
+    assert await registry.models(client) == ["model"]
+    await asyncio.sleep(0)
+    assert await registry.models(client) == ["model"]
+
+
+async def test_concurrent_misses_share_one_fetch(
+    registry: LlamaStackRegistryCache, client: Any
+) -> None:
+    """Test that concurrent lookups of a missing listing share one call."""
+    release = asyncio.Event()
+
+    async def slow_list() -> list[str]:
+        await release.wait()
+        return ["model"]
+
+    client.models.list.side_effect = slow_list
+
+    lookups = [asyncio.create_task(registry.models(client)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*lookups) == [["model"]] * 5
+    client.models.list.assert_awaited_once()
+
+
+async def test_fetch_errors_propagate(
+    registry: LlamaStackRegistryCache, client: Any
+) -> None:
+    """Test that a failed fetch is raised and not cached."""
+    client.models.list.side_effect = [RuntimeError("boom"), ["model"]]
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await registry.models(client)
+    assert await registry.models(client) == ["model"]
+
+
+async def test_invalidate(registry: LlamaStackRegistryCache, client: Any) -> None:
+    """Test that invalidate only drops the requested listings."""
+    await registry.models(client)
+    await registry.vector_stores(client)
+
+    registry.invalidate(REGISTRY_VECTOR_STORES)
+    await registry.models(client)
+    await registry.vector_stores(client)
+
+    client.models.list.assert_awaited_once()
+    assert client.vector_stores.list.await_count == 2
+
+    registry.invalidate()
+    await registry.models(client)
+    assert client.models.list.await_count == 2
+
+
+async def test_invalidate_during_fetch_discards_result(
+    registry: LlamaStackRegistryCache, client: Any
+) -> None:
+    """Test that a listing invalidated while being fetched is not stored."""
+    release = asyncio.Event()
+
+    async def slow_list() -> list[str]:
+        await release.wait()
+        return ["stale-model"]
+
+    client.models.list.side_effect = slow_list
+    lookup = asyncio.create_task(registry.models(client))
+    await asyncio.sleep(0)
+    registry.invalidate(REGISTRY_MODELS)
+    release.set()
+    assert await lookup == ["stale-model"]
+
+    client.models.list.side_effect = None
+    assert await registry.models(client) == ["model"]
+
+
+async def test_other_client_is_a_miss(
+    registry: LlamaStackRegistryCache, client: Any, mocker: MockerFixture
+) -> None:
+    """Test that listings are not served to a different client."""
+    other_client = mocker.AsyncMock()
+    other_client.models.list.return_value = ["other-model"]
+
+    assert await registry.models(client) == ["model"]
+    assert await registry.models(other_client) == ["other-model"]
+
+
+async def test_rebind(
+    registry: LlamaStackRegistryCache, client: Any, mocker: MockerFixture
+) -> None:
+    """Test that listings follow a client copied with new headers."""
+    copied_client = mocker.AsyncMock()
+    await registry.models(client)
+
+    registry.rebind(client, copied_client)
+
+    assert await registry.models(copied_client) == ["model"]
+    copied_client.models.list.assert_not_awaited()
@@ -2,6 +2,7 @@
 
 # pylint: disable=line-too-long,too-many-lines
 
+import asyncio
 import json
 from pathlib import Path
 from typing import Any, Optional, cast
@@ -79,6 +80,7 @@ from utils.responses import (
     get_topic_summary,
     get_vector_store_ids,
     is_server_deployed_output,
+    join_topic_summary,
     parse_arguments_string,
     parse_referenced_documents,
     prepare_responses_params,
@@ -86,6 +88,8 @@ from utils.responses import (
     resolve_client_tool_choice,
     resolve_tool_choice,
     resolve_vector_store_ids,
+    shutdown_background_topic_summary_tasks,
+    start_topic_summary,
 )
 
 
@@ -884,6 +888,50 @@ class TestGetTopicSummary:
             await get_topic_summary("test question", mock_client, "model1")
 
 
+class TestTopicSummaryTasks:
+    """Test cases for topic summary generated alongside the main response."""
+
+    @pytest.mark.asyncio
+    async def test_join_returns_topic_summary(self) -> None:
+        """Test that a started topic summary is joined."""
+
+        async def summary() -> str:
+            return "Topic"
+
+        task = start_topic_summary(summary())
+
+        assert await join_topic_summary(task) == "Topic"
+
+    @pytest.mark.asyncio
+    async def test_join_propagates_error(self) -> None:
+        """Test that a failed topic summary raises when joined."""
+
+        async def summary() -> str:
+            raise HTTPException(status_code=503, detail="unavailable")
+
+        task = start_topic_summary(summary())
+
+        with pytest.raises(HTTPException):
+            await join_topic_summary(task)
+
+    @pytest.mark.asyncio
+    async def test_join_timeout_cancels_task(self) -> None:
+        """Test that a slow topic summary is cancelled and skipped."""
+        task = start_topic_summary(asyncio.sleep(10, result="Topic"))
+
+        assert await join_topic_summary(task, timeout=0.01) is None
+        assert task.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_running_tasks(self) -> None:
+        """Test that shutdown cancels topic summaries still running."""
+        task = start_topic_summary(asyncio.sleep(10, result="Topic"))
+
+        await shutdown_background_topic_summary_tasks()
+
+        assert task.cancelled()
+
+
 class TestResolveToolChoice:
     """Tests for resolve_tool_choice (ToolChoiceMode, AllowedTools, explicit/implicit tools)."""
 
@@ -1,5 +1,8 @@
 """Unit tests for utils/shields.py functions."""
 
+import asyncio
+from typing import Any
+
 import pytest
 from fastapi import HTTPException, status
 from llama_stack_client import APIConnectionError, APIStatusError
@@ -390,6 +393,99 @@ class TestRunShieldModeration:
             input="test input", model="model-1"
         )
 
+    @staticmethod
+    def _moderation_client(mocker: MockerFixture, verdicts: dict[str, Any]) -> Any:
+        """Create a client whose shields moderate with the given verdicts.
+
+        Each verdict is a (delay, flagged) tuple keyed by shield model.
+        """
+        mock_client = mocker.Mock()
+        shields = []
+        for index, model_id in enumerate(verdicts):
+            shield = mocker.Mock()
+            shield.identifier = f"shield-{index}"
+            shield.provider_resource_id = model_id
+            shields.append(shield)
+        mock_client.shields.list = mocker.AsyncMock(return_value=shields)
+        mock_client.models.list = mocker.AsyncMock(
+            return_value=[mocker.Mock(id=model_id) for model_id in verdicts]
+        )
+
+        async def moderate(**kwargs: Any) -> Any:
+            model = kwargs["model"]
+            delay, flagged = verdicts[model]
+            await asyncio.sleep(delay)
+            result = mocker.Mock(flagged=flagged, user_message=f"blocked by {model}")
+            return mocker.Mock(id=f"mod-{model}", results=[result])
+
+        mock_client.moderations.create = mocker.AsyncMock(side_effect=moderate)
+        return mock_client
+
+    @pytest.mark.asyncio
+    async def test_shields_run_concurrently(self, mocker: MockerFixture) -> None:
+        """Test that moderation calls of all shields run at the same time."""
+        mock_client = self._moderation_client(
+            mocker, {"model-1": (0.2, False), "model-2": (0.2, False)}
+        )
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await run_shield_moderation(mock_client, "input", "/test-endpoint")
+
+        assert result.decision == "passed"
+        assert mock_client.moderations.create.await_count == 2
+        assert loop.time() - started < 0.35
+
+    @pytest.mark.asyncio
+    async def test_first_configured_violation_is_reported(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test that the first flagging shield in order wins over faster ones."""
+        mocker.patch("utils.shields.recording.record_llm_validation_error")
+        mock_client = self._moderation_client(
+            mocker, {"model-1": (0.05, True), "model-2": (0, True)}
+        )
+
+        result = await run_shield_moderation(mock_client, "input", "/test-endpoint")
+
+        assert result.decision == "blocked"
+        assert result.message == "blocked by model-1"
+
+    @pytest.mark.asyncio
+    async def test_violation_cancels_remaining_shields(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test that pending moderation calls are cancelled after a violation."""
+        mocker.patch("utils.shields.recording.record_llm_validation_error")
+        mock_client = self._moderation_client(
+            mocker, {"model-1": (0, True), "model-2": (10, False)}
+        )
+
+        result = await asyncio.wait_for(
+            run_shield_moderation(mock_client, "input", "/test-endpoint"), 1
+        )
+
+        assert result.decision == "blocked"
+        assert result.message == "blocked by model-1"
+
+    @pytest.mark.asyncio
+    async def test_violation_waits_only_for_earlier_shields(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test that a violation is reported once earlier shields passed."""
+        mocker.patch("utils.shields.recording.record_llm_validation_error")
+        mock_client = self._moderation_client(
+            mocker,
+            {"model-1": (0.05, False), "model-2": (0, True), "model-3": (10, False)},
+        )
+
+        result = await asyncio.wait_for(
+            run_shield_moderation(mock_client, "input", "/test-endpoint"), 1
+        )
+
+        assert result.decision == "blocked"
+        assert result.message == "blocked by model-2"
+
 
 class TestAppendTurnToConversation:  # pylint: disable=too-few-public-methods
     """Tests for append_turn_to_conversation function."""
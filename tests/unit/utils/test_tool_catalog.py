@@ -0,0 +1,109 @@
+"""Unit tests for the catalog of toolgroup tools."""
+
+import asyncio
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from utils.tool_catalog import ToolCatalog
+
+
+@pytest.fixture(name="catalog")
+def catalog_fixture() -> Generator[ToolCatalog, None, None]:
+    """Provide the tool catalog without entries."""
+    catalog = ToolCatalog()
+    catalog.invalidate()
+    yield catalog
+    catalog.invalidate()
+
+
+@pytest.fixture(name="load")
+def load_fixture(mocker: MockerFixture) -> Any:
+    """Provide a tool listing returning one tool."""
+    return mocker.AsyncMock(return_value=[{"identifier": "tool"}])
+
+
+def test_tool_catalog_is_singleton() -> None:
+    """Test that the tool catalog is shared process-wide."""
+    assert ToolCatalog() is ToolCatalog()
+
+
+async def test_tools_are_cached_per_headers(
+    catalog: ToolCatalog, load: Any, mocker: MockerFixture
+) -> None:
+    """Test that tools are listed once per toolgroup and headers."""
+    client = mocker.Mock()
+    for _ in range(2):
+        tools = await catalog.tools(client, "tg", {"Authorization": "a"}, load)
+        assert tools == [{"identifier": "tool"}]
+    assert load.await_count == 1
+
+    await catalog.tools(client, "tg", {"Authorization": "b"}, load)
+    await catalog.tools(client, "other", {"Authorization": "a"}, load)
+    assert load.await_count == 3
+
+    # tools listed with another client are not served
+    await catalog.tools(mocker.Mock(), "tg", {"Authorization": "a"}, load)
+    assert load.await_count == 4
+
+
+async def test_concurrent_lookups_share_listing(
+    catalog: ToolCatalog, mocker: MockerFixture
+) -> None:
+    """Test that concurrent misses wait for one listing."""
+
+    async def load() -> list[dict[str, Any]]:
+        await asyncio.sleep(0.01)
+        return []
+
+    spy = mocker.AsyncMock(side_effect=load)
+    client = mocker.Mock()
+    await asyncio.gather(*(catalog.tools(client, "tg", {}, spy) for _ in range(5)))
+
+    assert spy.await_count == 1
+
+
+async def test_invalidate_toolgroup(
+    catalog: ToolCatalog, load: Any, mocker: MockerFixture
+) -> None:
+    """Test that invalidating a toolgroup drops only its tools."""
+    client = mocker.Mock()
+    await catalog.tools(client, "tg", {}, load)
+    await catalog.tools(client, "other", {}, load)
+
+    catalog.invalidate("tg")
+    await catalog.tools(client, "tg", {}, load)
+    await catalog.tools(client, "other", {}, load)
+
+    assert load.await_count == 3
+
+
+async def test_listing_invalidated_while_loading_is_not_stored(
+    catalog: ToolCatalog, mocker: MockerFixture
+) -> None:
+    """Test that tools listed before invalidation are not cached."""
+
+    async def load() -> list[dict[str, Any]]:
+        catalog.invalidate()
+        return []
+
+    spy = mocker.AsyncMock(side_effect=load)
+    client = mocker.Mock()
+    await catalog.tools(client, "tg", {}, spy)
+    await catalog.tools(client, "tg", {}, spy)
+
+    assert spy.await_count == 2
+
+
+async def test_failed_listing_is_not_cached(
+    catalog: ToolCatalog, mocker: MockerFixture
+) -> None:
+    """Test that errors are raised to the caller and not cached."""
+    load = mocker.AsyncMock(side_effect=[RuntimeError("boom"), []])
+    client = mocker.Mock()
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await catalog.tools(client, "tg", {}, load)
+    assert await catalog.tools(client, "tg", {}, load) == []